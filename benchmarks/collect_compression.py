@@ -0,0 +1,97 @@
+#!/usr/bin/env python
+#   This file is part of nexdatas - Tango Server for NeXus data writer
+#
+#    Copyright (C) 2012-2018 DESY, Jan Kotanski <jkotan@mail.desy.de>
+#
+#    nexdatas is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    nexdatas is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with nexdatas.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+""" benchmark of nxscollect append with parallel compression """
+
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+import numpy
+
+from nxstools import filewriter
+from nxstools import nxscollect
+
+
+def main():
+    """ the main program function
+    """
+    parser = argparse.ArgumentParser(
+        description="benchmark of nxscollect append"
+        " with parallel compression")
+    parser.add_argument(
+        "-n", "--frames", type=int, default=100,
+        help="number of frames (default: 100)")
+    parser.add_argument(
+        "--frame", type=int, nargs=2, default=[1024, 1024],
+        metavar=("HEIGHT", "WIDTH"),
+        help="frame shape (default: 1024 1024)")
+    parser.add_argument(
+        "-c", "--compression", default="2",
+        help="compression rate or <filterid>:opt1,opt2,... (default: 2)")
+    parser.add_argument(
+        "-j", "--jobs", type=int, nargs="+", default=[0, 2, 4],
+        help="numbers of compression jobs, 0 for compression"
+        " by the HDF5 library (default: 0 2 4)")
+    parser.add_argument(
+        "--writer", default="h5py",
+        choices=sorted(nxscollect.WRITERS.keys()),
+        help="writer module (default: h5py)")
+    options = parser.parse_args()
+    writer = nxscollect.WRITERS[options.writer]
+    tmpdir = tempfile.mkdtemp(prefix="nxscollect_benchmark_")
+    try:
+        rng = numpy.random.RandomState(0)
+        for i in range(options.frames):
+            rng.poisson(5, options.frame).astype("uint32").tofile(
+                os.path.join(tmpdir, "frame_%05d.raw" % i))
+        inputfiles = [os.path.join(tmpdir, "frame_%%05d.raw:0:%s" % (
+            options.frames - 1))]
+        filename = os.path.join(tmpdir, "master.nxs")
+        stdout = sys.stdout
+        for jobs in options.jobs:
+            fl = filewriter.create_file(
+                filename, overwrite=True, writer=writer)
+            fl.root().create_group("entry", "NXentry")
+            fl.close()
+            start = time.time()
+            with open(os.devnull, "w") as devnull:
+                sys.stdout = devnull
+                try:
+                    nxscollect.Collector(
+                        filename, options.compression, storeold=False,
+                        writer=options.writer,
+                        compressionjobs=jobs).collect(
+                            "/entry/data", inputfiles, "uint32",
+                            options.frame)
+                finally:
+                    sys.stdout = stdout
+            elapsed = time.time() - start
+            print("jobs %3s  %8.3f s  %8.2f ms/frame  %8.1f MB" % (
+                jobs, elapsed, elapsed * 1e3 / options.frames,
+                os.path.getsize(filename) / 1e6))
+    finally:
+        shutil.rmtree(tmpdir)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
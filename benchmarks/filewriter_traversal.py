@@ -0,0 +1,162 @@
+#!/usr/bin/env python
+#   This file is part of nexdatas - Tango Server for NeXus data writer
+#
+#    Copyright (C) 2012-2018 DESY, Jan Kotanski <jkotan@mail.desy.de>
+#
+#    nexdatas is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    nexdatas is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with nexdatas.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+""" microbenchmark of the filewriter tree traversal """
+
+import argparse
+import os
+import sys
+import time
+
+from nxstools import filewriter
+from nxstools.nxsfileparser import NXSFileParser
+
+WRITERS = {}
+try:
+    from nxstools import h5pywriter
+    WRITERS["h5py"] = h5pywriter
+except Exception:
+    pass
+
+try:
+    from nxstools import h5cppwriter
+    WRITERS["h5cpp"] = h5cppwriter
+except Exception:
+    pass
+
+
+def generate(filename, nodes, width, writer):
+    """ creates a NeXus file with the given number of nodes
+
+    :param filename: file name
+    :type filename: :obj:`str`
+    :param nodes: number of nodes
+    :type nodes: :obj:`int`
+    :param width: number of fields in one group
+    :type width: :obj:`int`
+    :param writer: writer module
+    :type writer: :obj:`module`
+    """
+    fl = filewriter.create_file(filename, overwrite=True, writer=writer)
+    entry = fl.root().create_group("entry", "NXentry")
+    created = 0
+    gid = 0
+    while created < nodes:
+        group = entry.create_group("group%05d" % gid, "NXcollection")
+        created += 1
+        for fid in range(min(width, nodes - created)):
+            field = group.create_field("field%05d" % fid, "float64", [1])
+            field.write([float(fid)])
+            field.close()
+            created += 1
+        group.close()
+        gid += 1
+    entry.close()
+    fl.close()
+
+
+def walk(node):
+    """ iterates over the tree and touches paths of its nodes
+
+    :param node: file tree node
+    :type node: :class:`filewriter.FTObject`
+    :returns: number of visited nodes
+    :rtype: :obj:`int`
+    """
+    count = 1
+    node.path
+    if isinstance(node, filewriter.FTGroup):
+        for child in node:
+            count += walk(child)
+    return count
+
+
+def measure(label, func, repeat):
+    """ prints the best time of the function calls
+
+    :param label: measurement label
+    :type label: :obj:`str`
+    :param func: measured function
+    :type func: :obj:`instancemethod`
+    :param repeat: number of repetitions
+    :type repeat: :obj:`int`
+    """
+    times = []
+    result = None
+    for _ in range(repeat):
+        start = time.time()
+        result = func()
+        times.append(time.time() - start)
+    print("%-12s %10s nodes  best %8.3f s" % (label, result, min(times)))
+
+
+def main():
+    """ the main program function
+    """
+    parser = argparse.ArgumentParser(
+        description="benchmark of the filewriter tree traversal")
+    parser.add_argument(
+        "-n", "--nodes", type=int, default=100000,
+        help="number of nodes (default: 100000)")
+    parser.add_argument(
+        "-w", "--width", type=int, default=1000,
+        help="number of fields in one group (default: 1000)")
+    parser.add_argument(
+        "-r", "--repeat", type=int, default=3,
+        help="number of repetitions (default: 3)")
+    parser.add_argument(
+        "--writer", default="h5py", choices=sorted(WRITERS.keys()),
+        help="writer module (default: h5py)")
+    parser.add_argument(
+        "-f", "--file", default="/tmp/nxstools_traversal_benchmark.nxs",
+        help="benchmark file name")
+    options = parser.parse_args()
+    writer = WRITERS[options.writer]
+
+    start = time.time()
+    generate(options.file, options.nodes, options.width, writer)
+    print("generated %s nodes in %.3f s" % (
+        options.nodes, time.time() - start))
+    try:
+        def traverse():
+            fl = filewriter.open_file(
+                options.file, readonly=True, writer=writer)
+            try:
+                return walk(fl.root())
+            finally:
+                fl.close()
+
+        def parse():
+            fl = filewriter.open_file(
+                options.file, readonly=True, writer=writer)
+            try:
+                nxsparser = NXSFileParser(fl.root())
+                nxsparser.parse()
+                return len(nxsparser.description)
+            finally:
+                fl.close()
+
+        measure("traverse", traverse, options.repeat)
+        measure("fileparser", parse, options.repeat)
+    finally:
+        os.remove(options.file)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,167 @@
+#!/usr/bin/env python
+#   This file is part of nexdatas - Tango Server for NeXus data writer
+#
+#    Copyright (C) 2012-2018 DESY, Jan Kotanski <jkotan@mail.desy.de>
+#
+#    nexdatas is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    nexdatas is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with nexdatas.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+""" microbenchmark of the per-step field access """
+
+import argparse
+import os
+import sys
+import time
+
+import numpy
+
+from nxstools import filewriter
+
+WRITERS = {}
+try:
+    from nxstools import h5pywriter
+    WRITERS["h5py"] = h5pywriter
+except Exception:
+    pass
+
+try:
+    from nxstools import h5cppwriter
+    WRITERS["h5cpp"] = h5cppwriter
+except Exception:
+    pass
+
+
+def frames(field, steps, frame):
+    """ grows the field and writes the last frame in every step
+
+    :param field: growing field
+    :type field: :class:`filewriter.FTField`
+    :param steps: number of steps
+    :type steps: :obj:`int`
+    :param frame: frame data
+    :type frame: :class:`numpy.ndarray`
+    """
+    field[0, ...] = frame
+    for _ in range(1, steps):
+        field.grow()
+        field[-1, ...] = frame
+
+
+def scalars(field, steps):
+    """ grows the scalar field and writes the value in every step
+
+    :param field: growing field
+    :type field: :class:`filewriter.FTField`
+    :param steps: number of steps
+    :type steps: :obj:`int`
+    """
+    field[0] = 0.
+    for step in range(1, steps):
+        field.grow()
+        field[step] = float(step)
+
+
+def reads(field, steps):
+    """ reads the field values one by one
+
+    :param field: field
+    :type field: :class:`filewriter.FTField`
+    :param steps: number of steps
+    :type steps: :obj:`int`
+    """
+    for step in range(steps):
+        field[step]
+
+
+def measure(label, func, steps, repeat):
+    """ prints the best time per call of the function
+
+    :param label: measurement label
+    :type label: :obj:`str`
+    :param func: measured function
+    :type func: :obj:`instancemethod`
+    :param steps: number of calls in one function run
+    :type steps: :obj:`int`
+    :param repeat: number of repetitions
+    :type repeat: :obj:`int`
+    """
+    times = []
+    for _ in range(repeat):
+        start = time.time()
+        func()
+        times.append(time.time() - start)
+    print("%-12s %8s steps  best %8.2f us/step" % (
+        label, steps, min(times) * 1e6 / steps))
+
+
+def main():
+    """ the main program function
+    """
+    parser = argparse.ArgumentParser(
+        description="benchmark of the per-step field access")
+    parser.add_argument(
+        "-s", "--steps", type=int, default=10000,
+        help="number of steps (default: 10000)")
+    parser.add_argument(
+        "--frame", type=int, nargs=2, default=[16, 16],
+        metavar=("HEIGHT", "WIDTH"),
+        help="frame shape (default: 16 16)")
+    parser.add_argument(
+        "-r", "--repeat", type=int, default=5,
+        help="number of repetitions (default: 5)")
+    parser.add_argument(
+        "--writer", default="h5cpp", choices=sorted(WRITERS.keys()),
+        help="writer module (default: h5cpp)")
+    parser.add_argument(
+        "-f", "--file", default="/tmp/nxstools_field_benchmark.nxs",
+        help="benchmark file name")
+    options = parser.parse_args()
+    writer = WRITERS[options.writer]
+    frame = numpy.ones(options.frame, dtype="uint32")
+
+    def write(kind):
+        fl = filewriter.create_file(
+            options.file, overwrite=True, writer=writer)
+        try:
+            entry = fl.root().create_group("entry", "NXentry")
+            if kind == "frames":
+                field = entry.create_field(
+                    "data", "uint32", [1] + options.frame,
+                    [1] + options.frame)
+                frames(field, options.steps, frame)
+            else:
+                field = entry.create_field("value", "float64", [1], [1])
+                scalars(field, options.steps)
+        finally:
+            fl.close()
+
+    try:
+        measure("frames", lambda: write("frames"), options.steps,
+                options.repeat)
+        measure("scalars", lambda: write("scalars"), options.steps,
+                options.repeat)
+        fl = filewriter.open_file(options.file, readonly=True, writer=writer)
+        try:
+            field = fl.root().open("entry").open("value")
+            measure("reads", lambda: reads(field, options.steps),
+                    options.steps, options.repeat)
+        finally:
+            fl.close()
+    finally:
+        if os.path.exists(options.file):
+            os.remove(options.file)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
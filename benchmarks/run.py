@@ -0,0 +1,171 @@
+#!/usr/bin/env python
+#   This file is part of nexdatas - Tango Server for NeXus data writer
+#
+#    Copyright (C) 2012-2018 DESY, Jan Kotanski <jkotan@mail.desy.de>
+#
+#    nexdatas is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    nexdatas is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with nexdatas.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+""" runner of the benchmark suites with a result history """
+
+import argparse
+import datetime
+import inspect
+import itertools
+import json
+import os
+import platform
+import re
+import subprocess
+import sys
+import time
+
+try:
+    from . import suites
+except (ImportError, ValueError):
+    import suites
+
+
+def benchmarks(pattern=None):
+    """ finds benchmarks of the suites
+
+    :param pattern: regular expression of benchmark names
+    :type pattern: :obj:`str`
+    :returns: (name, suite class, method name, parameters) tuples
+    :rtype: :obj:`list` <:obj:`tuple`>
+    """
+    found = []
+    for cname, suite in sorted(inspect.getmembers(suites, inspect.isclass)):
+        if suite.__module__ != suites.__name__ \
+           or not hasattr(suite, "params"):
+            continue
+        params = suite.params
+        if not isinstance(params, tuple):
+            params = (params,)
+        for mname in sorted(dir(suite)):
+            if not mname.startswith("time_"):
+                continue
+            for values in itertools.product(*params):
+                name = "%s.%s(%s)" % (
+                    cname, mname, ", ".join(str(vl) for vl in values))
+                if pattern is None or re.search(pattern, name):
+                    found.append((name, suite, mname, values))
+    return found
+
+
+def measure(suite, mname, values, repeat):
+    """ measures a benchmark
+
+    :param suite: suite class
+    :type suite: :obj:`type`
+    :param mname: benchmark method name
+    :type mname: :obj:`str`
+    :param values: benchmark parameters
+    :type values: :obj:`tuple`
+    :param repeat: number of measurements
+    :type repeat: :obj:`int`
+    :returns: measured times in seconds
+    :rtype: :obj:`list` <:obj:`float`>
+    """
+    times = []
+    for _ in range(repeat):
+        bench = suite()
+        bench.setup(*values)
+        try:
+            method = getattr(bench, mname)
+            start = time.time()
+            for _ in range(suite.number):
+                method(*values)
+            times.append((time.time() - start) / suite.number)
+        finally:
+            bench.teardown(*values)
+    return times
+
+
+def commit():
+    """ provides the current git commit
+
+    :returns: commit hash or None
+    :rtype: :obj:`str`
+    """
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "HEAD"],
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+            stderr=subprocess.STDOUT).decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    """ the main program function
+    """
+    parser = argparse.ArgumentParser(
+        description="runner of the nxstools benchmark suites")
+    parser.add_argument(
+        "-b", "--bench", default=None,
+        help="regular expression of benchmark names")
+    parser.add_argument(
+        "-r", "--repeat", type=int, default=3,
+        help="number of measurements (default: 3)")
+    parser.add_argument(
+        "-l", "--list", action="store_true", default=False,
+        help="list benchmarks without running them")
+    parser.add_argument(
+        "--history", default=None,
+        help="JSON file to append results to and compare with"
+        " the previous results")
+    options = parser.parse_args()
+
+    found = benchmarks(options.bench)
+    if options.list:
+        for bench in found:
+            print(bench[0])
+        return
+
+    previous = {}
+    history = []
+    if options.history and os.path.exists(options.history):
+        with open(options.history) as fl:
+            history = json.load(fl)
+        if history:
+            previous = history[-1]["results"]
+
+    results = {}
+    for name, suite, mname, values in found:
+        times = sorted(measure(suite, mname, values, options.repeat))
+        best = times[0]
+        median = times[len(times) // 2]
+        results[name] = {"best": best, "median": median}
+        line = "%-60s %10.4f s %10.4f s" % (name, best, median)
+        if name in previous and previous[name]["best"]:
+            line += "  %+7.1f %%" % (
+                100. * (best / previous[name]["best"] - 1.))
+        print(line)
+        sys.stdout.flush()
+
+    if options.history:
+        history.append({
+            "date": datetime.datetime.now().isoformat(),
+            "commit": commit(),
+            "host": platform.node(),
+            "python": platform.python_version(),
+            "results": results,
+        })
+        with open(options.history, "w") as fl:
+            json.dump(history, fl, indent=1, sort_keys=True)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,355 @@
+#!/usr/bin/env python
+#   This file is part of nexdatas - Tango Server for NeXus data writer
+#
+#    Copyright (C) 2012-2018 DESY, Jan Kotanski <jkotan@mail.desy.de>
+#
+#    nexdatas is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    nexdatas is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with nexdatas.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+""" benchmark suites of nxstools in the asv style
+
+Every suite class provides ``setup`` and ``teardown`` methods called
+with parameters from the ``params`` attribute before and after each
+measurement of its ``time_*`` methods.
+"""
+
+import contextlib
+import os
+import shutil
+import sys
+import tempfile
+
+import numpy
+
+from nxstools import filewriter
+from nxstools import nxscollect
+from nxstools import nxsfileinfo
+from nxstools.nxsargparser import NXSArgParser
+from nxstools.nxsfileparser import NXSFileParser
+
+try:
+    from . import synthetic
+except (ImportError, ValueError):
+    import synthetic
+
+#: (:obj:`list` <:obj:`str`>) available writer names
+WRITERS = sorted(synthetic.WRITERS.keys())
+
+
+@contextlib.contextmanager
+def quiet():
+    """ redirects stdout to devnull
+    """
+    stdout = sys.stdout
+    with open(os.devnull, "w") as devnull:
+        sys.stdout = devnull
+        try:
+            yield
+        finally:
+            sys.stdout = stdout
+
+
+def parse(runner, args):
+    """ parses command-line arguments of the runner
+
+    :param runner: runner class
+    :type runner: :class:`nxstools.nxsargparser.Runner`
+    :param args: command-line arguments
+    :type args: :obj:`list` <:obj:`str`>
+    :returns: runner instance and parser options
+    :rtype: :obj:`tuple` <:class:`nxstools.nxsargparser.Runner`,
+            :class:`argparse.Namespace`>
+    """
+    parser = NXSArgParser()
+    parser.cmdrunners = [("command", runner)]
+    runners = parser.createSubParsers()
+    options = parser.parse_args(["command"] + list(args))
+    return runners["command"].runner, options
+
+
+class TemporaryDirectory(object):
+
+    """ base of suites with data in a temporary directory
+    """
+
+    #: (:obj:`int`) number of calls in one measurement
+    number = 1
+    #: (:obj:`int`) measurement timeout in seconds
+    timeout = 600
+
+    def setup(self, *params):
+        """ creates the temporary directory
+        """
+        self.tmpdir = tempfile.mkdtemp(prefix="nxstools_benchmark_")
+
+    def teardown(self, *params):
+        """ removes the temporary directory
+        """
+        shutil.rmtree(self.tmpdir)
+
+
+class CollectSuite(TemporaryDirectory):
+
+    """ Collector.collect of images in a postrun field
+
+    Raw images have no header, so they are appended with
+    an explicit data type and shape.
+    """
+
+    params = (WRITERS, ["raw", "tif", "h5"])
+    param_names = ["writer", "format"]
+    #: (:obj:`int`) number of images
+    images = 50
+    #: (:obj:`list` <:obj:`int`>) image shape
+    shape = [256, 256]
+
+    def setup(self, writer, fmt):
+        TemporaryDirectory.setup(self)
+        wrmodule = synthetic.WRITERS[writer]
+        postrun = synthetic.images(
+            self.tmpdir, self.images, self.shape, fmt=fmt, writer=wrmodule)
+        self.filename = os.path.join(self.tmpdir, "master.nxs")
+        if fmt == "raw":
+            synthetic.master(self.filename, wrmodule, 2, 10)
+            self.args = ("/scan/instrument/pilatus/data",
+                         [os.path.join(self.tmpdir, postrun)],
+                         "uint32", self.shape)
+        else:
+            synthetic.master(self.filename, wrmodule, 2, 10, postrun)
+            self.args = ()
+
+    def time_collect(self, writer, fmt):
+        with quiet():
+            nxscollect.Collector(
+                self.filename, 2, writer=writer).collect(*self.args)
+
+
+class VirtualDatasetSuite(TemporaryDirectory):
+
+    """ VirtualDataset.create of target detector files
+    """
+
+    params = (WRITERS, [10, 100])
+    param_names = ["writer", "targets"]
+    #: (:obj:`int`) number of frames in one target file
+    frames = 4
+    #: (:obj:`list` <:obj:`int`>) frame shape
+    shape = [64, 64]
+
+    def setup(self, writer, targets):
+        TemporaryDirectory.setup(self)
+        wrmodule = synthetic.WRITERS[writer]
+        pattern = synthetic.targets(
+            self.tmpdir, targets, self.frames, self.shape, writer=wrmodule)
+        filename = os.path.join(self.tmpdir, "master.nxs")
+        synthetic.master(filename, wrmodule, 1, 1)
+        self.runner, self.options = parse(nxscollect.VDS, [
+            "%s:/scan/instrument/detector/data" % filename,
+            "--shape", "%s,%s,%s" % (
+                targets * self.frames, self.shape[0], self.shape[1]),
+            "--dtype", "uint32",
+            "--target-fields", pattern,
+            "--shapes", ":".join(["%s,," % self.frames] * targets),
+            "--offsets", ":".join(
+                "%s,," % (i * self.frames) for i in range(targets)),
+            "-r", "--%s" % writer])
+
+    def time_create(self, writer, targets):
+        with quiet():
+            nxscollect.VirtualDataset(
+                self.options.args, self.options, writer=writer).create()
+
+
+class FileParserSuite(TemporaryDirectory):
+
+    """ NXSFileParser.parseMeta of master files
+    """
+
+    params = (WRITERS, [1000, 10000])
+    param_names = ["writer", "nodes"]
+
+    def setup(self, writer, nodes):
+        TemporaryDirectory.setup(self)
+        self.filename = os.path.join(self.tmpdir, "master.nxs")
+        synthetic.master(
+            self.filename, synthetic.WRITERS[writer], nodes // 100, 99)
+
+    def time_parseMeta(self, writer, nodes):
+        fl = filewriter.open_file(
+            self.filename, readonly=True,
+            writer=synthetic.WRITERS[writer])
+        try:
+            NXSFileParser(fl.root()).parseMeta()
+        finally:
+            fl.close()
+
+
+class MetadataSuite(TemporaryDirectory):
+
+    """ nxsfileinfo metadata of master files
+    """
+
+    params = (WRITERS, [1000, 10000])
+    param_names = ["writer", "nodes"]
+
+    def setup(self, writer, nodes):
+        TemporaryDirectory.setup(self)
+        filename = os.path.join(self.tmpdir, "master.nxs")
+        synthetic.master(
+            filename, synthetic.WRITERS[writer], nodes // 100, 99)
+        self.runner, self.options = parse(
+            nxsfileinfo.Metadata,
+            [filename, "-i", "12345678", "-p", "12345678/master",
+             "--%s" % writer])
+        self.roptions = parse(
+            nxsfileinfo.Metadata,
+            [filename, "-i", "12345678", "-p", "12345678/master",
+             "--%s" % writer, "--copy-map", "\n".join(
+                 "scientificMetadata.instrument.collection%05d:" % gid
+                 for gid in range(1, nodes // 100))])[1]
+
+    def time_metadata(self, writer, nodes):
+        with quiet():
+            self.runner.run(self.options)
+
+    def time_metadata_removed(self, writer, nodes):
+        with quiet():
+            self.runner.run(self.roptions)
+
+
+class GroupMetadataSuite(TemporaryDirectory):
+
+    """ GroupMetadata.groupmetadata of scan metadata into a group
+    """
+
+    params = [10, 100]
+    param_names = ["scans"]
+
+    def setup(self, scans):
+        TemporaryDirectory.setup(self)
+        filename = os.path.join(self.tmpdir, "master.nxs")
+        writer = WRITERS[0]
+        synthetic.master(filename, synthetic.WRITERS[writer], 10, 10)
+        self.scanoptions = []
+        for i in range(scans):
+            mfile = os.path.join(self.tmpdir, "scan_%05d.scan.json" % i)
+            runner, options = parse(
+                nxsfileinfo.Metadata,
+                [filename, "-i", "12345678",
+                 "-p", "12345678/scan_%05d" % i, "-o", mfile,
+                 "--%s" % writer])
+            with quiet():
+                runner.run(options)
+            self.scanoptions.append(parse(
+                nxsfileinfo.GroupMetadata,
+                ["group01", "-m", mfile,
+                 "-o", os.path.join(self.tmpdir, "group01.json")])[1])
+
+    def time_groupmetadata(self, scans):
+        with quiet():
+            for options in self.scanoptions:
+                nxsfileinfo.GroupMetadata.groupmetadata(options)
+
+
+class OrigDatablockSuite(TemporaryDirectory):
+
+    """ OrigDatablock.datablock of scan files
+    """
+
+    params = [100, 1000]
+    param_names = ["files"]
+
+    def setup(self, files):
+        TemporaryDirectory.setup(self)
+        scandir = os.path.join(self.tmpdir, "scan_00001")
+        os.makedirs(scandir)
+        for i in range(files):
+            with open(os.path.join(
+                    scandir, "scan_00001_%05d.raw" % i), "w") as fl:
+                fl.write("0")
+        self.runner, self.options = parse(
+            nxsfileinfo.OrigDatablock,
+            [os.path.join(self.tmpdir, "scan_00001")])
+
+    def time_datablock(self, files):
+        self.runner.datablock(self.options)
+
+
+class FileWriterSuite(TemporaryDirectory):
+
+    """ h5py and h5cpp filewriter backends
+    """
+
+    params = WRITERS
+    param_names = ["writer"]
+    #: (:obj:`int`) number of written frames or scalars
+    steps = 1000
+    #: (:obj:`list` <:obj:`int`>) frame shape
+    shape = [64, 64]
+
+    def setup(self, writer):
+        TemporaryDirectory.setup(self)
+        self.writer = synthetic.WRITERS[writer]
+        self.filename = os.path.join(self.tmpdir, "fields.nxs")
+        self.master = os.path.join(self.tmpdir, "master.nxs")
+        synthetic.master(self.master, self.writer, 50, 99)
+
+    def _write(self, dtype, shape, value):
+        """ writes a growing field step by step
+
+        :param dtype: field data type
+        :type dtype: :obj:`str`
+        :param shape: frame shape
+        :type shape: :obj:`list` <:obj:`int`>
+        :param value: frame value
+        :type value: `any`
+        """
+        fl = filewriter.create_file(
+            self.filename, overwrite=True, writer=self.writer)
+        try:
+            field = fl.root().create_field(
+                "data", dtype, [0] + shape, [1] + shape)
+            for _ in range(self.steps):
+                field.grow()
+                field[-1, ...] = value
+            field.close()
+        finally:
+            fl.close()
+
+    def time_write_frames(self, writer):
+        self._write("uint32", self.shape,
+                    numpy.ones(self.shape, dtype="uint32"))
+
+    def time_write_scalars(self, writer):
+        self._write("float64", [], 1.5)
+
+    def time_find_fields(self, writer):
+        fl = filewriter.open_file(
+            self.master, readonly=True, writer=self.writer)
+        try:
+            fl.root().find_fields("field00000")
+        finally:
+            fl.close()
+
+    def time_read_attributes(self, writer):
+        fl = filewriter.open_file(
+            self.master, readonly=True, writer=self.writer)
+        try:
+            instrument = fl.root().open("scan").open("instrument")
+            for group in instrument:
+                if isinstance(group, filewriter.FTGroup):
+                    for field in group:
+                        field.attributes.read_all()
+        finally:
+            fl.close()
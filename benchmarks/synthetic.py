@@ -0,0 +1,259 @@
+#!/usr/bin/env python
+#   This file is part of nexdatas - Tango Server for NeXus data writer
+#
+#    Copyright (C) 2012-2018 DESY, Jan Kotanski <jkotan@mail.desy.de>
+#
+#    nexdatas is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    nexdatas is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with nexdatas.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+""" generator of synthetic NeXus master files and detector images """
+
+import argparse
+import os
+import sys
+
+import numpy
+
+from nxstools import filewriter
+
+WRITERS = {}
+try:
+    from nxstools import h5pywriter
+    WRITERS["h5py"] = h5pywriter
+except Exception:
+    pass
+
+try:
+    from nxstools import h5cppwriter
+    WRITERS["h5cpp"] = h5cppwriter
+except Exception:
+    pass
+
+#: (:obj:`dict` <:obj:`str`, :obj:`str`>) file extensions of image formats
+EXTENSIONS = {"raw": "raw", "tif": "tif", "h5": "h5"}
+
+
+def master(filename, writer, groups=10, fields=100, postrun=None,
+           detector="pilatus", steps=10):
+    """ creates a master file with the given number of nodes
+
+    :param filename: file name
+    :type filename: :obj:`str`
+    :param writer: writer module
+    :type writer: :obj:`module`
+    :param groups: number of NXcollection groups in the instrument
+    :type groups: :obj:`int`
+    :param fields: number of fields in one group
+    :type fields: :obj:`int`
+    :param postrun: postrun field value of the detector
+    :type postrun: :obj:`str`
+    :param detector: detector group name
+    :type detector: :obj:`str`
+    :param steps: number of scan steps of the fields
+    :type steps: :obj:`int`
+    :returns: number of created nodes
+    :rtype: :obj:`int`
+    """
+    fl = filewriter.create_file(filename, overwrite=True, writer=writer)
+    root = fl.root()
+    entry = root.create_group("scan", "NXentry")
+    entry.create_field("title", "string").write("synthetic scan")
+    entry.create_field("experiment_identifier", "string").write("12345678")
+    entry.create_field("start_time", "string").write(
+        "2024-01-01T10:00:00.000000+0100")
+    entry.create_field("end_time", "string").write(
+        "2024-01-01T10:10:00.000000+0100")
+    sample = entry.create_group("sample", "NXsample")
+    sample.create_field("name", "string").write("synthetic sample")
+    instrument = entry.create_group("instrument", "NXinstrument")
+    instrument.create_field("name", "string").write("synthetic instrument")
+    data = entry.create_group("data", "NXdata")
+    nodes = 8
+    values = numpy.arange(steps, dtype="float64")
+    for gid in range(groups):
+        group = instrument.create_group("collection%05d" % gid,
+                                        "NXcollection")
+        nodes += 1
+        for fid in range(fields):
+            field = group.create_field(
+                "field%05d" % fid, "float64", [steps], [steps])
+            field.write(values + fid)
+            field.attributes.create("units", "string").write("mm")
+            field.close()
+            nodes += 1
+        if gid == 0 and fields:
+            filewriter.link(
+                "/scan/instrument/collection00000/field00000", data,
+                "field00000")
+            nodes += 1
+        group.close()
+    if postrun is not None:
+        det = instrument.create_group(detector, "NXdetector")
+        col = det.create_group("collection", "NXcollection")
+        col.create_field("postrun", "string").write(postrun)
+        col.close()
+        det.close()
+        nodes += 3
+    data.close()
+    instrument.close()
+    sample.close()
+    entry.close()
+    fl.close()
+    return nodes
+
+
+def images(dirname, count, shape, dtype="uint32", fmt="raw",
+           prefix="image", writer=None, seed=0):
+    """ creates a stack of images in separate files
+
+    :param dirname: image directory
+    :type dirname: :obj:`str`
+    :param count: number of images
+    :type count: :obj:`int`
+    :param shape: image shape
+    :type shape: :obj:`list` <:obj:`int`>
+    :param dtype: image data type
+    :type dtype: :obj:`str`
+    :param fmt: image format, i.e. raw, tif or h5
+    :type fmt: :obj:`str`
+    :param prefix: image file name prefix
+    :type prefix: :obj:`str`
+    :param writer: writer module of h5 images
+    :type writer: :obj:`module`
+    :param seed: random generator seed
+    :type seed: :obj:`int`
+    :returns: postrun file pattern of the images
+    :rtype: :obj:`str`
+    """
+    rng = numpy.random.RandomState(seed)
+    template = "%s_%%05d.%s" % (prefix, EXTENSIONS[fmt])
+    for i in range(count):
+        image = rng.poisson(5, shape).astype(dtype)
+        filename = os.path.join(dirname, template % i)
+        if fmt == "raw":
+            image.tofile(filename)
+        elif fmt == "tif":
+            import fabio.tifimage
+            fabio.tifimage.TifImage(data=image).write(filename)
+        else:
+            fl = filewriter.create_file(
+                filename, overwrite=True, writer=writer)
+            field = fl.root().create_field(
+                "data", dtype, list(shape), list(shape))
+            field.write(image)
+            field.close()
+            fl.close()
+    return "%s:0:%s" % (template, count - 1)
+
+
+def targets(dirname, count, frames, shape, dtype="uint32", writer=None,
+            prefix="target", seed=0):
+    """ creates detector files with /entry/data/data fields
+    to be gathered by a virtual dataset
+
+    :param dirname: target directory
+    :type dirname: :obj:`str`
+    :param count: number of target files
+    :type count: :obj:`int`
+    :param frames: number of frames in one target file
+    :type frames: :obj:`int`
+    :param shape: frame shape
+    :type shape: :obj:`list` <:obj:`int`>
+    :param dtype: frame data type
+    :type dtype: :obj:`str`
+    :param writer: writer module
+    :type writer: :obj:`module`
+    :param prefix: target file name prefix
+    :type prefix: :obj:`str`
+    :param seed: random generator seed
+    :type seed: :obj:`int`
+    :returns: target fields pattern of nxscollect vds
+    :rtype: :obj:`str`
+    """
+    rng = numpy.random.RandomState(seed)
+    template = "%s_%%05d.nxs" % prefix
+    fshape = [frames] + list(shape)
+    for i in range(count):
+        fl = filewriter.create_file(
+            os.path.join(dirname, template % i), overwrite=True,
+            writer=writer)
+        entry = fl.root().create_group("entry", "NXentry")
+        data = entry.create_group("data", "NXdata")
+        field = data.create_field(
+            "data", dtype, fshape, [1] + list(shape))
+        field.write(rng.poisson(5, fshape).astype(dtype))
+        field.close()
+        data.close()
+        entry.close()
+        fl.close()
+    return "%s://entry/data/data:0:%s" % (
+        os.path.join(dirname, template), count - 1)
+
+
+def main():
+    """ the main program function
+    """
+    parser = argparse.ArgumentParser(
+        description="generator of synthetic NeXus master files"
+        " and detector images")
+    parser.add_argument(
+        "directory", help="output directory")
+    parser.add_argument(
+        "-g", "--groups", type=int, default=10,
+        help="number of NXcollection groups (default: 10)")
+    parser.add_argument(
+        "-n", "--fields", type=int, default=100,
+        help="number of fields in one group (default: 100)")
+    parser.add_argument(
+        "-i", "--images", type=int, default=0,
+        help="number of images collected by a postrun field (default: 0)")
+    parser.add_argument(
+        "-t", "--targets", type=int, default=0,
+        help="number of vds target files (default: 0)")
+    parser.add_argument(
+        "--frames", type=int, default=10,
+        help="number of frames in one vds target file (default: 10)")
+    parser.add_argument(
+        "--frame", type=int, nargs=2, default=[256, 256],
+        metavar=("HEIGHT", "WIDTH"),
+        help="frame shape (default: 256 256)")
+    parser.add_argument(
+        "--format", dest="fmt", default="raw",
+        choices=sorted(EXTENSIONS.keys()),
+        help="image format (default: raw)")
+    parser.add_argument(
+        "--writer", default="h5py", choices=sorted(WRITERS.keys()),
+        help="writer module (default: h5py)")
+    options = parser.parse_args()
+    writer = WRITERS[options.writer]
+    if not os.path.isdir(options.directory):
+        os.makedirs(options.directory)
+    postrun = None
+    if options.images:
+        postrun = images(
+            options.directory, options.images, options.frame,
+            fmt=options.fmt, writer=writer)
+        print("images: %s" % postrun)
+    if options.targets:
+        print("targets: %s" % targets(
+            options.directory, options.targets, options.frames,
+            options.frame, writer=writer))
+    filename = os.path.join(options.directory, "master.nxs")
+    nodes = master(filename, writer, options.groups, options.fields,
+                   postrun)
+    print("master: %s with %s nodes" % (filename, nodes))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,224 @@
+#!/usr/bin/env python
+#   This file is part of nexdatas - Tango Server for NeXus data writer
+#
+#    Copyright (C) 2012-2018 DESY, Jan Kotanski <jkotan@mail.desy.de>
+#
+#    nexdatas is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    nexdatas is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with nexdatas.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+""" Parallel compression of chunks for the direct chunk write """
+
+import collections
+import multiprocessing
+import multiprocessing.pool
+import signal
+import zlib
+
+import numpy
+
+#: (:obj:`int`) HDF5 identifier of the deflate filter
+DEFLATE = 1
+
+#: (:obj:`dict` <:obj:`tuple`, :obj:`tuple`>) in-memory files with
+#:    filtered datasets opened by the encoding worker processes
+_ENCODERS = {}
+
+
+def _initworker():
+    """ makes worker processes leave signals to the main process
+    """
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    for sig in (signal.SIGHUP, signal.SIGALRM, signal.SIGTERM):
+        signal.signal(sig, signal.SIG_DFL)
+
+
+def _importfilters():
+    """ imports h5py and registers the filters of hdf5plugin
+
+    :returns: h5py module or None
+    :rtype: :obj:`module`
+    """
+    try:
+        import h5py
+    except ImportError:
+        return None
+    try:
+        import hdf5plugin  # noqa: F401
+    except ImportError:
+        pass
+    return h5py
+
+
+def deflate(task):
+    """ compresses a chunk with the deflate filter
+
+    :param task: (level, chunk) tuple
+    :type task: :obj:`tuple` <:obj:`int`, :class:`numpy.ndarray`>
+    :returns: compressed chunk and its filter mask
+    :rtype: :obj:`tuple` <:obj:`bytes`, :obj:`int`>
+    """
+    level, chunk = task
+    return zlib.compress(chunk.tobytes(), level), 0
+
+
+def hdf5filter(task):
+    """ compresses a chunk with an HDF5 filter in a worker process
+
+    The chunk is written into an in-memory dataset with the given filter
+    and its filtered form is read back, so the result is exactly
+    what the HDF5 filter would store.
+
+    :param task: (filter id, filter options, chunk) tuple
+    :type task: :obj:`tuple`
+    :returns: compressed chunk and its filter mask
+    :rtype: :obj:`tuple` <:obj:`bytes`, :obj:`int`>
+    """
+    filterid, options, chunk = task
+    key = (filterid, options, chunk.dtype.str, chunk.shape)
+    if key not in _ENCODERS:
+        h5py = _importfilters()
+        fl = h5py.File("__nxscollect_chunk__%s" % len(_ENCODERS), "w",
+                       driver="core", backing_store=False)
+        ds = fl.create_dataset(
+            "chunk", shape=chunk.shape, chunks=chunk.shape,
+            dtype=chunk.dtype, compression=filterid,
+            compression_opts=options or None)
+        _ENCODERS[key] = (fl, ds)
+    ds = _ENCODERS[key][1]
+    ds[...] = chunk
+    mask, data = ds.id.read_direct_chunk((0,) * len(chunk.shape))
+    return bytes(data), mask
+
+
+class ChunkCompressor(object):
+
+    """ Compress chunks in a pool of threads or processes
+
+    Deflate chunks are compressed by zlib in threads. Chunks of other
+    filters, e.g. bitshuffle, blosc or lz4 registered by hdf5plugin,
+    are compressed in processes by the HDF5 filter itself.
+    """
+
+    def __init__(self, compression, dtype, jobs=None):
+        """ The constructor creates the compressor object
+
+        :param compression: deflate rate or
+                            [filter id, filter options] list
+        :type compression: :obj:`int` or :obj:`list` <:obj:`int`>
+        :param dtype: chunk data type
+        :type dtype: :obj:`str`
+        :param jobs: number of compressing threads or processes
+        :type jobs: :obj:`int`
+        """
+        #: (:obj:`int`) number of compressing threads or processes
+        self.jobs = jobs or multiprocessing.cpu_count()
+        #: (:obj:`int`) maximal number of chunks in the pipeline
+        self.maxpending = 2 * self.jobs
+        #: (:class:`numpy.dtype`) chunk data type
+        self.dtype = numpy.dtype(dtype)
+        #: (:obj:`int`) filter id
+        self.filterid = DEFLATE
+        #: (:obj:`tuple` <:obj:`int`>) filter options
+        self.options = ()
+        if isinstance(compression, (list, tuple)):
+            self.filterid = int(compression[0])
+            self.options = tuple(int(opt) for opt in compression[1:])
+        else:
+            self.options = (int(compression),)
+        if self.filterid == DEFLATE:
+            self.__encode = deflate
+            self.__pool = multiprocessing.pool.ThreadPool(self.jobs)
+        else:
+            self.__encode = hdf5filter
+            self.__pool = multiprocessing.Pool(self.jobs, _initworker)
+        #: (:class:`collections.deque`) chunks in the pipeline
+        self.__pending = collections.deque()
+
+    @classmethod
+    def supported(cls, compression, dtype):
+        """ checks if chunks can be compressed outside HDF5
+
+        Chunks in a non-native byte order are left to HDF5, which converts
+        them to the byte order of the field
+
+        :param compression: deflate rate or
+                            [filter id, filter options] list
+        :type compression: :obj:`int` or :obj:`list` <:obj:`int`>
+        :param dtype: chunk data type
+        :type dtype: :obj:`str`
+        :returns: if chunks can be compressed
+        :rtype: :obj:`bool`
+        """
+        try:
+            dtype = numpy.dtype(dtype)
+            if dtype.kind not in "iuf" or not dtype.isnative:
+                return False
+        except TypeError:
+            return False
+        if not isinstance(compression, (list, tuple)):
+            return bool(compression)
+        if not compression:
+            return False
+        if int(compression[0]) == DEFLATE:
+            return True
+        h5py = _importfilters()
+        return h5py is not None and \
+            bool(h5py.h5z.filter_avail(int(compression[0])))
+
+    @property
+    def pending(self):
+        """ number of chunks in the pipeline
+
+        :returns: number of chunks in the pipeline
+        :rtype: :obj:`int`
+        """
+        return len(self.__pending)
+
+    def put(self, chunk):
+        """ puts a chunk into the pipeline
+
+        :param chunk: chunk data
+        :type chunk: :class:`numpy.ndarray`
+        :returns: compressed chunks leaving the pipeline
+        :rtype: :obj:`list` <:obj:`tuple` <:obj:`bytes`, :obj:`int`>>
+        """
+        chunk = numpy.ascontiguousarray(chunk, dtype=self.dtype)
+        if self.filterid == DEFLATE:
+            task = (self.options[0], chunk)
+        else:
+            task = (self.filterid, self.options, chunk)
+        self.__pending.append(self.__pool.apply_async(self.__encode, (task,)))
+        return self.ready()
+
+    def ready(self, wait=False):
+        """ takes compressed chunks from the pipeline in their order
+
+        :param wait: wait for all chunks in the pipeline
+        :type wait: :obj:`bool`
+        :returns: compressed chunks with their filter masks
+        :rtype: :obj:`list` <:obj:`tuple` <:obj:`bytes`, :obj:`int`>>
+        """
+        chunks = []
+        while self.__pending and (
+                wait or len(self.__pending) > self.maxpending
+                or self.__pending[0].ready()):
+            chunks.append(self.__pending.popleft().get())
+        return chunks
+
+    def close(self):
+        """ drops the chunks in the pipeline and stops the pool
+        """
+        self.__pending.clear()
+        self.__pool.terminate()
+        self.__pool.join()
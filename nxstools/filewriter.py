@@ -23,6 +23,7 @@ import time
 import pytz
 import datetime
 import threading
+import warnings
 import numpy
 
 
@@ -33,6 +34,97 @@ writer = None
 #: (:class:`threading.Lock`) writer module
 writerlock = threading.Lock()
 
+#: (:obj:`list` <:obj:`str`>) names of file tuning parameters, i.e.
+#:    the raw-data chunk cache size in bytes (rdcc_nbytes),
+#:    its number of hash slots (rdcc_nslots), its preemption policy (rdcc_w0),
+#:    the page buffer size (page_buf_size), the file space strategy
+#:    (fs_strategy) and the metadata block size (meta_block_size)
+TUNING_PARAMETERS = ["rdcc_nbytes", "rdcc_nslots", "rdcc_w0",
+                     "page_buf_size", "fs_strategy", "meta_block_size"]
+
+#: (:obj:`dict` <:obj:`str`, :obj:`dict` <:obj:`str`, `any`>>)
+#:    file tuning parameters of access patterns. Parameters which are
+#:    not supported by the writer module or by its library version
+#:    are skipped, e.g. the h5cpp writer does not support any of them
+ACCESS_PATTERNS = {
+    # a single pass over attributes and small fields
+    "metadata": {"rdcc_nbytes": 0},
+    # appending or reading detector frames along the first dimension
+    "frames": {"rdcc_nbytes": 64 << 20, "rdcc_nslots": 12421,
+               "rdcc_w0": 1.0, "meta_block_size": 1 << 20},
+}
+
+#: (:obj:`int`) target chunk size in bytes of the automatic chunking
+CHUNK_BYTES = 1 << 20
+
+
+def _tuning(pars, wr):
+    """ replaces the access pattern by its tuning parameters
+
+    Tuning parameters of the access pattern which the writer does not
+    support are skipped. Explicitly given unsupported tuning parameters
+    are skipped with a warning.
+
+    :param pars: file parameters with an optional access pattern name
+    :type pars: :obj:`dict` < :obj:`str`, `any`>
+    :param wr: writer module
+    :type wr: :mod:`H5PYWriter` or :mod:`H5CppWriter`
+    :returns: file parameters
+    :rtype: :obj:`dict` < :obj:`str`, `any`>
+    """
+    supported = wr.tuning_parameters() \
+        if hasattr(wr, "tuning_parameters") else []
+    access = pars.pop('access', None)
+    ignored = [key for key, value in pars.items()
+               if value is not None and key in TUNING_PARAMETERS
+               and key not in supported]
+    if ignored:
+        warnings.warn(
+            "File tuning parameters %s are not supported by %s "
+            "and they are ignored" % (
+                ", ".join(sorted(ignored)),
+                getattr(wr, "__name__", str(wr))))
+    if access:
+        tpars = dict((key, value)
+                     for key, value in ACCESS_PATTERNS[access].items()
+                     if key in supported)
+        tpars.update(pars)
+        pars = tpars
+    return dict((key, value) for key, value in pars.items()
+                if value is not None and key not in ignored)
+
+
+def auto_chunk(shape, dtype, chunkbytes=None):
+    """ provides a chunk shape for frames stacked along the first dimension
+
+    Frames are split along their slowest dimensions until they fit into
+    the target chunk size and then as many frames as fit are
+    put into one chunk.
+
+    :param shape: field shape where 0 or None means a growing dimension
+    :type shape: :obj:`list` < :obj:`int` >
+    :param dtype: field data type
+    :type dtype: :obj:`str`
+    :param chunkbytes: target chunk size in bytes
+    :type chunkbytes: :obj:`int`
+    :returns: chunk shape
+    :rtype: :obj:`list` < :obj:`int` >
+    """
+    chunkbytes = chunkbytes or CHUNK_BYTES
+    shape = [int(dm or 0) for dm in (shape or [0])]
+    try:
+        itemsize = numpy.dtype(dtype).itemsize or 8
+    except TypeError:
+        itemsize = 8
+    chunk = [max(dm, 1) for dm in shape]
+    for dm in range(1, len(chunk)):
+        while chunk[dm] > 1 and \
+                int(numpy.prod(chunk[1:])) * itemsize > chunkbytes:
+            chunk[dm] = (chunk[dm] + 1) // 2
+    frames = max(1, chunkbytes // (int(numpy.prod(chunk[1:])) * itemsize))
+    chunk[0] = min(frames, shape[0]) if shape[0] else frames
+    return chunk
+
 
 def open_file(filename, readonly=False, **pars):
     """ open the new file
@@ -41,7 +133,8 @@ def open_file(filename, readonly=False, **pars):
     :type filename: :obj:`str`
     :param readonly: readonly flag
     :type readonly: :obj:`bool`
-    :param pars: parameters
+    :param pars: parameters, e.g. writer, access pattern name
+                 or file tuning parameters
     :type pars: :obj:`dict` < :obj:`str`, :obj:`str`>
     :returns: file object
     :rtype: :class:`FTFile`
@@ -51,7 +144,7 @@ def open_file(filename, readonly=False, **pars):
     else:
         with writerlock:
             wr = writer
-    fl = wr.open_file(filename, readonly, **pars)
+    fl = wr.open_file(filename, readonly, **_tuning(pars, wr))
     if hasattr(fl, "writer"):
         fl.writer = wr
     return fl
@@ -64,7 +157,8 @@ def create_file(filename, overwrite=False, **pars):
     :type filename: :obj:`str`
     :param overwrite: overwrite flag
     :type overwrite: :obj:`bool`
-    :param pars: parameters
+    :param pars: parameters, e.g. writer, access pattern name
+                 or file tuning parameters
     :type pars: :obj:`dict` < :obj:`str`, :obj:`str`>
     :returns: file object
     :rtype: :class:`FTFile`
@@ -74,7 +168,7 @@ def create_file(filename, overwrite=False, **pars):
     else:
         with writerlock:
             wr = writer
-    fl = wr.create_file(filename, overwrite, **pars)
+    fl = wr.create_file(filename, overwrite, **_tuning(pars, wr))
     if hasattr(fl, "writer"):
         fl.writer = wr
     return fl
@@ -355,6 +449,9 @@ class FTObject(object):
     """ virtual file tree object
     """
 
+    #: (:obj:`int`) minimal length of the children list before pruning
+    prunelimit = 32
+
     def __init__(self, h5object, tparent=None):
         """ constructor
 
@@ -369,22 +466,23 @@ class FTObject(object):
         self._tparent = tparent
         #: (:obj:`list` < :obj:`FTObject` > ) weak references of children
         self.__tchildren = []
-        if tparent:
+        #: (:obj:`int`) length of the children list which triggers pruning
+        self.__tlimit = self.prunelimit
+        if tparent is not None:
             tparent.append(self)
 
     def append(self, child):
         """ append child weakref
 
+        Dead references are pruned lazily, i.e. when the children list
+        has grown twice as long as its live part after the last pruning
+
         :param tparent: tree parent
         :type tparent: :obj:`FTObject`
         """
         self.__tchildren.append(weakref.ref(child))
-
-    def __del__(self):
-        """ removes weakref in parent object
-        """
-        if self._tparent:
-            self._tparent.reload()
+        if len(self.__tchildren) >= self.__tlimit:
+            self.reload()
 
     def reload(self):
         """ reload a list of valid children
@@ -392,20 +490,24 @@ class FTObject(object):
         if self.__tchildren:
             self.__tchildren = [
                 kd for kd in self.__tchildren if kd() is not None]
+        self.__tlimit = max(2 * len(self.__tchildren), self.prunelimit)
 
     def close(self):
         """ close element
         """
         for ch in self.__tchildren:
-            if ch() is not None:
-                ch().close()
+            kd = ch()
+            if kd is not None:
+                kd.close()
 
     def _reopen(self):
         """ reopen elements and children
         """
-        self.__tchildren = [ch for ch in self.__tchildren if ch() is not None]
+        self.reload()
         for ch in self.__tchildren:
-            ch().reopen()
+            kd = ch()
+            if kd is not None:
+                kd.reopen()
 
     @property
     def parent(self):
@@ -614,8 +716,8 @@ class FTGroup(FTObject):
         :type type_code: :obj:`str`
         :param shape: shape
         :type shape: :obj:`list` < :obj:`int` >
-        :param chunk: chunk
-        :type chunk: :obj:`list` < :obj:`int` >
+        :param chunk: chunk or 'auto' for :func:`auto_chunk`
+        :type chunk: :obj:`list` < :obj:`int` > or :obj:`str`
         :param dfilter: filter deflater
         :type dfilter: :class:`FTDeflate`
         :returns: file tree field
@@ -654,6 +756,32 @@ class FTGroup(FTObject):
         :rtype: :obj:`list` <`str`>
         """
 
+    def find_fields(self, name):
+        """ find all fields with the given name in the group subtree,
+        links are not followed
+
+        :param name: field name
+        :type name: :obj:`str`
+        :returns: field paths relative to the group
+        :rtype: :obj:`list` <`str`>
+        """
+        paths = []
+        for nm in self.names():
+            child = self.open(nm)
+            if isinstance(child, FTGroup):
+                paths.extend(
+                    "%s/%s" % (nm, path) for path in child.find_fields(name))
+            elif nm == name and isinstance(child, FTField):
+                paths.append(nm)
+        return paths
+
+    def remove(self, name):
+        """ removes the child link
+
+        :param name: child name
+        :type name: :obj:`str`
+        """
+
     def reopen(self):
         """ reopen attribute
         """
@@ -845,6 +973,17 @@ class FTField(FTObject):
         :type dim: :obj:`int`
         """
 
+    def write_chunk(self, offset, data, filter_mask=0):
+        """ write an already filtered chunk directly into the field
+
+        :param offset: logical offset of the chunk
+        :type offset: :obj:`list` <:obj:`int`>
+        :param data: filtered chunk data
+        :type data: :obj:`bytes`
+        :param filter_mask: mask of the skipped filters
+        :type filter_mask: :obj:`int`
+        """
+
     def refresh(self):
         """ refresh the field
 
@@ -1148,6 +1287,20 @@ class FTAttributeManager(FTObject):
         :rtype: :obj:`list` <:obj:`str`>
         """
 
+    def read_all(self, names=None):
+        """ read values of all attributes in one sweep
+
+        :param names: names of attributes to read, missing ones are skipped,
+                      `None` reads all attributes
+        :type names: :obj:`list` <:obj:`str`>
+        :returns: attribute values
+        :rtype: :obj:`dict` <:obj:`str`, :obj:`any`>
+        """
+        anames = list(self.names())
+        if names is not None:
+            anames = [nm for nm in names if nm in anames]
+        return dict((nm, self[nm].read()) for nm in anames)
+
     def reopen(self):
         """ reopen attribute
         """
@@ -133,6 +133,23 @@ def _slice2selection(t, shape):
     :returns: hyperslab selection
     :rtype: :class:`h5cpp.dataspace.Hyperslab`
     """
+    params = _slice2hyperslab(t, shape)
+    if params is not None:
+        offset, block, count, stride = params
+        return h5cpp.dataspace.Hyperslab(
+            offset=offset, block=block, count=count, stride=stride)
+
+
+def _slice2hyperslab(t, shape):
+    """ converts slice(s) to hyperslab parameters
+
+    :param t: slice tuple
+    :type t: :obj:`tuple`
+    :return shape: field shape
+    :type shape: :obj:`list` < :obj:`int` >
+    :returns: hyperslab offset, block, count and stride
+    :rtype: :obj:`tuple` < :obj:`list` < :obj:`int` > >
+    """
     if t is Ellipsis:
         return None
     elif isinstance(t, filewriter.FTHyperslab):
@@ -162,8 +179,7 @@ def _slice2selection(t, shape):
             else:
                 stride.append(1)
         # print("Hyperslab %s %s %s %s" % (offset, block, count, stride))
-        return h5cpp.dataspace.Hyperslab(
-            offset=offset, block=block, count=count, stride=stride)
+        return offset, block, count, stride
 
     elif isinstance(t, slice):
         start = t.start or 0
@@ -173,16 +189,13 @@ def _slice2selection(t, shape):
         if stop < 0:
             stop == shape[0] + stop
         if t.step in [None, 1]:
-            return h5cpp.dataspace.Hyperslab(
-                offset=(start,), block=((stop - start),))
+            return [start], [stop - start], [1], [1]
         else:
-            return h5cpp.dataspace.Hyperslab(
-                offset=(start,),
-                count=int(math.ceil((stop - start) / float(t.step))),
-                stride=(t.step,))
+            return ([start], [1],
+                    [int(math.ceil((stop - start) / float(t.step)))],
+                    [t.step])
     elif isinstance(t, (int, long)):
-        return h5cpp.dataspace.Hyperslab(
-            offset=(t,), block=(1,))
+        return [t], [1], [1], [1]
     elif isinstance(t, (list, tuple)):
         offset = []
         block = []
@@ -229,8 +242,7 @@ def _slice2selection(t, shape):
                         it += 1
         # print("Hyperslab %s %s %s %s" % (offset, block, count, stride))
         if len(offset):
-            return h5cpp.dataspace.Hyperslab(
-                offset=offset, block=block, count=count, stride=stride)
+            return offset, block, count, stride
 
 
 pTh = {
@@ -285,6 +297,18 @@ def unlimited(parent=None):
     return h5cpp.dataspace.UNLIMITED
 
 
+def tuning_parameters():
+    """ provides names of supported file tuning parameters
+
+    The h5cpp bindings do not expose the chunk cache, page buffer and
+    metadata block size properties, so file tuning is not supported.
+
+    :returns: names of supported file tuning parameters
+    :rtype: :obj:`list` <:obj:`str`>
+    """
+    return []
+
+
 def open_file(filename, readonly=False, libver=None, swmr=False):
     """ open the new file
 
@@ -819,13 +843,15 @@ class H5CppGroup(filewriter.FTGroup):
         :type type_code: :obj:`str`
         :param shape: shape
         :type shape: :obj:`list` < :obj:`int` >
-        :param chunk: chunk
-        :type chunk: :obj:`list` < :obj:`int` >
+        :param chunk: chunk or 'auto' for :func:`filewriter.auto_chunk`
+        :type chunk: :obj:`list` < :obj:`int` > or :obj:`str`
         :param dfilter: filter deflater
         :type dfilter: :class:`H5CppDataFilter`
         :returns: file tree field
         :rtype: :class:`H5CppField`
         """
+        if chunk == "auto":
+            chunk = filewriter.auto_chunk(shape or [1], _tostr(type_code))
         dcpl = h5cpp.property.DatasetCreationList()
         if type_code in ["str", "unicode", "string"] and \
            shape is None and chunk is None:
@@ -951,6 +977,38 @@ class H5CppGroup(filewriter.FTGroup):
         return [
             lk.path.name for lk in self._h5object.links]
 
+    def find_fields(self, name):
+        """ find all fields with the given name in the group subtree,
+        links are not followed
+
+        :param name: field name
+        :type name: :obj:`str`
+        :returns: field paths relative to the group
+        :rtype: :obj:`list` <`str`>
+        """
+        paths = []
+
+        def _find(group, prefix):
+            for lk in group.links:
+                if lk.type() != h5cpp.node.LinkType.HARD:
+                    continue
+                path = h5cpp.Path(lk.path.name)
+                if group.has_group(path):
+                    _find(group.get_group(path), prefix + lk.path.name + "/")
+                elif lk.path.name == name and group.has_dataset(path):
+                    paths.append(prefix + lk.path.name)
+
+        _find(self._h5object, "")
+        return paths
+
+    def remove(self, name):
+        """ removes the child link
+
+        :param name: child name
+        :type name: :obj:`str`
+        """
+        h5cpp.node.remove(base=self._h5object, path=h5cpp.Path(name))
+
     class H5CppGroupIter(object):
 
         def __init__(self, group):
@@ -1007,6 +1065,9 @@ class H5CppField(filewriter.FTField):
     """ file tree file
     """
 
+    #: (:obj:`int`) maximal number of cached hyperslab selections
+    selectionlimit = 16
+
     def __init__(self, h5object, tparent=None):
         """ constructor
 
@@ -1029,6 +1090,52 @@ class H5CppField(filewriter.FTField):
                     self.path = tparent.path + "/" + self.name
         #: (:obj:`bool`) bool flag
         # self.boolflag = False
+        #: (:class:`h5cpp.dataspace.Dataspace`) cached dataspace
+        self._dataspace = None
+        #: (:obj:`tuple` < :obj:`int` >) cached field shape
+        self._shape = None
+        #: (:obj:`str`) cached field data type
+        self._dtype = None
+        #: (:obj:`dict` < :obj:`tuple`, \
+        #:     :class:`h5cpp.dataspace.Hyperslab` >) hyperslab selections
+        #:     with their block, count and stride
+        self._selections = {}
+
+    def _resetcache(self, dtype=False):
+        """ resets the cached dataspace and shape
+
+        :param dtype: reset also the cached data type
+        :type dtype: :obj:`bool`
+        """
+        self._dataspace = None
+        self._shape = None
+        if dtype:
+            self._dtype = None
+            self._selections = {}
+
+    def _selection(self, t):
+        """ provides a cached hyperslab selection moved to the slice offset
+
+        :param t: slice tuple
+        :type t: :obj:`tuple`
+        :returns: hyperslab selection
+        :rtype: :class:`h5cpp.dataspace.Hyperslab`
+        """
+        params = _slice2hyperslab(t, self.shape)
+        if params is None:
+            return None
+        offset, block, count, stride = params
+        key = (tuple(block), tuple(count), tuple(stride))
+        selection = self._selections.get(key)
+        if selection is None:
+            if len(self._selections) >= self.selectionlimit:
+                self._selections = {}
+            selection = h5cpp.dataspace.Hyperslab(
+                offset=offset, block=block, count=count, stride=stride)
+            self._selections[key] = selection
+        else:
+            selection.offset(offset)
+        return selection
 
     @property
     def attributes(self):
@@ -1043,12 +1150,14 @@ class H5CppField(filewriter.FTField):
         """ close field
         """
         filewriter.FTField.close(self)
+        self._resetcache(True)
         if self._h5object.is_valid:
             self._h5object.close()
 
     def reopen(self):
         """ reopen field
         """
+        self._resetcache(True)
         try:
             self._h5object = self._tparent.h5object.get_dataset(
                 h5cpp.Path(self.name))
@@ -1064,6 +1173,7 @@ class H5CppField(filewriter.FTField):
         :returns: refreshed
         :rtype: :obj:`bool`
         """
+        self._resetcache()
         self._h5object.refresh()
         return True
 
@@ -1075,8 +1185,23 @@ class H5CppField(filewriter.FTField):
         :param dim: size of the grow
         :type dim: :obj:`int`
         """
-        if self._h5object.dataspace.type != h5cpp.dataspace.Type.SCALAR:
+        if self._getdataspace().type != h5cpp.dataspace.Type.SCALAR:
             self._h5object.extent(dim, ext)
+            self._resetcache()
+
+    def write_chunk(self, offset, data, filter_mask=0):
+        """ write an already filtered chunk directly into the field
+
+        :param offset: logical offset of the chunk
+        :type offset: :obj:`list` <:obj:`int`>
+        :param data: filtered chunk data
+        :type data: :obj:`bytes`
+        :param filter_mask: mask of the skipped filters
+        :type filter_mask: :obj:`int`
+        """
+        self._h5object.write_chunk(
+            np.frombuffer(data, dtype="uint8"),
+            [int(off) for off in offset], filter_mask)
 
     def read(self):
         """ read the field value
@@ -1120,7 +1245,7 @@ class H5CppField(filewriter.FTField):
         """
         if self.shape == (1,) and t == 0:
             return self._h5object.write(o)
-        selection = _slice2selection(t, self.shape)
+        selection = self._selection(t)
         if selection is None:
             self._h5object.write(o)
         else:
@@ -1134,8 +1259,9 @@ class H5CppField(filewriter.FTField):
         :returns: h5 object
         :rtype: :obj:`any`
         """
+        dtype = self.dtype
         if self.shape == (1,) and t == 0:
-            if self.dtype in ['string', b'string']:
+            if dtype in ['string', b'string']:
                 # workaround for bug: h5cpp #355
                 if self.size == 0:
                     if self.shape:
@@ -1147,9 +1273,9 @@ class H5CppField(filewriter.FTField):
             else:
                 v = self._h5object.read()
 
-        selection = _slice2selection(t, self.shape)
+        selection = self._selection(t)
         if selection is None:
-            if self.dtype in ['string', b'string']:
+            if dtype in ['string', b'string']:
                 # workaround for bug: h5cpp #355
                 if self.size == 0:
                     if self.shape:
@@ -1195,7 +1321,7 @@ class H5CppField(filewriter.FTField):
                 shape = v.shape
             if len(shape) == 1 and shape[0] == 1:
                 v = v[0]
-        if self.dtype in ['string', b'string']:
+        if dtype in ['string', b'string']:
             try:
                 v = v.decode('UTF-8')
             except Exception:
@@ -1215,6 +1341,16 @@ class H5CppField(filewriter.FTField):
     def dtype(self):
         """ field data type
 
+        :returns: field data type
+        :rtype: :obj:`str`
+        """
+        if self._dtype is None:
+            self._dtype = self._datatype()
+        return self._dtype
+
+    def _datatype(self):
+        """ reads field data type
+
         :returns: field data type
         :rtype: :obj:`str`
         """
@@ -1268,19 +1404,38 @@ class H5CppField(filewriter.FTField):
         return hTp[self._h5object.datatype.type]
 #
 
+    def _getdataspace(self):
+        """ provides the cached field dataspace
+
+        :returns: field dataspace
+        :rtype: :class:`h5cpp.dataspace.Dataspace`
+        """
+        if self._dataspace is None:
+            self._dataspace = self._h5object.dataspace
+        return self._dataspace
+
     @property
     def shape(self):
         """ field shape
 
+        The shape is cached until :meth:`grow`, :meth:`refresh`,
+        :meth:`close` or :meth:`reopen` of this field object.
+        If the dataset is extended through another field object
+        or another process, :meth:`refresh` has to be called before
+        the shape or negative indices of this object are used.
+
         :returns: field shape
         :rtype: :obj:`list` < :obj:`int` >
         """
-        if hasattr(self._h5object.dataspace, "current_dimensions"):
-            return self._h5object.dataspace.current_dimensions
-        if self._h5object.dataspace.type == h5cpp.dataspace.Type.SCALAR:
-            return ()
-        else:
-            return (1,)
+        if self._shape is None:
+            dataspace = self._getdataspace()
+            if hasattr(dataspace, "current_dimensions"):
+                self._shape = dataspace.current_dimensions
+            elif dataspace.type == h5cpp.dataspace.Type.SCALAR:
+                self._shape = ()
+            else:
+                self._shape = (1,)
+        return self._shape
 
     @property
     def size(self):
@@ -1289,7 +1444,7 @@ class H5CppField(filewriter.FTField):
         :returns: field size
         :rtype: :obj:`int`
         """
-        return self._h5object.dataspace.size
+        return self._getdataspace().size
 
 
 class H5CppLink(filewriter.FTLink):
@@ -1608,6 +1763,29 @@ class H5CppAttributeManager(filewriter.FTAttributeManager):
         """
         return [att.name for att in self._h5object]
 
+    def read_all(self, names=None):
+        """ read values of all attributes in one sweep
+
+        :param names: names of attributes to read, missing ones are skipped,
+                      `None` reads all attributes
+        :type names: :obj:`list` <:obj:`str`>
+        :returns: attribute values
+        :rtype: :obj:`dict` <:obj:`str`, :obj:`any`>
+        """
+        names = set(names) if names is not None else None
+        values = {}
+        for att in self._h5object:
+            if names is not None and att.name not in names:
+                continue
+            vl = att.read()
+            if hTp.get(att.datatype.type) == "string":
+                try:
+                    vl = vl.decode('UTF-8')
+                except Exception:
+                    pass
+            values[att.name] = vl
+        return values
+
     def close(self):
         """ close attribure manager
         """
@@ -23,6 +23,7 @@ import numpy as np
 import os
 import sys
 import io
+import inspect
 
 from . import filewriter
 # from .Types import nptype
@@ -272,6 +273,22 @@ def is_strings_as_bytes():
     return h5ver >= 3000
 
 
+def _decode(value):
+    """ decodes attribute strings read as bytes
+
+    :param value: attribute value
+    :type value: :obj:`any`
+    :returns: attribute value with decoded strings
+    :rtype: :obj:`any`
+    """
+    if hasattr(value, "decode") and not isinstance(value, unicode):
+        return value.decode(encoding="utf-8")
+    if is_strings_as_bytes() and isinstance(value, np.ndarray) \
+       and value.dtype.kind == "S":
+        return np.char.decode(value, encoding="utf-8")
+    return value
+
+
 def unlimited(parent=None):
     """ return dataspace UNLIMITED variable for the current writer module
 
@@ -286,6 +303,32 @@ def unlimited(parent=None):
         return h5py.UNLIMITED
 
 
+def _h5pyfileargs():
+    """ provides names of h5py.File arguments
+
+    :returns: argument names
+    :rtype: :obj:`list` <:obj:`str`>
+    """
+    try:
+        return list(inspect.signature(h5py.File.__init__).parameters.keys())
+    except AttributeError:
+        return list(inspect.getargspec(h5py.File.__init__).args)
+
+
+#: (:obj:`list` <:obj:`str`>) file tuning parameters accepted by h5py.File
+_TUNING_PARAMETERS = [par for par in filewriter.TUNING_PARAMETERS
+                      if par in _h5pyfileargs()]
+
+
+def tuning_parameters():
+    """ provides names of file tuning parameters supported by h5py
+
+    :returns: names of supported file tuning parameters
+    :rtype: :obj:`list` <:obj:`str`>
+    """
+    return list(_TUNING_PARAMETERS)
+
+
 def load_file(membuffer, filename=None, readonly=False, **pars):
     """ load a file from memory byte buffer
 
@@ -343,6 +386,8 @@ def create_file(filename, overwrite=False, **pars):
     :returns: file object
     :rtype: :class:`H5PYFile`
     """
+    if pars.get("page_buf_size") and "fs_strategy" not in pars:
+        pars["fs_strategy"] = "page"
     fl = h5py.File(filename, "w" if overwrite else "w-", **pars)
     fl.attrs["file_time"] = unicode(H5PYFile.currenttime())
     fl.attrs["HDF5_Version"] = str(h5py.version.hdf5_version)
@@ -612,23 +657,48 @@ class H5PYGroup(filewriter.FTGroup):
         :type tparent: :obj:`FTObject`
         """
         filewriter.FTGroup.__init__(self, h5object, tparent)
-        self.path = u""
+        #: (:obj:`str`) object nexus path, evaluated on the first access
+        self._path = None
+        #: (:obj:`str`) object name
         self.name = None
         if hasattr(h5object, "name"):
-            name = h5object.name
-            self.name = name.split("/")[-1]
-            if tparent and tparent.path:
-                if tparent.path == u"/":
-                    self.path = u"/" + self.name
-                else:
-                    self.path = tparent.path + u"/" + self.name
-            if ":" not in self.name:
-                if u"NX_class" in h5object.attrs:
-                    clss = filewriter.first(h5object.attrs["NX_class"])
-                else:
-                    clss = ""
-                if clss:
-                    self.path += u":" + str(clss)
+            self.name = h5object.name.split("/")[-1]
+
+    @property
+    def path(self):
+        """ nexus path of the group with its NX_class suffixes
+
+        :returns: nexus path
+        :rtype: :obj:`str`
+        """
+        if self._path is None:
+            path = u""
+            if self.name is not None:
+                tparent = self._tparent
+                if tparent and tparent.path:
+                    if tparent.path == u"/":
+                        path = u"/" + self.name
+                    else:
+                        path = tparent.path + u"/" + self.name
+                if ":" not in self.name:
+                    attrs = self._h5object.attrs
+                    if u"NX_class" in attrs:
+                        clss = filewriter.first(attrs["NX_class"])
+                    else:
+                        clss = ""
+                    if clss:
+                        path += u":" + str(clss)
+            self._path = path
+        return self._path
+
+    @path.setter
+    def path(self, value):
+        """ setter for nexus path
+
+        :param value: nexus path
+        :type value: :obj:`str`
+        """
+        self._path = value
 
     def open(self, name):
         """ open a file tree element
@@ -638,13 +708,13 @@ class H5PYGroup(filewriter.FTGroup):
         :returns: file tree object
         :rtype: :class:`FTObject`
         """
-        if name not in self._h5object:
+        itm = self._h5object.get(name)
+        if itm is None and name not in self._h5object:
             at = self._h5object.attrs[name]
             if at is None:
                 raise Exception("Empty attriibute")
             return H5PYAttribute((self._h5object.attrs, name), self)
 
-        itm = self._h5object.get(name)
         if isinstance(itm, h5py._hl.dataset.Dataset):
             el = H5PYField(itm, self)
         elif isinstance(itm, h5py._hl.group.Group):
@@ -675,7 +745,7 @@ class H5PYGroup(filewriter.FTGroup):
             """
 
             self.__group = group
-            self.__names = sorted(self.__group._h5object.keys()) or []
+            self.__names = iter(sorted(self.__group._h5object.keys()))
 
         def __next__(self):
             """ the next attribute
@@ -683,10 +753,7 @@ class H5PYGroup(filewriter.FTGroup):
             :returns: attribute object
             :rtype: :class:`FTAtribute`
             """
-            if self.__names:
-                return self.__group.open(self.__names.pop(0))
-            else:
-                raise StopIteration()
+            return self.__group.open(next(self.__names))
 
         next = __next__
 
@@ -754,13 +821,15 @@ class H5PYGroup(filewriter.FTGroup):
         :type type_code: :obj:`str`
         :param shape: shape
         :type shape: :obj:`list` < :obj:`int` >
-        :param chunk: chunk
-        :type chunk: :obj:`list` < :obj:`int` >
+        :param chunk: chunk or 'auto' for :func:`filewriter.auto_chunk`
+        :type chunk: :obj:`list` < :obj:`int` > or :obj:`str`
         :param dfilter: filter deflater
         :type dfilter: :class:`H5PYDataFilter`
         :returns: file tree field
         :rtype: :class:`H5PYField`
         """
+        if chunk == "auto":
+            chunk = filewriter.auto_chunk(shape or [1], type_code)
         if type_code in ['string', b'string']:
             type_code = h5py.special_dtype(vlen=unicode)
             # type_code = h5py.special_dtype(vlen=bytes)
@@ -840,7 +909,7 @@ class H5PYGroup(filewriter.FTGroup):
         :returns: group size
         :rtype: :obj:`int`
         """
-        return len(list(self._h5object.keys()))
+        return len(self._h5object)
 
     def exists(self, name):
         """ if child exists
@@ -860,6 +929,33 @@ class H5PYGroup(filewriter.FTGroup):
         """
         return list(self._h5object.keys())
 
+    def find_fields(self, name):
+        """ find all fields with the given name in the group subtree,
+        links are not followed
+
+        :param name: field name
+        :type name: :obj:`str`
+        :returns: field paths relative to the group
+        :rtype: :obj:`list` <`str`>
+        """
+        paths = []
+
+        def _visit(path):
+            if path.rsplit("/", 1)[-1] == name and \
+               self._h5object.get(path, getclass=True) is h5py.Dataset:
+                paths.append(path)
+
+        self._h5object.visit(_visit)
+        return paths
+
+    def remove(self, name):
+        """ removes the child link
+
+        :param name: child name
+        :type name: :obj:`str`
+        """
+        del self._h5object[name]
+
     @property
     def is_valid(self):
         """ check if group is valid
@@ -949,6 +1045,19 @@ class H5PYField(filewriter.FTField):
         else:
             return self._h5object
 
+    def write_chunk(self, offset, data, filter_mask=0):
+        """ write an already filtered chunk directly into the field
+
+        :param offset: logical offset of the chunk
+        :type offset: :obj:`list` <:obj:`int`>
+        :param data: filtered chunk data
+        :type data: :obj:`bytes`
+        :param filter_mask: mask of the skipped filters
+        :type filter_mask: :obj:`int`
+        """
+        self._h5object.id.write_direct_chunk(
+            tuple(offset), data, filter_mask)
+
     def read(self):
         """ read the field value
 
@@ -1415,6 +1524,22 @@ class H5PYAttributeManager(filewriter.FTAttributeManager):
         """
         return self._h5object.keys()
 
+    def read_all(self, names=None):
+        """ read values of all attributes in one sweep
+
+        :param names: names of attributes to read, missing ones are skipped,
+                      `None` reads all attributes
+        :type names: :obj:`list` <:obj:`str`>
+        :returns: attribute values
+        :rtype: :obj:`dict` <:obj:`str`, :obj:`any`>
+        """
+        attrs = self._h5object
+        anames = list(attrs.keys())
+        if names is not None:
+            akeys = set(anames)
+            anames = [nm for nm in names if nm in akeys]
+        return dict((nm, _decode(attrs[nm])) for nm in anames)
+
     def reopen(self):
         """ reopen field
         """
@@ -1461,11 +1586,7 @@ class H5PYAttribute(filewriter.FTAttribute):
         :returns: python object
         :rtype: :obj:`any`
         """
-        at = self._h5object[0][self.name]
-        if hasattr(at, "decode") and not isinstance(at, unicode):
-            return at.decode(encoding="utf-8")
-        else:
-            return at
+        return _decode(self._h5object[0][self.name])
 
     def write(self, o):
         """ write attribute value
@@ -1556,10 +1677,7 @@ class H5PYAttribute(filewriter.FTAttribute):
                 at = self._h5object[0][self.name][t]
         else:
             at = self._h5object[0][self.name].__getitem__(t)
-        if hasattr(at, "decode") and not isinstance(at, unicode):
-            return at.decode(encoding="utf-8")
-        else:
-            return at
+        return _decode(at)
 
     @property
     def is_valid(self):
@@ -21,6 +21,50 @@
 
 import argparse
 import argcomplete
+import cProfile
+import json
+import os
+import sys
+import time
+
+
+#: (:obj:`float`) import time of the module
+_IMPORTTIME = time.time()
+
+#: (:obj:`str`) environment variable with the default profile file
+PROFILE_ENV = "NXSTOOLS_PROFILE"
+
+#: (:obj:`str`) environment variable with the default timings file
+TIMINGS_ENV = "NXSTOOLS_TIMINGS"
+
+
+def _cputime():
+    """ provides cpu time of the process
+
+    :returns: cpu time in seconds
+    :rtype: :obj:`float`
+    """
+    if hasattr(time, "process_time"):
+        return time.process_time()
+    times = os.times()
+    return times[0] + times[1]
+
+
+def _processstarttime():
+    """ provides start time of the process if known by the system
+
+    :returns: start time of the process or None
+    :rtype: :obj:`float`
+    """
+    try:
+        with open("/proc/self/stat") as fl:
+            stat = fl.read().rsplit(")", 1)[1].split()
+        with open("/proc/uptime") as fl:
+            uptime = float(fl.read().split()[0])
+        return time.time() - uptime \
+            + float(stat[19]) / os.sysconf("SC_CLK_TCK")
+    except Exception:
+        return None
 
 
 class Runner(object):
@@ -56,6 +100,114 @@ class Runner(object):
         """
 
 
+class RunnerProfiler(object):
+
+    """ runner wrapper which measures timings of the command
+    or runs it under the profiler
+    """
+
+    def __init__(self, runner):
+        """ constructor
+
+        :param runner: command runner
+        :type runner: :class:`Runner`
+        """
+        #: (:class:`Runner`) command runner
+        self.runner = runner
+
+    def __getattr__(self, name):
+        """ provides attributes of the runner
+
+        :param name: attribute name
+        :type name: :obj:`str`
+        :returns: attribute value
+        :rtype: `any`
+        """
+        return getattr(self.runner, name)
+
+    @classmethod
+    def _write(cls, filename, text):
+        """ writes the text to the file or to stderr for '-'
+
+        :param filename: file name
+        :type filename: :obj:`str`
+        :param text: output text
+        :type text: :obj:`str`
+        """
+        if filename == "-":
+            sys.stderr.write(text + "\n")
+            sys.stderr.flush()
+        else:
+            with open(filename, "w") as fl:
+                fl.write(text + "\n")
+
+    def timings(self, options, start, startcpu, status):
+        """ provides timings of the command
+
+        :param options: parser options
+        :type options: :class:`argparse.Namespace`
+        :param start: start time of the run
+        :type start: :obj:`float`
+        :param startcpu: cpu time before the run
+        :type startcpu: :obj:`float`
+        :param status: exit status of the command
+        :type status: `any`
+        :returns: timings of the command
+        :rtype: :obj:`dict` <:obj:`str`, `any`>
+        """
+        stop = time.time()
+        processstart = _processstarttime()
+        return {
+            "command": " ".join(
+                [os.path.basename(sys.argv[0] if sys.argv else "")]
+                + [str(getattr(options, "subparser", "") or "")]).strip(),
+            "startup": start - processstart
+            if processstart is not None else None,
+            "setup": start - _IMPORTTIME,
+            "startup_cpu": startcpu,
+            "run": stop - start,
+            "run_cpu": _cputime() - startcpu,
+            "profiled": bool(getattr(options, "cprofile", None)),
+            "exit_status": status,
+        }
+
+    def run(self, options):
+        """ runs the command with measured timings
+        or under the profiler
+
+        :param options: parser options
+        :type options: :class:`argparse.Namespace`
+        :returns: result of the command
+        :rtype: `any`
+        """
+        if not getattr(options, "cprofile", None):
+            options.cprofile = os.environ.get(PROFILE_ENV) or None
+        if not getattr(options, "cmdtimings", None):
+            options.cmdtimings = os.environ.get(TIMINGS_ENV) or None
+        if not options.cprofile and not options.cmdtimings:
+            return self.runner.run(options)
+        profiler = cProfile.Profile() if options.cprofile else None
+        status = None
+        startcpu = _cputime()
+        start = time.time()
+        try:
+            if profiler is not None:
+                return profiler.runcall(self.runner.run, options)
+            return self.runner.run(options)
+        except SystemExit as e:
+            status = e.code
+            raise
+        except BaseException as e:
+            status = type(e).__name__
+            raise
+        finally:
+            timings = self.timings(options, start, startcpu, status)
+            if profiler is not None:
+                profiler.dump_stats(options.cprofile)
+            if options.cmdtimings:
+                self._write(options.cmdtimings, json.dumps(timings))
+
+
 class ErrorException(Exception):
 
     """ error parser exception """
@@ -108,10 +260,34 @@ class NXSArgParser(argparse.ArgumentParser):
             )
             pars[cmd] = klass(self.subparsers[cmd])
             pars[cmd].create()
+            self.addProfileArguments(self.subparsers[cmd])
 
         argcomplete.autocomplete(self)
 
         for cmd, klass in self.cmdrunners:
             pars[cmd].postauto()
 
-        return pars
+        return dict((cmd, RunnerProfiler(runner))
+                    for cmd, runner in pars.items())
+
+    @classmethod
+    def addProfileArguments(cls, parser):
+        """ adds profiling parameters to the command parser
+
+        :param parser: command parser
+        :type parser: :class:`argparse.ArgumentParser`
+        """
+        group = parser.add_argument_group(
+            "profiling",
+            "default files can be also set by the %s and %s"
+            " environment variables" % (PROFILE_ENV, TIMINGS_ENV))
+        group.add_argument(
+            "--cprofile", dest="cprofile",
+            action="store", type=str, default=None, metavar="PSTATS_FILE",
+            help="run the command under cProfile and dump"
+            " its statistics into the pstats file")
+        group.add_argument(
+            "--cmd-timings", dest="cmdtimings",
+            action="store", type=str, default=None, metavar="JSON_FILE",
+            help="write startup and run wall/cpu times of the command"
+            " in json into the file or to stderr for '-'")
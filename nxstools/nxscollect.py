@@ -29,8 +29,20 @@ import signal
 import argparse
 import numpy
 import json
+import time
+import glob
+import hashlib
+import collections
+import contextlib
+import multiprocessing
+
+try:
+    import queue as Queue
+except ImportError:
+    import Queue
 
 from .filenamegenerator import FilenameGenerator
+from .chunkcompressor import ChunkCompressor
 from .nxsargparser import (Runner, NXSArgParser, ErrorException)
 from . import filewriter
 
@@ -41,6 +53,9 @@ if sys.version_info > (3,):
 else:
     bytes = str
 
+#: (:obj:`instancemethod`) monotonic clock of stage timing
+_clock = getattr(time, "perf_counter", time.time)
+
 
 WRITERS = {}
 try:
@@ -112,6 +127,61 @@ def filegenerator(filestr, pattern=None):
         return _files
 
 
+def postruntasks(root):
+    """ locates postrun fields of NXcollection groups in one traversal
+
+    Only hard links are traversed, i.e. every postrun field is found once
+    at its own path. Postrun fields which are reachable only through soft
+    or external links, e.g. in other files, are not collected.
+
+    :param root: hdf5 root node
+    :type root: :class:`filewriter.FTGroup`
+    :returns: collection tasks with the path of the output group
+              relative to the root, the output field name, the input files
+              and the field dtype, shape, attributes and compression
+    :rtype: :obj:`list` <:obj:`dict` <:obj:`str`, `any`>>
+    """
+    tasks = []
+    for path in root.find_fields("postrun"):
+        names = path.split("/")
+        if len(names) < 2:
+            continue
+        node = root
+        for name in names[:-1]:
+            node = node.open(name)
+        nxclass = node.attributes.read_all(["NX_class"]).get("NX_class")
+        if filewriter.first(nxclass) != "NXcollection":
+            continue
+        inputfiles = node.open("postrun")
+        files = inputfiles.read()
+        if hasattr(files, "tolist"):
+            files = files.tolist()
+        if isinstance(files, (str, unicode)):
+            files = [files]
+        attrs = inputfiles.attributes
+        values = dict(
+            (name, filewriter.first(value))
+            for name, value in attrs.read_all(
+                ["fieldname", "fieldcompression", "fielddtype",
+                 "fieldshape"]).items())
+        fieldattrs = {}
+        for name in attrs.names():
+            if name.startswith("fieldattr_") and name[10:]:
+                at = attrs[name]
+                fieldattrs[name[10:]] = (at.read(), at.dtype, at.shape)
+        tasks.append({
+            "path": "/".join(names[:-2]),
+            "fieldname": values.get("fieldname", "data"),
+            "files": files,
+            "dtype": values.get("fielddtype"),
+            "shape": json.loads(values["fieldshape"])
+            if "fieldshape" in values else None,
+            "attrs": fieldattrs,
+            "compression": values.get("fieldcompression"),
+        })
+    return tasks
+
+
 def splitcoords(crdstr):
     """ splits coordinate string
 
@@ -228,13 +298,342 @@ def getcompression(compression):
         return
 
 
+def _fieldmetadata(field):
+    """ provides maximal shape and chunks of the field
+
+    :param field: field object
+    :type field: :class:`filewriter.FTField`
+    :returns: maximal shape and chunks of the field
+    :rtype: :obj:`tuple` <:obj:`list` <:obj:`int`>, :obj:`list` <:obj:`int`>>
+    """
+    h5object = field.h5object
+    maxshape = None
+    chunks = None
+    if hasattr(h5object, "maxshape"):
+        maxshape = h5object.maxshape
+        chunks = h5object.chunks
+    elif hasattr(h5object, "dataspace"):
+        try:
+            maxshape = h5object.dataspace.maximum_dimensions
+        except Exception:
+            pass
+        try:
+            chunks = h5object.creation_list.chunk
+        except Exception:
+            pass
+    if maxshape is not None:
+        maxshape = [(int(dm) if dm is not None and dm < 2 ** 63 else None)
+                    for dm in maxshape]
+    if chunks is not None:
+        chunks = [int(dm) for dm in chunks] or None
+    return maxshape, chunks
+
+
+def probetarget(target):
+    """ reads metadata of the target field without reading its data
+
+    :param target: (file name, field path, writer name) tuple
+    :type target: :obj:`tuple` <:obj:`str`, :obj:`str`, :obj:`str`>
+    :returns: target field metadata or an error message
+    :rtype: :obj:`dict` <:obj:`str`, `any`>
+    """
+    filename, path, writer = target
+    probe = {"filename": filename, "path": path}
+    try:
+        stat = os.stat(filename)
+        probe["mtime"] = stat.st_mtime
+        probe["size"] = stat.st_size
+        fl = filewriter.open_file(
+            filename, readonly=True, writer=WRITERS[writer])
+        try:
+            node = fl.root()
+            for name in path.split("/"):
+                if name:
+                    node = node.open(name)
+            probe["shape"] = [int(dm) for dm in node.shape]
+            probe["dtype"] = _tostr(node.dtype)
+            probe["maxshape"], probe["chunks"] = _fieldmetadata(node)
+        finally:
+            fl.close()
+    except Exception as e:
+        probe["error"] = "%s://%s: %s" % (filename, path, str(e))
+    return probe
+
+
+class ProbeCache(object):
+
+    """ cache of target field metadata validated by file mtime and size
+    """
+
+    def __init__(self, filename=None):
+        """ constructor
+
+        :param filename: json file to keep the cache between runs
+        :type filename: :obj:`str`
+        """
+        #: (:obj:`str`) cache file name
+        self.filename = filename
+        #: (:obj:`dict` <:obj:`str`, :obj:`dict`>) cached metadata
+        self.probes = {}
+        #: (:obj:`bool`) cache was updated
+        self.__changed = False
+        if filename and os.path.isfile(filename):
+            try:
+                with open(filename) as fl:
+                    self.probes = json.load(fl)
+            except Exception:
+                self.probes = {}
+
+    @classmethod
+    def key(cls, filename, path):
+        """ provides the cache key of the target field
+
+        :param filename: file name
+        :type filename: :obj:`str`
+        :param path: field path
+        :type path: :obj:`str`
+        :returns: cache key
+        :rtype: :obj:`str`
+        """
+        return "%s:/%s" % (os.path.abspath(filename), path)
+
+    def get(self, filename, path):
+        """ provides valid cached metadata of the target field
+
+        :param filename: file name
+        :type filename: :obj:`str`
+        :param path: field path
+        :type path: :obj:`str`
+        :returns: target field metadata or None
+        :rtype: :obj:`dict` <:obj:`str`, `any`>
+        """
+        probe = self.probes.get(self.key(filename, path))
+        if probe is None:
+            return None
+        try:
+            stat = os.stat(filename)
+        except OSError:
+            return None
+        if probe.get("mtime") != stat.st_mtime or \
+           probe.get("size") != stat.st_size:
+            return None
+        return probe
+
+    def update(self, probe):
+        """ stores metadata of the target field
+
+        :param probe: target field metadata
+        :type probe: :obj:`dict` <:obj:`str`, `any`>
+        """
+        if "error" not in probe:
+            self.probes[self.key(probe["filename"], probe["path"])] = probe
+            self.__changed = True
+
+    def save(self):
+        """ writes the cache into its file
+        """
+        if self.filename and self.__changed:
+            with open(self.filename, "w") as fl:
+                json.dump(self.probes, fl)
+            self.__changed = False
+
+
+def probetargets(targets, writer, cache=None, jobs=None):
+    """ reads metadata of target fields concurrently
+
+    :param targets: (file name, field path) tuples
+    :type targets: :obj:`list` <:obj:`tuple` <:obj:`str`, :obj:`str`>>
+    :param writer: writer name
+    :type writer: :obj:`str`
+    :param cache: probe cache
+    :type cache: :class:`ProbeCache`
+    :param jobs: number of probing processes
+    :type jobs: :obj:`int`
+    :returns: target field metadata and a number of cached probes
+    :rtype: :obj:`tuple` <:obj:`list` <:obj:`dict`>, :obj:`int`>
+    """
+    cache = cache if cache is not None else ProbeCache()
+    probes = [cache.get(fn, ph) for fn, ph in targets]
+    missing = [i for i, pb in enumerate(probes) if pb is None]
+    tasks = [(targets[i][0], targets[i][1], writer) for i in missing]
+    jobs = jobs or multiprocessing.cpu_count()
+    if jobs > 1 and len(tasks) > 1:
+        pool = multiprocessing.Pool(min(jobs, len(tasks)))
+        try:
+            results = pool.map(
+                probetarget, tasks,
+                max(1, len(tasks) // (4 * min(jobs, len(tasks)))))
+        finally:
+            pool.close()
+            pool.join()
+    else:
+        results = [probetarget(task) for task in tasks]
+    for i, probe in zip(missing, results):
+        probes[i] = probe
+        cache.update(probe)
+    cache.save()
+    return probes, len(targets) - len(missing)
+
+
+def stacklayout(probes, axis=0):
+    """ computes a layout of target fields stacked along the given axis
+
+    :param probes: target field metadata
+    :type probes: :obj:`list` <:obj:`dict` <:obj:`str`, `any`>>
+    :param axis: stacking axis
+    :type axis: :obj:`int`
+    :returns: vds shape, vds dtype and target offsets in the layout
+    :rtype: :obj:`tuple` <:obj:`list` <:obj:`int`>, :obj:`str`,
+             :obj:`list` <:obj:`tuple` <:obj:`int`>>>
+    """
+    errors = [pb["error"] for pb in probes if "error" in pb]
+    if errors:
+        raise ValueError("\n".join(errors))
+    if not probes:
+        raise ValueError("no target fields found")
+    rank = len(probes[0]["shape"])
+    if axis < 0 or axis >= rank:
+        raise ValueError(
+            "stacking axis %s does not fit to the target rank %s"
+            % (axis, rank))
+    shape = list(probes[0]["shape"])
+    shape[axis] = 0
+    offsets = []
+    for pb in probes:
+        tshape = list(pb["shape"])
+        other = tshape[:axis] + tshape[axis + 1:]
+        if len(tshape) != rank or other != shape[:axis] + shape[axis + 1:]:
+            raise ValueError(
+                "%s://%s: shape %s does not match %s"
+                % (pb["filename"], pb["path"], pb["shape"],
+                   probes[0]["shape"]))
+        offset = [0] * rank
+        offset[axis] = shape[axis]
+        offsets.append(tuple(offset))
+        shape[axis] += tshape[axis]
+    dtype = str(numpy.result_type(*[pb["dtype"] for pb in probes]))
+    return shape, dtype, offsets
+
+
+class Statistics(object):
+
+    """ Cumulative times of stages and counters of a collection
+    """
+
+    #: (:obj:`list` <:obj:`str`>) statistics formats
+    formats = ["table", "json"]
+
+    def __init__(self, name):
+        """ constructor
+
+        :param name: name of the measured action
+        :type name: :obj:`str`
+        """
+        #: (:obj:`str`) name of the measured action
+        self.name = name
+        #: (:obj:`collections.OrderedDict` <:obj:`str`, :obj:`list`>)
+        #:    number of calls and seconds of the stages
+        self.stages = collections.OrderedDict()
+        #: (:obj:`collections.OrderedDict` <:obj:`str`, :obj:`int`>)
+        #:    counters, e.g. frames, bytes_read, bytes_written
+        #:    of uncompressed data and bytes_compressed
+        self.counters = collections.OrderedDict()
+        self.__start = _clock()
+        self.__stop = None
+
+    @contextlib.contextmanager
+    def stage(self, name):
+        """ measures time of the stage
+
+        :param name: stage name
+        :type name: :obj:`str`
+        """
+        start = _clock()
+        try:
+            yield
+        finally:
+            stage = self.stages.setdefault(name, [0, 0.])
+            stage[0] += 1
+            stage[1] += _clock() - start
+
+    def add(self, name, value=1):
+        """ increases the counter
+
+        :param name: counter name
+        :type name: :obj:`str`
+        :param value: counter increment
+        :type value: :obj:`int`
+        """
+        self.counters[name] = self.counters.get(name, 0) + value
+
+    def stop(self):
+        """ stops the time measurement
+        """
+        self.__stop = _clock()
+
+    @property
+    def elapsed(self):
+        """ elapsed time
+
+        :returns: elapsed time in seconds
+        :rtype: :obj:`float`
+        """
+        return (self.__stop or _clock()) - self.__start
+
+    def todict(self):
+        """ provides the statistics
+
+        :returns: statistics dictionary
+        :rtype: :obj:`dict` <:obj:`str`, `any`>
+        """
+        elapsed = self.elapsed
+        stats = collections.OrderedDict()
+        stats["name"] = self.name
+        stats["seconds"] = elapsed
+        stats["stages"] = collections.OrderedDict(
+            (name, {"calls": calls, "seconds": seconds})
+            for name, (calls, seconds) in self.stages.items())
+        stats.update(self.counters)
+        if elapsed > 0 and "frames" in self.counters:
+            stats["frames_per_second"] = self.counters["frames"] / elapsed
+        return stats
+
+    def report(self, fmt="table"):
+        """ provides the statistics report
+
+        :param fmt: report format, i.e. table or json
+        :type fmt: :obj:`str`
+        :returns: statistics report
+        :rtype: :obj:`str`
+        """
+        stats = self.todict()
+        if fmt == "json":
+            return json.dumps(stats)
+        elapsed = stats["seconds"]
+        lines = ["stats: %s in %.3f s" % (self.name, elapsed),
+                 "  %-14s %8s %10s %7s" % (
+                     "stage", "calls", "seconds", "share")]
+        for name, stage in stats["stages"].items():
+            lines.append("  %-14s %8s %10.3f %6.1f%%" % (
+                name, stage["calls"], stage["seconds"],
+                100. * stage["seconds"] / elapsed if elapsed else 0.))
+        for name, value in self.counters.items():
+            line = "  %-14s %8s" % (name.replace("_", " "), value)
+            if elapsed > 0 and name == "frames":
+                line += "  %.1f frames/s" % (value / elapsed)
+            elif elapsed > 0 and name.startswith("bytes"):
+                line += "  %.1f MB/s" % (value / elapsed / 1e6)
+            lines.append(line)
+        return "\n".join(lines)
+
+
 class Linker(object):
 
     """ Create external and internal links of NeXus files
     """
 
     def __init__(self, nexusfilepath, target, name=None,
-                 storeold=False, testmode=False, writer=None):
+                 storeold=False, testmode=False, writer=None, stats=None):
         """ The constructor creates the collector object
 
         :param nexusfilepath: the nexus file name and nexus path
@@ -247,6 +646,8 @@ class Linker(object):
         :type testmode: :obj:`bool`
         :param writer: the writer module
         :type writer: :obj:`str`
+        :param stats: format of printed statistics, i.e. table or json
+        :type stats: :obj:`str`
         """
         self.__target = target
         self.__name = name
@@ -258,6 +659,9 @@ class Linker(object):
         self.__nexuspath = None
         self.__nexusfilename, self.__nexuspath = \
             nexusfilepath.split(":/")
+        self.__statsformat = stats
+        #: (:class:`Statistics`) link statistics
+        self.stats = Statistics("link %s" % self.__nexusfilename)
 
         if writer and writer.lower() in WRITERS.keys():
             self.__wrmodule = WRITERS[writer.lower()]
@@ -297,12 +701,14 @@ class Linker(object):
     def link(self):
         """ creates NeXus link
         """
-        self._createtmpfile()
+        with self.stats.stage("copy"):
+            self._createtmpfile()
         path = self.__nexuspath
         try:
-            self.__nxsfile = filewriter.open_file(
-                self.__tempfilename, readonly=False,
-                writer=self.__wrmodule)
+            with self.stats.stage("open"):
+                self.__nxsfile = filewriter.open_file(
+                    self.__tempfilename, readonly=False,
+                    writer=self.__wrmodule)
             root = self.__nxsfile.root()
             groups = path.split("/")
             parent = root
@@ -329,14 +735,20 @@ class Linker(object):
                 print("link: target %s at %s as %s" %
                       (self.__target, path, self.__name))
             if not self.__testmode:
-                filewriter.link(self.__target, parent, self.__name)
+                with self.stats.stage("link"):
+                    filewriter.link(self.__target, parent, self.__name)
 
-            if self.__storeold:
-                self._storeoldfile()
-            shutil.move(self.__tempfilename, self.__nexusfilename)
+            with self.stats.stage("store"):
+                if self.__storeold:
+                    self._storeoldfile()
+                shutil.move(self.__tempfilename, self.__nexusfilename)
         except Exception as e:
             print(str(e))
             os.remove(self.__tempfilename)
+        finally:
+            self.stats.stop()
+            if self.__statsformat:
+                print(self.stats.report(self.__statsformat))
 
 
 class TargetFieldView(object):
@@ -537,10 +949,10 @@ class VirtualDataset(object):
         :param writer: the writer module
         :type writer: :obj:`str`
         """
-        shape = options.shape
+        shape = options.shape or ""
         if shape.startswith("[") and shape.endswith("]"):
             shape = shape[1:-1]
-        shape = splitcoords(shape)
+        shape = splitcoords(shape) if shape else []
         self.__shape = shape[0] if shape else []
         self.__shapes = splitcoords(options.shapes)
         if self.__shape:
@@ -565,6 +977,9 @@ class VirtualDataset(object):
         self.__nexuspath = None
         self.__nexusfilename, self.__nexuspath = \
             nexusfilepath.split(":/")
+        self.__statsformat = getattr(options, "stats", None)
+        #: (:class:`Statistics`) vds statistics
+        self.stats = Statistics("vds %s" % self.__nexusfilename)
 
         self.__ltfields = TargetFieldsLayout(
             options.targetfields,
@@ -587,6 +1002,11 @@ class VirtualDataset(object):
 
         if writer and writer.lower() in WRITERS.keys():
             self.__wrmodule = WRITERS[writer.lower()]
+        if getattr(options, "auto", False):
+            with self.stats.stage("probe"):
+                self.__autolayout(
+                    writer, ProbeCache(options.probecache),
+                    options.axis, options.jobs)
         self.__siginfo = dict(
             (signal.__dict__[sname], sname)
             for sname in ('SIGINT', 'SIGHUP', 'SIGALRM', 'SIGTERM'))
@@ -594,6 +1014,34 @@ class VirtualDataset(object):
         for sig in self.__siginfo.keys():
             signal.signal(sig, self._signalhandler)
 
+    def __autolayout(self, writer, cache, axis=0, jobs=None):
+        """ infers the vds layout from metadata of target fields
+
+        :param writer: writer name
+        :type writer: :obj:`str`
+        :param cache: probe cache
+        :type cache: :class:`ProbeCache`
+        :param axis: stacking axis
+        :type axis: :obj:`int`
+        :param jobs: number of probing processes
+        :type jobs: :obj:`int`
+        """
+        starttime = time.time()
+        probes, cached = probetargets(
+            [(lfd.target.filename, lfd.target.path)
+             for lfd in self.__ltfields], writer, cache, jobs)
+        shape, dtype, offsets = stacklayout(probes, axis)
+        if not self.__shape:
+            self.__shape = shape
+        if not self.__dtype:
+            self.__dtype = dtype
+        for lfd, probe, offset in zip(self.__ltfields, probes, offsets):
+            lfd.target.shape = tuple(probe["shape"])
+            lfd.shape = tuple(probe["shape"])
+            lfd.hyperslab.offset = offset
+        print("vds: probed %s target fields (%s cached) in %.2f s"
+              % (len(probes), cached, time.time() - starttime))
+
     def _signalhandler(self, sig, _):
         """ signal handler
 
@@ -623,12 +1071,14 @@ class VirtualDataset(object):
     def create(self):
         """ creates VDS
         """
-        self._createtmpfile()
+        with self.stats.stage("copy"):
+            self._createtmpfile()
         path = self.__nexuspath
         try:
-            self.__nxsfile = filewriter.open_file(
-                self.__tempfilename, readonly=False,
-                writer=self.__wrmodule)
+            with self.stats.stage("open"):
+                self.__nxsfile = filewriter.open_file(
+                    self.__tempfilename, readonly=False,
+                    writer=self.__wrmodule)
             root = self.__nxsfile.root()
             groups = path.split("/") or ["data"]
             parent = root
@@ -651,12 +1101,14 @@ class VirtualDataset(object):
             layout = filewriter.virtual_field_layout(
                 self.__shape, self.__dtype, self.__maxshape, parent)
             for flm in self.__ltfields:
-                efield = filewriter.target_field_view(
-                    flm.target.filename, flm.target.path,
-                    flm.target.shape or flm.shape,
-                    flm.target.maxshape, parent=parent)
-                layout.add(flm.hyperslab, efield, flm.target.hyperslab,
-                           flm.shape)
+                with self.stats.stage("layout"):
+                    efield = filewriter.target_field_view(
+                        flm.target.filename, flm.target.path,
+                        flm.target.shape or flm.shape,
+                        flm.target.maxshape, parent=parent)
+                    layout.add(flm.hyperslab, efield, flm.target.hyperslab,
+                               flm.shape)
+                self.stats.add("targets")
                 if parent:
                     print("vds: target %s://%s %s at %s/%s" %
                           (flm.target.filename, flm.target.path,
@@ -667,15 +1119,337 @@ class VirtualDataset(object):
                            flm.target.shape, path, fieldname))
             if not self.__testmode:
                 fillvalue = pTc[_tostr(self.__dtype)](self.__fillvalue or 0)
-                fd = parent.create_virtual_field(fieldname, layout, fillvalue)
-                fd.close()
-
-            if self.__storeold:
-                self._storeoldfile()
-            shutil.move(self.__tempfilename, self.__nexusfilename)
+                with self.stats.stage("create"):
+                    fd = parent.create_virtual_field(
+                        fieldname, layout, fillvalue)
+                    fd.close()
+
+            with self.stats.stage("store"):
+                if self.__storeold:
+                    self._storeoldfile()
+                shutil.move(self.__tempfilename, self.__nexusfilename)
         except Exception as e:
             print(str(e))
             os.remove(self.__tempfilename)
+        finally:
+            self.stats.stop()
+            if self.__statsformat:
+                print(self.stats.report(self.__statsformat))
+
+
+#: (:obj:`dict` <:obj:`tuple`, :class:`filewriter.FTField`>) fields
+#:    opened by materialization worker processes
+_MATERIALIZE_FIELDS = {}
+
+
+def _initworker(stop):
+    """ makes worker processes leave signals to the main process
+
+    Signals sent to the whole process group are ignored so a worker
+    is not killed in the middle of its task. SIGTERM stops the worker
+    only after the main process has set the stop event.
+
+    :param stop: event set by the main process before terminating the pool
+    :type stop: :class:`multiprocessing.Event`
+    """
+    def stopworker(sig, _):
+        if stop.is_set():
+            signal.signal(sig, signal.SIG_DFL)
+            os.kill(os.getpid(), sig)
+
+    for sig in (signal.SIGINT, signal.SIGHUP, signal.SIGALRM):
+        signal.signal(sig, signal.SIG_IGN)
+    signal.signal(signal.SIGTERM, stopworker)
+
+
+def readhyperslab(task):
+    """ reads a frame range of the field in a worker process
+
+    :param task: (file name, field path, writer name, start, stop) tuple
+    :type task: :obj:`tuple`
+    :returns: start frame and the read data
+    :rtype: :obj:`tuple` <:obj:`int`, :class:`numpy.ndarray`>
+    """
+    filename, path, writer, start, stop = task
+    key = (filename, path, writer)
+    if key not in _MATERIALIZE_FIELDS:
+        fl = filewriter.open_file(
+            filename, readonly=True, writer=WRITERS[writer])
+        node = fl.root()
+        for name in path.split("/"):
+            if name:
+                node = node.open(name)
+        _MATERIALIZE_FIELDS[key] = (fl, node)
+    node = _MATERIALIZE_FIELDS[key][1]
+    data = node[(slice(start, stop), Ellipsis)]
+    # h5cpp squeezes single-frame selections
+    return start, numpy.reshape(
+        data, (stop - start,) + tuple(node.shape[1:]))
+
+
+class Materializer(object):
+
+    """ Replace a virtual field with a chunked and compressed field
+    """
+
+    #: (:obj:`int`) approximate data size of one reading task in bytes
+    tasksize = 64 << 20
+
+    def __init__(self, nexusfilepath, compression=2, chunkframes=1,
+                 jobs=None, storeold=False, testmode=False, writer=None):
+        """ The constructor creates the materializer object
+
+        :param nexusfilepath: the nexus file name and nexus path
+        :type nexusfilepath: :obj:`str`
+        :param compression: compression rate
+        :type compression: :obj:`int`
+        :param chunkframes: number of frames in one chunk
+        :type chunkframes: :obj:`int`
+        :param jobs: number of reading processes
+        :type jobs: :obj:`int`
+        :param storeold: if backup the input file
+        :type storeold: :obj:`bool`
+        :param testmode: if run in a test mode
+        :type testmode: :obj:`bool`
+        :param writer: the writer name
+        :type writer: :obj:`str`
+        """
+        self.__nexusfilename, self.__nexuspath = \
+            nexusfilepath.split(":/")
+        self.__compression = compression
+        self.__chunkframes = max(1, chunkframes or 1)
+        self.__jobs = jobs or multiprocessing.cpu_count()
+        self.__storeold = storeold
+        self.__testmode = testmode
+        self.__writer = writer
+        self.__wrmodule = WRITERS[writer]
+        self.__tempfilename = self.__nexusfilename \
+            + ".__nxscollect_materialize__"
+        self.__progressfilename = self.__tempfilename + ".json"
+        self.__break = False
+        self.__siginfo = dict(
+            (signal.__dict__[sname], sname)
+            for sname in ('SIGINT', 'SIGHUP', 'SIGALRM', 'SIGTERM'))
+
+        for sig in self.__siginfo.keys():
+            signal.signal(sig, self._signalhandler)
+
+    def _signalhandler(self, sig, _):
+        """ signal handler
+
+        :param sig: signal name, i.e. 'SIGINT', 'SIGHUP', 'SIGALRM', 'SIGTERM'
+        :type sig: :obj:`str`
+        """
+        if sig in self.__siginfo.keys():
+            self.__break = True
+            print("terminated by %s" % self.__siginfo[sig])
+
+    def _storeoldfile(self):
+        """ makes back up of the input file
+        """
+        temp = self.__nexusfilename + ".__nxscollect_old__"
+        while os.path.exists(temp):
+            temp += "_"
+        shutil.move(self.__nexusfilename, temp)
+
+    def _readprogress(self, shape, dtype):
+        """ reads the number of already materialized frames
+
+        :param shape: field shape
+        :type shape: :obj:`list` <:obj:`int`>
+        :param dtype: field data type
+        :type dtype: :obj:`str`
+        :returns: number of materialized frames or None
+        :rtype: :obj:`int`
+        """
+        if not os.path.isfile(self.__tempfilename) or \
+           not os.path.isfile(self.__progressfilename):
+            return None
+        try:
+            with open(self.__progressfilename) as fl:
+                progress = json.load(fl)
+        except Exception:
+            return None
+        if progress.get("path") != self.__nexuspath or \
+           progress.get("shape") != list(shape) or \
+           progress.get("dtype") != dtype:
+            return None
+        return progress.get("frames")
+
+    def _writeprogress(self, shape, dtype, frames):
+        """ writes the number of materialized frames
+
+        :param shape: field shape
+        :type shape: :obj:`list` <:obj:`int`>
+        :param dtype: field data type
+        :type dtype: :obj:`str`
+        :param frames: number of materialized frames
+        :type frames: :obj:`int`
+        """
+        progress = {"path": self.__nexuspath, "shape": list(shape),
+                    "dtype": dtype, "frames": frames}
+        with open(self.__progressfilename + "_", "w") as fl:
+            json.dump(progress, fl)
+        os.rename(self.__progressfilename + "_", self.__progressfilename)
+
+    def _openfield(self, nxsfile):
+        """ opens the field and its parent group
+
+        :param nxsfile: nexus file
+        :type nxsfile: :class:`filewriter.FTFile`
+        :returns: parent group and the field
+        :rtype: :obj:`tuple` <:class:`filewriter.FTGroup`,
+                 :class:`filewriter.FTField`>
+        """
+        names = [name for name in self.__nexuspath.split("/") if name]
+        if not names:
+            raise ValueError("field path is missing")
+        parent = nxsfile.root()
+        for name in names[:-1]:
+            parent = parent.open(name.split(":")[0])
+        return parent, parent.open(names[-1])
+
+    def _createfield(self, parent, field, shape, dtype):
+        """ replaces the virtual field with the chunked field
+
+        :param parent: parent group
+        :type parent: :class:`filewriter.FTGroup`
+        :param field: virtual field
+        :type field: :class:`filewriter.FTField`
+        :param shape: field shape
+        :type shape: :obj:`list` <:obj:`int`>
+        :param dtype: field data type
+        :type dtype: :obj:`str`
+        :returns: chunked field
+        :rtype: :class:`filewriter.FTField`
+        """
+        name = field.name
+        attrs = [(at.name, at.dtype, at.shape, at.read())
+                 for at in field.attributes]
+        field.close()
+        parent.remove(name)
+        cfilter = None
+        if self.__compression:
+            opts = getcompression(self.__compression)
+            if isinstance(opts, int):
+                cfilter = filewriter.data_filter(parent)
+                cfilter.rate = opts
+            elif isinstance(opts, list) and opts:
+                cfilter = filewriter.data_filter(parent)
+                cfilter.filterid = opts[0]
+                cfilter.options = tuple(opts[1:])
+        chunk = [min(self.__chunkframes, shape[0]) or 1] + list(shape[1:])
+        field = parent.create_field(
+            name, dtype, shape=shape, chunk=chunk, dfilter=cfilter)
+        for atname, atdtype, atshape, value in attrs:
+            field.attributes.create(
+                atname, atdtype, atshape, overwrite=True)[...] = value
+        return field
+
+    def _tasks(self, shape, dtype, start):
+        """ provides chunk-aligned frame ranges to read
+
+        :param shape: field shape
+        :type shape: :obj:`list` <:obj:`int`>
+        :param dtype: field data type
+        :type dtype: :obj:`str`
+        :param start: first frame to read
+        :type start: :obj:`int`
+        :returns: reading tasks
+        :rtype: :obj:`list` <:obj:`tuple`>
+        """
+        framesize = int(numpy.prod(shape[1:])) * numpy.dtype(dtype).itemsize
+        chunks = max(
+            1, self.tasksize // max(1, framesize * self.__chunkframes))
+        step = chunks * self.__chunkframes
+        return [(self.__nexusfilename, self.__nexuspath, self.__writer,
+                 st, min(st + step, shape[0]))
+                for st in range(start, shape[0], step)]
+
+    def materialize(self):
+        """ materializes the virtual field
+        """
+        starttime = time.time()
+        nxsfile = filewriter.open_file(
+            self.__nexusfilename, readonly=True, writer=self.__wrmodule)
+        try:
+            _, field = self._openfield(nxsfile)
+            shape = [int(dm) for dm in field.shape]
+            dtype = _tostr(field.dtype)
+            virtual = getattr(field.h5object, "is_virtual", True)
+        finally:
+            nxsfile.close()
+        if not shape:
+            raise ValueError("%s://%s is a scalar field"
+                             % (self.__nexusfilename, self.__nexuspath))
+        done = self._readprogress(shape, dtype)
+        if done is None and not virtual:
+            raise ValueError("%s://%s is not a virtual field"
+                             % (self.__nexusfilename, self.__nexuspath))
+        print("materialize: %s://%s %s %s%s" % (
+            self.__nexusfilename, self.__nexuspath, shape, dtype,
+            " resumed at frame %s" % done if done else ""))
+        if self.__testmode:
+            return
+
+        frames = done or 0
+        tasks = self._tasks(shape, dtype, frames)
+        pool = None
+        stop = multiprocessing.Event()
+        if self.__jobs > 1 and len(tasks) > 1:
+            # workers are forked before the output file is opened
+            pool = multiprocessing.Pool(
+                min(self.__jobs, len(tasks)), _initworker, (stop,))
+        try:
+            if done is None:
+                shutil.copy2(self.__nexusfilename, self.__tempfilename)
+            nxsfile = filewriter.open_file(
+                self.__tempfilename, readonly=False,
+                writer=self.__wrmodule, access="frames")
+            try:
+                parent, field = self._openfield(nxsfile)
+                if done is None:
+                    field = self._createfield(parent, field, shape, dtype)
+                    nxsfile.flush()
+                    self._writeprogress(shape, dtype, frames)
+                if pool is not None:
+                    results = pool.imap(readhyperslab, tasks)
+                else:
+                    results = (readhyperslab(task) for task in tasks)
+                for start, data in results:
+                    field[(slice(start, start + data.shape[0]),
+                           Ellipsis)] = data
+                    nxsfile.flush()
+                    frames = start + data.shape[0]
+                    self._writeprogress(shape, dtype, frames)
+                    if self.__break:
+                        break
+                field.close()
+            finally:
+                nxsfile.close()
+        finally:
+            if pool is not None:
+                stop.set()
+                pool.terminate()
+                pool.join()
+            for fl, _ in _MATERIALIZE_FIELDS.values():
+                fl.close()
+            _MATERIALIZE_FIELDS.clear()
+
+        duration = time.time() - starttime
+        size = (frames - (done or 0)) * \
+            int(numpy.prod(shape[1:])) * numpy.dtype(dtype).itemsize
+        print("materialize: %s frames, %.1f MB in %.2f s (%.1f MB/s)" % (
+            frames - (done or 0), size / 1e6, duration,
+            size / 1e6 / duration if duration else 0))
+        if frames < shape[0]:
+            print("materialize: interrupted at frame %s of %s, "
+                  "run the command again to resume" % (frames, shape[0]))
+            return
+        if self.__storeold:
+            self._storeoldfile()
+        shutil.move(self.__tempfilename, self.__nexusfilename)
+        os.remove(self.__progressfilename)
 
 
 class Collector(object):
@@ -686,7 +1460,8 @@ class Collector(object):
 
     def __init__(self, nexusfilename, compression=2,
                  skipmissing=False, storeold=False, testmode=False,
-                 writer=None):
+                 writer=None, chunkbytes=None, keepinterrupted=True,
+                 checkpoint=False, compressionjobs=0, stats=None):
         """ The constructor creates the collector object
 
         :param nexusfilename: the nexus file name
@@ -701,9 +1476,33 @@ class Collector(object):
         :type testmode: :obj:`bool`
         :param writer: the writer module
         :type writer: :obj:`str`
+        :param chunkbytes: target chunk size in bytes of new fields,
+                           one image per chunk if None
+        :type chunkbytes: :obj:`int`
+        :param keepinterrupted: if store images collected
+                                before an interruption
+        :type keepinterrupted: :obj:`bool`
+        :param checkpoint: if keep a checkpoint of interrupted or failed
+                           collection and resume from it
+        :type checkpoint: :obj:`bool`
+        :param compressionjobs: number of threads or processes compressing
+                                images of new fields, compression by
+                                the HDF5 library if 0
+        :type compressionjobs: :obj:`int`
+        :param stats: format of printed statistics, i.e. table or json
+        :type stats: :obj:`str`
         """
         self.__nexusfilename = nexusfilename
         self.__compression = compression
+        self.__chunkbytes = chunkbytes
+        self.__compressionjobs = compressionjobs
+        self.__statsformat = stats
+        #: (:class:`Statistics`) collection statistics
+        self.stats = Statistics("append %s" % nexusfilename)
+        self.__keepinterrupted = keepinterrupted
+        self.__checkpoint = checkpoint and not testmode
+        self.__progressfilename = None
+        self.__progress = None
         self.__skipmissing = skipmissing
         self.__testmode = testmode
         self.__storeold = storeold
@@ -748,6 +1547,88 @@ class Collector(object):
             temp += "_"
         shutil.move(self.__nexusfilename, temp)
 
+    def _masterstamp(self):
+        """ provides size and modification time of the input file
+
+        :returns: size and modification time
+        :rtype: :obj:`list` <:obj:`float`>
+        """
+        stat = os.stat(self.__nexusfilename)
+        return [stat.st_size, stat.st_mtime]
+
+    def _opencheckpoint(self):
+        """ reuses the checkpoint file of the unchanged input file
+        or creates a new one
+        """
+        self.__tempfilename = self.__nexusfilename \
+            + ".__nxscollect_checkpoint__"
+        self.__progressfilename = self.__tempfilename + ".json"
+        stamp = self._masterstamp()
+        self.__progress = None
+        if os.path.isfile(self.__tempfilename) and \
+           os.path.isfile(self.__progressfilename):
+            try:
+                with open(self.__progressfilename) as fl:
+                    progress = json.load(fl)
+                if progress.get("master") == stamp:
+                    filewriter.open_file(
+                        self.__tempfilename, readonly=True,
+                        writer=self.__wrmodule).close()
+                    self.__progress = progress
+            except Exception:
+                pass
+        if self.__progress is None:
+            self.__progress = {"master": stamp, "fields": {}}
+            shutil.copy2(self.__nexusfilename, self.__tempfilename)
+            self._writecheckpoint()
+        else:
+            print("resume: %s" % self.__tempfilename)
+
+    def _writecheckpoint(self):
+        """ writes the collection progress
+        """
+        with open(self.__progressfilename + "_", "w") as fl:
+            json.dump(self.__progress, fl)
+        os.rename(self.__progressfilename + "_", self.__progressfilename)
+
+    def _closecheckpoint(self, done):
+        """ removes the collection progress of the finished collection
+        or keeps the checkpoint file for the next run
+
+        :param done: if the collection was finished
+        :type done: :obj:`bool`
+        """
+        if done:
+            os.remove(self.__progressfilename)
+        else:
+            print("checkpoint: %s, run the command again to resume"
+                  % self.__tempfilename)
+
+    @classmethod
+    def _sourceshash(cls, files, datatype, shape):
+        """ provides a hash of the image source parameters
+
+        :param files: a list of file strings
+        :type files: :obj:`list` <:obj:`str`>
+        :param datatype: field data type
+        :type datatype: :obj:`str`
+        :param shape: field shape
+        :type shape: :obj:`list` <:obj:`int` >
+        :returns: source hash
+        :rtype: :obj:`str`
+        """
+        return hashlib.sha1(json.dumps(
+            [list(files), datatype, shape]).encode()).hexdigest()
+
+    @property
+    def interrupted(self):
+        """ if the collection was interrupted by a signal
+
+        :returns: interrupted flag
+        :rtype: :obj:`bool`
+        """
+        return self.__break
+
     @classmethod
     def _absolutefilename(cls, filename, masterfile):
         """ provides absolute image file name
@@ -994,6 +1875,9 @@ class Collector(object):
                 else:
                     nshape = [0, shape[0]]
                     nchunk = [1, shape[0]]
+                if self.__chunkbytes:
+                    nchunk = filewriter.auto_chunk(
+                        nshape, dtype, self.__chunkbytes)
                 field = node.create_field(
                     fieldname,
                     dtype,
@@ -1003,6 +1887,69 @@ class Collector(object):
                 self._addattr(field, fieldattrs)
             return field
 
+    def _getcompressor(self, field, dtype, fieldcompression):
+        """ provides a compressor of images for a new field
+        with one image per chunk
+
+        :param field: new hdf5 field
+        :type field: :class:`filewriter.FTField`
+        :param dtype: field data type
+        :type dtype: :obj:`str`
+        :param fieldcompression: field compression rate
+        :type fieldcompression: :obj:`int`
+        :returns: chunk compressor or None
+        :rtype: :class:`nxstools.chunkcompressor.ChunkCompressor`
+        """
+        if not field or self.__testmode or self.__chunkbytes or \
+           not self.__compressionjobs or not fieldcompression:
+            return None
+        opts = getcompression(fieldcompression)
+        if not ChunkCompressor.supported(opts, dtype):
+            return None
+        return ChunkCompressor(opts, dtype, self.__compressionjobs)
+
+    def _writechunks(self, field, chunks):
+        """ appends compressed images to the field
+
+        :param field: hdf5 field
+        :type field: :class:`filewriter.FTField`
+        :param chunks: compressed images with their filter masks
+        :type chunks: :obj:`list` <:obj:`tuple` <:obj:`bytes`, :obj:`int`>>
+        """
+        if chunks:
+            framebytes = int(numpy.prod(field.shape[1:])) * \
+                numpy.dtype(field.dtype).itemsize
+            with self.stats.stage("write"):
+                start = field.shape[0]
+                offset = [0] * len(field.shape)
+                field.grow(0, len(chunks))
+                for data, mask in chunks:
+                    offset[0] = start
+                    field.write_chunk(offset, data, mask)
+                    start += 1
+                    self.stats.add("bytes_written", framebytes)
+                    self.stats.add("bytes_compressed", len(data))
+            self.stats.add("frames", len(chunks))
+            with self.stats.stage("flush"):
+                self.__nxsfile.flush()
+
+    def _updateprogress(self, fprogress, marks, frames):
+        """ stores progress of inputs with all images written
+
+        :param fprogress: field progress
+        :type fprogress: :obj:`dict` <:obj:`str`, `any`>
+        :param marks: (inputs, frames) after the loaded inputs
+        :type marks: :class:`collections.deque`
+        :param frames: number of written images
+        :type frames: :obj:`int`
+        """
+        mark = None
+        while marks and marks[0][1] <= frames:
+            mark = marks.popleft()
+        if mark is not None:
+            fprogress["inputs"], fprogress["frames"] = mark
+            self._writecheckpoint()
+
     def _collectimages(self, files, node, fieldname=None, fieldattrs=None,
                        fieldcompression=None, datatype=None, shape=None):
         """ collects images
@@ -1025,118 +1972,165 @@ class Collector(object):
         """
         fieldname = fieldname or "data"
         field = None
+        compressor = None
+        marks = collections.deque()
         ind = 0
-        for filestr in files:
-            if self.__break:
-                break
-            inputfiles = filegenerator(filestr, self.__filepattern)
-            for fname in inputfiles():
+        inputs = 0
+        skip = 0
+        fprogress = None
+        if self.__checkpoint and node is not None:
+            sources = self._sourceshash(files, datatype, shape)
+            fprogress = self.__progress["fields"].setdefault(
+                "%s/%s" % (node.path, fieldname), {})
+            if fprogress.get("sources") == sources and \
+               fieldname in node.names():
+                field = node.open(fieldname)
+                if field.shape[0] == fprogress.get("frames"):
+                    skip = fprogress["inputs"]
+                    ind = fprogress["frames"]
+                else:
+                    field = None
+            fprogress.update({"sources": sources, "inputs": skip,
+                              "frames": ind})
+        try:
+            for filestr in files:
                 if self.__break:
                     break
-                npath = None
-                if not datatype and \
-                   ".h5://" in fname or ".nxs://" in fname:
-                    fname, npath = fname.split("://", 1)
-                if not self.__testmode or node is not None:
-                    fname = self._findfile(fname, node.name)
-                if not fname:
-                    continue
-                if datatype:
-                    data, dtype, shape = self._loadrawimage(
-                        fname, datatype, shape)
-                elif fname.endswith(".h5") or fname.endswith(".nxs"):
-                    try:
-                        data, dtype, shape = self._loadh5data(fname, npath)
-                    except Exception as e:
-                        print(str(e))
-                        data, dtype, shape = self._loadimage(fname)
-                else:
-                    data, dtype, shape = self._loadimage(fname)
-                if data is not None:
-                    ishape = shape
-                    nrim = 1
-                    if len(shape) == 3:
-                        ishape = [shape[1], shape[2]]
-                        nrim = shape[0]
-                    if field is None:
-                        if not self.__testmode or node is not None:
-                            field = self._getfield(
-                                node, fieldname, dtype, ishape,
-                                fieldattrs, fieldcompression)
-                    if field and ind == field.shape[0]:
-                        if not self.__testmode:
-                            if nrim == 1:
-                                field.grow(0, 1)
-                                field[-1, ...] = data
+                inputfiles = filegenerator(filestr, self.__filepattern)
+                for fname in inputfiles():
+                    if self.__break:
+                        break
+                    inputs += 1
+                    if inputs <= skip:
+                        continue
+                    npath = None
+                    if not datatype and \
+                       ".h5://" in fname or ".nxs://" in fname:
+                        fname, npath = fname.split("://", 1)
+                    if not self.__testmode or node is not None:
+                        with self.stats.stage("find"):
+                            fname = self._findfile(fname, node.name)
+                    if not fname:
+                        if fprogress is not None:
+                            marks.append((inputs, ind))
+                            self._updateprogress(
+                                fprogress, marks, ind - (
+                                    compressor.pending if compressor
+                                    else 0))
+                        continue
+                    with self.stats.stage("load"):
+                        if datatype:
+                            data, dtype, shape = self._loadrawimage(
+                                fname, datatype, shape)
+                        elif fname.endswith(".h5") or \
+                                fname.endswith(".nxs"):
+                            try:
+                                data, dtype, shape = self._loadh5data(
+                                    fname, npath)
+                            except Exception as e:
+                                print(str(e))
+                                data, dtype, shape = self._loadimage(fname)
+                        else:
+                            data, dtype, shape = self._loadimage(fname)
+                    if data is not None:
+                        self.stats.add("files")
+                        self.stats.add("bytes_read", data.nbytes)
+                        ishape = shape
+                        nrim = 1
+                        if len(shape) == 3:
+                            ishape = [shape[1], shape[2]]
+                            nrim = shape[0]
+                        if field is None:
+                            if not self.__testmode or node is not None:
+                                created = fieldname not in node.names()
+                                field = self._getfield(
+                                    node, fieldname, dtype, ishape,
+                                    fieldattrs, fieldcompression)
+                                if created:
+                                    compressor = self._getcompressor(
+                                        field, dtype, fieldcompression)
+                        written = field.shape[0] if field else 0
+                        if compressor is not None:
+                            written += compressor.pending
+                        if field and ind == written:
+                            if compressor is not None:
+                                frames = numpy.reshape(
+                                    data, [nrim] + list(ishape))
+                                if list(frames.shape[1:]) != \
+                                   list(field.shape[1:]):
+                                    raise ValueError(
+                                        "Image shape %s of %s does not fit"
+                                        " to the field shape %s" % (
+                                            list(shape), fname,
+                                            list(field.shape)))
+                                for frame in frames:
+                                    with self.stats.stage("compress"):
+                                        chunks = compressor.put(frame[None])
+                                    self._writechunks(field, chunks)
+                            elif not self.__testmode:
+                                with self.stats.stage("write"):
+                                    if nrim == 1:
+                                        field.grow(0, 1)
+                                        field[-1, ...] = data
+                                    else:
+                                        field.grow(0, nrim)
+                                        field[field.shape[0]-nrim:, ...] = \
+                                            data
+                                self.stats.add("frames", nrim)
+                                self.stats.add("bytes_written", data.nbytes)
                             else:
-                                field.grow(0, nrim)
-                                field[field.shape[0]-nrim:, ...] = data
-                        print(" * append %s " % (fname))
-                    ind += nrim
-                    if not self.__testmode:
-                        self.__nxsfile.flush()
-
-    def _inspect(self, parent, collection=False):
-        """ collects recursively the all image files defined
-        by hdf5 postrun fields bellow hdf5 parent node
-
-        :param parent: hdf5 parent node
-        :type parent: :class:`filewriter.FTGroup` or \
-                      :class:`filewriter.FTLink`
-        :param collection: if parent is of NXcollection type
-        :type collection: :obj:`bool`
-        """
-        if hasattr(parent, "names"):
-            if collection:
-                if "postrun" in parent.names():
-                    inputfiles = parent.open("postrun")
-                    files = inputfiles.read()
-                    if hasattr(files, "tolist"):
-                        files = files.tolist()
-                    if isinstance(files, (str, unicode)):
-                        files = [files]
-                    fieldname = "data"
-                    fielddtype = None
-                    fieldshape = None
-                    fieldattrs = {}
-                    fieldcompression = None
-                    for at in inputfiles.attributes:
-                        if at.name == "fieldname":
-                            fieldname = filewriter.first(at.read())
-                        elif at.name == "fieldcompression":
-                            fieldcompression = filewriter.first(at.read())
-                        elif at.name == "fielddtype":
-                            fielddtype = filewriter.first(at.read())
-                        elif at.name == "fieldshape":
-                            fieldshape = json.loads(
-                                filewriter.first(at.read()))
-                        elif at.name.startswith("fieldattr_"):
-                            atname = at.name[10:]
-                            if atname:
-                                fieldattrs[atname] = (
-                                    at.read(), at.dtype, at.shape
-                                )
-                    print("populate: %s/%s with %s" % (
-                        parent.parent.path, fieldname, files))
-                    if fieldcompression is None:
-                        fieldcompression = self.__compression
-                    self._collectimages(
-                        files, parent.parent, fieldname, fieldattrs,
-                        fieldcompression, fielddtype, fieldshape)
-            try:
-                names = parent.names()
-            except Exception:
-                names = []
-            for name in names:
-                coll = False
-                child = parent.open(name)
-                if hasattr(child, "attributes"):
-                    for at in child.attributes:
-                        if at.name == "NX_class":
-                            gtype = filewriter.first(at.read())
-                            if gtype == 'NXcollection':
-                                coll = True
-                    self._inspect(child, coll)
+                                self.stats.add("frames", nrim)
+                            print(" * append %s " % (fname))
+                        elif self.__testmode and field is None:
+                            self.stats.add("frames", nrim)
+                        ind += nrim
+                        if not self.__testmode and compressor is None:
+                            with self.stats.stage("flush"):
+                                self.__nxsfile.flush()
+                    if fprogress is not None:
+                        marks.append((inputs, ind))
+                        self._updateprogress(
+                            fprogress, marks, ind - (
+                                compressor.pending if compressor else 0))
+            if compressor is not None:
+                with self.stats.stage("compress"):
+                    chunks = compressor.ready(wait=True)
+                self._writechunks(field, chunks)
+                if fprogress is not None:
+                    self._updateprogress(fprogress, marks, ind)
+        except Exception:
+            if compressor is not None and fprogress is not None:
+                # keeps the loaded images in the checkpoint
+                self._writechunks(field, compressor.ready(wait=True))
+                self._updateprogress(fprogress, marks, field.shape[0])
+            raise
+        finally:
+            if compressor is not None:
+                compressor.close()
+
+    def _inspect(self, root):
+        """ collects the all image files defined
+        by hdf5 postrun fields of NXcollection groups,
+        soft and external links are not followed (see :func:`postruntasks`)
+
+        :param root: hdf5 root node
+        :type root: :class:`filewriter.FTGroup`
+        """
+        for task in postruntasks(root):
+            if self.__break:
+                break
+            parent = root
+            for name in task["path"].split("/"):
+                if name:
+                    parent = parent.open(name)
+            print("populate: %s/%s with %s" % (
+                parent.path, task["fieldname"], task["files"]))
+            fieldcompression = task["compression"]
+            if fieldcompression is None:
+                fieldcompression = self.__compression
+            self._collectimages(
+                task["files"], parent, task["fieldname"], task["attrs"],
+                fieldcompression, task["dtype"], task["shape"])
 
     def _add(self, root, path, inputfiles, fieldtype=None, fieldshape=None):
         """appends specific data if path and inputfiles are given
@@ -1197,12 +2191,19 @@ class Collector(object):
         :type datatype: :obj:`str`
         :param shape: field shape
         :type shape: :obj:`list` <:obj:`int` >
+        :returns: if the collection was completed
+        :rtype: :obj:`bool`
         """
-        self._createtmpfile()
+        with self.stats.stage("copy"):
+            if self.__checkpoint:
+                self._opencheckpoint()
+            else:
+                self._createtmpfile()
         try:
-            self.__nxsfile = filewriter.open_file(
-                self.__tempfilename, readonly=self.__testmode,
-                writer=self.__wrmodule)
+            with self.stats.stage("open"):
+                self.__nxsfile = filewriter.open_file(
+                    self.__tempfilename, readonly=self.__testmode,
+                    writer=self.__wrmodule, access="frames")
             root = self.__nxsfile.root()
             try:
                 self.__fullfilename = filewriter.first(
@@ -1214,13 +2215,246 @@ class Collector(object):
                 self._add(root, path, inputfiles, datatype, shape)
             else:
                 self._inspect(root)
-            self.__nxsfile.close()
-            if self.__storeold:
-                self._storeoldfile()
-            shutil.move(self.__tempfilename, self.__nexusfilename)
+            with self.stats.stage("close"):
+                self.__nxsfile.close()
+            if self.__break and self.__checkpoint:
+                self._closecheckpoint(False)
+                return False
+            if self.__break and not self.__keepinterrupted:
+                os.remove(self.__tempfilename)
+                return False
+            with self.stats.stage("store"):
+                if self.__storeold:
+                    self._storeoldfile()
+                shutil.move(self.__tempfilename, self.__nexusfilename)
+            if self.__checkpoint:
+                self._closecheckpoint(True)
+            return not self.__break
         except Exception as e:
             print(str(e))
-            os.remove(self.__tempfilename)
+            if self.__checkpoint:
+                try:
+                    self.__nxsfile.close()
+                except Exception:
+                    pass
+                self._closecheckpoint(False)
+            else:
+                os.remove(self.__tempfilename)
+            return False
+        finally:
+            self.stats.stop()
+            if self.__statsformat:
+                print(self.stats.report(self.__statsformat))
+
+
+class _LineOutput(object):
+
+    """ stdout replacement which sends complete lines to a queue
+    """
+
+    def __init__(self, queue, name):
+        """ constructor
+
+        :param queue: output queue
+        :type queue: :class:`multiprocessing.Queue`
+        :param name: name of the output source
+        :type name: :obj:`str`
+        """
+        self.__queue = queue
+        self.__name = name
+        self.__buffer = ""
+
+    def write(self, text):
+        """ writes the text
+
+        :param text: output text
+        :type text: :obj:`str`
+        """
+        lines = (self.__buffer + text).split("\n")
+        self.__buffer = lines.pop()
+        for line in lines:
+            self.__queue.put((self.__name, line))
+
+    def flush(self):
+        """ sends the incomplete line
+        """
+        if self.__buffer:
+            self.__queue.put((self.__name, self.__buffer))
+            self.__buffer = ""
+
+
+#: (:obj:`dict` <:obj:`int`, :obj:`str`>) collection status
+#:    of the worker exit codes
+COLLECT_STATUS = {
+    0: "collected",
+    1: "failed",
+    2: "interrupted",
+}
+
+
+def _collectfile(queue, nexusfilename, options, args):
+    """ collects images of one master file in a worker process
+
+    :param queue: output queue
+    :type queue: :class:`multiprocessing.Queue`
+    :param nexusfilename: the nexus file name
+    :type nexusfilename: :obj:`str`
+    :param options: collector constructor parameters
+    :type options: :obj:`dict` <:obj:`str`, `any`>
+    :param args: collect parameters
+    :type args: :obj:`tuple`
+    """
+    sys.stdout = _LineOutput(queue, nexusfilename)
+    status = 1
+    try:
+        collector = Collector(
+            nexusfilename, keepinterrupted=False, **options)
+        if collector.collect(*args):
+            status = 0
+        elif collector.interrupted:
+            status = 2
+    except Exception as e:
+        print(str(e))
+    finally:
+        sys.stdout.flush()
+    sys.exit(status)
+
+
+class ParallelCollector(object):
+
+    """ Collector of master files in parallel worker processes
+    """
+
+    def __init__(self, nexusfilenames, jobs, **options):
+        """ The constructor creates the parallel collector object
+
+        :param nexusfilenames: the nexus file names
+        :type nexusfilenames: :obj:`list` <:obj:`str`>
+        :param jobs: number of worker processes
+        :type jobs: :obj:`int`
+        :param options: collector constructor parameters
+        :type options: :obj:`dict` <:obj:`str`, `any`>
+        """
+        self.__nexusfilenames = nexusfilenames
+        self.__jobs = max(1, jobs)
+        self.__options = options
+        self.__break = False
+        #: (:obj:`collections.OrderedDict` <:obj:`str`, :obj:`str`>)
+        #:    collection status of the nexus files
+        self.status = collections.OrderedDict(
+            (fname, "skipped") for fname in nexusfilenames)
+        self.__siginfo = dict(
+            (signal.__dict__[sname], sname)
+            for sname in ('SIGINT', 'SIGHUP', 'SIGALRM', 'SIGTERM'))
+
+        for sig in self.__siginfo.keys():
+            signal.signal(sig, self._signalhandler)
+
+    def _signalhandler(self, sig, _):
+        """ signal handler
+
+        :param sig: signal name, i.e. 'SIGINT', 'SIGHUP', 'SIGALRM', 'SIGTERM'
+        :type sig: :obj:`str`
+        """
+        if sig in self.__siginfo.keys():
+            self.__break = True
+            print("terminated by %s" % self.__siginfo[sig])
+
+    @classmethod
+    def _tmpfiles(cls, nexusfilename):
+        """ provides temporary files of the nexus file
+
+        :param nexusfilename: the nexus file name
+        :type nexusfilename: :obj:`str`
+        :returns: temporary file names
+        :rtype: :obj:`set` <:obj:`str`>
+        """
+        return set(glob.glob(
+            glob.escape(nexusfilename) + ".__nxscollect_temp__*")
+            if hasattr(glob, "escape") else
+            glob.glob(nexusfilename + ".__nxscollect_temp__*"))
+
+    @classmethod
+    def _relay(cls, queue, timeout=None):
+        """ prints output lines of the workers
+
+        :param queue: output queue
+        :type queue: :class:`multiprocessing.Queue`
+        :param timeout: waiting time for the first line in seconds
+        :type timeout: :obj:`float`
+        """
+        block = timeout is not None
+        while True:
+            try:
+                name, line = queue.get(block, timeout)
+            except Queue.Empty:
+                break
+            print("%s: %s" % (name, line))
+            block = False
+
+    def collect(self, path=None, inputfiles=None, datatype=None, shape=None):
+        """ collects the master files in worker processes
+
+        :param path: nexus path of the data field
+        :type path: :obj:`str`
+        :param inputfiles: a list of file strings
+        :type inputfiles: :obj:`list` <:obj:`str`>
+        :param datatype: field data type
+        :type datatype: :obj:`str`
+        :param shape: field shape
+        :type shape: :obj:`list` <:obj:`int` >
+        :returns: if all files were collected
+        :rtype: :obj:`bool`
+        """
+        starttime = time.time()
+        queue = multiprocessing.Queue()
+        pending = list(self.__nexusfilenames)
+        running = []
+        terminated = False
+        args = (path, inputfiles, datatype, shape)
+        while pending or running:
+            while pending and len(running) < self.__jobs \
+                    and not self.__break:
+                fname = pending.pop(0)
+                process = multiprocessing.Process(
+                    target=_collectfile,
+                    args=(queue, fname, self.__options, args))
+                running.append(
+                    (process, fname, self._tmpfiles(fname)))
+                process.start()
+            if self.__break and not terminated:
+                terminated = True
+                pending = []
+                for process, _, _ in running:
+                    process.terminate()
+            self._relay(queue, 0.1)
+            for task in list(running):
+                process, fname, tmpfiles = task
+                if process.is_alive():
+                    continue
+                process.join()
+                self._relay(queue)
+                running.remove(task)
+                if process.exitcode in COLLECT_STATUS:
+                    self.status[fname] = COLLECT_STATUS[process.exitcode]
+                else:
+                    self.status[fname] = "interrupted" \
+                        if process.exitcode < 0 else "failed"
+                    for tmpfile in self._tmpfiles(fname) - tmpfiles:
+                        os.remove(tmpfile)
+                print("append: %s %s (exit status %s)" % (
+                    fname, self.status[fname], process.exitcode))
+        self._relay(queue)
+
+        counts = collections.Counter(self.status.values())
+        print("append: %s files in %.2f s: %s" % (
+            len(self.status), time.time() - starttime,
+            ", ".join("%s %s" % (counts[st], st) for st in
+                      ["collected", "failed", "interrupted", "skipped"])))
+        for fname, status in self.status.items():
+            if status != "collected":
+                print("append: %s %s" % (status, fname))
+        return counts["collected"] == len(self.status)
 
 
 class VDS(Runner):
@@ -1272,6 +2506,17 @@ class VDS(Runner):
         + "                merged in their the first dimension " \
         + "with interlaying frames\n" \
         + "                and unlimited first dimension\n" \
+        + "\n\n\n" \
+        + "       nxscollect vds " \
+        + "scan_234.nxs://entry/instrument/eiger/data " \
+        + " --target-fields 'eiger_%05d.nxs://entry/data/data:1:5000'" \
+        + " --auto --probe-cache eiger_probes.json \n\n" \
+        + "\n" \
+        + "           - creates VDS of" \
+        " 5000 nexus files with different frame numbers" \
+        + " merged in their first dimension,\n" \
+        + "               shapes and types of target fields" \
+        + " are read from their metadata\n" \
         + "\n\n" \
         + "\n"
 
@@ -1401,11 +2646,40 @@ class VDS(Runner):
             "and different fields separated by ';'  or spaces e.g."
             " ':,0:50,: :,0:50,:' "
             "where U means span along the layout ")
+        parser.add_argument(
+            "-a", "--auto", action="store_true",
+            default=False, dest="auto",
+            help="read shapes and types of target fields and stack them "
+            "along the --axis dimension. The --shape, --dtype, "
+            "--shapes and --offsets options are not required")
+        parser.add_argument(
+            "--axis", dest="axis",
+            action="store", type=int, default=0,
+            help="stacking dimension of target fields in the auto mode "
+            "(default: 0)")
+        parser.add_argument(
+            "-j", "--jobs", dest="jobs",
+            action="store", type=int, default=None,
+            help="number of processes probing target fields "
+            "in the auto mode (default: number of CPUs)")
+        parser.add_argument(
+            "--probe-cache", dest="probecache",
+            action="store", type=str, default=None,
+            help="json file with cached shapes and types of target fields "
+            "used in the auto mode")
         parser.add_argument(
             "-r", "--replace-nexus-file", action="store_true",
             default=False, dest="replaceold",
             help="if it is set the old file is not copied into "
             "a file with .__nxscollect__old__* extension")
+        parser.add_argument(
+            "--stats", action="store_const", const="table",
+            default=None, dest="stats",
+            help="print a table with times of stages and sizes of data")
+        parser.add_argument(
+            "--stats-json", action="store_const", const="json",
+            dest="stats",
+            help="print times of stages and sizes of data in json")
         parser.add_argument(
             "--test", action="store_true",
             default=False, dest="testmode",
@@ -1449,13 +2723,13 @@ class VDS(Runner):
             print("")
             sys.exit(0)
 
-        if options.shape is None:
+        if options.shape is None and not options.auto:
             sys.stderr.write("nxscollect: shape is missing\n")
             parser.print_help()
             print("")
             sys.exit(0)
 
-        if options.shapes is None:
+        if options.shapes is None and not options.auto:
             sys.stderr.write("nxscollect: shapes is missing\n")
             parser.print_help()
             print("")
@@ -1479,11 +2753,137 @@ class VDS(Runner):
             sys.exit(255)
 
         # configuration server
-        vds = VirtualDataset(
-            nexusfilepath, options, writer=writer)
+        try:
+            vds = VirtualDataset(
+                nexusfilepath, options, writer=writer)
+        except ValueError as e:
+            sys.stderr.write("nxscollect: %s\n" % str(e))
+            sys.stderr.flush()
+            sys.exit(255)
         vds.create()
 
 
+class Materialize(Runner):
+
+    """ Materialize runner
+    """
+
+    #: (:obj:`str`) command description
+    description = "replace a virtual dataset with a chunked " \
+        "and compressed field"
+    #: (:obj:`str`) command epilog
+    epilog = "" \
+        + " examples:\n\n" \
+        + "       nxscollect materialize " \
+        + "scan_234.nxs://entry/instrument/eiger/data -j 8\n\n" \
+        + "           - reads the VDS with 8 processes and replaces it" \
+        + " by a field compressed with deflate level 2,\n" \
+        + "               interrupted runs are resumed" \
+        + " when the command is executed again\n" \
+        + "\n" \
+        + "       nxscollect materialize " \
+        + "scan_234.nxs://entry/instrument/eiger/data -c32008:0,2 -k 10\n\n" \
+        + "           - replaces the VDS by a field with 10 frames" \
+        + " in a chunk compressed with bitshuffle/lz4\n" \
+        + "\n"
+
+    def create(self):
+        """ creates parser
+        """
+        parser = self._parser
+        parser.add_argument(
+            "-c", "--compression", dest="compression",
+            action="store", type=str, default="2",
+            help="deflate compression rate from 0 to 9 (default: 2)"
+            " or <filterid>:opt1,opt2,..."
+            " e.g.  -c 32008:0,2  for bitshuffle with lz4")
+        parser.add_argument(
+            "-k", "--chunk-frames", dest="chunkframes",
+            action="store", type=int, default=1,
+            help="number of frames in one chunk (default: 1)")
+        parser.add_argument(
+            "-j", "--jobs", dest="jobs",
+            action="store", type=int, default=None,
+            help="number of processes reading the virtual dataset"
+            " (default: number of CPUs)")
+        parser.add_argument(
+            "-r", "--replace-nexus-file", action="store_true",
+            default=False, dest="replaceold",
+            help="if it is set the old file is not copied into "
+            "a file with .__nxscollect__old__* extension")
+        parser.add_argument(
+            "--test", action="store_true",
+            default=False, dest="testmode",
+            help="execute in the test mode")
+        parser.add_argument(
+            "--h5cpp", action="store_true",
+            default=False, dest="h5cpp",
+            help="use h5cpp module as a nexus reader")
+        parser.add_argument(
+            "--h5py", action="store_true",
+            default=False, dest="h5py",
+            help="use h5py module as a nexus reader/writer")
+
+    def postauto(self):
+        """ creates parser
+        """
+        parser = self._parser
+        parser.add_argument(
+            'args', metavar='nexus_file_path_field',
+            type=str, nargs='?',
+            help='nexus file with the nexus path of the VDS field')
+
+    def run(self, options):
+        """ the main program function
+
+        :param options: parser options
+        :type options: :class:`argparse.Namespace`
+        """
+        parser = self._parser
+        nexusfilepath = options.args
+
+        try:
+            getcompression(options.compression)
+        except Exception as e:
+            print(str(e))
+            parser.print_help()
+            print("")
+            sys.exit(0)
+
+        if not nexusfilepath or ":/" not in nexusfilepath:
+            parser.print_help()
+            print("")
+            sys.exit(0)
+
+        if options.h5cpp:
+            writer = "h5cpp"
+        elif options.h5py:
+            writer = "h5py"
+        elif "h5cpp" in WRITERS.keys():
+            writer = "h5cpp"
+        else:
+            writer = "h5py"
+
+        if (options.h5py and options.h5cpp) or \
+           writer not in WRITERS.keys():
+            sys.stderr.write("nxscollect: Writer '%s' cannot be opened\n"
+                             % writer)
+            sys.stderr.flush()
+            parser.print_help()
+            sys.exit(255)
+
+        materializer = Materializer(
+            nexusfilepath, options.compression, options.chunkframes,
+            options.jobs, not options.replaceold, options.testmode,
+            writer=writer)
+        try:
+            materializer.materialize()
+        except (ValueError, KeyError, IOError) as e:
+            sys.stderr.write("nxscollect: %s\n" % str(e))
+            sys.stderr.flush()
+            sys.exit(255)
+
+
 class Link(Runner):
 
     """ Execute runner
@@ -1518,6 +2918,14 @@ class Link(Runner):
             default=False, dest="replaceold",
             help="if it is set the old file is not copied into "
             "a file with .__nxscollect__old__* extension")
+        parser.add_argument(
+            "--stats", action="store_const", const="table",
+            default=None, dest="stats",
+            help="print a table with times of stages and sizes of data")
+        parser.add_argument(
+            "--stats-json", action="store_const", const="json",
+            dest="stats",
+            help="print times of stages and sizes of data in json")
         parser.add_argument(
             "--test", action="store_true",
             default=False, dest="testmode",
@@ -1574,7 +2982,8 @@ class Link(Runner):
         # configuration server
         linker = Linker(
             nexusfilepath, options.target, options.name,
-            not options.replaceold, options.testmode, writer=writer)
+            not options.replaceold, options.testmode, writer=writer,
+            stats=options.stats)
         linker.link()
 
 
@@ -1591,6 +3000,11 @@ class Execute(Runner):
         + "       nxscollect append -c1 /tmp/gpfs/raw/scan_234.nxs \n\n" \
         + "       nxscollect append -c32008:0,2 /ramdisk/scan_123.nxs \n\n" \
         + "       nxscollect append --test /tmp/gpfs/raw/scan_234.nxs \n\n" \
+        + "       nxscollect append -j 8 /tmp/gpfs/raw/scan_*.nxs \n\n" \
+        + "       nxscollect append -c32008:0,2 --compression-jobs 8" \
+        + " /ramdisk/scan_123.nxs \n\n" \
+        + "       nxscollect append --checkpoint /tmp/gpfs/raw/scan_234.nxs" \
+        + " \n\n" \
         + "       nxscollect append scan_234.nxs " \
         + "--path /scan/instrument/pilatus/data  " \
         + "--input-files 'scan_%05d.tif:0:100' "\
@@ -1631,6 +3045,30 @@ class Execute(Runner):
             action="store", type=str, default=None,
             help="shape of input data - only for raw data,"
             " e.g. '[4096,2048]'")
+        parser.add_argument(
+            "--chunk-bytes", dest="chunkbytes",
+            action="store", type=int, default=None,
+            help="target chunk size in bytes of new fields "
+            "(default: one image per chunk)")
+        parser.add_argument(
+            "-j", "--jobs", dest="jobs",
+            action="store", type=int, default=1,
+            help="number of nexus files collected in parallel processes,"
+            " files of interrupted processes are not changed"
+            " and the command exits with status 1 if any file"
+            " is not collected (default: 1)")
+        parser.add_argument(
+            "--compression-jobs", dest="compressionjobs",
+            action="store", type=int, default=0,
+            help="number of threads or processes compressing images"
+            " of new fields with one image per chunk before their"
+            " direct chunk write, compression by the HDF5 library"
+            " if 0 (default: 0)")
+        parser.add_argument(
+            "--checkpoint", action="store_true",
+            default=False, dest="checkpoint",
+            help="keep the partially collected file of an interrupted"
+            " or failed run and resume from it in the next run")
         parser.add_argument(
             "-s", "--skip-missing", action="store_true",
             default=False, dest="skipmissing",
@@ -1640,6 +3078,14 @@ class Execute(Runner):
             default=False, dest="replaceold",
             help="if it is set the old file is not copied into "
             "a file with .__nxscollect__old__* extension")
+        parser.add_argument(
+            "--stats", action="store_const", const="table",
+            default=None, dest="stats",
+            help="print a table with times of stages and sizes of data")
+        parser.add_argument(
+            "--stats-json", action="store_const", const="json",
+            dest="stats",
+            help="print times of stages and sizes of data in json")
         parser.add_argument(
             "--test", action="store_true",
             default=False, dest="testmode",
@@ -1725,11 +3171,31 @@ class Execute(Runner):
                 parser.print_help()
                 sys.exit(255)
 
+        if options.jobs > 1 and len(nexusfiles) > 1:
+            collector = ParallelCollector(
+                nexusfiles, options.jobs,
+                compression=options.compression,
+                skipmissing=options.skipmissing,
+                storeold=not options.replaceold,
+                testmode=options.testmode, writer=writer,
+                chunkbytes=options.chunkbytes,
+                checkpoint=options.checkpoint,
+                compressionjobs=options.compressionjobs,
+                stats=options.stats)
+            if not collector.collect(
+                    options.path, inputfiles, options.datatype, shape):
+                sys.exit(1)
+            return
+
         # configuration server
         for nxsfile in nexusfiles:
             collector = Collector(
                 nxsfile, options.compression, options.skipmissing,
-                not options.replaceold, options.testmode, writer=writer)
+                not options.replaceold, options.testmode, writer=writer,
+                chunkbytes=options.chunkbytes,
+                checkpoint=options.checkpoint,
+                compressionjobs=options.compressionjobs,
+                stats=options.stats)
             collector.collect(options.path, inputfiles,
                               options.datatype, shape)
 
@@ -1772,7 +3238,8 @@ def main():
     parser.cmdrunners = [
         ('append', Execute),
         ('link', Link),
-        ('vds', VDS)
+        ('vds', VDS),
+        ('materialize', Materialize)
     ]
     runners = parser.createSubParsers()
 
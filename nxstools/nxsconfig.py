@@ -22,6 +22,7 @@ import sys
 import os
 import argparse
 import json
+import itertools
 from .nxsparser import ParserTools, TableTools, TableDictTools, ESRFConverter
 from .nxsargparser import (Runner, NXSArgParser, ErrorException)
 from .nxsdevicetools import (checkServer, listServers, openServer)
@@ -60,6 +61,52 @@ class ConfigServer(object):
         #: (:class:`tango.DeviceProxy`) configuration server proxy
         self._cnfServer = openServer(device)
         self._cnfServer.Open()
+        #: (:obj:`str`) describe output format: table, jsonl or csv
+        self.outputformat = "table"
+        #: (:obj:`int`) number of rows which fix table column widths
+        self.samplerows = None
+        #: (:obj:`dict` <:obj:`str` , :obj:`int`>) fixed table column widths
+        self.columnwidths = {}
+
+    def __streamed(self):
+        """ checks if table rows should be streamed
+
+        :returns: True if table rows are generated lazily
+        :rtype: :obj:`bool`
+        """
+        return self.outputformat != "table" \
+            or self.samplerows is not None or bool(self.columnwidths)
+
+    def __tableRows(self, ttools, first=True):
+        """ generates table rows in the selected output format
+
+        :param ttools: table tools
+        :type ttools: :class:`nxstools.nxsparser.TableTools`
+        :param first: if it is the first table of the output
+        :type first: :obj:`bool`
+        :returns: table rows
+        :rtype: :obj:`list` <:obj:`str`> or :obj:`iter` <:obj:`str`>
+        """
+        if not self.__streamed():
+            return ttools.generateList()
+        ttools.sample = self.samplerows
+        ttools.widths = dict(self.columnwidths)
+        if self.outputformat == "jsonl":
+            return ttools.generateJSONLines()
+        elif self.outputformat == "csv":
+            return ttools.generateCSV(header=first)
+        return ttools.generateRows()
+
+    def __joinTables(self, tables):
+        """ joins rows of tables
+
+        :param tables: list of table rows
+        :type tables: :obj:`list` <:obj:`iter` <:obj:`str`> >
+        :returns: rows of all tables
+        :rtype: :obj:`list` <:obj:`str`> or :obj:`iter` <:obj:`str`>
+        """
+        rows = itertools.chain.from_iterable(tables)
+        return rows if self.__streamed() else list(rows)
 
     def listCmd(self, ds, mandatory=False, private=False, profiles=False):
         """ lists the DB item names
@@ -485,9 +532,11 @@ class ConfigServer(object):
                 parameters = ParserTools.parseDataSources(xmls)
                 ttools = TableTools(parameters,
                                     headers=headers,
-                                    filters=filters)
+                                    filters=filters,
+                                    stream=self.__streamed())
                 ttools.title = "DataSource: '%s'" % args[i]
-                description.extend(ttools.generateList())
+                description.append(
+                    self.__tableRows(ttools, not description))
         else:
             dsxmls = self._cnfServer.DataSources(dss)
             xmls = ParserTools.mergeDefinitions(dsxmls).strip()
@@ -496,8 +545,9 @@ class ConfigServer(object):
                 headers = ["source_name"].extend(headers)
             ttools = TableTools(parameters,
                                 headers=headers,
-                                filters=filters)
-            description.extend(ttools.generateList())
+                                filters=filters,
+                                stream=self.__streamed())
+            description.append(self.__tableRows(ttools))
 
         if not description:
             sys.stderr.write(
@@ -505,7 +555,7 @@ class ConfigServer(object):
                 "or -m for mandatory components \n\n")
             sys.stderr.flush()
             return ""
-        return description
+        return self.__joinTables(description)
 
     def __describeProfiles(self, args, headers=None):
         """ provides description of datasources
@@ -621,26 +671,29 @@ class ConfigServer(object):
                         sys.stderr.flush()
 
             for i, xmls in enumerate(cpxmls):
-                parameters = ParserTools.parseFields(xmls)
+                document = ParserTools.parseDocument(xmls)
+                parameters = ParserTools.parseFields(document)
                 if attrs:
-                    parameters.extend(ParserTools.parseAttributes(xmls))
-                parameters.extend(ParserTools.parseLinks(xmls))
+                    parameters.extend(ParserTools.parseAttributes(document))
+                parameters.extend(ParserTools.parseLinks(document))
                 ttools = TableTools(parameters, nonone,
                                     headers,
-                                    filters)
+                                    filters,
+                                    stream=self.__streamed())
                 if dargs[i] in deps:
                     ttools.title = "Component: '%s' %s" % (
                         dargs[i], deps[dargs[i]])
                 else:
                     ttools.title = "Component: '%s'" % dargs[i]
-                description.extend(ttools.generateList())
+                description.append(
+                    self.__tableRows(ttools, not description))
         if not description:
             sys.stderr.write(
                 "\nHint: add component names as command arguments "
                 "or -m for mandatory components \n\n")
             sys.stderr.flush()
             return ""
-        return description
+        return self.__joinTables(description)
 
     def __describeConfiguration(self, args, headers=None, nonone=None,
                                 attrs=True, filters=None):
@@ -679,10 +732,11 @@ class ConfigServer(object):
         self._cnfServer.CreateConfiguration(args)
         xmls = str(self._cnfServer.XMLString).strip()
         if xmls:
-            description.extend(ParserTools.parseFields(xmls))
+            document = ParserTools.parseDocument(xmls)
+            description.extend(ParserTools.parseFields(document))
             if attrs:
-                description.extend(ParserTools.parseAttributes(xmls))
-            description.extend(ParserTools.parseLinks(xmls))
+                description.extend(ParserTools.parseAttributes(document))
+            description.extend(ParserTools.parseLinks(document))
         if not description:
             sys.stderr.write(
                 "\nHint: add components as command arguments "
@@ -691,10 +745,11 @@ class ConfigServer(object):
             return ""
         ttools = TableTools(description, nonone,
                             headers=headers,
-                            filters=filters)
+                            filters=filters,
+                            stream=self.__streamed())
         if headers:
             ttools.headers = headers
-        return ttools.generateList()
+        return self.__tableRows(ttools)
 
     def describeCmd(self, ds, args, md, pr, headers=None, filters=None):
         """ provides description of configuration elements
@@ -1355,6 +1410,7 @@ class Describe(Runner):
     epilog = "" \
         + " examples:\n" \
         + "       nxsconfig describe pilatus\n" \
+        + "       nxsconfig describe pilatus --format jsonl\n" \
         + "\n"
 
     def create(self):
@@ -1391,6 +1447,19 @@ class Describe(Runner):
             default=False, dest="private",
             help="make use private components,"
             " i.e. starting with '__'")
+        parser.add_argument(
+            "--format", dest="outputformat", default="table",
+            choices=["table", "jsonl", "csv"],
+            help="output format: table, jsonl (JSON lines) or csv."
+            " Default: table")
+        parser.add_argument(
+            "--sample-rows", dest="samplerows", type=int, default=None,
+            help="number of rows which fix the table column widths."
+            " Rows are printed as soon as the widths are fixed")
+        parser.add_argument(
+            "--column-widths", dest="columnwidths", default="",
+            help="fixed table column widths (separated by commas "
+            "without spaces), e.g. 'nexus_path=60,value=20'")
         parser.add_argument(
             'args', metavar='name', type=str, nargs='*',
             help='names of components or datasources')
@@ -1404,10 +1473,25 @@ class Describe(Runner):
         :rtype: :obj:`str`
         """
         cnfserver = ConfigServer(options.server)
-        string = cnfserver.char.join(cnfserver.describeCmd(
+        cnfserver.outputformat = options.outputformat
+        cnfserver.samplerows = options.samplerows
+        try:
+            cnfserver.columnwidths = TableTools.parseWidths(
+                options.columnwidths)
+        except ValueError as e:
+            sys.stderr.write("Error: %s\n" % str(e))
+            sys.stderr.flush()
+            self._parser.print_help()
+            sys.exit(255)
+        rows = cnfserver.describeCmd(
             options.datasources, options.args, options.mandatory,
-            options.private, options.headers, options.filters))
-        return string
+            options.private, options.headers, options.filters)
+        if isinstance(rows, (list, str)):
+            return cnfserver.char.join(rows)
+        for row in rows:
+            sys.stdout.write(row + cnfserver.char)
+        sys.stdout.flush()
+        return ""
 
 
 class Info(Runner):
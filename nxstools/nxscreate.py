@@ -1231,6 +1231,11 @@ class SECoPCP(Runner):
         + "\n" \
         + "           - create the all secop components" \
         + " in the given directory\n" \
+        + "\n" \
+        + "       nxscreate secopcp -d . -j secopn_node.json --snapshot \n" \
+        + "\n" \
+        + "           - create the secop components which read" \
+        + " all parameters of the node in one exchange per step\n" \
         + "\n"
 
     def create(self):
@@ -1252,6 +1257,10 @@ class SECoPCP(Runner):
         parser.add_argument("--sample-nxdata", action="store_true",
                             default=False, dest="samplenxdata",
                             help="create NXdata in NXsample")
+        parser.add_argument("--snapshot", action="store_true",
+                            default=False, dest="snapshot",
+                            help="read all node parameters in one "
+                            "exchange per step")
         parser.add_argument("-c", "--component",
                             help="component name" +
                             "secop component name",
@@ -2118,7 +2118,9 @@ class SECoPCPCreator(CPCreator):
                             timedsname = timedsname.lower()
                         self.createSECoPDS(dsname,
                                            "read %s:%s" % (name, pname),
-                                           dsname, "[0]")
+                                           self.__groupname(
+                                               dsname, nodename),
+                                           "[0]")
                         field.setText("$datasources.%s" % dsname)
                         if units:
                             field.setUnits(units)
@@ -2182,6 +2184,21 @@ class SECoPCPCreator(CPCreator):
                                   (ename, basename, nodename, name))
         return links
 
+    def __groupname(self, dsname, nodename):
+        """ provides secop group name of the datasource
+
+        :param dsname: datasource name
+        :type dsname: :obj:`str`
+        :param nodename: node name
+        :type nodename: :obj:`str`
+        :returns: datasource name or node name in the snapshot mode
+        :rtype: :obj:`str`
+        """
+        if getattr(self.options, "snapshot", False):
+            return "%s_snapshot" % (
+                nodename.lower() if self.options.lower else nodename)
+        return dsname
+
     def __createSECoPParam(self, par, name, conf, nodename, modname,
                            canfail=None, access=None, accesstype=None):
         """ create nexus node tree
@@ -2224,7 +2241,7 @@ class SECoPCPCreator(CPCreator):
         pstrategy = self.options.paramstrategy
         self.createSECoPDS(dsname,
                            "read %s:%s" % (modname, name),
-                           dsname, access)
+                           self.__groupname(dsname, nodename), access)
         field.setStrategy(pstrategy)
         if units:
             field.setUnits(units)
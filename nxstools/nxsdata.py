@@ -19,6 +19,7 @@
 """ Command-line tool to ascess to Tango Data Server"""
 
 import sys
+import time
 
 import argparse
 
@@ -75,6 +76,24 @@ class NexusServer(object):
         """
         self.tdwServer.Record(jsondata)
 
+    def recordAsynch(self, jsondata):
+        """ starts recording one step without waiting for the reply
+
+        :param jsondata: step JSON data
+        :type jsondata: :obj:`str`
+        :returns: asynchronous call id
+        :rtype: :obj:`int`
+        """
+        return self.tdwServer.command_inout_asynch("Record", jsondata)
+
+    def recordReply(self, cid):
+        """ waits for the reply of the asynchronous record call
+
+        :param cid: asynchronous call id
+        :type cid: :obj:`int`
+        """
+        self.tdwServer.command_inout_reply(cid, 0)
+
     def closeEntry(self):
         """ closes the entry
         """
@@ -244,6 +263,104 @@ class Record(Runner):
             options.args[0].strip() if options.args else '{}')
 
 
+class Stream(Runner):
+
+    """ Stream runner"""
+
+    #: (:obj:`str`) command description
+    description = "record steps with step JSON data read line by line"
+    epilog = "" \
+        + " examples:\n" \
+        + "       myscan | nxsdata stream \n" \
+        + "       nxsdata stream -i /tmp/nxsdata.fifo \n" \
+        + "\n"
+
+    def create(self):
+        """ creates parser
+
+        """
+        parser = self._parser
+        parser.add_argument(
+            "-s", "--server", dest="server",
+            help="writer server device name")
+        parser.add_argument(
+            "-i", "--input", dest="input", default=None,
+            help="input file or FIFO with one step JSON data per line."
+            " Default: standard input")
+
+    def run(self, options):
+        """ the main program function
+
+        Steps are recorded in the input order. Only one asynchronous
+        Record call is in flight at a time, i.e. the next line is read
+        and prepared while the previous step is being written.
+
+        :param options: parser options
+        :type options: :class:`argparse.Namespace`
+        :returns: output information
+        :rtype: :obj:`str`
+        """
+        tdwserver = NexusServer(options.server)
+        latencies = []
+        pending = []
+
+        def reply():
+            cid, starttime = pending.pop()
+            tdwserver.recordReply(cid)
+            latencies.append(time.time() - starttime)
+
+        if options.input:
+            stream = open(options.input)
+        else:
+            stream = sys.stdin
+        starttime = time.time()
+        try:
+            for line in iter(stream.readline, ""):
+                jsondata = line.strip()
+                if not jsondata:
+                    continue
+                if pending:
+                    reply()
+                pending.append(
+                    (tdwserver.recordAsynch(jsondata), time.time()))
+        except KeyboardInterrupt:
+            pass
+        finally:
+            try:
+                if pending:
+                    reply()
+            finally:
+                if options.input:
+                    stream.close()
+        return self.statistics(latencies, time.time() - starttime)
+
+    @classmethod
+    def statistics(cls, latencies, duration):
+        """ provides throughput and latency statistics
+
+        :param latencies: record latencies in seconds
+        :type latencies: :obj:`list` <:obj:`float`>
+        :param duration: total time in seconds
+        :type duration: :obj:`float`
+        :returns: statistics report
+        :rtype: :obj:`str`
+        """
+        report = ["records: %s" % len(latencies),
+                  "time: %.3f s" % duration]
+        if latencies and duration > 0:
+            sltc = sorted(latencies)
+            report.append(
+                "throughput: %.1f records/s" % (len(latencies) / duration))
+            report.append(
+                "latency: mean %.2f ms, min %.2f ms, max %.2f ms, "
+                "p95 %.2f ms" % (
+                    1000. * sum(sltc) / len(sltc),
+                    1000. * sltc[0], 1000. * sltc[-1],
+                    1000. * sltc[min(int(0.95 * len(sltc)),
+                                     len(sltc) - 1)]))
+        return "\n".join(report)
+
+
 class CloseEntry(Runner):
 
     """ CloseEntry runner"""
@@ -347,13 +464,6 @@ def main():
     """ the main program function
     """
 
-    #: pipe arguments
-    pipe = ""
-    if not sys.stdin.isatty():
-        pp = sys.stdin.readlines()
-        #: system pipe
-        pipe = "".join(pp)
-
     description = "Command-line tool for writing NeXus files" \
                   + " with NXSDataWriter"
 
@@ -365,6 +475,7 @@ def main():
                          ('setdata', SetData),
                          ('openentry', OpenEntry),
                          ('record', Record),
+                         ('stream', Stream),
                          ('closefile', CloseFile),
                          ('closeentry', CloseEntry)]
     runners = parser.createSubParsers()
@@ -395,6 +506,13 @@ def main():
             print("")
             sys.exit(255)
 
+    #: pipe arguments
+    pipe = ""
+    if options.subparser != 'stream' and not sys.stdin.isatty():
+        pp = sys.stdin.readlines()
+        #: system pipe
+        pipe = "".join(pp)
+
     #: command-line and pipe arguments
     parg = []
     if hasattr(options, "args"):
@@ -25,6 +25,8 @@ import time
 import json
 import argparse
 import subprocess
+import threading
+from multiprocessing.pool import ThreadPool
 
 try:
     import tango
@@ -248,6 +250,8 @@ class SetUp(object):
         self.writer_name = None
         #: (:obj:`str`) NeXus config server device name
         self.cserver_name = None
+        #: (:obj:`bool`) use Starter change events while waiting
+        self.useevents = True
 
     def changeRecorderPath(self, path, instance=None):
         """ adds a new recorder path
@@ -394,11 +398,117 @@ class SetUp(object):
                 admin = eadmins[0]
         return admin
 
+    def _waitFor(self, condition, timeout, event=None,
+                 mindelay=0.01, maxdelay=0.5):
+        """ waits with exponential backoff until the condition is satisfied
+
+        :param condition: condition function
+        :type condition: :obj:`function`
+        :param timeout: timeout in seconds
+        :type timeout: :obj:`float`
+        :param event: event which wakes up the waiting loop
+        :type event: :class:`threading.Event`
+        :param mindelay: initial delay between checks in seconds
+        :type mindelay: :obj:`float`
+        :param maxdelay: maximal delay between checks in seconds
+        :type maxdelay: :obj:`float`
+        :returns: True if condition was satisfied
+        :rtype: :obj:`bool`
+        """
+        deadline = time.time() + timeout
+        delay = mindelay
+        while True:
+            try:
+                if condition():
+                    return True
+            except Exception as e:
+                print(str(e))
+            left = deadline - time.time()
+            if left <= 0:
+                return False
+            if event is not None:
+                event.wait(min(delay, left))
+                event.clear()
+            else:
+                time.sleep(min(delay, left))
+            delay = min(2 * delay, maxdelay)
+
+    def _subscribeServers(self, adminproxy):
+        """ subscribes change events of the Starter running server list
+
+        :param adminproxy: Starter device proxy
+        :type adminproxy: :obj:`tango.DeviceProxy`
+        :returns: (event set on server list changes, event id)
+        :rtype: (:class:`threading.Event`, :obj:`int`)
+        """
+        if not self.useevents or adminproxy is None:
+            return None, None
+        changed = threading.Event()
+
+        def callback(event):
+            changed.set()
+
+        try:
+            eid = adminproxy.subscribe_event(
+                "RunningServers", tango.EventType.CHANGE_EVENT, callback)
+        except Exception:
+            return None, None
+        return changed, eid
+
+    def _unsubscribeServers(self, adminproxy, eid):
+        """ unsubscribes change events of the Starter running server list
+
+        :param adminproxy: Starter device proxy
+        :type adminproxy: :obj:`tango.DeviceProxy`
+        :param eid: event id
+        :type eid: :obj:`int`
+        """
+        if eid is not None:
+            try:
+                adminproxy.unsubscribe_event(eid)
+            except Exception:
+                pass
+
+    def _serverPids(self, server):
+        """ provides process ids of the local server instance
+
+        :param server: server name
+        :type server: :obj:`str`
+        :returns: process ids
+        :rtype: :obj:`list` <:obj:`str`>
+        """
+        sserver = server.split("/")
+        if len(sserver) < 2:
+            return []
+        proc = subprocess.Popen(
+            "ps -ef | grep '%s %s' | grep -v grep"
+            % (sserver[0], sserver[1]),
+            stdout=subprocess.PIPE, shell=True)
+        res = proc.communicate()[0]
+        if not isinstance(res, str):
+            res = res.decode("utf8")
+        return [sr[1] for sr in (r.split() for r in res.split("\n"))
+                if len(sr) > 2]
+
+    def _isLocal(self, adminproxy):
+        """ checks if Starter runs on the local host
+
+        :param adminproxy: Starter device proxy
+        :type adminproxy: :obj:`tango.DeviceProxy`
+        :returns: True if Starter runs on the local host
+        :rtype: :obj:`bool`
+        """
+        try:
+            host = adminproxy.name().split("/")[-1]
+        except Exception:
+            return False
+        return host.split(".")[0] == _hostname.split(".")[0]
+
     def waitServerNotRunning(self, server=None, device=None,
                              adminproxy=None,
                              maxcnt=1000, verbose=True,
-                             waitforproc=True):
-        """  wait until device is exported and server is running
+                             waitforproc=True, timeout=None):
+        """  wait until device is not exported and server is not running
 
         :param server: server name, check if running when not None
         :type server: :obj:`str`
@@ -406,59 +516,56 @@ class SetUp(object):
         :type device: :obj:`str`
         :param adminproxy: Starter device proxy
         :type adminproxy: :obj:`tango.DeviceProxy`
-        :param maxcnt: maximal waiting time in 10ms
+        :param maxcnt: maximal waiting time in 0.2s if timeout is not set
         :type maxcnt: :obj:`int`
         :param verbose: verbose mode
         :type verbose: :obj:`bool`
         :param waitforproc: wait for process list update
         :type waitforporc: :obj:`bool`
+        :param timeout: timeout in seconds
+        :type timeout: :obj:`float`
         :returns: True if server is running
         :rtype: :obj:`bool`
         """
-        found = True
-        cnt = 0
-        running = True
-        while found and cnt < maxcnt:
-            try:
-                if server and adminproxy is not None and running:
-                    if verbose:
-                        sys.stdout.write(".")
-                        sys.stdout.flush()
-                    adminproxy.UpdateServersInfo()
-                    # running = adminproxy.RunningServers
-                    running = adminproxy.DevGetRunningServers(True)
-                    if server in running:
-                        time.sleep(0.02)
-                        cnt += 1
-                        continue
-                    else:
-                        running = False
-                if device:
-                    if verbose:
-                        sys.stdout.write(".")
-                        sys.stdout.flush()
-                    exl = self.db.get_device_exported(device)
-                    if device in exl.value_string:
-                        time.sleep(0.02)
-                        cnt += 1
-                        continue
-                found = False
+        if timeout is None:
+            timeout = maxcnt * 0.2
+
+        def stopped():
+            if server and adminproxy is not None:
                 if verbose:
-                    if device or server:
-                        print(" %s is not working" % (device or server))
-            except Exception as e:
-                print(str(e))
-                time.sleep(0.02)
-                found = True
-            cnt += 1
-        if waitforproc:
-            time.sleep(1.5)
+                    sys.stdout.write(".")
+                    sys.stdout.flush()
+                adminproxy.UpdateServersInfo()
+                if server in adminproxy.DevGetRunningServers(True):
+                    return False
+            if device:
+                if verbose:
+                    sys.stdout.write(".")
+                    sys.stdout.flush()
+                exl = self.db.get_device_exported(device)
+                if device in exl.value_string:
+                    return False
+            return True
+
+        event, eid = self._subscribeServers(
+            adminproxy if server else None)
+        try:
+            found = not self._waitFor(stopped, timeout, event)
+        finally:
+            self._unsubscribeServers(adminproxy, eid)
+        if not found and verbose:
+            if device or server:
+                print(" %s is not working" % (device or server))
+        if waitforproc and server and adminproxy is not None \
+           and self._isLocal(adminproxy):
+            self._waitFor(lambda: not self._serverPids(server),
+                          min(timeout, 1.5))
         return found
 
     def waitServerRunning(self, server=None, device=None,
                           adminproxy=None,
                           maxcnt=1000, verbose=True,
-                          waitforproc=True):
+                          waitforproc=True, timeout=None):
         """  wait until device is exported and server is running
 
         :param server: server name, check if running when not None
@@ -467,89 +574,63 @@ class SetUp(object):
         :type device: :obj:`str`
         :param adminproxy: Starter device proxy
         :type adminproxy: :obj:`tango.DeviceProxy`
-        :param maxcnt: maximal waiting time in 10ms
+        :param maxcnt: maximal waiting time in 0.2s if timeout is not set
         :type maxcnt: :obj:`int`
         :param verbose: verbose mode
         :type verbose: :obj:`bool`
         :param waitforproc: wait for process list update
         :type waitforporc: :obj:`bool`
+        :param timeout: timeout in seconds
+        :type timeout: :obj:`float`
         :returns: True if server is running
         :rtype: :obj:`bool`
         """
-        found = False
-        cnt = 0
-        exported = False
-        while not found and cnt < maxcnt:
-            try:
-                if device and not exported:
-                    if verbose:
-                        sys.stdout.write(".")
-                        sys.stdout.flush()
-                    exl = self.db.get_device_exported(device)
-                    if device not in exl.value_string:
-                        time.sleep(0.02)
-                        cnt += 1
-                        continue
-                    else:
-                        exported = True
-                if server is not None and adminproxy is not None:
-                    if verbose:
-                        sys.stdout.write(".")
-                        sys.stdout.flush()
-                    adminproxy.UpdateServersInfo()
-                    # running = adminproxy.RunningServers
-                    running = adminproxy.DevGetRunningServers(True)
-                    if server not in running:
-                        time.sleep(0.02)
-                        cnt += 1
-                        continue
-                found = True
+        if timeout is None:
+            timeout = maxcnt * 0.2
+        exported = [False]
+
+        def started():
+            if device and not exported[0]:
                 if verbose:
-                    if device or server:
-                        print(" %s is working" % (device or server))
-            except Exception as e:
-                print(str(e))
-                time.sleep(0.02)
-                found = False
-            cnt += 1
-        if waitforproc:
-            time.sleep(1.5)
+                    sys.stdout.write(".")
+                    sys.stdout.flush()
+                exl = self.db.get_device_exported(device)
+                if device not in exl.value_string:
+                    return False
+                exported[0] = True
+            if server is not None and adminproxy is not None:
+                if verbose:
+                    sys.stdout.write(".")
+                    sys.stdout.flush()
+                adminproxy.UpdateServersInfo()
+                if server not in adminproxy.DevGetRunningServers(True):
+                    return False
+            return True
+
+        event, eid = self._subscribeServers(
+            adminproxy if server is not None else None)
+        try:
+            found = self._waitFor(started, timeout, event)
+        finally:
+            self._unsubscribeServers(adminproxy, eid)
+        if found and verbose:
+            if device or server:
+                print(" %s is working" % (device or server))
+        if waitforproc and found and server and adminproxy is not None \
+           and self._isLocal(adminproxy):
+            self._waitFor(lambda: bool(self._serverPids(server)),
+                          min(timeout, 1.5))
         return found
 
     def killServer(self, server):
-        sserver = server.split("/")
-        if len(sserver) > 1:
-            sname = sserver[0]
-            instance = sserver[1]
-        if sys.version_info > (3,):
-            with subprocess.Popen(
-                    "ps -ef | grep '%s %s' | grep -v grep"
-                    % (sname, instance),
-                    stdout=subprocess.PIPE, shell=True) as proc:
-
-                pipe = proc.stdout
-                res = str(pipe.read(), "utf8").split("\n")
-                for r in res:
-                    sr = r.split()
-                    if len(sr) > 2:
-                        subprocess.call(
-                            "kill -9 %s" % sr[1], stderr=subprocess.PIPE,
-                            shell=True)
-                pipe.close()
-        else:
-            pipe = subprocess.Popen(
-                "ps -ef | grep '%s %s' | grep -v grep"
-                % (sname, instance),
-                stdout=subprocess.PIPE, shell=True).stdout
-
-            res = str(pipe.read()).split("\n")
-            for r in res:
-                sr = r.split()
-                if len(sr) > 2:
-                    subprocess.call(
-                        "kill -9 %s" % sr[1], stderr=subprocess.PIPE,
-                        shell=True)
-            pipe.close()
+        """ kills the local server instance processes
+
+        :param server: server name
+        :type server: :obj:`str`
+        """
+        for pid in self._serverPids(server):
+            subprocess.call(
+                "kill -9 %s" % pid, stderr=subprocess.PIPE, shell=True)
 
     def restartServer(self, name, host=None, level=None,
                       restart=True, stopstart=True, wait=True,
@@ -633,11 +714,12 @@ class SetUp(object):
                                             time.sleep(0.4)
                                 if wait:
                                     try:
-                                        maxcnt = int(float(timeout)/0.2)
+                                        timeout = float(timeout)
                                     except Exception:
-                                        maxcnt = 1000
+                                        timeout = None
                                     problems = not self.waitServerRunning(
-                                        svl, None, adminproxy, maxcnt) \
+                                        svl, None, adminproxy,
+                                        timeout=timeout) \
                                         or problems
                                     if problems:
                                         print("%s was not restarted" % svl)
@@ -717,6 +799,235 @@ class SetUp(object):
                                     print("Warning: Process with the server"
                                           "instance could be suspended")
 
+    def _serverStarter(self, server, host=None):
+        """ provides Starter device name of the server host
+
+        :param server: server name
+        :type server: :obj:`str`
+        :param host: default server host name
+        :type host: :obj:`str`
+        :returns: starter device name
+        :rtype: :obj:`str`
+        """
+        try:
+            shost = self.db.get_server_info(server).host
+        except Exception:
+            shost = None
+        if shost:
+            for admin in ['tango/admin/%s' % shost,
+                          'tango/admin/%s' % shost.split(".")[0]]:
+                try:
+                    if self.db.get_device_exported(admin).value_string:
+                        return admin
+                except Exception:
+                    pass
+        return self.getStarterName(host)
+
+    def _serverTargets(self, names, host=None, level=None, restart=True):
+        """ finds registered servers with their Starters and levels
+
+        :param names: server names
+        :type names: :obj:`list` <:obj:`str`>
+        :param host: default server host name
+        :type host: :obj:`str`
+        :param level: start up level
+        :type level: :obj:`int`
+        :param restart: select only running servers
+        :type restart: :obj:`bool`
+        :returns: (server, starter, level, running) tuples
+        :rtype: :obj:`list` < (:obj:`str`, :obj:`str`, :obj:`int`,
+                :obj:`bool`) >
+        """
+        targets = []
+        running = {}
+        try:
+            servers = self.__registered_servers()
+        except Exception:
+            servers = []
+        for vl in sorted(set(servers)):
+            svl = vl.split('\t')[0]
+            if any(name.startswith("NXSRecSelector") for name in names) \
+               and svl.startswith("NXSRecSelector"):
+                self._changeLevel(svl, 4)
+            cname = svl.split('/')[0]
+            if svl not in names and cname not in names:
+                continue
+            admin = self._serverStarter(svl, host)
+            if not admin:
+                raise Exception("Starter tango server is not running")
+            if admin not in running:
+                try:
+                    adminproxy = tango.DeviceProxy(admin)
+                    adminproxy.UpdateServersInfo()
+                    running[admin] = adminproxy.DevGetRunningServers(True)
+                except Exception:
+                    running[admin] = []
+            started = svl in running[admin]
+            if not started and restart:
+                continue
+            if level is not None:
+                self._changeLevel(svl, level, tohigher=False)
+            try:
+                slevel = self.db.get_server_info(svl).level
+            except Exception:
+                slevel = 0
+            targets.append((svl, admin, slevel, started))
+        return targets
+
+    def _stopTask(self, task):
+        """ stops the server
+
+        :param task: (server, starter, timeout) tuple
+        :type task: (:obj:`str`, :obj:`str`, :obj:`float`)
+        :returns: (server, status, duration) tuple
+        :rtype: (:obj:`str`, :obj:`bool`, :obj:`float`)
+        """
+        server, admin, timeout = task
+        starttime = time.time()
+        problems = True
+        try:
+            adminproxy = tango.DeviceProxy(admin)
+            try:
+                adminproxy.DevStop(server)
+            except Exception:
+                adminproxy.HardKillServer(server)
+            problems = self.waitServerNotRunning(
+                server, None, adminproxy, verbose=False, timeout=timeout)
+            if problems:
+                self.killServer(server)
+        except Exception as e:
+            print("%s: %s" % (server, str(e)))
+        return server, not problems, time.time() - starttime
+
+    def _startTask(self, task):
+        """ starts the server
+
+        :param task: (server, starter, timeout, wait) tuple
+        :type task: (:obj:`str`, :obj:`str`, :obj:`float`, :obj:`bool`)
+        :returns: (server, status, duration) tuple
+        :rtype: (:obj:`str`, :obj:`bool`, :obj:`float`)
+        """
+        server, admin, timeout, wait = task
+        starttime = time.time()
+        problems = True
+        try:
+            adminproxy = tango.DeviceProxy(admin)
+            counter = 0
+            while problems and counter < 100:
+                try:
+                    adminproxy.DevStart(server)
+                    problems = False
+                except Exception:
+                    counter += 1
+                    time.sleep(0.4)
+            if wait:
+                problems = not self.waitServerRunning(
+                    server, None, adminproxy, verbose=False,
+                    timeout=timeout) or problems
+        except Exception as e:
+            print("%s: %s" % (server, str(e)))
+        return server, not problems, time.time() - starttime
+
+    def _waitTask(self, task):
+        """ waits for the server
+
+        :param task: (server, starter, timeout) tuple
+        :type task: (:obj:`str`, :obj:`str`, :obj:`float`)
+        :returns: (server, status, duration) tuple
+        :rtype: (:obj:`str`, :obj:`bool`, :obj:`float`)
+        """
+        server, admin, timeout = task
+        starttime = time.time()
+        found = False
+        try:
+            found = self.waitServerRunning(
+                server, None, tango.DeviceProxy(admin), verbose=False,
+                timeout=timeout)
+        except Exception as e:
+            print("%s: %s" % (server, str(e)))
+        return server, found, time.time() - starttime
+
+    def restartServers(self, names, host=None, level=None,
+                       restart=True, stopstart=True, wait=True,
+                       timeout=None, jobs=4, start=True):
+        """ restarts servers concurrently level by level
+
+        Servers are stopped from the highest to the lowest Starter level
+        and started from the lowest to the highest one. Servers with
+        the same level are processed by a bounded pool of workers.
+
+        :param names: server names
+        :type names: :obj:`list` <:obj:`str`>
+        :param host: default server host name
+        :type host: :obj:`str`
+        :param level: start up level
+        :type level: :obj:`int`
+        :param restart:  if server should be restarted
+        :type restart: :obj:`bool`
+        :param stopstart:  if server should be stopped and started
+        :type stopstart: :obj:`bool`
+        :param wait:  script should wait for the server
+        :type wait: :obj:`bool`
+        :param timeout: timeout for  start
+        :type timeout: :obj:`float`
+        :param jobs: maximal number of concurrent workers
+        :type jobs: :obj:`int`
+        :param start:  if server should be started after stopping
+        :type start: :obj:`bool`
+        :returns: True if all servers were processed successfully
+        :rtype: :obj:`bool`
+        """
+        try:
+            timeout = float(timeout)
+        except Exception:
+            timeout = None
+        targets = self._serverTargets(
+            names, host, level if start else None, restart or not start)
+        levels = sorted(set(tg[2] for tg in targets))
+        summary = {}
+        lock = threading.Lock()
+
+        def report(results, label):
+            for server, status, duration in results:
+                with lock:
+                    summary[server] = (
+                        label if status else "%s failed" % label,
+                        summary.get(server, ("", 0))[1] + duration)
+                    print("%s%s: %s (%.2f s)" % (
+                        label.capitalize(), "" if status else " FAILED",
+                        server, duration))
+
+        pool = ThreadPool(max(1, min(jobs, len(targets) or 1)))
+        try:
+            if stopstart:
+                for lv in reversed(levels):
+                    report(pool.imap_unordered(
+                        self._stopTask,
+                        [(sv, adm, timeout) for sv, adm, slv, started
+                         in targets if slv == lv and started]), "stopped")
+                if start:
+                    for lv in levels:
+                        report(pool.imap_unordered(
+                            self._startTask,
+                            [(sv, adm, timeout, wait)
+                             for sv, adm, slv, _ in targets if slv == lv]),
+                            "started")
+            elif wait:
+                report(pool.imap_unordered(
+                    self._waitTask,
+                    [(sv, adm, timeout) for sv, adm, _, _ in targets]),
+                    "running")
+        finally:
+            pool.close()
+            pool.join()
+
+        print("\nSummary:")
+        for sv, adm, slv, _ in targets:
+            status, duration = summary.get(sv, ("skipped", 0))
+            print("  %-40s %-24s level %3s  %-16s %7.2f s" % (
+                sv, adm, slv, status, duration))
+        return all(not st.endswith("failed") for st, _ in summary.values())
+
     def _changeLevel(self, name, level, tohigher=True):
         """ change startup level
 
@@ -1280,6 +1591,10 @@ class Start(Runner):
             "-e", "--no-wait", action="store_true",
             default=False, dest="nowait",
             help="do not wait")
+        parser.add_argument(
+            "-j", "--jobs", action="store", type=int, default=1,
+            dest="jobs",
+            help="number of servers processed concurrently, default: 1")
         parser.add_argument(
             'args', metavar='server_name',
             type=str, nargs='*',
@@ -1295,12 +1610,21 @@ class Start(Runner):
         setUp = SetUp()
         servers = args if args else [
             "NXSConfigServer", "NXSRecSelector", "NXSDataWriter"]
-        for server in servers:
-            setUp.restartServer(
-                server,
+        starttime = time.time()
+        if options.jobs > 1:
+            setUp.restartServers(
+                servers,
                 level=(options.level if options.level > -1 else None),
                 restart=False, timeout=options.timeout,
-                wait=(not options.nowait))
+                wait=(not options.nowait), jobs=options.jobs)
+        else:
+            for server in servers:
+                setUp.restartServer(
+                    server,
+                    level=(options.level if options.level > -1 else None),
+                    restart=False, timeout=options.timeout,
+                    wait=(not options.nowait))
+        print("Total start time: %.2f s" % (time.time() - starttime))
 
 
 class Wait(Runner):
@@ -1322,6 +1646,10 @@ class Wait(Runner):
         parser.add_argument(
             "-z", "--timeout", action="store", type=float, default=None,
             dest="timeout", help="timeout in seconds")
+        parser.add_argument(
+            "-j", "--jobs", action="store", type=int, default=1,
+            dest="jobs",
+            help="number of servers processed concurrently, default: 1")
         parser.add_argument(
             'args', metavar='server_name',
             type=str, nargs='*',
@@ -1337,10 +1665,15 @@ class Wait(Runner):
         setUp = SetUp()
         servers = args if args else [
             "NXSConfigServer", "NXSRecSelector", "NXSDataWriter"]
-        for server in servers:
-            setUp.restartServer(
-                server,
-                restart=False, stopstart=False, timeout=options.timeout)
+        if options.jobs > 1:
+            setUp.restartServers(
+                servers, restart=False, stopstart=False,
+                timeout=options.timeout, jobs=options.jobs)
+        else:
+            for server in servers:
+                setUp.restartServer(
+                    server,
+                    restart=False, stopstart=False, timeout=options.timeout)
 
 
 class MoveProp(Runner):
@@ -1550,6 +1883,8 @@ class Restart(Runner):
     epilog = "" \
         + " examples:\n" \
         + "       nxsetup restart Pool/haso228 -l 2\n" \
+        + "       nxsetup restart NXSConfigServer NXSDataWriter " \
+        + "NXSRecSelector -j 4\n" \
         + "\n"
 
     def create(self):
@@ -1566,6 +1901,10 @@ class Restart(Runner):
             "-e", "--no-wait", action="store_true",
             default=False, dest="nowait",
             help="do not wait")
+        parser.add_argument(
+            "-j", "--jobs", action="store", type=int, default=1,
+            dest="jobs",
+            help="number of servers processed concurrently, default: 1")
         parser.add_argument(
             'args', metavar='server_name',
             type=str, nargs='*',
@@ -1581,10 +1920,20 @@ class Restart(Runner):
         setUp = SetUp()
         servers = args if args else [
             "NXSConfigServer", "NXSRecSelector", "NXSDataWriter"]
-        for server in servers:
-            setUp.restartServer(
-                server, level=(options.level if options.level > -1 else None),
-                timeout=options.timeout, wait=(not options.nowait))
+        starttime = time.time()
+        if options.jobs > 1:
+            setUp.restartServers(
+                servers,
+                level=(options.level if options.level > -1 else None),
+                timeout=options.timeout, wait=(not options.nowait),
+                jobs=options.jobs)
+        else:
+            for server in servers:
+                setUp.restartServer(
+                    server,
+                    level=(options.level if options.level > -1 else None),
+                    timeout=options.timeout, wait=(not options.nowait))
+        print("Total restart time: %.2f s" % (time.time() - starttime))
 
 
 class Stop(Runner):
@@ -1603,6 +1952,10 @@ class Stop(Runner):
         """ creates parser
         """
         parser = self._parser
+        parser.add_argument(
+            "-j", "--jobs", action="store", type=int, default=1,
+            dest="jobs",
+            help="number of servers processed concurrently, default: 1")
         parser.add_argument(
             'args', metavar='server_name',
             type=str, nargs='*',
@@ -1618,8 +1971,13 @@ class Stop(Runner):
         setUp = SetUp()
         servers = args if args else [
             "NXSConfigServer", "NXSRecSelector", "NXSDataWriter"]
-        for server in servers:
-            setUp.stopServer(server)
+        starttime = time.time()
+        if options.jobs > 1:
+            setUp.restartServers(servers, start=False, jobs=options.jobs)
+        else:
+            for server in servers:
+                setUp.stopServer(server)
+        print("Total stop time: %.2f s" % (time.time() - starttime))
 
 
 def _supportoldcommands():
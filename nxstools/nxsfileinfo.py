@@ -31,6 +31,7 @@ import datetime
 import pwd
 import grp
 import fnmatch
+import hashlib
 import yaml
 import base64
 import math
@@ -43,7 +44,7 @@ from .nxsfileparser import (NXSFileParser, FIOFileParser,
                             numpyEncoder, numpyEncoderNull, isoDate)
 from .nxsargparser import (Runner, NXSArgParser, ErrorException)
 from . import filewriter
-from .ontology import id_techniques, nexus_panet
+from .ontology import id_techniques, nexus_panet, PANET_PREFIX
 
 
 if sys.version_info > (3,):
@@ -78,6 +79,9 @@ except Exception:
 #     #: (:obj:`bool`) PIL imported
 #     PILLOW = False
 
+#: (:obj:`str`) environment variable with the metadata cache directory
+CACHE_ENV = "NXSFILEINFO_METADATA_CACHE"
+
 
 def getlist(text):
     """ converts a text string to a list of lists
@@ -184,7 +188,7 @@ class General(Runner):
         try:
             fl = filewriter.open_file(
                 options.args[0], readonly=True,
-                writer=wrmodule)
+                writer=wrmodule, access="metadata")
         except Exception:
             sys.stderr.write("nxsfileinfo: File '%s' cannot be opened\n"
                              % options.args[0])
@@ -332,10 +336,9 @@ class General(Runner):
             if "program_name" in entry.names():
                 pn = entry.open("program_name")
                 pname = filewriter.first(pn.read())
-                attr = pn.attributes
-                names = [att.name for att in attr]
-                if "scan_command" in names:
-                    scommand = filewriter.first(attr["scan_command"].read())
+                avalues = pn.attributes.read_all(["scan_command"])
+                if "scan_command" in avalues:
+                    scommand = filewriter.first(avalues["scan_command"])
                     pname = "%s (%s)" % (pname, scommand)
                 description.append({key: "Program:", value: pname})
         return [key, value]
@@ -349,12 +352,8 @@ class General(Runner):
 
         description = []
 
-        attr = root.attributes
-
-        names = [at.name for at in attr]
-        fname = filewriter.first(
-            (attr["file_name"].read()
-             if "file_name" in names else " ") or " ")
+        avalues = root.attributes.read_all(["file_name"])
+        fname = filewriter.first(avalues.get("file_name", " ") or " ")
         title = "File name: '%s'" % fname
 
         print("")
@@ -470,6 +469,24 @@ class BeamtimeLoader(object):
         ["creationTime", "endTime"],
     ]
 
+    #: (:obj:`list` <:obj:`str`>) metadata paths read by the loader
+    #:    before the metadata removal
+    readpaths = [
+        "pid",
+        "datasetName",
+        "instrumentId",
+        "techniques",
+        "sampleId",
+        "scientificMetadata.name",
+        "scientificMetadata.beamtimeId",
+        "scientificMetadata.definition",
+        "scientificMetadata.experiment_description",
+        "scientificMetadata.sample.name",
+        "scientificMetadata.sample.description",
+        "scientificMetadata.experiment_identifier.beamtime_filename",
+        "scientificMetadata.experimental_identifier.beamtime_filename",
+    ]
+
     def __init__(self, options):
         """ loader constructor
 
@@ -631,7 +648,8 @@ class BeamtimeLoader(object):
             cplist.extend(clist)
         return cplist
 
-    def append_copymap_field(self, metadata, cmap, clist, cmapfield=None):
+    @classmethod
+    def append_copymap_field(cls, metadata, cmap, clist, cmapfield=None):
         """ overwrite metadata with dictionary
 
         :param metadata: metadata dictionary to merge in
@@ -759,48 +777,111 @@ class BeamtimeLoader(object):
         cplist = list(clist or [])
         self.append_copymap_field(metadata, cpmap, cplist, cmapfield)
         if metadata:
-            for ts, vs in cpmap.items():
-                vv = None
-                if not ts:
-                    vv = vs
-                if not vs:
-                    vv = ts
-                if vv and isinstance(vv, basestring):
-                    vls = vv.split(".")
-                    md = metadata
-                    parent = None
-                    for vl in vls:
-                        parent = md
-                        if vl in md:
-                            md = md[vl]
-                        else:
-                            break
+            for vv in self._removed_paths(cpmap, cplist):
+                vls = vv.split(".")
+                md = metadata
+                parent = None
+                for vl in vls:
+                    parent = md
+                    if vl in md:
+                        md = md[vl]
                     else:
-                        parent.pop(vl)
-            for line in cplist:
-                vv = None
-                if line:
-                    if len(line) == 1 and line[0]:
-                        vv = line[0]
-                    elif len(line) > 1:
-                        if line[0] and not line[1]:
-                            vv = line[0]
-                        if line[1] and not line[0]:
-                            vv = line[1]
-                    if vv and isinstance(vv, basestring):
-                        vls = vv.split(".")
-                        md = metadata
-                        parent = None
-                        for vl in vls:
-                            parent = md
-                            if vl in md:
-                                md = md[vl]
-                            else:
-                                break
-                        else:
-                            parent.pop(vl)
+                        break
+                else:
+                    parent.pop(vl)
         return metadata
 
+    @classmethod
+    def _removed_paths(cls, cpmap, cplist):
+        """ provides metadata paths with empty input or output
+            in the copy map
+
+        :param cpmap: copy map dictionary
+        :type cpmap: :obj:`dict` <:obj:`str`, :obj:`str`>
+        :param cplist: copy list
+        :type cplist: :obj:`list` < [:obj:`str`, :obj:`str`] >
+        :returns: metadata paths to remove
+        :rtype: :obj:`list` <:obj:`str`>
+        """
+        paths = []
+        for ts, vs in cpmap.items():
+            vv = None
+            if not ts:
+                vv = vs
+            if not vs:
+                vv = ts
+            if vv and isinstance(vv, basestring):
+                paths.append(vv)
+        for line in cplist:
+            vv = None
+            if line:
+                if len(line) == 1 and line[0]:
+                    vv = line[0]
+                elif len(line) > 1:
+                    if line[0] and not line[1]:
+                        vv = line[0]
+                    if line[1] and not line[0]:
+                        vv = line[1]
+                if vv and isinstance(vv, basestring):
+                    paths.append(vv)
+        return paths
+
+    @classmethod
+    def _copied_paths(cls, cpmap, cplist):
+        """ provides input metadata paths of the copy map
+
+        :param cpmap: copy map dictionary
+        :type cpmap: :obj:`dict` <:obj:`str`, :obj:`str`>
+        :param cplist: copy list
+        :type cplist: :obj:`list` < [:obj:`str`, :obj:`str`] >
+        :returns: metadata paths to copy
+        :rtype: :obj:`list` <:obj:`str`>
+        """
+        paths = [vs for ts, vs in cpmap.items()
+                 if ts and vs and isinstance(ts, basestring)
+                 and isinstance(vs, basestring)]
+        paths.extend(
+            line[1] for line in cplist
+            if line and len(line) > 1 and line[0] and line[1]
+            and isinstance(line[0], basestring)
+            and isinstance(line[1], basestring))
+        return paths
+
+    @classmethod
+    def pruned_paths(cls, cmap=None, clist=None, cmapfield=None,
+                     metadata=None):
+        """ provides metadata paths which are removed by the copy map
+            and not read before their removal,
+            so their nexus subtrees do not need to be parsed
+
+        :param cmap: copy map dictionary
+        :type cmap: :obj:`dict` <:obj:`str`, :obj:`str`>
+        :param clist: copy list
+        :type clist: :obj:`list` < [:obj:`str`, :obj:`str`] >
+        :param cmapfield: copy map nexus field
+        :type cmapfield: :obj:`str`
+        :param metadata: metadata with the copy map field
+        :type metadata: :obj:`dict` <:obj:`str`, `any`>
+        :returns: metadata paths
+        :rtype: :obj:`list` <:obj:`str`>
+        """
+        cpmap = dict(cls.copymap)
+        cpmap.update(cmap or {})
+        rmlist = list(clist or [])
+        cplist = list(cls.copylist) + rmlist
+        if metadata:
+            mdlist = []
+            cls.append_copymap_field(metadata, cpmap, mdlist, cmapfield)
+            rmlist.extend(mdlist)
+            cplist.extend(mdlist)
+        read = cls._copied_paths(cpmap, cplist) + list(cls.readpaths)
+        if cmapfield:
+            read.append(cmapfield)
+        return [
+            path for path in cls._removed_paths(cpmap, rmlist)
+            if not any(rd == path or rd.startswith(path + ".")
+                       for rd in read)]
+
     @classmethod
     def _mergedict(self, dct1, dct2):
         for key in set(dct1) | set(dct2):
@@ -1053,17 +1134,21 @@ class BeamtimeLoader(object):
             if techniques_pids and len(techniques_pids) > it and \
                techniques_pids[it] is not None:
                 pid = techniques_pids[it]
-            elif te.startswith("http:/") and te in id_techniques.keys():
+            elif te.startswith("http:/") and te in id_techniques:
                 pid = te
                 name = id_techniques[pid]
             elif te in nexus_panet.keys():
                 pid = nexus_panet[te]
                 name = id_techniques[pid]
             elif te.startswith("PaNET"):
-                nm = "http://purl.org/pan-science/PaNET/%s" % te
-                if nm in id_techniques.keys():
+                nm = "%s%s" % (PANET_PREFIX, te)
+                if nm in id_techniques:
                     pid = nm
                     name = id_techniques[pid]
+            elif te:
+                pid = id_techniques.find(te)
+                if pid:
+                    name = id_techniques[pid]
             if pid:
                 result.append({"pid": pid, "name": name})
             elif name:
@@ -1072,6 +1157,150 @@ class BeamtimeLoader(object):
         return result
 
 
+class MetadataCache(object):
+
+    """ on-disk cache of generated metadata validated by the file inode,
+        size, mtime, the metadata options and digests of the beamtime,
+        scientific metadata and copy-map files
+    """
+
+    #: (:obj:`list` <:obj:`str`>) options which do not change metadata
+    ignored = ["output", "chmod", "cachedir", "nocache", "cachesize",
+               "cprofile", "cmdtimings", "subparser", "h5py", "h5cpp"]
+
+    #: (:obj:`list` <:obj:`str`>) options with names of read files
+    depends = ["beamtimemeta", "scientificmeta", "copymapfile"]
+
+    #: (:obj:`str`) suffix of cache entry files
+    suffix = ".nxsmdcache.json"
+
+    #: (:class:`re.Pattern`) names of cache entry files
+    entrypattern = re.compile(r"^[0-9a-f]{40}\.nxsmdcache\.json$")
+
+    def __init__(self, directory, filename, options, maxentries=1000):
+        """ constructor
+
+        :param directory: cache directory
+        :type directory: :obj:`str`
+        :param filename: nexus or fio file name
+        :type filename: :obj:`str`
+        :param options: parser options
+        :type options: :class:`argparse.Namespace`
+        :param maxentries: maximal number of cached entries
+        :type maxentries: :obj:`int`
+        """
+        #: (:obj:`str`) cache directory
+        self.directory = directory
+        #: (:obj:`int`) maximal number of cached entries
+        self.maxentries = maxentries
+        #: (:obj:`str`) cache entry file name
+        self.entryname = None
+        #: (:obj:`str`) cached metadata
+        self.__metadata = None
+        #: (:obj:`bool`) cache entry was read
+        self.__read = False
+        try:
+            fst = os.stat(filename)
+        except OSError:
+            return
+        mtime = getattr(fst, "st_mtime_ns", fst.st_mtime)
+        opts = dict((key, value) for key, value in vars(options).items()
+                    if key not in self.ignored)
+        key = json.dumps(
+            [os.path.realpath(filename), fst.st_ino, fst.st_size, mtime,
+             opts], sort_keys=True, default=str)
+        self.entryname = os.path.join(
+            directory, hashlib.sha1(key.encode()).hexdigest() + self.suffix)
+
+    @classmethod
+    def digest(cls, filename):
+        """ provides a digest of the file content
+
+        :param filename: file name
+        :type filename: :obj:`str`
+        :returns: sha1 digest or None if the file does not exist
+        :rtype: :obj:`str`
+        """
+        if not filename or not os.path.isfile(filename):
+            return None
+        sha = hashlib.sha1()
+        with open(filename, "rb") as fl:
+            for block in iter(lambda: fl.read(1 << 20), b""):
+                sha.update(block)
+        return sha.hexdigest()
+
+    def get(self):
+        """ provides valid cached metadata
+
+        :returns: cached metadata or None
+        :rtype: :obj:`str`
+        """
+        if self.__read or self.entryname is None:
+            return self.__metadata
+        self.__read = True
+        try:
+            with open(self.entryname) as fl:
+                entry = json.load(fl)
+        except Exception:
+            return None
+        for name, digest in entry.get("depends", {}).items():
+            if self.digest(name) != digest:
+                return None
+        try:
+            os.utime(self.entryname, None)
+        except OSError:
+            pass
+        self.__metadata = entry.get("metadata")
+        return self.__metadata
+
+    def store(self, metadata, options):
+        """ stores metadata and evicts the least recently used entries
+
+        :param metadata: generated metadata
+        :type metadata: :obj:`str`
+        :param options: parser options after the metadata generation
+        :type options: :class:`argparse.Namespace`
+        """
+        if self.entryname is None:
+            return
+        depends = {}
+        for name in self.depends:
+            filename = getattr(options, name, None)
+            if filename:
+                depends[os.path.abspath(filename)] = self.digest(filename)
+        try:
+            if not os.path.isdir(self.directory):
+                os.makedirs(self.directory)
+            tmpname = "%s.%s.tmp" % (self.entryname, os.getpid())
+            with open(tmpname, "w") as fl:
+                json.dump({"depends": depends, "metadata": metadata}, fl)
+            os.rename(tmpname, self.entryname)
+            self.evict()
+        except (OSError, IOError) as e:
+            sys.stderr.write(
+                "nxsfileinfo: metadata cannot be cached: '%s'\n" % str(e))
+            sys.stderr.flush()
+
+    def evict(self):
+        """ removes the least recently used entries over the limit,
+            other files in the cache directory are left untouched
+        """
+        entries = []
+        for name in os.listdir(self.directory):
+            if self.entrypattern.match(name):
+                path = os.path.join(self.directory, name)
+                try:
+                    entries.append((os.path.getmtime(path), path))
+                except OSError:
+                    pass
+        entries.sort()
+        for _, path in entries[:max(0, len(entries) - self.maxentries)]:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+
 class Metadata(Runner):
 
     """ Metadata runner"""
@@ -1087,6 +1316,8 @@ class Metadata(Runner):
         + "       nxsfileinfo metadata /user/data/myfile.nxs -s\n" \
         + "       nxsfileinfo metadata /user/data/myfile.nxs " \
         + "-a units,NX_class\n" \
+        + "       nxsfileinfo metadata /user/data/myfile.nxs " \
+        + "-b bt.json --cache-dir /tmp/nxsmetadata\n" \
         + "\n"
 
     def create(self):
@@ -1240,6 +1471,23 @@ class Metadata(Runner):
             "--copy-map-error", action="store_true",
             default=False, dest="copymaperror",
             help=("Raise an error when the copy map file does not exist"))
+        self._parser.add_argument(
+            "--cache-dir", dest="cachedir",
+            default=os.environ.get(CACHE_ENV) or None,
+            help=("directory of the metadata cache which reuses metadata"
+                  " of unchanged files generated with the same options."
+                  " The default is taken from the %s environment variable"
+                  % CACHE_ENV))
+        self._parser.add_argument(
+            "--cache-size", dest="cachesize", type=int, default=1000,
+            help=("maximal number of cached metadata entries,"
+                  " the least recently used *.nxsmdcache.json"
+                  " entries are removed."
+                  " The default: 1000"))
+        self._parser.add_argument(
+            "--no-cache", action="store_true",
+            default=False, dest="nocache",
+            help=("do not read or write the metadata cache"))
 
     def postauto(self):
         """ parser creator after autocomplete run """
@@ -1300,7 +1548,14 @@ class Metadata(Runner):
                 sys.stderr.flush()
                 self._parser.print_help()
                 sys.exit(255)
-        if options.args:
+        cache = None
+        if options.args and getattr(options, "cachedir", None) \
+           and not getattr(options, "nocache", False) \
+           and not options.puuid:
+            cache = MetadataCache(
+                options.cachedir, options.args[0], options,
+                getattr(options, "cachesize", 1000))
+        if options.args and (cache is None or cache.get() is None):
             wrmodule = WRITERS[writer.lower()]
             if not options.fileformat:
                 rt, ext = os.path.splitext(options.args[0])
@@ -1310,7 +1565,7 @@ class Metadata(Runner):
                 if options.fileformat in ['nxs', 'h5', 'nx', 'ndf']:
                     nxfl = filewriter.open_file(
                         options.args[0], readonly=True,
-                        writer=wrmodule)
+                        writer=wrmodule, access="metadata")
                     root = nxfl.root()
                 elif options.fileformat in ['fio']:
                     with open(options.args[0]) as fl:
@@ -1322,7 +1577,7 @@ class Metadata(Runner):
                 self._parser.print_help()
                 sys.exit(255)
 
-        self.show(root, options)
+        self.show(root, options, cache)
         if nxfl is not None:
             nxfl.close()
 
@@ -1343,6 +1598,50 @@ class Metadata(Runner):
             result['ownerGroup'] = "ingestor"
         return result
 
+    @classmethod
+    def _beamtimefile(cls, desc, identifier):
+        """ provides the beamtime file name stored in the metadata
+
+        :param desc: metadata dictionary
+        :type desc: :obj:`dict` <:obj:`str`, `any`>
+        :param identifier: experiment identifier key
+        :type identifier: :obj:`str`
+        :returns: beamtime file name or None
+        :rtype: :obj:`str`
+        """
+        try:
+            return desc["scientificMetadata"][identifier][
+                "beamtime_filename"]
+        except Exception:
+            return None
+
+    @classmethod
+    def _loader(cls, options, loaders, beamtimemeta=None, keep=False):
+        """ provides a beamtime loader which has been run
+
+        :param options: parser options
+        :type options: :class:`argparse.Namespace`
+        :param loaders: run loaders with their beamtime file names
+        :type loaders: :obj:`dict` <:obj:`str`, :class:`BeamtimeLoader`>
+        :param beamtimemeta: beamtime file name used if it is not
+                             given in the options
+        :type beamtimemeta: :obj:`str`
+        :param keep: keep the loader for a next call
+        :type keep: :obj:`bool`
+        :returns: beamtime loader
+        :rtype: :class:`BeamtimeLoader`
+        """
+        if not options.beamtimemeta and beamtimemeta is not None:
+            options = argparse.Namespace(**vars(options))
+            options.beamtimemeta = beamtimemeta
+        bl = loaders.pop(options.beamtimemeta, None)
+        if bl is None:
+            bl = BeamtimeLoader(options)
+            bl.run()
+        if keep:
+            loaders[options.beamtimemeta] = bl
+        return bl
+
     @classmethod
     def metadata(cls, root, options):
         """ get metadata from nexus and beamtime file
@@ -1428,6 +1727,8 @@ class Metadata(Runner):
 
         result = None
         nxsparser = None
+        # beamtime loaders which have already been run
+        loaders = {}
         if not hasattr(options, "fileformat"):
             options.fileformat = ""
         if options.args and not options.fileformat:
@@ -1450,7 +1751,31 @@ class Metadata(Runner):
                     nxsparser.oned = options.oned
                 if hasattr(options, "maxonedsize"):
                     nxsparser.maxonedsize = int(options.maxonedsize)
+                # group postfixes may rename metadata keys
+                # of groups colliding with fields
+                if not options.group_postfix:
+                    nxsparser.skippaths = BeamtimeLoader.pruned_paths(
+                        usercopymap, usercopylist, copymapfield)
                 nxsparser.parseMeta()
+                if nxsparser.skippaths:
+                    skippaths = set(nxsparser.skippaths)
+                    identifier = "experiment_identifier" \
+                        if len(nxsparser.description) == 1 \
+                        else "experimental_identifier"
+                    for desc in nxsparser.description:
+                        bl = cls._loader(
+                            options, loaders,
+                            cls._beamtimefile(desc, identifier), True)
+                        # a copy map stored in the file may read
+                        # from the skipped subtrees
+                        if not skippaths.issubset(
+                                BeamtimeLoader.pruned_paths(
+                                    usercopymap, usercopylist,
+                                    copymapfield, bl.merge(desc))):
+                            nxsparser.description = []
+                            nxsparser.skippaths = []
+                            nxsparser.parseMeta()
+                            break
             elif options.fileformat in ['fio']:
                 nxsparser = FIOFileParser(root)
                 nxsparser.group_postfix = options.group_postfix
@@ -1518,8 +1843,7 @@ class Metadata(Runner):
                                         "beamtime_filename"]
                     except Exception:
                         pass
-                bl = BeamtimeLoader(options)
-                bl.run()
+                bl = cls._loader(options, loaders)
                 result = bl.merge(desc)
                 result = bl.overwrite(
                     result, usercopymap or None,
@@ -1573,8 +1897,7 @@ class Metadata(Runner):
                                             "beamtime_filename"]
                         except Exception:
                             pass
-                    bl = BeamtimeLoader(options)
-                    bl.run()
+                    bl = cls._loader(options, loaders)
                     rst = bl.merge(desc)
                     rst = bl.overwrite(
                         rst, usercopymap or None,
@@ -1615,16 +1938,22 @@ class Metadata(Runner):
                 result, sort_keys=True, indent=4,
                 cls=numpyEncoderNull)
 
-    def show(self, root, options):
+    def show(self, root, options, cache=None):
         """ the main function
 
         :param options: parser options
         :type options: :class:`argparse.Namespace`
         :param root: nexus file root
         :type root: :class:`filewriter.FTGroup`
+        :param cache: metadata cache
+        :type cache: :class:`MetadataCache`
         """
         try:
-            metadata = self.metadata(root, options)
+            metadata = cache.get() if cache is not None else None
+            if metadata is None:
+                metadata = self.metadata(root, options)
+                if cache is not None and metadata:
+                    cache.store(metadata, options)
             if metadata:
                 if options.output:
                     chmod = None
@@ -3843,7 +4172,7 @@ class Attachment(Runner):
                 if options.fileformat in ['nxs', 'h5', 'nx', 'ndf']:
                     nxfl = filewriter.open_file(
                         options.args[0], readonly=True,
-                        writer=wrmodule)
+                        writer=wrmodule, access="metadata")
                     root = nxfl.root()
                 elif options.fileformat in ['fio']:
                     with open(options.args[0]) as fl:
@@ -4142,9 +4471,9 @@ class Attachment(Runner):
             entry = nxdata.parent
         if nxdata is None:
             entry = None
-            attrs = root.attributes
-            if hasattr(root, "names") and "default" in attrs.names():
-                nname = filewriter.first(attrs["default"].read())
+            attrs = root.attributes.read_all(["default"])
+            if hasattr(root, "names") and "default" in attrs:
+                nname = filewriter.first(attrs["default"])
                 if nname in root.names():
                     entry = root.open(nname)
             if entry is None:
@@ -4154,9 +4483,9 @@ class Attachment(Runner):
                         entry = root.open(enm)
                         break
             if entry is not None:
-                attrs = entry.attributes
-                if hasattr(entry, "names") and "default" in attrs.names():
-                    nname = filewriter.first(attrs["default"].read())
+                attrs = entry.attributes.read_all(["default"])
+                if hasattr(entry, "names") and "default" in attrs:
+                    nname = filewriter.first(attrs["default"])
                     if nname in entry.names():
                         nxdata = entry.open(nname)
             if entry is not None and nxdata is None:
@@ -4166,9 +4495,9 @@ class Attachment(Runner):
                         entry = entry.open(enm)
                         break
             if nxdata is not None:
-                attrs = nxdata.attributes
-                if hasattr(nxdata, "names") and "signal" in attrs.names():
-                    nname = filewriter.first(attrs["signal"].read())
+                attrs = nxdata.attributes.read_all(["signal"])
+                if hasattr(nxdata, "names") and "signal" in attrs:
+                    nname = filewriter.first(attrs["signal"])
                     if nname in nxdata.names():
                         sgnode = nxdata.open(nname)
             if nxdata is not None and (override or sgnode is None) and \
@@ -4195,11 +4524,10 @@ class Attachment(Runner):
                             hasattr(nxdata, "names") and \
                             "program_name" in entry.names():
                         pn = entry.open("program_name")
-                        attr = pn.attributes
-                        names = [att.name for att in attr]
-                        if "scan_command" in names:
+                        avalues = pn.attributes.read_all(["scan_command"])
+                        if "scan_command" in avalues:
                             scommand = filewriter.first(
-                                attr["scan_command"].read())
+                                avalues["scan_command"])
                             ax = self._axesfromcommand(
                                 scommand, scmdaxes, nxdata, axes)
                             if ax:
@@ -4259,12 +4587,9 @@ class Attachment(Runner):
         sdata = sgnode[frame, :, :]
         sunits = None
         slname = None
-        if "units" in sgnode.attributes.names():
-            sunits = filewriter.first(
-                sgnode.attributes["units"].read())
-        if "long_name" in sgnode.attributes.names():
-            slname = filewriter.first(
-                sgnode.attributes["long_name"].read())
+        savalues = sgnode.attributes.read_all(["units", "long_name"])
+        sunits = filewriter.first(savalues.get("units"))
+        slname = filewriter.first(savalues.get("long_name"))
         if not override or not slabel:
             if slname:
                 slabel = "%s[%s]" % (slname, frame)
@@ -4305,12 +4630,9 @@ class Attachment(Runner):
         sdata = sgnode.read()
         sunits = None
         slname = None
-        if "units" in sgnode.attributes.names():
-            sunits = filewriter.first(
-                sgnode.attributes["units"].read())
-        if "long_name" in sgnode.attributes.names():
-            slname = filewriter.first(
-                sgnode.attributes["long_name"].read())
+        savalues = sgnode.attributes.read_all(["units", "long_name"])
+        sunits = filewriter.first(savalues.get("units"))
+        slname = filewriter.first(savalues.get("long_name"))
         if not override or not slabel:
             if slname:
                 slabel = slname
@@ -4352,10 +4674,9 @@ class Attachment(Runner):
         signal = sgnode.name
         nxdata = sgnode.parent
 
-        attrs = nxdata.attributes
-        if hasattr(nxdata, "names") and "axes" in attrs.names():
-
-            naxes = filewriter.first(attrs["axes"].read())
+        attrs = nxdata.attributes.read_all(["axes"])
+        if hasattr(nxdata, "names") and "axes" in attrs:
+            naxes = filewriter.first(attrs["axes"])
             if not override and naxes:
                 axes = [naxes]
         adata = []
@@ -4376,12 +4697,9 @@ class Attachment(Runner):
         aunits = None
         slname = None
         alname = None
-        if "units" in sgnode.attributes.names():
-            sunits = filewriter.first(
-                sgnode.attributes["units"].read())
-        if "long_name" in sgnode.attributes.names():
-            slname = filewriter.first(
-                sgnode.attributes["long_name"].read())
+        savalues = sgnode.attributes.read_all(["units", "long_name"])
+        sunits = filewriter.first(savalues.get("units"))
+        slname = filewriter.first(savalues.get("long_name"))
         if not override or not slabel:
             if slname:
                 slabel = slname
@@ -4389,11 +4707,10 @@ class Attachment(Runner):
                 slabel = signal
             if sunits:
                 slabel = "%s (%s)" % (slabel, sunits)
-        if anode is not None and "units" in anode.attributes.names():
-            aunits = filewriter.first(anode.attributes["units"].read())
-        if anode is not None and "long_name" in anode.attributes.names():
-            alname = filewriter.first(
-                anode.attributes["long_name"].read())
+        if anode is not None:
+            aavalues = anode.attributes.read_all(["units", "long_name"])
+            aunits = filewriter.first(aavalues.get("units"))
+            alname = filewriter.first(aavalues.get("long_name"))
         if (not override or not xlabel) and axes and axes[0]:
             if alname:
                 xlabel = alname
@@ -4755,6 +5072,7 @@ class Field(Runner):
         + "       nxsfileinfo field /user/data/myfile.nxs\n" \
         + "       nxsfileinfo field /user/data/myfile.nxs -g\n" \
         + "       nxsfileinfo field /user/data/myfile.nxs -s\n" \
+        + "       nxsfileinfo field /user/data/myfile.nxs --format jsonl\n" \
         + "\n"
 
     def create(self):
@@ -4790,6 +5108,19 @@ class Field(Runner):
             "-s", "--source", action="store_true",
             default=False, dest="source",
             help="show datasource parameters")
+        self._parser.add_argument(
+            "--format", dest="outputformat", default="table",
+            choices=["table", "jsonl", "csv"],
+            help="output format: table, jsonl (JSON lines) or csv."
+            " Default: table")
+        self._parser.add_argument(
+            "--sample-rows", dest="samplerows", type=int, default=None,
+            help="number of rows which fix the table column widths."
+            " Rows are printed as soon as the widths are fixed")
+        self._parser.add_argument(
+            "--column-widths", dest="columnwidths", default="",
+            help="fixed table column widths (separated by commas "
+            "without spaces), e.g. 'nexus_path=60,value=20'")
         self._parser.add_argument(
             "--h5py", action="store_true",
             default=False, dest="h5py",
@@ -4831,7 +5162,7 @@ class Field(Runner):
         try:
             fl = filewriter.open_file(
                 options.args[0], readonly=True,
-                writer=wrmodule)
+                writer=wrmodule, access="metadata")
         except Exception:
             sys.stderr.write("nxsfileinfo: File '%s' cannot be opened\n"
                              % options.args[0])
@@ -4880,17 +5211,37 @@ class Field(Runner):
         if options.values:
             values = options.values.split(',')
 
+        try:
+            widths = TableTools.parseWidths(options.columnwidths)
+        except ValueError as e:
+            sys.stderr.write("nxsfileinfo: %s\n" % str(e))
+            sys.stderr.flush()
+            self._parser.print_help()
+            sys.exit(255)
+
         nxsparser = NXSFileParser(root)
         nxsparser.filters = filters
         nxsparser.valuestostore = values
         nxsparser.parse()
 
-        description = []
-        ttools = TableTools(nxsparser.description, toshow)
+        stream = options.outputformat != "table" \
+            or options.samplerows is not None or bool(widths)
+        ttools = TableTools(nxsparser.description, toshow, stream=stream)
         ttools.title = "File name: '%s'" % options.args[0]
         ttools.headers = headers
-        description.extend(ttools.generateList())
-        print("\n".join(description))
+        if stream:
+            ttools.sample = options.samplerows
+            ttools.widths = widths
+            if options.outputformat == "jsonl":
+                rows = ttools.generateJSONLines()
+            elif options.outputformat == "csv":
+                rows = ttools.generateCSV()
+            else:
+                rows = ttools.generateRows()
+            for row in rows:
+                sys.stdout.write(row + "\n")
+        else:
+            print("\n".join(ttools.generateList()))
 
 
 def main():
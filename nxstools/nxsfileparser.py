@@ -196,6 +196,89 @@ def getdssource(xmlstring):
     return dssource
 
 
+class PathTrie(object):
+
+    """ Trie of path segments which tells if a subtree of nodes
+        may contain paths matched by the added fnmatch patterns
+        or if it lies below one of the added paths
+    """
+
+    #: (:obj:`str`) trie key which matches any path continuation
+    ANY = "*"
+
+    def __init__(self, patterns=None, separator="/", wildcards=True):
+        """ constructor
+
+        :param patterns: fnmatch patterns or paths
+        :type patterns: :obj:`list` <:obj:`str`>
+        :param separator: path separator
+        :type separator: :obj:`str`
+        :param wildcards: treat fnmatch special characters as wildcards
+        :type wildcards: :obj:`bool`
+        """
+        #: (:obj:`str`) path separator
+        self.separator = separator
+        #: (:obj:`bool`) treat fnmatch special characters as wildcards
+        self.wildcards = wildcards
+        #: (:obj:`dict` <:obj:`str`, :obj:`dict`>) trie nodes,
+        #:    the None key marks the end of a path
+        self.__root = {}
+        for pattern in patterns or []:
+            self.add(pattern)
+
+    def add(self, pattern):
+        """ adds a pattern or a path into the trie
+
+        Segments from the first one with a wildcard are replaced by
+        the ANY key since `*` in fnmatch also matches the separator.
+
+        :param pattern: fnmatch pattern or path
+        :type pattern: :obj:`str`
+        """
+        node = self.__root
+        for segment in pattern.split(self.separator):
+            if self.wildcards and \
+               ("*" in segment or "?" in segment or "[" in segment):
+                node[self.ANY] = {}
+                return
+            node = node.setdefault(segment, {})
+        node[None] = {}
+
+    def descends(self, path):
+        """ checks if any node below the path may match a pattern
+
+        :param path: node path
+        :type path: :obj:`str`
+        :returns: if the node subtree has to be traversed
+        :rtype: :obj:`bool`
+        """
+        node = self.__root
+        for segment in path.rstrip(self.separator).split(self.separator):
+            if self.wildcards and self.ANY in node:
+                return True
+            if segment not in node:
+                return False
+            node = node[segment]
+        return any(key is not None for key in node.keys())
+
+    def covers(self, path):
+        """ checks if the path is one of the added paths or lies below them
+
+        :param path: node path
+        :type path: :obj:`str`
+        :returns: if the path is covered by the trie
+        :rtype: :obj:`bool`
+        """
+        node = self.__root
+        for segment in path.split(self.separator):
+            if None in node or (self.wildcards and self.ANY in node):
+                return True
+            if segment not in node:
+                return False
+            node = node[segment]
+        return None in node or (self.wildcards and self.ANY in node)
+
+
 class NXSFileParser(object):
 
     """ Metadata parser for NeXus files
@@ -264,6 +347,11 @@ class NXSFileParser(object):
         self.__root = root
         #: (:obj:`list`< :obj:`str`>)  filters for `full_path` names
         self.filters = []
+        #: (:obj:`list`< :obj:`str`>)  dotted metadata paths of subtrees
+        #:     which are not parsed by parseMeta
+        self.skippaths = []
+        #: (:class:`PathTrie`) trie of filters or skipped paths
+        self.__trie = None
         # (:obj:`bool`) oned value flag
         self.oned = False
         # (:obj:`int`) maximal 1d record size
@@ -301,11 +389,11 @@ class NXSFileParser(object):
         if hasattr(node, "shape"):
             desc["shape"] = [int(n) for n in (node.shape or [])]
         if hasattr(node, "attributes"):
-            attrs = node.attributes
-            anames = [at.name for at in attrs]
+            avalues = node.attributes.read_all(
+                [vl[0] for vl in self.attrdesc.values()])
             for key, vl in self.attrdesc.items():
-                if vl[0] in anames:
-                    desc[key] = vl[1](filewriter.first(attrs[vl[0]].read()))
+                if vl[0] in avalues:
+                    desc[key] = vl[1](filewriter.first(avalues[vl[0]]))
         if node.name in self.valuestostore and node.is_valid:
             try:
                 vl = node.read()
@@ -347,9 +435,12 @@ class NXSFileParser(object):
         :param tgpath: target path of the link target or `None`
         :type tgpath: :obj:`str`
         """
-        self.__addnode(node, tgpath)
+        path = filewriter.first(node.path)
+        if self.__trie is None or self.__match(path):
+            self.__addnode(node, tgpath)
         names = []
-        if isinstance(node, filewriter.FTGroup):
+        if isinstance(node, filewriter.FTGroup) and \
+           (self.__trie is None or self.__trie.descends(path)):
             names = [
                 (ch.name,
                  str(ch.target_path) if hasattr(ch, "target_path") else None)
@@ -395,14 +486,14 @@ class NXSFileParser(object):
                 else:
                     gr = dct[name] = {}
                 ch = node.open(nm[0])
-                self.__parsemeta(ch, gr)
+                self.__parsemeta(ch, gr, name)
 #            except Exception:
 #                pass
             finally:
                 pass
         lst.append(dct)
 
-    def __parsemeta(self, node, dct):
+    def __parsemeta(self, node, dct, parent=""):
         """parses the node and add it into the description list
 
         :param node: nexus node
@@ -412,7 +503,15 @@ class NXSFileParser(object):
                     :class:`filewriter.FTGroup`
         :param dct: metadata dictionary
         :type dct: :obj:`dict` <:obj:`str`, `any`>
+        :param parent: dotted metadata path of the parent node
+        :type parent: :obj:`str`
         """
+        name = node.name
+        if isinstance(node, filewriter.FTGroup):
+            name += self.group_postfix
+        mpath = "%s.%s" % (parent, name) if parent else name
+        if self.__trie is not None and self.__trie.covers(mpath):
+            return
         self.__addmeta(node, dct)
         names = []
         if isinstance(node, filewriter.FTGroup):
@@ -434,7 +533,7 @@ class NXSFileParser(object):
                 else:
                     gr = dct[name] = {}
                 ch = node.open(nm[0])
-                self.__parsemeta(ch, gr)
+                self.__parsemeta(ch, gr, mpath)
 #            except Exception:
 #                pass
             finally:
@@ -496,28 +595,31 @@ class NXSFileParser(object):
         if hasattr(node, "shape"):
             desc["shape"] = [int(n) for n in (node.shape or [])]
         if hasattr(node, "attributes"):
-            attrs = node.attributes
-            anames = [at.name for at in attrs]
+            if self.attrs is not None:
+                avalues = node.attributes.read_all(
+                    list(self.attrs) +
+                    [vl[0] for vl in self.mattrdesc.values()])
+            else:
+                avalues = node.attributes.read_all()
             for key, vl in self.mattrdesc.items():
-                if vl[0] in anames and \
+                if vl[0] in avalues and \
                    (self.attrs is None or key in self.attrs) and \
                    (self.hiddenattrs is None or key not in self.hiddenattrs):
-                    nd[key] = vl[1](filewriter.first(attrs[vl[0]].read()))
+                    nd[key] = vl[1](filewriter.first(avalues[vl[0]]))
 
             if self.attrs is not None:
                 for at in self.attrs:
-                    if at in anames:
-                        if at in self.attrs and \
-                           at not in self.mattrdesc.keys() and \
+                    if at in avalues:
+                        if at not in self.mattrdesc.keys() and \
                            (self.hiddenattrs is None or
                                 at not in self.hiddenattrs):
-                            nd[at] = filewriter.first(attrs[at].read())
+                            nd[at] = filewriter.first(avalues[at])
             else:
-                for at in anames:
+                for at in avalues.keys():
                     if at not in self.mattrdesc.keys() and \
                        (self.hiddenattrs is None or
                             at not in self.hiddenattrs):
-                        nd[at] = filewriter.first(attrs[at].read())
+                        nd[at] = filewriter.first(avalues[at])
             if self.scientific and "NX_class" in nd.keys() and \
                nd["NX_class"] == "NXentry":
                 nd.pop("NX_class")
@@ -568,6 +670,19 @@ class NXSFileParser(object):
                 nd["shape"] = desc["shape"]
         return smname
 
+    def __match(self, path):
+        """checks if the full_path matches one of the filters
+
+        :param path: nexus full_path
+        :type path: :obj:`str`
+        :returns: if the full_path matches
+        :rtype: :obj:`bool`
+        """
+        for df in self.filters:
+            if fnmatch.fnmatch(path, df):
+                return True
+        return False
+
     def __filter(self):
         """filters description list
 
@@ -588,13 +703,32 @@ class NXSFileParser(object):
     def parse(self):
         """parses the file and creates the filtered description list
 
+        Subtrees which cannot contain paths matched by the filters
+        are not traversed.
         """
-        self.__parsenode(self.__root)
+        self.__trie = PathTrie(self.filters) if self.filters else None
+        try:
+            self.__parsenode(self.__root)
+        finally:
+            self.__trie = None
         self.__filter()
 
     def parseMeta(self):
         """parses the file and creates the filtered description list
 
+        Subtrees of the entries with metadata paths in skippaths
+        are not traversed.
+        """
+        self.__trie = PathTrie(self.skippaths, ".", False) \
+            if self.skippaths else None
+        try:
+            self.__parsemetaentries()
+        finally:
+            self.__trie = None
+
+    def __parsemetaentries(self):
+        """parses the entries and creates the description list
+
         """
         for entry in self.__root:
             nm = entry.name
@@ -19,12 +19,19 @@
 """ Command-line tool for ascess to the nexdatas configuration server """
 
 import sys
+import csv
 import json
 import fnmatch
+import itertools
 import xml.etree.ElementTree as et
 import lxml.etree
 from lxml.etree import XMLParser
 
+try:
+    from cStringIO import StringIO
+except ImportError:
+    from io import StringIO
+
 
 if sys.version_info > (3,):
     unicode = str
@@ -270,17 +277,31 @@ class ParserTools(object):
             rxml = _toxml(indom1)
         return rxml
 
+    @classmethod
+    def parseDocument(cls, xmlc):
+        """ parses xml string into a document with precomputed node paths
+
+        :param xmlc: xml string or parsed document
+        :type xmlc: :obj:`str` or :class:`ParsedDocument`
+        :returns: parsed document
+        :rtype: :class:`ParsedDocument`
+        """
+        if isinstance(xmlc, ParsedDocument):
+            return xmlc
+        return ParsedDocument(xmlc)
+
     @classmethod
     def parseDataSources(cls, xmlc):
         """ provides datasources and its records from xml string
 
-        :param xmlc: xml string
-        :type xmlc: :obj:`str`
+        :param xmlc: xml string or parsed document
+        :type xmlc: :obj:`str` or :class:`ParsedDocument`
         :returns: list of datasource descriptions
         :rtype: :obj:`list` <:obj:`dict` <:obj:`str`, :obj:`str`>>
         """
-        indom = _parseString(xmlc)
-        return cls.__getDataSources(indom)
+        document = cls.parseDocument(xmlc)
+        return cls.__describeDataSources(
+            [nd for nd, _, _ in document.nodes("datasource")])
 
     @classmethod
     def __getDataSources(cls, node, direct=False):
@@ -298,6 +319,17 @@ class ParserTools(object):
             if node.tag == "datasource":
                 dss.append(node)
             dss.extend(node.findall(".//datasource"))
+        return cls.__describeDataSources(dss)
+
+    @classmethod
+    def __describeDataSources(cls, dss):
+        """ provides descriptions of datasource nodes
+
+        :param dss: datasource nodes
+        :type dss: :obj:`list` <:class:`lxml.etree.Element`>
+        :returns: list of datasource descriptions
+        :rtype: :obj:`list` <:obj:`dict` <:obj:`str`, :obj:`str`>>
+        """
         dslist = []
         for ds in dss:
             if ds.tag == 'datasource':
@@ -312,79 +344,6 @@ class ParserTools(object):
 
         return dslist
 
-    @classmethod
-    def __getPath(cls, node):
-        """ provides node path
-
-        :param node: etree node
-        :type node: :class:`lxml.etree.Element`
-        :returns: node path
-        :rtype: :obj:`str`
-        """
-        name = cls.__getAttr(node, "name")
-        if not name:
-            return ""
-        attr = False
-        while node.getparent() is not None:
-            onode = node
-            node = node.getparent()
-            if onode.tag == "attribute":
-                attr = True
-            else:
-                attr = False
-            if node.tag not in ["group", "field"]:
-                return name
-            else:
-                gname = cls.__getAttr(node, "name")
-                if not gname:
-                    gname = cls.__getAttr(node, "type")
-                    if len(gname) > 2:
-                        gname = gname[2:]
-                if attr:
-                    name = gname + "@" + name
-                else:
-                    name = gname + "/" + name
-                attr = False
-        return name
-
-    @classmethod
-    def __getFullPath(cls, node):
-        """ provides node path
-
-        :param node: etree node
-        :type node: :class:`lxml.etree.Element`
-        :returns: node path
-        :rtype: :obj:`str`
-        """
-        name = cls.__getAttr(node, "name")
-        if not name:
-            return ""
-        attr = False
-        while node.getparent() is not None:
-            onode = node
-            node = node.getparent()
-            if onode.tag == "attribute":
-                attr = True
-            else:
-                attr = False
-            if node.tag not in ["group", "field"]:
-                return name
-            else:
-                gname = cls.__getAttr(node, "name")
-                nxtype = cls.__getAttr(node, "type")
-                if not gname:
-                    if len(nxtype) > 2:
-                        gname = nxtype[2:]
-                if attr:
-                    name = gname + "@" + name
-                elif nxtype:
-                    name = "%s:%s/%s" % (gname, nxtype, name)
-                else:
-                    name = gname + "/" + name
-
-                attr = False
-        return name
-
     @classmethod
     def __getAttr(cls, node, name, tag=False):
         """ provides value of attirbute
@@ -489,72 +448,64 @@ class ParserTools(object):
     def parseFields(cls, xmlc):
         """ provides datasources and its records from xml string
 
-        :param xmlc: xml string
-        :type xmlc: :obj:`str`
+        :param xmlc: xml string or parsed document
+        :type xmlc: :obj:`str` or :class:`ParsedDocument`
         :returns: list of datasource descriptions
         :rtype: :obj:`list` < :obj:`dict` <:obj:`str`, `any`> >
         """
-        tagname = "field"
-        indom = _parseString(xmlc)
-        nodes = []
-        if indom.tag == tagname:
-            nodes.append(indom)
-        nodes.extend(indom.findall(".//%s" % tagname))
+        document = cls.parseDocument(xmlc)
         taglist = []
-        for nd in nodes:
-            if nd.tag == tagname:
-                nxtype = cls.__getAttr(nd, "type")
-                units = cls.__getAttr(nd, "units")
-                value = cls._getPureText(nd) or None
-                trtype = cls.__getAttr(nd, "transformation_type", True)
-                trvector = cls.__getAttr(nd, "vector", True)
-                troffset = cls.__getAttr(nd, "offset", True)
-                trdependson = cls.__getAttr(nd, "depends_on", True)
-                nxpath = cls.__getPath(nd)
-                fullnxpath = cls.__getFullPath(nd)
-                dnodes = cls.__getChildrenByTagName(nd, "dimensions")
-                shape = cls.__getShape(dnodes[0]) if dnodes else None
-                docnodes = cls.__getChildrenByTagName(nd, "doc")
-                doc = cls._getPureText((docnodes[0])) if docnodes else None
-                stnodes = cls.__getChildrenByTagName(nd, "strategy")
-                strategy = cls.__getAttr(stnodes[0], "mode") \
-                    if stnodes else None
-
-                sfdinfo = {
-                    "strategy": strategy,
-                    "nexus_path": nxpath,
-                    "full_nexus_path": fullnxpath,
-                }
-                fdinfo = {
-                    "nexus_type": nxtype,
-                    "units": units,
-                    "shape": shape,
-                    "trans_type": trtype,
-                    "trans_vector": trvector,
-                    "trans_offset": troffset,
-                    "depends_on": trdependson,
-                    "value": value,
-                    "doc": doc
-                }
-                fdinfo.update(sfdinfo)
-                otherinfo = cls.__getAllAttr(nd, list(fdinfo.keys()))
-                fdinfo.update(otherinfo)
-                dss = cls.__getDataSources(nd, direct=True)
-                if dss:
-                    for ds in dss:
-                        ds.update(fdinfo)
-                        taglist.append(ds)
-                        nddss = cls.__getChildrenByTagName(nd, "datasource")
-                        for ndds in nddss:
-                            sdss = cls.__getDataSources(ndds, direct=True)
-                            if sdss:
-                                for sds in sdss:
-                                    sds.update(sfdinfo)
-                                    sds["source_name"] \
-                                        = "\\" + sds["source_name"]
-                                    taglist.append(sds)
-                else:
-                    taglist.append(fdinfo)
+        for nd, nxpath, fullnxpath in document.nodes("field"):
+            nxtype = cls.__getAttr(nd, "type")
+            units = cls.__getAttr(nd, "units")
+            value = cls._getPureText(nd) or None
+            trtype = cls.__getAttr(nd, "transformation_type", True)
+            trvector = cls.__getAttr(nd, "vector", True)
+            troffset = cls.__getAttr(nd, "offset", True)
+            trdependson = cls.__getAttr(nd, "depends_on", True)
+            dnodes = cls.__getChildrenByTagName(nd, "dimensions")
+            shape = cls.__getShape(dnodes[0]) if dnodes else None
+            docnodes = cls.__getChildrenByTagName(nd, "doc")
+            doc = cls._getPureText((docnodes[0])) if docnodes else None
+            stnodes = cls.__getChildrenByTagName(nd, "strategy")
+            strategy = cls.__getAttr(stnodes[0], "mode") \
+                if stnodes else None
+
+            sfdinfo = {
+                "strategy": strategy,
+                "nexus_path": nxpath,
+                "full_nexus_path": fullnxpath,
+            }
+            fdinfo = {
+                "nexus_type": nxtype,
+                "units": units,
+                "shape": shape,
+                "trans_type": trtype,
+                "trans_vector": trvector,
+                "trans_offset": troffset,
+                "depends_on": trdependson,
+                "value": value,
+                "doc": doc
+            }
+            fdinfo.update(sfdinfo)
+            otherinfo = cls.__getAllAttr(nd, list(fdinfo.keys()))
+            fdinfo.update(otherinfo)
+            dss = cls.__getDataSources(nd, direct=True)
+            if dss:
+                for ds in dss:
+                    ds.update(fdinfo)
+                    taglist.append(ds)
+                    nddss = cls.__getChildrenByTagName(nd, "datasource")
+                    for ndds in nddss:
+                        sdss = cls.__getDataSources(ndds, direct=True)
+                        if sdss:
+                            for sds in sdss:
+                                sds.update(sfdinfo)
+                                sds["source_name"] \
+                                    = "\\" + sds["source_name"]
+                                taglist.append(sds)
+            else:
+                taglist.append(fdinfo)
 
         return taglist
 
@@ -562,67 +513,58 @@ class ParserTools(object):
     def parseAttributes(cls, xmlc):
         """ provides datasources and its records from xml string
 
-        :param xmlc: xml string
-        :type xmlc: :obj:`str`
+        :param xmlc: xml string or parsed document
+        :type xmlc: :obj:`str` or :class:`ParsedDocument`
         :returns: list of datasource descriptions
         :rtype: :obj:`list` < :obj:`dict` <:obj:`str`, `any`> >
         """
-        tagname = "attribute"
-        indom = _parseString(xmlc)
-        nodes = []
-        if indom.tag == tagname:
-            nodes.append(indom)
-        nodes.extend(indom.findall(".//%s" % tagname))
+        document = cls.parseDocument(xmlc)
         taglist = []
-        for nd in nodes:
-            if nd.tag == tagname:
-
-                nxtype = cls.__getAttr(nd, "type")
-                units = cls.__getAttr(nd, "units")
-                value = cls._getPureText(nd) or None
-                trtype = cls.__getAttr(nd, "transformation_type", True)
-                trvector = cls.__getAttr(nd, "vector", True)
-                troffset = cls.__getAttr(nd, "offset", True)
-                trdependson = cls.__getAttr(nd, "depends_on", True)
-                nxpath = cls.__getPath(nd)
-                fullnxpath = cls.__getFullPath(nd)
-                dnodes = cls.__getChildrenByTagName(nd, "dimensions")
-                shape = cls.__getShape(dnodes[0]) if dnodes else None
-                stnodes = cls.__getChildrenByTagName(nd, "strategy")
-                strategy = cls.__getAttr(stnodes[0], "mode") \
-                    if stnodes else None
-                sfdinfo = {
-                    "strategy": strategy,
-                    "nexus_path": nxpath,
-                    "full_nexus_path": fullnxpath,
-                }
-                fdinfo = {
-                    "nexus_type": nxtype,
-                    "units": units,
-                    "shape": shape,
-                    "trans_type": trtype,
-                    "trans_vector": trvector,
-                    "trans_offset": troffset,
-                    "depends_on": trdependson,
-                    "value": value
-                }
-                fdinfo.update(sfdinfo)
-                dss = cls.__getDataSources(nd, direct=True)
-                if dss:
-                    for ds in dss:
-                        ds.update(fdinfo)
-                        taglist.append(ds)
-                        nddss = cls.__getChildrenByTagName(nd, "datasource")
-                        for ndds in nddss:
-                            sdss = cls.__getDataSources(ndds, direct=True)
-                            if sdss:
-                                for sds in sdss:
-                                    sds.update(sfdinfo)
-                                    sds["source_name"] \
-                                        = "\\" + sds["source_name"]
-                                    taglist.append(sds)
-                else:
-                    taglist.append(fdinfo)
+        for nd, nxpath, fullnxpath in document.nodes("attribute"):
+            nxtype = cls.__getAttr(nd, "type")
+            units = cls.__getAttr(nd, "units")
+            value = cls._getPureText(nd) or None
+            trtype = cls.__getAttr(nd, "transformation_type", True)
+            trvector = cls.__getAttr(nd, "vector", True)
+            troffset = cls.__getAttr(nd, "offset", True)
+            trdependson = cls.__getAttr(nd, "depends_on", True)
+            dnodes = cls.__getChildrenByTagName(nd, "dimensions")
+            shape = cls.__getShape(dnodes[0]) if dnodes else None
+            stnodes = cls.__getChildrenByTagName(nd, "strategy")
+            strategy = cls.__getAttr(stnodes[0], "mode") \
+                if stnodes else None
+            sfdinfo = {
+                "strategy": strategy,
+                "nexus_path": nxpath,
+                "full_nexus_path": fullnxpath,
+            }
+            fdinfo = {
+                "nexus_type": nxtype,
+                "units": units,
+                "shape": shape,
+                "trans_type": trtype,
+                "trans_vector": trvector,
+                "trans_offset": troffset,
+                "depends_on": trdependson,
+                "value": value
+            }
+            fdinfo.update(sfdinfo)
+            dss = cls.__getDataSources(nd, direct=True)
+            if dss:
+                for ds in dss:
+                    ds.update(fdinfo)
+                    taglist.append(ds)
+                    nddss = cls.__getChildrenByTagName(nd, "datasource")
+                    for ndds in nddss:
+                        sdss = cls.__getDataSources(ndds, direct=True)
+                        if sdss:
+                            for sds in sdss:
+                                sds.update(sfdinfo)
+                                sds["source_name"] \
+                                    = "\\" + sds["source_name"]
+                                taglist.append(sds)
+            else:
+                taglist.append(fdinfo)
 
         return taglist
 
@@ -630,56 +572,49 @@ class ParserTools(object):
     def parseLinks(cls, xmlc):
         """ provides datasources and its records from xml string
 
-        :param xmlc: xml string
-        :type xmlc: :obj:`str`
+        :param xmlc: xml string or parsed document
+        :type xmlc: :obj:`str` or :class:`ParsedDocument`
         :returns: list of datasource descriptions
         :rtype: :obj:`list` < :obj:`dict` <:obj:`str`, `any`> >
         """
-        tagname = "link"
-        indom = _parseString(xmlc)
-        nodes = []
-        if indom.tag == tagname:
-            nodes.append(indom)
-        nodes.extend(indom.findall(".//%s" % tagname))
+        document = cls.parseDocument(xmlc)
         taglist = []
-        for nd in nodes:
-            if nd.tag == tagname:
-
-                target = cls.__getAttr(nd, "target")
-                value = cls._getPureText(nd) or None
-                nxpath = cls.__getPath(nd)
-                stnodes = cls.__getChildrenByTagName(nd, "strategy")
-                strategy = cls.__getAttr(stnodes[0], "mode") \
-                    if stnodes else None
-
-                sfdinfo = {
-                    "strategy": strategy,
-                    "nexus_path": "[%s]" % nxpath,
-                }
-                fdinfo = {
-                    "value": value
-                }
-                fdinfo.update(sfdinfo)
-                dss = cls.__getDataSources(nd, direct=True)
-                if dss:
-                    for ds in dss:
-                        ds.update(fdinfo)
-                        taglist.append(ds)
-                        nddss = cls.__getChildrenByTagName(nd, "datasource")
-                        for ndds in nddss:
-                            sdss = cls.__getDataSources(ndds, direct=True)
-                            if sdss:
-                                for sds in sdss:
-                                    sds.update(sfdinfo)
-                                    sds["source_name"] \
-                                        = "\\" + sds["source_name"]
-                                    taglist.append(sds)
-                else:
-                    taglist.append(fdinfo)
-                    if target and target.strip():
-                        fdinfo2 = dict(fdinfo)
-                        fdinfo2["nexus_path"] = "\\-> %s" % target
-                        taglist.append(fdinfo2)
+        for nd, nxpath, _ in document.nodes("link"):
+
+            target = cls.__getAttr(nd, "target")
+            value = cls._getPureText(nd) or None
+            stnodes = cls.__getChildrenByTagName(nd, "strategy")
+            strategy = cls.__getAttr(stnodes[0], "mode") \
+                if stnodes else None
+
+            sfdinfo = {
+                "strategy": strategy,
+                "nexus_path": "[%s]" % nxpath,
+            }
+            fdinfo = {
+                "value": value
+            }
+            fdinfo.update(sfdinfo)
+            dss = cls.__getDataSources(nd, direct=True)
+            if dss:
+                for ds in dss:
+                    ds.update(fdinfo)
+                    taglist.append(ds)
+                    nddss = cls.__getChildrenByTagName(nd, "datasource")
+                    for ndds in nddss:
+                        sdss = cls.__getDataSources(ndds, direct=True)
+                        if sdss:
+                            for sds in sdss:
+                                sds.update(sfdinfo)
+                                sds["source_name"] \
+                                    = "\\" + sds["source_name"]
+                                taglist.append(sds)
+            else:
+                taglist.append(fdinfo)
+                if target and target.strip():
+                    fdinfo2 = dict(fdinfo)
+                    fdinfo2["nexus_path"] = "\\-> %s" % target
+                    taglist.append(fdinfo2)
 
         return taglist
 
@@ -696,12 +631,94 @@ class ParserTools(object):
         return cls.getRecord(indom)
 
 
+class ParsedDocument(object):
+
+    """ xml configuration parsed once with precomputed node paths
+    """
+
+    #: (:obj:`list` <:obj:`str`>) tags of collected nodes
+    tags = ["field", "attribute", "link", "datasource"]
+
+    def __init__(self, xmlc):
+        """ constructor
+
+        :param xmlc: xml string
+        :type xmlc: :obj:`str`
+        """
+        #: (:class:`lxml.etree.Element`) root node
+        self.root = _parseString(xmlc)
+        #: (:obj:`dict` <:obj:`str`, :obj:`list` <(
+        #:    :class:`lxml.etree.Element`, :obj:`str`, :obj:`str`)> >)
+        #:    (node, nexus path, full nexus path) tuples by tag name
+        self.__nodes = dict((tag, []) for tag in self.tags)
+        self.__traverse()
+
+    def nodes(self, tagname):
+        """ provides nodes with their paths in the document order
+
+        :param tagname: tag name
+        :type tagname: :obj:`str`
+        :returns: (node, nexus path, full nexus path) tuples
+        :rtype: :obj:`list` <(:class:`lxml.etree.Element`,
+                :obj:`str`, :obj:`str`)>
+        """
+        return self.__nodes.get(tagname, [])
+
+    def __traverse(self):
+        """ collects nodes and computes their paths in one top-down pass
+        """
+        containers = ["group", "field"]
+        # (node, parent path, parent full path,
+        #  parent full path for attributes)
+        stack = [(self.root, None, None, None)]
+        while stack:
+            node, ppath, pfull, pattr = stack.pop()
+            tag = node.tag
+            name = node.attrib.get("name")
+            if tag in self.__nodes:
+                path = ""
+                fullpath = ""
+                if name:
+                    if ppath is None:
+                        path = name
+                        fullpath = name
+                    elif tag == "attribute":
+                        path = "%s@%s" % (ppath, name)
+                        fullpath = "%s@%s" % (pattr, name)
+                    else:
+                        path = "%s/%s" % (ppath, name)
+                        fullpath = "%s/%s" % (pfull, name)
+                self.__nodes[tag].append((node, path, fullpath))
+            if tag in containers:
+                nxtype = node.attrib.get("type")
+                gname = name
+                if not gname:
+                    gname = nxtype or ""
+                    if len(gname) > 2:
+                        gname = gname[2:]
+                fname = name
+                if not fname and nxtype and len(nxtype) > 2:
+                    fname = nxtype[2:]
+                prefix = "" if ppath is None else pfull + "/"
+                cpath = gname if ppath is None else "%s/%s" % (ppath, gname)
+                cfull = prefix + (
+                    "%s:%s" % (fname, nxtype) if nxtype else "%s" % fname)
+                cattr = prefix + "%s" % fname
+            else:
+                cpath = cfull = cattr = None
+            stack.extend(
+                (child, cpath, cfull, cattr)
+                for child in reversed(node)
+                if isinstance(child.tag, str))
+
+
 class TableTools(object):
 
     """ configuration server adapter
     """
 
-    def __init__(self, description, nonone=None, headers=None, filters=None):
+    def __init__(self, description, nonone=None, headers=None, filters=None,
+                 stream=False):
         """ constructor
 
         :param description: description list
@@ -712,6 +729,8 @@ class TableTools(object):
         :type headers: :obj:`list` <:obj:`str`>
         :param filters:  filters for first column names
         :type filters: :obj:`list` <:obj:`str`>
+        :param stream: consume the description lazily while generating rows
+        :type stream: :obj:`bool`
         """
         #: (:obj:`list` <:obj:`str`>)
         #:    list of parameters which have to exist to be shown
@@ -746,19 +765,33 @@ class TableTools(object):
 
         #: (:obj:`str`) table title
         self.title = None
-        self.loadDescription(description)
+        #: (:obj:`int`) number of streamed rows which fix column widths,
+        #:    all rows if None
+        self.sample = None
+        #: (:obj:`dict` <:obj:`str` , :obj:`int`>) fixed column widths
+        self.widths = {}
+        #: (:obj:`str`) column name used by filters
+        self.__filterkey = self.headers[0] if self.headers else None
+        #: (:obj:`iter` <:obj:`dict` <:obj:`str`, `any`> >)
+        #:    description to be streamed
+        self.__stream = None
+        if stream:
+            self.__stream = iter(description)
+        else:
+            self.loadDescription(description)
 
-    def loadDescription(self, description):
-        """ loads description
+    def __filterDescription(self, description):
+        """ filters description rows
 
         :param description:  description list
         :type description:  :obj:`list` <:obj:`str`>
+        :returns: generator of shown rows
+        :rtype: :obj:`iter` <:obj:`dict` <:obj:`str`, `any`> >
         """
-        if self.headers:
-            hkey = self.headers[0]
+        hkey = self.__filterkey
         for desc in description:
             if desc is None:
-                self.__description.append(desc)
+                yield desc
                 continue
             skip = False
             found = False
@@ -786,20 +819,36 @@ class TableTools(object):
             elif not self.filters:
                 found = True
             if not skip and found:
-                self.__description.append(desc)
+                yield desc
+
+    def __updateSizes(self, desc):
+        """ updates column sizes by the description row
+
+        :param desc:  description row
+        :type desc:  :obj:`dict` <:obj:`str`, `any`>
+        """
+        if desc is None:
+            return
+        for hd, vl in desc.items():
+            if hd not in self.__nonone or vl:
+                if hd not in self.__hdsizes.keys():
+                    self.__hdsizes[hd] = max(len(hd) + 1, 5)
+                if isinstance(vl, (list, tuple)):
+                    vl = self.__toString(vl)
+                if not isinstance(vl, str):
+                    vl = str(vl)
+                if self.__hdsizes[hd] <= len(vl):
+                    self.__hdsizes[hd] = len(vl) + 1
+
+    def loadDescription(self, description):
+        """ loads description
+
+        :param description:  description list
+        :type description:  :obj:`list` <:obj:`str`>
+        """
+        self.__description.extend(self.__filterDescription(description))
         for desc in self.__description:
-            if desc is None:
-                continue
-            for hd, vl in desc.items():
-                if hd not in self.__nonone or vl:
-                    if hd not in self.__hdsizes.keys():
-                        self.__hdsizes[hd] = max(len(hd) + 1, 5)
-                    if isinstance(vl, (list, tuple)):
-                        vl = self.__toString(vl)
-                    if not isinstance(vl, str):
-                        vl = str(vl)
-                    if self.__hdsizes[hd] <= len(vl):
-                        self.__hdsizes[hd] = len(vl) + 1
+            self.__updateSizes(desc)
 
     @classmethod
     def __toString(cls, lst):
@@ -815,62 +864,158 @@ class TableTools(object):
             res.append(it or "*")
         return str(res)
 
-    def generateList(self):
-        """ generate row lists of table
+    @classmethod
+    def __toJSON(cls, value):
+        """ converts value to JSON serializable type
 
-        :returns:  table rows
-        :rtype: :obj:`list` <:obj:`str`>
+        :param value: given value
+        :type value: :obj:`any`
+        :returns: JSON serializable value
+        :rtype: :obj:`any`
         """
-        lst = [""]
-        if self.title is not None:
-            lst.append(self.title)
-            lst.append("-" * len(self.title))
-            lst.append("")
-
-        headers = [hd for hd in self.headers if hd in self.__hdsizes.keys()]
-        line = ""
-        for hd in headers:
-            line += "=" * (self.__hdsizes[hd] - 1) + " "
-        lst.append(line)
+        if hasattr(value, "tolist"):
+            return value.tolist()
+        return str(value)
+
+    def __cell(self, desc, hd):
+        """ converts description value to cell text
+
+        :param desc:  description row
+        :type desc:  :obj:`dict` <:obj:`str`, `any`>
+        :param hd: column header
+        :type hd: :obj:`str`
+        :returns: cell text
+        :rtype: :obj:`str`
+        """
+        vl = desc[hd] if hd in desc else None
+        if isinstance(vl, (list, tuple)):
+            vl = self.__toString(vl)
+        elif vl is None:
+            vl = ""
+        elif not isinstance(vl, str):
+            vl = str(vl)
+        return vl
+
+    def __rows(self):
+        """ provides shown description rows
+
+        :returns: generator of shown rows
+        :rtype: :obj:`iter` <:obj:`dict` <:obj:`str`, `any`> >
+        """
+        if self.__stream is None:
+            return iter(self.__description)
+        return self.__filterDescription(self.__stream)
 
-        line = ""
-        for hd in headers:
-            line += hd + " " * (self.__hdsizes[hd] - len(hd))
-        lst.append(line)
+    @classmethod
+    def parseWidths(cls, text):
+        """ parses fixed column widths, e.g. 'nexus_path=60,value=20'
 
-        line = ""
-        for hd in headers:
-            line += "=" * (self.__hdsizes[hd] - 1) + " "
-        lst.append(line)
+        :param text: column widths separated by commas
+        :type text: :obj:`str`
+        :returns: column name -> width
+        :rtype: :obj:`dict` <:obj:`str` , :obj:`int`>
+        :raises: :exc:`ValueError` for an invalid column width
+        """
+        widths = {}
+        for cw in (text or "").split(","):
+            if not cw:
+                continue
+            name, _, width = cw.partition("=")
+            if not name or not width.isdigit():
+                raise ValueError(
+                    "Column width '%s' is not of the form "
+                    "'<name>=<non-negative integer>'" % cw)
+            widths[name] = int(width)
+        return widths
+
+    def generateRows(self):
+        """ generate row lines of table
+
+        In the stream mode column widths are fixed by the first
+        :attr:`sample` rows and by :attr:`widths`.
+
+        :returns:  generator of table rows
+        :rtype: :obj:`iter` <:obj:`str`>
+        """
+        rows = self.__rows()
+        buffered = self.__description
+        if self.__stream is not None:
+            buffered = list(itertools.islice(rows, self.sample)) \
+                if self.sample is not None else list(rows)
+            for desc in buffered:
+                self.__updateSizes(desc)
+        for hd, width in self.widths.items():
+            self.__hdsizes[hd] = width + 1
+
+        yield ""
+        if self.title is not None:
+            yield self.title
+            yield "-" * len(self.title)
+            yield ""
 
-        for desc in self.__description:
-            line = ""
+        headers = [hd for hd in self.headers if hd in self.__hdsizes.keys()]
+        sizes = [self.__hdsizes[hd] for hd in headers]
+        border = "".join("=" * (size - 1) + " " for size in sizes)
+        yield border
+        yield "".join(hd + " " * (size - len(hd))
+                      for hd, size in zip(headers, sizes))
+        yield border
+
+        for desc in itertools.chain(
+                buffered, rows if self.__stream is not None else []):
             if desc is None:
-                for hd in headers:
-                    line += "=" * (self.__hdsizes[hd] - 1) + " "
-                lst.append(line.rstrip())
+                yield border.rstrip()
                 continue
             line = ""
-            for hd in headers:
-                vl = desc[hd] if hd in desc else None
-                if isinstance(vl, (list, tuple)):
-                    vl = self.__toString(vl)
-                elif vl is None:
-                    vl = ""
-                elif not isinstance(vl, str):
-                    vl = str(vl)
-                line += vl + " " * (self.__hdsizes[hd] - len(vl))
+            for hd, size in zip(headers, sizes):
+                vl = self.__cell(desc, hd)
+                line += vl + " " * max(size - len(vl), 1)
+            yield line.rstrip()
 
-            lst.append(line.rstrip())
+        yield border
+        yield ""
+
+    def generateList(self):
+        """ generate row lists of table
 
-        line = ""
-        for hd in headers:
-            line += "=" * (self.__hdsizes[hd] - 1) + " "
-        lst.append(line)
+        :returns:  table rows
+        :rtype: :obj:`list` <:obj:`str`>
+        """
+        return list(self.generateRows())
 
-        lst.append("")
+    def generateJSONLines(self):
+        """ generate JSON lines with shown columns of description rows
 
-        return lst
+        :returns:  generator of JSON lines
+        :rtype: :obj:`iter` <:obj:`str`>
+        """
+        for desc in self.__rows():
+            if desc is not None:
+                yield json.dumps(
+                    dict((hd, desc[hd]) for hd in self.headers
+                         if hd in desc),
+                    default=self.__toJSON)
+
+    def generateCSV(self, delimiter=",", header=True):
+        """ generate CSV lines with shown columns of description rows
+
+        :param delimiter: column delimiter
+        :type delimiter: :obj:`str`
+        :param header: if the header line should be generated
+        :type header: :obj:`bool`
+        :returns:  generator of CSV lines
+        :rtype: :obj:`iter` <:obj:`str`>
+        """
+        buf = StringIO()
+        writer = csv.writer(buf, delimiter=delimiter, lineterminator="")
+        for row in itertools.chain(
+                [self.headers] if header else [],
+                ([self.__cell(desc, hd) for hd in self.headers]
+                 for desc in self.__rows() if desc is not None)):
+            buf.seek(0)
+            buf.truncate()
+            writer.writerow(row)
+            yield buf.getvalue()
 
 
 class TableDictTools(object):
@@ -19,18 +19,37 @@
 
 """  PaNET ontology dictionary """
 
+import bisect
 import json
 import os
+import re
 
+try:
+    from collections.abc import Mapping
+except ImportError:
+    from collections import Mapping
 
-def read_techniques():
+
+#: (:obj:`str`) PaNET ontology JSON-LD file
+ONTOLOGY_FILE = os.path.join(os.path.dirname(__file__), "ontology.json")
+
+#: (:obj:`str`) precompiled technique index file
+INDEX_FILE = os.path.join(os.path.dirname(__file__), "techniques.json")
+
+#: (:obj:`str`) PaNET technique id prefix
+PANET_PREFIX = "http://purl.org/pan-science/PaNET/"
+
+
+def read_techniques(filename=None):
     """ read PaNET ontology techniques to dictionary
 
+    :param filename: ontology JSON-LD file name
+    :type filename: :obj:`str`
     :returns: techniques id:label
     :rtype: :obj:`dict` <:obj:`str`,:obj:`str`>
     """
     result = {}
-    with open(os.path.join(os.path.dirname(__file__), "ontology.json")) as fp:
+    with open(filename or ONTOLOGY_FILE) as fp:
         ont = json.loads(fp.read())
     ott = [on for on in ont
            if "@type" in on
@@ -43,9 +62,158 @@ def read_techniques():
     return result
 
 
-#: (:obj:`dict` <:obj:`str`,:obj:`str` >)
-#:     techniques id:label
-id_techniques = read_techniques()
+def normalize(name):
+    """ normalizes technique name for lookups
+
+    :param name: technique name
+    :type name: :obj:`str`
+    :returns: lower case name with collapsed separators
+    :rtype: :obj:`str`
+    """
+    return " ".join(re.split(r"[\s_]+", name.strip().lower()))
+
+
+def compile_techniques(filename=None, output=None):
+    """ compiles PaNET ontology into technique index file
+
+    :param filename: ontology JSON-LD file name
+    :type filename: :obj:`str`
+    :param output: index file name
+    :type output: :obj:`str`
+    :returns: technique index
+    :rtype: :obj:`dict` <:obj:`str`, :obj:`any`>
+    """
+    filename = filename or ONTOLOGY_FILE
+    techniques = read_techniques(filename)
+    ids = sorted(techniques.keys())
+    index = {
+        "source_size": os.path.getsize(filename),
+        "ids": ids,
+        "labels": [techniques[tid] for tid in ids],
+    }
+    if output:
+        with open(output, "w") as fl:
+            json.dump(index, fl, separators=(",", ":"))
+    return index
+
+
+class TechniqueIndex(Mapping):
+
+    """ lazy loaded PaNET technique index with id:label mapping
+    """
+
+    def __init__(self, filename=None, ontology=None):
+        """ constructor
+
+        :param filename: index file name
+        :type filename: :obj:`str`
+        :param ontology: ontology JSON-LD file name
+        :type ontology: :obj:`str`
+        """
+        #: (:obj:`str`) index file name
+        self.__filename = filename or INDEX_FILE
+        #: (:obj:`str`) ontology JSON-LD file name
+        self.__ontology = ontology or ONTOLOGY_FILE
+        #: (:obj:`list` <:obj:`str`>) sorted technique ids
+        self.__ids = None
+        #: (:obj:`list` <:obj:`str`>) technique labels ordered by ids
+        self.__labels = None
+        #: (:obj:`list` <:obj:`str`>) sorted normalized labels
+        self.__names = None
+        #: (:obj:`list` <:obj:`str`>) ids ordered by normalized labels
+        self.__nameids = None
+
+    def __load(self):
+        """ loads the index from the precompiled file or the ontology
+        """
+        index = None
+        try:
+            with open(self.__filename) as fl:
+                index = json.load(fl)
+            if index.get("source_size") != \
+               os.path.getsize(self.__ontology):
+                index = None
+        except Exception:
+            index = None
+        if index is None:
+            index = compile_techniques(self.__ontology)
+        self.__ids = index["ids"]
+        self.__labels = index["labels"]
+        pairs = sorted(
+            (normalize(lb), tid) for tid, lb in zip(self.__ids, self.__labels))
+        self.__names = [nm for nm, _ in pairs]
+        self.__nameids = [tid for _, tid in pairs]
+
+    def __index(self, tid):
+        """ provides position of the technique id
+
+        :param tid: technique id
+        :type tid: :obj:`str`
+        :returns: position in the id list or -1
+        :rtype: :obj:`int`
+        """
+        if self.__ids is None:
+            self.__load()
+        pos = bisect.bisect_left(self.__ids, tid)
+        if pos < len(self.__ids) and self.__ids[pos] == tid:
+            return pos
+        return -1
+
+    def __getitem__(self, tid):
+        pos = self.__index(tid)
+        if pos < 0:
+            raise KeyError(tid)
+        return self.__labels[pos]
+
+    def __contains__(self, tid):
+        return self.__index(tid) >= 0
+
+    def __iter__(self):
+        if self.__ids is None:
+            self.__load()
+        return iter(self.__ids)
+
+    def __len__(self):
+        if self.__ids is None:
+            self.__load()
+        return len(self.__ids)
+
+    def find(self, name):
+        """ finds technique id by its name
+
+        :param name: technique name
+        :type name: :obj:`str`
+        :returns: technique id or None
+        :rtype: :obj:`str`
+        """
+        if self.__ids is None:
+            self.__load()
+        nm = normalize(name)
+        pos = bisect.bisect_left(self.__names, nm)
+        if pos < len(self.__names) and self.__names[pos] == nm:
+            return self.__nameids[pos]
+
+    def find_prefix(self, prefix):
+        """ finds technique ids with names starting with the prefix
+
+        :param prefix: technique name prefix
+        :type prefix: :obj:`str`
+        :returns: technique ids sorted by their names
+        :rtype: :obj:`list` <:obj:`str`>
+        """
+        if self.__ids is None:
+            self.__load()
+        nm = normalize(prefix)
+        pos = bisect.bisect_left(self.__names, nm)
+        result = []
+        while pos < len(self.__names) and self.__names[pos].startswith(nm):
+            result.append(self.__nameids[pos])
+            pos += 1
+        return result
+
+
+#: (:class:`TechniqueIndex`) techniques id:label
+id_techniques = TechniqueIndex()
 
 #: (:obj:`dict` <:obj:`str`,:obj:`str` >)
 #:     nexus application  to PaNET
@@ -21,6 +21,95 @@
 
 import os
 import socket
+import stat
+import threading
+import time
+
+
+class DirectoryCache(object):
+
+    """ cache of directory listings validated by TTL and directory mtime
+    """
+
+    def __init__(self, ttl=5.0, mtimewindow=2.0):
+        """ constructor
+
+        :param ttl: time in seconds in which listings are not revalidated
+        :type ttl: :obj:`float`
+        :param mtimewindow: time in seconds before the last check in which
+                            a directory mtime is not trusted
+        :type mtimewindow: :obj:`float`
+        """
+        #: (:obj:`float`) time to live of cached listings in seconds
+        self.ttl = ttl
+        #: (:obj:`float`) time in seconds before the last check in which
+        #:    a directory mtime is not trusted because of coarse timestamps
+        self.mtimewindow = mtimewindow
+        #: (:class:`threading.Lock`) threading lock
+        self.__lock = threading.Lock()
+        #: (:obj:`dict` <:obj:`str`, (:obj:`float`, :obj:`float`,
+        #:  :obj:`tuple` <:obj:`str`>)>) check time, mtime and names
+        self.__entries = {}
+
+    def listdir(self, dirpath):
+        """ provides names of the directory entries
+
+        Within the TTL the filesystem is not touched, afterwards the listing
+        is read again if the directory mtime has changed or if it is
+        within mtimewindow of the last check, i.e. the directory could be
+        modified in the same timestamp tick after the last listing
+
+        :param dirpath: directory path
+        :type dirpath: :obj:`str`
+        :returns: entry names or `None` if dirpath is not a directory
+        :rtype: :obj:`tuple` <:obj:`str`>
+        """
+        now = time.time()
+        with self.__lock:
+            entry = self.__entries.get(dirpath)
+        if entry is not None and now - entry[0] < self.ttl:
+            return entry[2]
+        try:
+            st = os.stat(dirpath)
+            mtime = st.st_mtime if stat.S_ISDIR(st.st_mode) else None
+        except OSError:
+            mtime = None
+        if mtime is None:
+            names = None
+        elif entry is not None and entry[1] == mtime and \
+                mtime < entry[0] - self.mtimewindow:
+            names = entry[2]
+        else:
+            names = tuple(os.listdir(dirpath))
+        with self.__lock:
+            self.__entries[dirpath] = (now, mtime, names)
+        return names
+
+    def clear(self):
+        """ removes all cached listings
+        """
+        with self.__lock:
+            self.__entries.clear()
+
+
+#: (:class:`DirectoryCache`) directory listings shared by pyeval calls
+dircache = DirectoryCache()
+
+
+def beamtime_files(dirpath, prefix, ext):
+    """ provides names of beamtime metadata files from the directory cache
+
+    :param dirpath: directory path
+    :type dirpath: :obj:`str`
+    :param prefix: file name prefix
+    :type prefix: :obj:`str`
+    :param ext: file name postfix
+    :type ext: :obj:`str`
+    :returns: file names
+    :rtype: :obj:`list` <:obj:`str`>
+    """
+    return [fl for fl in (dircache.listdir(dirpath) or ())
+            if fl.startswith(prefix) and fl.endswith(ext)]
 
 
 def beamtimeid(commonblock, starttime, shortname, compath, curpath, locpath,
@@ -60,10 +149,7 @@ def beamtimeid(commonblock, starttime, shortname, compath, curpath, locpath,
         fpath = root.parent.name
     if fpath.startswith(curpath):
         try:
-            if os.path.isdir(curpath):
-                btml = [fl for fl in os.listdir(curpath)
-                        if (fl.startswith(curprefix)
-                            and fl.endswith(curext))]
+            btml = beamtime_files(curpath, curprefix, curext)
             if btml:
                 if strip:
                     result = btml[0][len(curprefix):-len(curext)]
@@ -73,10 +159,7 @@ def beamtimeid(commonblock, starttime, shortname, compath, curpath, locpath,
             pass
     if not result and fpath.startswith(compath):
         try:
-            if os.path.isdir(compath):
-                btml = [fl for fl in os.listdir(compath)
-                        if (fl.startswith(comprefix)
-                            and fl.endswith(comext))]
+            btml = beamtime_files(compath, comprefix, comext)
             if btml:
                 if strip:
                     result = btml[0][len(comprefix):-len(comext)]
@@ -88,17 +171,13 @@ def beamtimeid(commonblock, starttime, shortname, compath, curpath, locpath,
         try:
             dirpath = os.path.dirname(fpath)
             while dirpath.startswith(locpath):
-                if os.path.isdir(dirpath):
-                    btml = [fl for fl in os.listdir(dirpath)
-                            if (fl.startswith(curprefix)
-                                and fl.endswith(curext))]
+                if dircache.listdir(dirpath) is not None:
+                    btml = beamtime_files(dirpath, curprefix, curext)
                     if btml:
                         result = btml[0][len(curprefix):-len(curext)]
                         break
                     else:
-                        btml = [fl for fl in os.listdir(dirpath)
-                                if (fl.startswith(comprefix)
-                                    and fl.endswith(comext))]
+                        btml = beamtime_files(dirpath, comprefix, comext)
                         if btml:
                             if strip:
                                 result = btml[0][len(comprefix):-len(comext)]
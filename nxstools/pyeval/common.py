@@ -19,6 +19,10 @@
 
 """  pyeval common helper functions """
 
+import weakref
+from collections import OrderedDict
+from nxstools import filewriter
+
 
 def get_element(lst, index):
     """ get list element
@@ -125,3 +129,80 @@ def blockitem_addint_safe(commonblock, name, value):
     else:
         commonblock[name].append(value)
     return value
+
+
+def nxdata_index(commonblock, nxdata, writer=None):
+    """ provides an index of NXdata group items cached in commonblock
+
+    The link targets are read in one traversal of the group links without
+    opening the items. Whether an item is a field and its rank do not
+    change during the scan, so they are cached by :func:`nxdata_shape`
+    when the item is opened for the first time. The cache is scoped to
+    the nexus file object of the current scan and it is rebuilt when
+    the number of group links changes.
+
+    :param commonblock: commonblock of nxswriter
+    :type commonblock: :obj:`dict`<:obj:`str`, `any`>
+    :param nxdata: NXdata group
+    :type nxdata: :class:`nxstools.filewriter.FTGroup`
+    :param writer: writer module, default: writer of the nexus file
+    :type writer: :mod:`nxstools.h5pywriter` or :mod:`nxstools.h5cppwriter`
+    :returns: item name -> {"target", "field", "rank"},
+              "field" and "rank" are `None` until the item is opened
+    :rtype: :class:`collections.OrderedDict` <:obj:`str`,
+            :obj:`dict` <:obj:`str`, `any`>>
+    """
+    fl = nxdata
+    while fl is not None and not isinstance(fl, filewriter.FTFile):
+        fl = fl.parent
+    writer = writer or getattr(fl, "writer", None)
+    cache = commonblock.get("__nxdata_index__")
+    if cache is None or cache[0]() is not fl:
+        cache = (weakref.ref(fl) if fl is not None else (lambda: None), {})
+        commonblock["__nxdata_index__"] = cache
+    indexes = cache[1]
+    key = nxdata.path
+    index = indexes.get(key)
+    if index is not None and len(index) == nxdata.size:
+        return index
+    index = OrderedDict()
+    for lk in writer.get_links(nxdata):
+        try:
+            target = str(lk.target_path)
+        except Exception:
+            target = ""
+        index[lk.name] = {"target": target, "field": None, "rank": None}
+    indexes[key] = index
+    return index
+
+
+def nxdata_shape(index, nxdata, name, rank=None):
+    """ provides the current shape of an NXdata field
+
+    Items which are not fields or have a different rank are skipped
+    without opening them when they are known from the index.
+
+    :param index: NXdata index from :func:`nxdata_index`
+    :type index: :obj:`dict` <:obj:`str`, :obj:`dict` <:obj:`str`, `any`>>
+    :param nxdata: NXdata group
+    :type nxdata: :class:`nxstools.filewriter.FTGroup`
+    :param name: item name
+    :type name: :obj:`str`
+    :param rank: required field rank
+    :type rank: :obj:`int`
+    :returns: field shape or None
+    :rtype: :obj:`list` <:obj:`int`>
+    """
+    item = index[name]
+    if item["field"] is False or (
+            rank is not None and item["rank"] not in (None, rank)):
+        return None
+    fld = nxdata.open(name)
+    item["field"] = isinstance(fld, filewriter.FTField)
+    if not item["field"]:
+        return None
+    shape = fld.shape
+    item["rank"] = len(shape)
+    if rank is not None and len(shape) != rank:
+        return None
+    return shape
@@ -19,13 +19,16 @@
 
 """  pyeval helper functions for datasignal """
 
-from nxstools import filewriter
-
 try:
     from . import mssar
 except Exception:
     import mssar
 
+try:
+    from . import common
+except Exception:
+    import common
+
 
 def signalname(commonblock, detector, firstchannel,
                timers, mgchannels, entryname, defaultattrs=True,
@@ -76,9 +79,8 @@ def signalname(commonblock, detector, firstchannel,
             at.write("data")
             at.close()
         nxdata = nxentry.open("data")
-        writer = root.parent.writer
-        links = writer.get_links(nxdata)
-        names = list(sorted([ch.name for ch in links]))
+        index = common.nxdata_index(commonblock, nxdata)
+        names = list(sorted(index.keys()))
         sarsg = ""
         if msenv and sardanasignal:
             try:
@@ -99,10 +101,9 @@ def signalname(commonblock, detector, firstchannel,
                     break
         if not result:
             for name in names:
-                fld = nxdata.open(name)
-                if isinstance(fld, filewriter.FTField) and \
-                   len(fld.shape) == 1 and fld.shape[0] > 1:
-                    result = str(fld.name)
+                shape = common.nxdata_shape(index, nxdata, name, 1)
+                if shape is not None and shape[0] > 1:
+                    result = str(name)
                     break
         if not result and names:
             result = str(names[0])
@@ -156,9 +157,8 @@ def axesnames(commonblock, detector, firstchannel,
         root = commonblock["__root__"]
         nxentry = root.open(entryname)
         nxdata = nxentry.open("data")
-        writer = root.parent.writer
-        links = writer.get_links(nxdata)
-        names = list(sorted([ch.name for ch in links]))
+        index = common.nxdata_index(commonblock, nxdata)
+        names = list(sorted(index.keys()))
         if scancommand:
             pars = [par for par in str(scancommand).split(" ") if par]
             if len(pars) > 1:
@@ -172,13 +172,15 @@ def axesnames(commonblock, detector, firstchannel,
             dtshape = dt.shape
             if len(dtshape) > 0 and dtshape[0] > 0:
                 if stepdss and stepdss[0] in names:
-                    ax = nxdata.open(stepdss[0])
-                    if len(ax.shape) == 1 and ax.shape[0] == dtshape[0]:
+                    shape = common.nxdata_shape(
+                        index, nxdata, stepdss[0], 1)
+                    if shape is not None and shape[0] == dtshape[0]:
                         result = [stepdss[0]]
             if result and len(dtshape) > 1 and dtshape[1] > 0:
                 if len(stepdss) > 1 and stepdss[1] in names:
-                    ax = nxdata.open(stepdss[1])
-                    if len(ax.shape) == 1 and ax.shape[0] == dtshape[1]:
+                    shape = common.nxdata_shape(
+                        index, nxdata, stepdss[1], 1)
+                    if shape is not None and shape[0] == dtshape[1]:
                         result.append(stepdss[1])
             if result:
                 while len(dtshape) > len(result):
@@ -24,6 +24,7 @@ import socket
 import tango
 import json
 import time
+from nxstools.pyeval.beamtimeid import beamtime_files
 
 # from sardana.macroserver.macro import Macro
 
@@ -187,11 +188,8 @@ def beamtime_id(fpath, bmtfpath, bmtfprefix, bmtfext):
     result = ""
     if fpath.startswith(bmtfpath):
         try:
-            if os.path.isdir(bmtfpath):
-                btml = [fl for fl in os.listdir(bmtfpath)
-                        if (fl.startswith(bmtfprefix)
-                            and fl.endswith(bmtfext))]
-                result = btml[0][len(bmtfprefix):-len(bmtfext)]
+            btml = beamtime_files(bmtfpath, bmtfprefix, bmtfext)
+            result = btml[0][len(bmtfprefix):-len(bmtfext)]
         except Exception:
             pass
     return result
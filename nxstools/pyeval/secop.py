@@ -23,11 +23,34 @@ import json
 import socket
 import select
 import threading
+import time
+from collections import deque
 from nxstools import filewriter
 
+try:
+    from . import common
+except Exception:
+    import common
+
 
 socketlock = threading.Lock()
 
+#: (:obj:`dict` <:obj:`str`, :obj:`str`>) secop reply actions of requests
+REPLIES = {
+    "read": "reply",
+    "change": "changed",
+    "do": "done",
+    "describe": "describing",
+    "activate": "active",
+    "deactivate": "inactive",
+    "ping": "pong",
+    "buffer": "buffered",
+    "check": "checked",
+}
+
+#: (:obj:`dict` <:obj:`str`, :obj:`str`>) secop request actions of replies
+REQUESTS = dict((vl, ky) for ky, vl in REPLIES.items())
+
 
 class SocketHolder(object):
 
@@ -36,16 +59,16 @@ class SocketHolder(object):
     def __init__(self, sckt):
         """ constructor
 
-        :param sckt: system socket
-        :type sckt: :class:`socket.socket`
+        :param sckt: system socket or secop client
+        :type sckt: :class:`socket.socket` or :class:`SecopClient`
         """
         self.__sckt = sckt
 
     def get(self):
         """ socket getter
 
-        :returns: system socket
-        :rtype: :class:`socket.socket`
+        :returns: system socket or secop client
+        :rtype: :class:`socket.socket` or :class:`SecopClient`
         """
         return self.__sckt
 
@@ -58,7 +81,7 @@ class SocketHolder(object):
 
 class SecopGroup(object):
 
-    """ socket holder """
+    """ secop group with a value table shared by its datasources """
 
     def __init__(self, group):
         """ constructor
@@ -72,15 +95,18 @@ class SecopGroup(object):
         self.lock = threading.Lock()
         #: (:obj:`int`) counter of steps
         self.counter = -2
-        #: (:obj:`any`) any data
-        self.__data = None
+        #: (:obj:`list` <:obj:`str`>) commands of the group
+        self.commands = []
+        #: (:obj:`dict` <:obj:`str`, :obj:`any`>) command results of the step
+        self.data = {}
 
     def getData(self, cmd, host=None, port=None, timeout=None,
                 access=None, commonblock=None):
-        """ create a socket end execute the command with the group result
+        """ provides the command result from the group value table
+
+        On a new step all commands known to the group are sent
+        in one pipelined exchange
 
-        :param counter: counts of scan steps
-        :type counter: :obj:`int`
         :param cmd: command
         :type cmd: :obj:`str`
         :param host: secop host name
@@ -100,12 +126,18 @@ class SecopGroup(object):
         counter = commonblock["__counter__"]
         data = None
         with self.lock:
-            if counter == self.counter:
-                data = self.data
-            else:
-                data = secop_cmd(cmd, host, port, timeout, commonblock)
-                self.data = data
+            if cmd not in self.commands:
+                self.commands.append(cmd)
+            if counter != self.counter:
+                self.data = dict(zip(
+                    self.commands,
+                    secop_pipeline(self.commands, host, port, timeout,
+                                   commonblock)))
                 self.counter = counter
+            elif cmd not in self.data:
+                self.data[cmd] = secop_cmd(
+                    cmd, host, port, timeout, commonblock)
+            data = self.data[cmd]
         try:
             for idx in access:
                 data = data[idx]
@@ -114,6 +146,244 @@ class SecopGroup(object):
         return data
 
 
+class SecopRequest(object):
+
+    """ pending secop request """
+
+    def __init__(self, cmd):
+        """ constructor
+
+        :param cmd: command
+        :type cmd: :obj:`str`
+        """
+        words = cmd.strip().split(" ", 2)
+        #: (:obj:`str`) command
+        self.cmd = cmd
+        #: (:obj:`str`) request action
+        self.action = words[0]
+        #: (:obj:`str`) request specifier
+        self.specifier = words[1] if len(words) > 1 else None
+        #: (:class:`threading.Event`) reply event
+        self.event = threading.Event()
+        #: (:obj:`any`) reply result
+        self.result = ""
+
+    def matches(self, action, specifier):
+        """ checks if the reply belongs to the request
+
+        :param action: request action of the reply
+        :type action: :obj:`str`
+        :param specifier: reply specifier
+        :type specifier: :obj:`str`
+        :returns: if the reply belongs to the request
+        :rtype: :obj:`bool`
+        """
+        if action is None:
+            return self.action not in REPLIES
+        return self.action == action and \
+            (self.specifier is None or self.specifier == specifier)
+
+    def wait(self, timeout):
+        """ waits for the reply
+
+        :param timeout: timeout in seconds
+        :type timeout: :obj:`float`
+        :returns: reply result or empty string on timeout
+        :rtype: :obj:`any`
+        """
+        self.event.wait(timeout)
+        return self.result
+
+
+class SecopClient(object):
+
+    """ secop client with a background reader and pipelined requests """
+
+    def __init__(self, host=None, port=None):
+        """ constructor
+
+        :param host: secop host name
+        :type host: :obj:`str`
+        :param port: secop port name
+        :type port: :obj:`int`
+        """
+        #: (:obj:`str`) secop host name
+        self.host = host or socket.gethostname()
+        #: (:obj:`int`) secop port
+        self.port = int(port or 5000)
+        #: (:class:`threading.Lock`) request lock
+        self.__lock = threading.Lock()
+        #: (:class:`collections.deque` <:class:`SecopRequest`>) requests
+        self.__pending = deque()
+        #: (:class:`socket.socket`) system socket
+        self.__sckt = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        try:
+            self.__sckt.connect((self.host, self.port))
+        except Exception as e:
+            self.__sckt.close()
+            raise e
+        #: (:obj:`bool`) connection flag
+        self.__connected = True
+        #: (:class:`threading.Thread`) reader thread
+        self.__reader = threading.Thread(target=self.__read)
+        self.__reader.daemon = True
+        self.__reader.start()
+
+    @property
+    def connected(self):
+        """ connection flag
+
+        :returns: if the client is connected
+        :rtype: :obj:`bool`
+        """
+        return self.__connected
+
+    def __read(self):
+        """ reads replies from the socket and dispatches them
+        """
+        sbuffer = bytearray()
+        try:
+            while True:
+                chunk = self.__sckt.recv(65536)
+                if not chunk:
+                    break
+                sbuffer.extend(chunk)
+                idx = sbuffer.find(b"\n")
+                while idx >= 0:
+                    line = bytes(sbuffer[:idx]).decode()
+                    del sbuffer[:idx + 1]
+                    self.__dispatch(line)
+                    idx = sbuffer.find(b"\n")
+        except Exception:
+            pass
+        self.__connected = False
+        with self.__lock:
+            while self.__pending:
+                self.__pending.popleft().event.set()
+
+    def __dispatch(self, line):
+        """ passes the reply line to its request
+
+        :param line: reply line
+        :type line: :obj:`str`
+        """
+        line = line.strip()
+        if not line:
+            return
+        words = line.split(" ", 2)
+        action = words[0]
+        specifier = words[1] if len(words) > 1 else None
+        if action.startswith("error_"):
+            action = action[6:]
+        elif action in REQUESTS:
+            action = REQUESTS[action]
+        elif action == "update" or action in REPLIES:
+            return
+        else:
+            action = None
+        try:
+            result = json.loads(words[2].strip())
+        except Exception:
+            result = line
+        with self.__lock:
+            for request in self.__pending:
+                if request.matches(action, specifier):
+                    self.__pending.remove(request)
+                    request.result = result
+                    request.event.set()
+                    break
+
+    def send(self, cmd):
+        """ sends a request without waiting for its reply
+
+        :param cmd: command
+        :type cmd: :obj:`str`
+        :returns: pending request
+        :rtype: :class:`SecopRequest`
+        """
+        if not self.__connected:
+            raise Exception("SECoP client %s:%s is disconnected"
+                            % (self.host, self.port))
+        request = SecopRequest(cmd)
+        with self.__lock:
+            self.__pending.append(request)
+            self.__sckt.sendall((cmd + "\n").encode())
+        return request
+
+    def pipeline(self, cmds, timeout=None):
+        """ sends all requests and then waits for their replies
+
+        :param cmds: commands
+        :type cmds: :obj:`list` <:obj:`str`>
+        :param timeout: minimal timeout
+        :type timeout: :obj:`float`
+        :returns: reply results
+        :rtype: :obj:`list` <:obj:`any`>
+        """
+        requests = [self.send(cmd) for cmd in cmds]
+        deadline = time.time() + 3000 * float(timeout or 0.001)
+        results = []
+        for request in requests:
+            results.append(
+                request.wait(max(deadline - time.time(), 0)))
+        with self.__lock:
+            for request in requests:
+                if request in self.__pending:
+                    self.__pending.remove(request)
+        return results
+
+    def command(self, cmd, timeout=None):
+        """ sends a request and waits for its reply
+
+        :param cmd: command
+        :type cmd: :obj:`str`
+        :param timeout: minimal timeout
+        :type timeout: :obj:`float`
+        :returns: reply result
+        :rtype: :obj:`any`
+        """
+        return self.pipeline([cmd], timeout)[0]
+
+    def close(self):
+        """ closes the connection
+        """
+        if self.__sckt is not None:
+            try:
+                self.__sckt.shutdown(socket.SHUT_RDWR)
+            except Exception:
+                pass
+            self.__sckt.close()
+        self.__connected = False
+
+
+def secop_client(host=None, port=None, commonblock=None):
+    """ provides a secop client pooled in commonblock per host:port
+
+    :param host: secop host name
+    :type host: :obj:`str`
+    :param port: secop port name
+    :type port: :obj:`int`
+    :param commonblock: common block
+    :type commonblock: :obj:`dict`
+    :returns: secop client
+    :rtype: :class:`SecopClient`
+    """
+    host = host or socket.gethostname()
+    port = int(port or 5000)
+    if not isinstance(commonblock, dict):
+        return SecopClient(host, port)
+    name = "secop_%s:%s" % (host, port)
+    with socketlock:
+        if name in commonblock.keys() and \
+           isinstance(commonblock[name], SocketHolder) and \
+           isinstance(commonblock[name].get(), SecopClient) and \
+           commonblock[name].get().connected:
+            return commonblock[name].get()
+        client = SecopClient(host, port)
+        commonblock[name] = SocketHolder(client)
+    return client
+
+
 def secop_send(cmd, sckt, timeout=None):
     """ sends a command, reads the reply and returns a result
 
@@ -196,20 +466,42 @@ def secop_cmd(cmd, host=None, port=None, timeout=None, commonblock=None):
     :returns: json string
     :rtype: :obj:`dict` <:obj:`str`, :obj:`any`>
     """
-    res = None
-    sckt = None
+    return secop_pipeline([cmd], host, port, timeout, commonblock)[0]
+
+
+def secop_pipeline(cmds, host=None, port=None, timeout=None,
+                   commonblock=None):
+    """ execute several commands in one pipelined exchange
+
+    :param cmds: commands
+    :type cmds: :obj:`list` <:obj:`str`>
+    :param host: secop host name
+    :type host: :obj:`str`
+    :param port: secop port name
+    :type port: :obj:`int`
+    :param timeout: minial tiemout
+    :type timeout: :obj:`float`
+    :param commonblock: common block
+    :type commonblock: :obj:`dict`
+    :returns: json strings
+    :rtype: :obj:`list` <:obj:`dict` <:obj:`str`, :obj:`any`>>
+    """
+    res = [None] * len(cmds)
+    client = None
     try:
         try:
-            sckt = secop_socket(host, port, commonblock)
-            res = secop_send(cmd, sckt, timeout)
+            client = secop_client(host, port, commonblock)
+            res = client.pipeline(cmds, timeout)
         except Exception:
-            sckt = secop_socket(host, port)
-            res = secop_send(cmd, sckt, timeout)
+            if client is not None:
+                client.close()
+            client = secop_client(host, port, commonblock)
+            res = client.pipeline(cmds, timeout)
         if not isinstance(commonblock, dict):
-            sckt.close()
+            client.close()
     except Exception:
-        if sckt is not None:
-            sckt.close()
+        if client is not None:
+            client.close()
     return res
 
 
@@ -426,12 +718,13 @@ def create_sample_nxdata(commonblock, entryname, samplename,
                 else:
                     sdt = smp.create_group(sampledataname, "NXdata")
 
-                for dl in nxw.get_links(dt):
-                    tpath = str(dl.target_path).split(":/")[-1]
+                index = common.nxdata_index(commonblock, dt, nxw)
+                for name, item in index.items():
+                    tpath = item["target"].split(":/")[-1]
                     if tpath.startswith(smppath) \
                        or tpath.startswith(smppath2):
-                        if dl.name not in sdt.names():
-                            nxw.link(tpath, sdt, dl.name)
+                        if name not in sdt.names():
+                            nxw.link(tpath, sdt, name)
                             sresult.append(tpath)
 
     return ",".join(sresult)
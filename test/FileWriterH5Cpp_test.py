@@ -27,6 +27,9 @@ import random
 import binascii
 import string
 import time
+import zlib
+import warnings
+import numpy
 
 import nxstools.filewriter as FileWriter
 import nxstools.h5cppwriter as H5CppWriter
@@ -2325,6 +2328,173 @@ class FileWriterH5CppTest(unittest.TestCase):
         finally:
             os.remove(self._fname)
 
+    # tuning test
+    # \brief It tests that file tuning is skipped by the h5cpp writer
+    def test_access_tuning_h5cpp(self):
+        fun = sys._getframe().f_code.co_name
+        print("Run: %s.%s() " % (self.__class__.__name__, fun))
+        self._fname = '%s/%s%s.h5' % (
+            os.getcwd(), self.__class__.__name__, fun)
+        self.assertEqual(H5CppWriter.tuning_parameters(), [])
+        try:
+            FileWriter.writer = H5CppWriter
+            with warnings.catch_warnings(record=True) as wrns:
+                warnings.simplefilter("always")
+                fl = FileWriter.create_file(
+                    self._fname, True, access="frames")
+                fl.close()
+                fl = FileWriter.open_file(
+                    self._fname, readonly=True, access="metadata")
+                fl.close()
+                self.assertEqual(wrns, [])
+
+            with warnings.catch_warnings(record=True) as wrns:
+                warnings.simplefilter("always")
+                fl = FileWriter.open_file(
+                    self._fname, readonly=True, rdcc_nbytes=1 << 20)
+                self.assertTrue(fl.is_valid)
+                fl.close()
+                self.assertEqual(len(wrns), 1)
+                self.assertTrue("rdcc_nbytes" in str(wrns[0].message))
+        finally:
+            os.remove(self._fname)
+
+    def test_find_fields_h5cpp(self):
+        fun = sys._getframe().f_code.co_name
+        print("Run: %s.%s() " % (self.__class__.__name__, fun))
+        self._fname = '%s/%s%s.h5' % (
+            os.getcwd(), self.__class__.__name__, fun)
+        try:
+            FileWriter.writer = H5CppWriter
+            fl = FileWriter.create_file(self._fname, True)
+            rt = fl.root()
+            en = rt.create_group("entry", "NXentry")
+            col = en.create_group("instrument", "NXinstrument").create_group(
+                "collection", "NXcollection")
+            col.create_field("postrun", "string")
+            en.create_group("postrun", "NXcollection")
+            en.create_group("data", "NXdata").create_field(
+                "postrun", "string")
+            en.create_field("value", "float64")
+            FileWriter.link(
+                "/entry/instrument/collection/postrun",
+                en.open("instrument"), "postrun")
+            FileWriter.link("missing.nxs://entry", en, "external")
+
+            paths = ["entry/data/postrun",
+                     "entry/instrument/collection/postrun"]
+            self.assertEqual(sorted(rt.find_fields("postrun")), paths)
+            self.assertEqual(
+                sorted(FileWriter.FTGroup.find_fields(rt, "postrun")), paths)
+            self.assertEqual(
+                sorted(en.find_fields("postrun")),
+                ["data/postrun", "instrument/collection/postrun"])
+            self.assertEqual(col.find_fields("postrun"), ["postrun"])
+            self.assertEqual(en.find_fields("value"), ["value"])
+            self.assertEqual(rt.find_fields("missing"), [])
+            col.close()
+            en.close()
+            rt.close()
+            fl.close()
+        finally:
+            os.remove(self._fname)
+
+    def test_write_chunk_h5cpp(self):
+        fun = sys._getframe().f_code.co_name
+        print("Run: %s.%s() " % (self.__class__.__name__, fun))
+        self._fname = '%s/%s%s.h5' % (
+            os.getcwd(), self.__class__.__name__, fun)
+        try:
+            FileWriter.writer = H5CppWriter
+            fl = FileWriter.create_file(self._fname, True)
+            rt = fl.root()
+            dfilter = FileWriter.data_filter(rt)
+            dfilter.rate = 3
+            field = rt.create_field(
+                "data", "uint16", [0, 4, 5], [1, 4, 5], dfilter=dfilter)
+            frames = numpy.arange(40, dtype="uint16").reshape(2, 4, 5)
+            field.grow(0, 2)
+            field.write_chunk(
+                [0, 0, 0], zlib.compress(frames[0].tobytes(), 3))
+            field.write_chunk(
+                [1, 0, 0], zlib.compress(frames[1].tobytes(), 3), 0)
+            self.assertEqual(field.shape, (2, 4, 5))
+            self.assertTrue((field.read() == frames).all())
+            fl.close()
+
+            fl = FileWriter.open_file(self._fname, readonly=True)
+            self.assertTrue((fl.root().open("data").read() == frames).all())
+            fl.close()
+        finally:
+            os.remove(self._fname)
+
+    def test_h5cppfield_cache(self):
+        fun = sys._getframe().f_code.co_name
+        print("Run: %s.%s() " % (self.__class__.__name__, fun))
+        self._fname = '%s/%s%s.h5' % (
+            os.getcwd(), self.__class__.__name__, fun)
+
+        try:
+            FileWriter.writer = H5CppWriter
+            fl = FileWriter.create_file(self._fname)
+            rt = fl.root()
+            entry = rt.create_group("entry12345", "NXentry")
+            intvec = entry.create_field(
+                "intvec", "uint32", [1, 3, 4], [1, 3, 4])
+            floatspec = entry.create_field("floatspec", "float64", [1], [1])
+
+            frames = [
+                [[self.__rnd.randint(1, 1600) for _ in range(4)]
+                 for _ in range(3)]
+                for _ in range(5)]
+            intvec[0, ...] = frames[0]
+            selection = intvec._selections[((1, 3, 4), (1, 1, 1), (1, 1, 1))]
+            for frame in frames[1:]:
+                intvec.grow()
+                self.assertEqual(intvec.shape[0], frames.index(frame) + 1)
+                intvec[-1, ...] = frame
+            self.assertEqual(intvec.shape, (5, 3, 4))
+            self.assertEqual(len(intvec._selections), 1)
+            self.assertTrue(
+                intvec._selections[((1, 3, 4), (1, 1, 1), (1, 1, 1))]
+                is selection)
+            self.assertEqual(selection.offset(), (4, 0, 0))
+            for i, frame in enumerate(frames):
+                self.myAssertImage(intvec[i, ...], frame)
+            self.assertEqual(list(intvec[-1, :, 2]),
+                             [row[2] for row in frames[4]])
+            self.assertEqual(len(intvec._selections), 2)
+
+            for step in range(10):
+                if step:
+                    floatspec.grow()
+                floatspec[step] = step * 0.5
+            self.assertEqual(floatspec.shape, (10,))
+            self.assertEqual(floatspec.dtype, "float64")
+            self.assertEqual(list(floatspec.read()),
+                             [step * 0.5 for step in range(10)])
+
+            other = entry.open("floatspec")
+            self.assertEqual(other.shape, (10,))
+            floatspec.grow(ext=2)
+            self.assertEqual(floatspec.shape, (12,))
+            self.assertEqual(other.shape, (10,))
+            other.refresh()
+            self.assertEqual(other.shape, (12,))
+
+            intvec.close()
+            self.assertEqual(intvec._selections, {})
+            self.assertEqual(intvec._shape, None)
+            intvec.reopen()
+            self.assertEqual(intvec.shape, (5, 3, 4))
+            self.assertEqual(intvec.dtype, "uint32")
+            self.myAssertImage(intvec[2, ...], frames[2])
+
+            entry.close()
+            fl.close()
+        finally:
+            os.remove(self._fname)
+
     # default createfile test
     # \brief It tests default settings
     def test_h5cppfield_vec(self):
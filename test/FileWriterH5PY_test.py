@@ -27,6 +27,9 @@ import random
 import binascii
 import string
 import time
+import zlib
+import warnings
+import numpy
 
 import nxstools.filewriter as FileWriter
 import nxstools.h5pywriter as H5PYWriter
@@ -402,6 +405,225 @@ class FileWriterH5PYTest(unittest.TestCase):
         finally:
             os.remove(self._fname)
 
+    # auto chunk test
+    # \brief It tests automatic chunking of frames
+    def test_auto_chunk(self):
+        fun = sys._getframe().f_code.co_name
+        print("Run: %s.%s() " % (self.__class__.__name__, fun))
+        self.assertEqual(
+            FileWriter.auto_chunk([0, 1679, 1475], "int32"),
+            [1, 105, 1475])
+        self.assertEqual(
+            FileWriter.auto_chunk([0, 10, 20], "int64"), [655, 10, 20])
+        self.assertEqual(
+            FileWriter.auto_chunk([5, 10, 20], "int64"), [5, 10, 20])
+        self.assertEqual(
+            FileWriter.auto_chunk([None, 10, 20], "int64", 1600),
+            [1, 10, 20])
+        self.assertEqual(
+            FileWriter.auto_chunk([0, 10, 20], "int64", 800),
+            [1, 5, 20])
+        self.assertEqual(FileWriter.auto_chunk([0], "float64"), [131072])
+        self.assertEqual(FileWriter.auto_chunk([0, 3], "string", 48),
+                         [2, 3])
+
+    # tuning test
+    # \brief It tests access pattern tuning parameters
+    def test_access_tuning_h5py(self):
+        fun = sys._getframe().f_code.co_name
+        print("Run: %s.%s() " % (self.__class__.__name__, fun))
+        self._fname = '%s/%s%s.h5' % (
+            os.getcwd(), self.__class__.__name__, fun)
+        try:
+            FileWriter.writer = H5PYWriter
+            fl = FileWriter.create_file(
+                self._fname, True, access="frames", rdcc_nslots=1031)
+            cache = fl.h5object.id.get_access_plist().get_cache()
+            self.assertEqual(cache[1:],
+                             (1031, 64 << 20, 1.0))
+            rt = fl.root()
+            fd = rt.create_field("data", "uint16", [0, 4096, 4096], "auto")
+            self.assertEqual(fd.h5object.chunks, (1, 128, 4096))
+            fd.close()
+            rt.close()
+            fl.close()
+
+            fl = FileWriter.open_file(
+                self._fname, readonly=True, access="metadata")
+            cache = fl.h5object.id.get_access_plist().get_cache()
+            self.assertEqual(cache[2], 0)
+            fl.close()
+
+            fl = FileWriter.open_file(
+                self._fname, readonly=True, rdcc_nbytes=None)
+            cache = fl.h5object.id.get_access_plist().get_cache()
+            self.assertTrue(cache[2] > 0)
+            fl.close()
+        finally:
+            os.remove(self._fname)
+
+    # tuning test
+    # \brief It tests tuning parameters unsupported by the h5py version
+    def test_access_tuning_unsupported_h5py(self):
+        fun = sys._getframe().f_code.co_name
+        print("Run: %s.%s() " % (self.__class__.__name__, fun))
+        self._fname = '%s/%s%s.h5' % (
+            os.getcwd(), self.__class__.__name__, fun)
+        supported = H5PYWriter.tuning_parameters()
+        self.assertTrue("rdcc_nbytes" in supported)
+        self.assertTrue(
+            set(supported).issubset(set(FileWriter.TUNING_PARAMETERS)))
+        # tuning parameters of h5py 2.9
+        old_supported = H5PYWriter._TUNING_PARAMETERS
+        H5PYWriter._TUNING_PARAMETERS = [
+            "rdcc_nbytes", "rdcc_nslots", "rdcc_w0"]
+        try:
+            FileWriter.writer = H5PYWriter
+            with warnings.catch_warnings(record=True) as wrns:
+                warnings.simplefilter("always")
+                fl = FileWriter.create_file(
+                    self._fname, True, access="frames")
+                self.assertEqual(wrns, [])
+            fapl = fl.h5object.id.get_access_plist()
+            self.assertEqual(fapl.get_cache()[1:], (12421, 64 << 20, 1.0))
+            self.assertTrue(fapl.get_meta_block_size() != 1 << 20)
+            fl.close()
+
+            with warnings.catch_warnings(record=True) as wrns:
+                warnings.simplefilter("always")
+                fl = FileWriter.open_file(
+                    self._fname, readonly=True, access="frames",
+                    meta_block_size=1 << 21, page_buf_size=None)
+                self.assertEqual(len(wrns), 1)
+                self.assertTrue("meta_block_size" in str(wrns[0].message))
+                self.assertTrue(
+                    "page_buf_size" not in str(wrns[0].message))
+            fapl = fl.h5object.id.get_access_plist()
+            self.assertTrue(fapl.get_meta_block_size() != 1 << 21)
+            fl.close()
+        finally:
+            H5PYWriter._TUNING_PARAMETERS = old_supported
+            os.remove(self._fname)
+
+    def test_find_fields_h5py(self):
+        fun = sys._getframe().f_code.co_name
+        print("Run: %s.%s() " % (self.__class__.__name__, fun))
+        self._fname = '%s/%s%s.h5' % (
+            os.getcwd(), self.__class__.__name__, fun)
+        try:
+            FileWriter.writer = H5PYWriter
+            fl = FileWriter.create_file(self._fname, True)
+            rt = fl.root()
+            en = rt.create_group("entry", "NXentry")
+            col = en.create_group("instrument", "NXinstrument").create_group(
+                "collection", "NXcollection")
+            col.create_field("postrun", "string")
+            en.create_group("postrun", "NXcollection")
+            en.create_group("data", "NXdata").create_field(
+                "postrun", "string")
+            en.create_field("value", "float64")
+            FileWriter.link(
+                "/entry/instrument/collection/postrun",
+                en.open("instrument"), "postrun")
+            FileWriter.link("missing.nxs://entry", en, "external")
+
+            paths = ["entry/data/postrun",
+                     "entry/instrument/collection/postrun"]
+            self.assertEqual(sorted(rt.find_fields("postrun")), paths)
+            self.assertEqual(
+                sorted(FileWriter.FTGroup.find_fields(rt, "postrun")), paths)
+            self.assertEqual(
+                sorted(en.find_fields("postrun")),
+                ["data/postrun", "instrument/collection/postrun"])
+            self.assertEqual(col.find_fields("postrun"), ["postrun"])
+            self.assertEqual(en.find_fields("value"), ["value"])
+            self.assertEqual(rt.find_fields("missing"), [])
+            col.close()
+            en.close()
+            rt.close()
+            fl.close()
+        finally:
+            os.remove(self._fname)
+
+    def test_write_chunk_h5py(self):
+        fun = sys._getframe().f_code.co_name
+        print("Run: %s.%s() " % (self.__class__.__name__, fun))
+        self._fname = '%s/%s%s.h5' % (
+            os.getcwd(), self.__class__.__name__, fun)
+        try:
+            FileWriter.writer = H5PYWriter
+            fl = FileWriter.create_file(self._fname, True)
+            rt = fl.root()
+            dfilter = FileWriter.data_filter(rt)
+            dfilter.rate = 3
+            field = rt.create_field(
+                "data", "uint16", [0, 4, 5], [1, 4, 5], dfilter=dfilter)
+            frames = numpy.arange(40, dtype="uint16").reshape(2, 4, 5)
+            field.grow(0, 2)
+            field.write_chunk(
+                [0, 0, 0], zlib.compress(frames[0].tobytes(), 3))
+            field.write_chunk(
+                [1, 0, 0], zlib.compress(frames[1].tobytes(), 3), 0)
+            self.assertEqual(field.shape, (2, 4, 5))
+            self.assertTrue((field.read() == frames).all())
+            fl.close()
+
+            fl = FileWriter.open_file(self._fname, readonly=True)
+            self.assertTrue((fl.root().open("data").read() == frames).all())
+            fl.close()
+        finally:
+            os.remove(self._fname)
+
+    def test_attributes_read_all_h5py(self):
+        fun = sys._getframe().f_code.co_name
+        print("Run: %s.%s() " % (self.__class__.__name__, fun))
+        self._fname = '%s/%s%s.h5' % (
+            os.getcwd(), self.__class__.__name__, fun)
+        try:
+            FileWriter.writer = H5PYWriter
+            fl = FileWriter.create_file(self._fname, True)
+            rt = fl.root()
+            en = rt.create_group("entry", "NXentry")
+            fd = en.create_field("data", "float64", [3])
+            fd.attributes.create("units", "string")[...] = "mm"
+            at = fd.attributes.create("offset", "int64", [2])
+            at[...] = numpy.array([1, 2])
+            fd.h5object.attrs["fixed"] = numpy.bytes_(b"bytes")
+            fd.h5object.attrs["fixedarray"] = numpy.array(
+                [b"ab", b"cde"], dtype="S3")
+
+            attrs = fd.attributes
+            values = attrs.read_all()
+            self.assertEqual(
+                sorted(values.keys()),
+                ["fixed", "fixedarray", "offset", "units"])
+            for name in attrs.names():
+                if hasattr(values[name], "shape"):
+                    self.assertTrue(
+                        numpy.array_equal(values[name], attrs[name].read()))
+                else:
+                    self.assertEqual(values[name], attrs[name].read())
+            self.assertEqual(values["fixed"], "bytes")
+            if H5PYWriter.is_strings_as_bytes():
+                self.assertEqual(values["fixedarray"].dtype.kind, "U")
+            self.assertEqual(
+                [str(vl) for vl in values["fixedarray"]], ["ab", "cde"])
+            self.assertEqual(
+                attrs.read_all(["fixedarray"])["fixedarray"].tolist(),
+                attrs["fixedarray"].read().tolist())
+            self.assertEqual(
+                attrs.read_all(["units", "missing"]), {"units": "mm"})
+            self.assertEqual(
+                en.attributes.read_all(["NX_class"]),
+                {"NX_class": "NXentry"})
+            self.assertEqual(attrs.read_all([]), {})
+            fd.close()
+            en.close()
+            rt.close()
+            fl.close()
+        finally:
+            os.remove(self._fname)
+
     # default createfile test
     # \brief It tests default settings
     def test_ftobject(self):
@@ -187,6 +187,72 @@ class H5PYWriterTest(unittest.TestCase):
 
         self.assertEqual(el.h5object, w)
 
+    # custom attributes test
+    # \brief It tests if custom attributes can be set on wrappers
+    def test_custom_attributes(self):
+        fun = sys._getframe().f_code.co_name
+        print("Run: %s.%s() " % (self.__class__.__name__, fun))
+        self._fname = '%s/%s%s.h5' % (os.getcwd(),
+                                      self.__class__.__name__, fun)
+        try:
+            fl = H5PYWriter.create_file(self._fname)
+            rt = fl.root()
+            entry = rt.create_group("entry", "NXentry")
+            field = entry.create_field("data", "int64", [2])
+            attrs = field.attributes
+            attr = attrs.create("units", "string")
+            for obj in [fl, rt, entry, field, attrs, attr]:
+                obj.custom = 1
+                self.assertEqual(obj.custom, 1)
+            attr.close()
+            field.close()
+            entry.close()
+            fl.close()
+        finally:
+            os.remove(self._fname)
+
+    # readonly paths test
+    # \brief It tests lazy nexus paths of readonly files
+    def test_readonly_paths(self):
+        fun = sys._getframe().f_code.co_name
+        print("Run: %s.%s() " % (self.__class__.__name__, fun))
+        self._fname = '%s/%s%s.h5' % (os.getcwd(),
+                                      self.__class__.__name__, fun)
+        try:
+            fl = H5PYWriter.create_file(self._fname)
+            entry = fl.root().create_group("entry", "NXentry")
+            field = entry.create_field("data", "int64", [2])
+            field.attributes.create("units", "string").write(u"mm")
+            H5PYWriter.link("/entry/data", entry, "lk")
+            field.close()
+            entry.close()
+            fl.close()
+
+            fl = H5PYWriter.open_file(self._fname, readonly=True)
+            rt = fl.root()
+            entry = rt.open("entry")
+            field = entry.open("data")
+            lk = entry.open_link("lk")
+            attrs = field.attributes
+            attr = attrs["units"]
+            self.assertEqual(type(fl), H5PYWriter.H5PYFile)
+            self.assertEqual(type(entry), H5PYWriter.H5PYGroup)
+            self.assertEqual(type(field), H5PYWriter.H5PYField)
+            self.assertEqual(type(lk), H5PYWriter.H5PYLink)
+            self.assertEqual(
+                [type(at) for at in attrs], [H5PYWriter.H5PYAttribute])
+            self.assertEqual(entry.path, "/entry:NXentry")
+            self.assertEqual(field.path, "/entry:NXentry/data")
+            self.assertEqual(lk.path, "/entry:NXentry/lk")
+            self.assertEqual(attr.path, "/entry:NXentry/data@units")
+            self.assertEqual(attr.read(), "mm")
+            attr.close()
+            field.close()
+            entry.close()
+            fl.close()
+        finally:
+            os.remove(self._fname)
+
     # default createfile test
     # \brief It tests default settings
     def test_default_createfile(self):
@@ -0,0 +1,225 @@
+#!/usr/bin/env python
+#   This file is part of nexdatas - Tango Server for NeXus data writer
+#
+#    Copyright (C) 2012-2018 DESY, Jan Kotanski <jkotan@mail.desy.de>
+#
+#    nexdatas is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    nexdatas is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with nexdatas.  If not, see <http://www.gnu.org/licenses/>.
+# \package test nexdatas
+# \file NXSArgParser_test.py
+# unittests for the profiling of the command runners
+#
+import unittest
+import os
+import sys
+import json
+import pstats
+import tempfile
+
+try:
+    from cStringIO import StringIO
+except ImportError:
+    from io import StringIO
+
+from nxstools.nxsargparser import (
+    Runner, NXSArgParser, RunnerProfiler, PROFILE_ENV, TIMINGS_ENV)
+
+
+class SumRunner(Runner):
+
+    """ sum runner """
+
+    #: (:obj:`str`) command description
+    description = "sum numbers"
+
+    def create(self):
+        """ creates parser
+        """
+        self._parser.add_argument(
+            "-e", "--exit", dest="exit", action="store", type=int,
+            default=None, help="exit status")
+
+    def postauto(self):
+        """ creates parser
+        """
+        self._parser.add_argument(
+            "args", metavar="number", type=int, nargs="*")
+
+    def run(self, options):
+        """ the main program function
+
+        :param options: parser options
+        :type options: :class:`argparse.Namespace`
+        :returns: sum of numbers
+        :rtype: :obj:`int`
+        """
+        if options.exit is not None:
+            sys.exit(options.exit)
+        return sum(options.args)
+
+
+class NXSArgParserTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.environ = dict(
+            (name, os.environ.pop(name))
+            for name in [PROFILE_ENV, TIMINGS_ENV] if name in os.environ)
+
+    def tearDown(self):
+        for name in os.listdir(self.tmpdir):
+            os.remove(os.path.join(self.tmpdir, name))
+        os.rmdir(self.tmpdir)
+        for name in [PROFILE_ENV, TIMINGS_ENV]:
+            os.environ.pop(name, None)
+        os.environ.update(self.environ)
+
+    def runcmd(self, argv):
+        """ parses arguments and runs the command
+
+        :param argv: command arguments
+        :type argv: :obj:`list` <:obj:`str`>
+        :returns: result of the command
+        :rtype: `any`
+        """
+        parser = NXSArgParser()
+        parser.cmdrunners = [("sum", SumRunner)]
+        runners = parser.createSubParsers()
+        options = parser.parse_args(argv)
+        return runners[options.subparser].run(options)
+
+    def test_plain_run(self):
+        fun = sys._getframe().f_code.co_name
+        print("Run: %s.%s() " % (self.__class__.__name__, fun))
+        parser = NXSArgParser()
+        parser.cmdrunners = [("sum", SumRunner)]
+        runners = parser.createSubParsers()
+        self.assertTrue(isinstance(runners["sum"], RunnerProfiler))
+        self.assertTrue(isinstance(runners["sum"].runner, SumRunner))
+        self.assertEqual(runners["sum"].description, "sum numbers")
+        self.assertEqual(self.runcmd(["sum", "1", "2", "3"]), 6)
+        self.assertEqual(os.listdir(self.tmpdir), [])
+
+    def test_timings(self):
+        fun = sys._getframe().f_code.co_name
+        print("Run: %s.%s() " % (self.__class__.__name__, fun))
+        tfile = os.path.join(self.tmpdir, "timings.json")
+        self.assertEqual(
+            self.runcmd(["sum", "--cmd-timings", tfile, "1", "2"]), 3)
+        with open(tfile) as fl:
+            timings = json.load(fl)
+        self.assertTrue(timings["command"].endswith(" sum"))
+        self.assertEqual(timings["exit_status"], None)
+        self.assertEqual(timings["profiled"], False)
+        for name in ["setup", "startup_cpu", "run", "run_cpu"]:
+            self.assertTrue(timings[name] >= 0)
+        if timings["startup"] is not None:
+            self.assertTrue(timings["startup"] >= timings["setup"])
+
+        old_stderr = sys.stderr
+        sys.stderr = mystderr = StringIO()
+        try:
+            with self.assertRaises(SystemExit):
+                self.runcmd(["sum", "--cmd-timings", "-", "-e", "3"])
+        finally:
+            sys.stderr = old_stderr
+        timings = json.loads(mystderr.getvalue())
+        self.assertEqual(timings["exit_status"], 3)
+
+    def test_profile(self):
+        fun = sys._getframe().f_code.co_name
+        print("Run: %s.%s() " % (self.__class__.__name__, fun))
+        pfile = os.path.join(self.tmpdir, "sum.pstats")
+        self.assertEqual(
+            self.runcmd(["sum", "--cprofile", pfile, "4", "5"]), 9)
+        stats = pstats.Stats(pfile)
+        self.assertTrue(
+            [fn for fn in stats.stats.keys() if fn[2] == "run"])
+
+    def test_environment(self):
+        fun = sys._getframe().f_code.co_name
+        print("Run: %s.%s() " % (self.__class__.__name__, fun))
+        pfile = os.path.join(self.tmpdir, "env.pstats")
+        tfile = os.path.join(self.tmpdir, "env.json")
+        os.environ[PROFILE_ENV] = pfile
+        os.environ[TIMINGS_ENV] = tfile
+        self.assertEqual(self.runcmd(["sum", "7"]), 7)
+        pstats.Stats(pfile)
+        with open(tfile) as fl:
+            self.assertEqual(json.load(fl)["profiled"], True)
+
+        tfile2 = os.path.join(self.tmpdir, "opt.json")
+        self.assertEqual(self.runcmd(["sum", "--cmd-timings", tfile2, "7"]), 7)
+        self.assertTrue(os.path.exists(tfile2))
+
+    def test_nxsconfig_profiles(self):
+        fun = sys._getframe().f_code.co_name
+        print("Run: %s.%s() " % (self.__class__.__name__, fun))
+        from nxstools import nxsconfig
+        parser = NXSArgParser()
+        parser.cmdrunners = [("list", nxsconfig.List)]
+        parser.createSubParsers()
+        for opt in ["-r", "--profiles", "--profile", "--prof"]:
+            options = parser.parse_args(["list", opt])
+            self.assertEqual(options.profiles, True)
+            self.assertEqual(options.cprofile, None)
+
+    def test_subcommand_abbreviations(self):
+        fun = sys._getframe().f_code.co_name
+        print("Run: %s.%s() " % (self.__class__.__name__, fun))
+        modules = []
+        for name in ["nxsconfig", "nxscreate", "nxsetup", "nxsdata",
+                     "nxscollect", "nxsfileinfo"]:
+            try:
+                modules.append(
+                    __import__("nxstools.%s" % name, fromlist=[name]))
+            except ImportError:
+                print("%s cannot be imported: skipping" % name)
+        self.assertTrue(modules)
+
+        def longoptions(parser):
+            return [opt for action in parser._actions
+                    for opt in action.option_strings
+                    if opt.startswith("--")]
+
+        for module in modules:
+            for klass in vars(module).values():
+                if not isinstance(klass, type) or \
+                   not issubclass(klass, Runner) or \
+                   klass.__module__ != module.__name__:
+                    continue
+                parser = NXSArgParser()
+                runner = klass(parser)
+                runner.create()
+                runner.postauto()
+                options = longoptions(parser)
+                parser.addProfileArguments(parser)
+                added = [opt for opt in longoptions(parser)
+                         if opt not in options]
+                for opt in options:
+                    # abbreviations with at least two letters
+                    for size in range(4, len(opt)):
+                        prefix = opt[:size]
+                        if [op for op in options
+                                if op.startswith(prefix)] == [opt]:
+                            self.assertEqual(
+                                [op for op in added
+                                 if op.startswith(prefix)], [],
+                                "%s.%s: %s" % (
+                                    module.__name__, klass.__name__,
+                                    prefix))
+                            break
+
+
+if __name__ == '__main__':
+    unittest.main()
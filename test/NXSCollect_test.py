@@ -26,11 +26,15 @@ import random
 import struct
 import binascii
 import shutil
+import signal
+import time
+import multiprocessing
 import fabio
 import numpy as np
 import json
 from nxstools import nxscollect
 from nxstools import filewriter
+from nxstools.chunkcompressor import ChunkCompressor
 try:
     from pninexus import h5cpp
     H5CPP = True
@@ -81,6 +85,11 @@ def myinput(w, text):
     # myio.close()
 
 
+def sleepingtask(index):
+    time.sleep(0.2)
+    return index
+
+
 # test fixture
 class NXSCollectTest(unittest.TestCase):
 
@@ -92,16 +101,20 @@ class NXSCollectTest(unittest.TestCase):
 
         self.helperror = "Error: too few arguments\n"
 
-        self.helpinfo = """usage: nxscollect [-h] {append,link,vds} ...
+        self.helpinfo = """usage: nxscollect [-h] """ + \
+            """{append,link,vds,materialize} ...
 
   Command-line tool to merge images of external file-formats """ + \
             """into the master NeXus file
 
 positional arguments:
-  {append,link,vds}  sub-command help
+  {append,link,vds,materialize}
+                     sub-command help
     append           append images to the master file
     link             create an external or internal link in the master file
     vds              create a virual dataset in the master file
+    materialize      replace a virtual dataset with a chunked and compressed
+                     field
 
 optional arguments:
   -h, --help         show this help message and exit
@@ -559,6 +572,545 @@ For more help:
             os.remove('./test1_00004.tif')
             os.remove('./test1_00005.tif')
 
+    def test_append_jobs(self):
+        """ test nxsconfig append files in parallel processes
+        """
+        fun = sys._getframe().f_code.co_name
+        print("Run: %s.%s() " % (self.__class__.__name__, fun))
+
+        filenames = ['%s/%s%s_%s.nxs' % (
+            os.getcwd(), self.__class__.__name__, fun, i) for i in range(3)]
+        broken = '%s/%s%s_broken.nxs' % (
+            os.getcwd(), self.__class__.__name__, fun)
+
+        wrmodule = WRITERS[self.writer]
+        filewriter.writer = wrmodule
+
+        try:
+            for i in range(6):
+                shutil.copy2('test/files/test_file%s.tif' % i,
+                             './test1_%05d.tif' % i)
+            with open(broken, "w") as fl:
+                fl.write("not a nexus file")
+            for filename in filenames:
+                nxsfile = filewriter.create_file(
+                    filename, overwrite=True)
+                rt = nxsfile.root()
+                entry = rt.create_group("entry12345", "NXentry")
+                ins = entry.create_group("instrument", "NXinstrument")
+                det = ins.create_group("pilatus300k", "NXdetector")
+                col = det.create_group("collection", "NXcollection")
+                postrun = col.create_field("postrun", "string")
+                postrun.write("test1_%05d.tif:0:5")
+                nxsfile.close()
+
+            with open(filenames[0], "rb") as fl:
+                content = fl.read()
+            collector = nxscollect.Collector(
+                filenames[0], writer=self.writer, keepinterrupted=False)
+            collector._signalhandler(signal.SIGTERM, None)
+            old_stdout = sys.stdout
+            sys.stdout = mystdout = StringIO()
+            try:
+                self.assertEqual(collector.collect(), False)
+            finally:
+                sys.stdout = old_stdout
+            self.assertTrue(collector.interrupted)
+            with open(filenames[0], "rb") as fl:
+                self.assertEqual(content, fl.read())
+            self.assertEqual(
+                nxscollect.ParallelCollector._tmpfiles(filenames[0]), set())
+
+            old_stdout = sys.stdout
+            old_stderr = sys.stderr
+            sys.stdout = mystdout = StringIO()
+            sys.stderr = mystderr = StringIO()
+            old_argv = sys.argv
+            sys.argv = ['nxscollect', 'append', '-r', '-j', '2',
+                        filenames[0], broken, filenames[1], filenames[2]]
+            sys.argv.extend(self.flags.split())
+            status = None
+            try:
+                nxscollect.main()
+            except SystemExit as e:
+                status = e.code
+            finally:
+                sys.argv = old_argv
+                sys.stdout = old_stdout
+                sys.stderr = old_stderr
+            vl = mystdout.getvalue()
+            self.assertEqual('', mystderr.getvalue())
+            self.assertEqual(status, 1)
+
+            svl = vl.strip().split("\n")
+            for filename in filenames:
+                lines = [line for line in svl
+                         if line.startswith("%s:  * append " % filename)]
+                self.assertEqual(len(lines), 6)
+                self.assertTrue(
+                    "append: %s collected (exit status 0)" % filename
+                    in svl)
+            self.assertTrue(
+                "append: %s failed (exit status 1)" % broken in svl)
+            self.assertTrue(svl[-2].startswith("append: 4 files in "))
+            self.assertTrue(svl[-2].endswith(
+                ": 3 collected, 1 failed, 0 interrupted, 0 skipped"))
+            self.assertEqual(svl[-1], "append: failed %s" % broken)
+
+            for filename in filenames:
+                self.assertEqual(
+                    nxscollect.ParallelCollector._tmpfiles(filename), set())
+                nxsfile = filewriter.open_file(filename, readonly=True)
+                rt = nxsfile.root()
+                dt = rt.open("entry12345").open("instrument").open(
+                    "pilatus300k").open("data")
+                buffer = dt.read()
+                self.assertEqual(buffer.shape, (6, 195, 487))
+                for i in range(6):
+                    fbuffer = fabio.open('./test1_%05d.tif' % i)
+                    self.assertTrue(
+                        (buffer[i, :, :] == fbuffer.data[...]).all())
+                nxsfile.close()
+        finally:
+            for i in range(6):
+                os.remove('./test1_%05d.tif' % i)
+            for filename in filenames + [broken]:
+                if os.path.exists(filename):
+                    os.remove(filename)
+
+    def test_append_checkpoint(self):
+        """ test nxsconfig append resumed from a checkpoint
+        """
+        fun = sys._getframe().f_code.co_name
+        print("Run: %s.%s() " % (self.__class__.__name__, fun))
+
+        filename = '%s/%s%s.nxs' % (os.getcwd(),
+                                    self.__class__.__name__, fun)
+        checkpoint = "%s.__nxscollect_checkpoint__" % filename
+        cmd = ('nxscollect append --checkpoint -r %s %s' % (
+            filename, self.flags)).split()
+
+        wrmodule = WRITERS[self.writer]
+        filewriter.writer = wrmodule
+
+        def collect():
+            old_stdout = sys.stdout
+            old_stderr = sys.stderr
+            sys.stdout = mystdout = StringIO()
+            sys.stderr = mystderr = StringIO()
+            old_argv = sys.argv
+            sys.argv = cmd
+            try:
+                nxscollect.main()
+            finally:
+                sys.argv = old_argv
+                sys.stdout = old_stdout
+                sys.stderr = old_stderr
+            self.assertEqual('', mystderr.getvalue())
+            return mystdout.getvalue().strip().split("\n")
+
+        try:
+            for i in range(3):
+                shutil.copy2('test/files/test_file%s.tif' % i,
+                             './test1_%05d.tif' % i)
+            nxsfile = filewriter.create_file(filename, overwrite=True)
+            rt = nxsfile.root()
+            entry = rt.create_group("entry12345", "NXentry")
+            ins = entry.create_group("instrument", "NXinstrument")
+            det = ins.create_group("pilatus300k", "NXdetector")
+            col = det.create_group("collection", "NXcollection")
+            postrun = col.create_field("postrun", "string")
+            postrun.write("test1_%05d.tif:0:5")
+            nxsfile.close()
+            with open(filename, "rb") as fl:
+                content = fl.read()
+
+            svl = collect()
+            self.assertEqual(len(svl), 6)
+            for i in range(3):
+                self.assertTrue(
+                    svl[i + 1].endswith('test1_%05d.tif ' % i))
+            self.assertTrue(svl[4].startswith("Cannot open any of"))
+            self.assertEqual(
+                svl[5], "checkpoint: %s, run the command again to resume"
+                % checkpoint)
+            with open(filename, "rb") as fl:
+                self.assertEqual(content, fl.read())
+            with open(checkpoint + ".json") as fl:
+                progress = json.load(fl)
+            self.assertEqual(
+                [(fd["inputs"], fd["frames"])
+                 for fd in progress["fields"].values()], [(3, 3)])
+
+            for i in range(3, 6):
+                shutil.copy2('test/files/test_file%s.tif' % i,
+                             './test1_%05d.tif' % i)
+            svl = collect()
+            self.assertEqual(len(svl), 5)
+            self.assertEqual(svl[0], "resume: %s" % checkpoint)
+            for i in range(3, 6):
+                self.assertTrue(svl[i - 1].startswith(' * append '))
+                self.assertTrue(
+                    svl[i - 1].strip().endswith('test1_%05d.tif' % i))
+            self.assertTrue(not os.path.exists(checkpoint))
+            self.assertTrue(not os.path.exists(checkpoint + ".json"))
+
+            nxsfile = filewriter.open_file(filename, readonly=True)
+            rt = nxsfile.root()
+            dt = rt.open("entry12345").open("instrument").open(
+                "pilatus300k").open("data")
+            buffer = dt.read()
+            self.assertEqual(buffer.shape, (6, 195, 487))
+            for i in range(6):
+                fbuffer = fabio.open('./test1_%05d.tif' % i)
+                self.assertTrue(
+                    (buffer[i, :, :] == fbuffer.data[...]).all())
+            nxsfile.close()
+        finally:
+            for i in range(6):
+                if os.path.exists('./test1_%05d.tif' % i):
+                    os.remove('./test1_%05d.tif' % i)
+            for fname in [filename, checkpoint, checkpoint + ".json"]:
+                if os.path.exists(fname):
+                    os.remove(fname)
+
+    def test_append_compression_jobs(self):
+        """ test nxsconfig append with images compressed in parallel
+        """
+        fun = sys._getframe().f_code.co_name
+        print("Run: %s.%s() " % (self.__class__.__name__, fun))
+
+        filename = '%s/%s%s.nxs' % (os.getcwd(),
+                                    self.__class__.__name__, fun)
+        checkpoint = "%s.__nxscollect_checkpoint__" % filename
+        compressions = ["2", "1:5"]
+        if ChunkCompressor.supported([32008, 0, 2], "int32"):
+            compressions.append("32008:0,2")
+
+        wrmodule = WRITERS[self.writer]
+        filewriter.writer = wrmodule
+
+        def collect(comp):
+            cmd = ('nxscollect append --checkpoint --compression-jobs 3'
+                   ' -c %s -r %s %s' % (comp, filename, self.flags)).split()
+            old_stdout = sys.stdout
+            old_stderr = sys.stderr
+            sys.stdout = mystdout = StringIO()
+            sys.stderr = mystderr = StringIO()
+            old_argv = sys.argv
+            sys.argv = cmd
+            try:
+                nxscollect.main()
+            finally:
+                sys.argv = old_argv
+                sys.stdout = old_stdout
+                sys.stderr = old_stderr
+            self.assertEqual('', mystderr.getvalue())
+            return mystdout.getvalue().strip().split("\n")
+
+        try:
+            for comp in compressions:
+                for i in range(4):
+                    shutil.copy2('test/files/test_file%s.tif' % i,
+                                 './test1_%05d.tif' % i)
+                for i in range(4, 6):
+                    if os.path.exists('./test1_%05d.tif' % i):
+                        os.remove('./test1_%05d.tif' % i)
+                nxsfile = filewriter.create_file(filename, overwrite=True)
+                rt = nxsfile.root()
+                entry = rt.create_group("entry12345", "NXentry")
+                ins = entry.create_group("instrument", "NXinstrument")
+                det = ins.create_group("pilatus300k", "NXdetector")
+                col = det.create_group("collection", "NXcollection")
+                postrun = col.create_field("postrun", "string")
+                postrun.write("test1_%05d.tif:0:5")
+                nxsfile.close()
+
+                svl = collect(comp)
+                self.assertEqual(len(svl), 7)
+                for i in range(4):
+                    self.assertTrue(
+                        svl[i + 1].endswith('test1_%05d.tif ' % i))
+                self.assertTrue(svl[5].startswith("Cannot open any of"))
+                with open(checkpoint + ".json") as fl:
+                    progress = json.load(fl)
+                self.assertEqual(
+                    [(fd["inputs"], fd["frames"])
+                     for fd in progress["fields"].values()], [(4, 4)])
+
+                for i in range(4, 6):
+                    shutil.copy2('test/files/test_file%s.tif' % i,
+                                 './test1_%05d.tif' % i)
+                svl = collect(comp)
+                self.assertEqual(len(svl), 4)
+                self.assertEqual(svl[0], "resume: %s" % checkpoint)
+                self.assertTrue(not os.path.exists(checkpoint))
+
+                nxsfile = filewriter.open_file(filename, readonly=True)
+                rt = nxsfile.root()
+                dt = rt.open("entry12345").open("instrument").open(
+                    "pilatus300k").open("data")
+                buffer = dt.read()
+                self.assertEqual(buffer.shape, (6, 195, 487))
+                for i in range(6):
+                    fbuffer = fabio.open('./test1_%05d.tif' % i)
+                    self.assertTrue(
+                        (buffer[i, :, :] == fbuffer.data[...]).all())
+                nxsfile.close()
+        finally:
+            for i in range(6):
+                if os.path.exists('./test1_%05d.tif' % i):
+                    os.remove('./test1_%05d.tif' % i)
+            for fname in [filename, checkpoint, checkpoint + ".json"]:
+                if os.path.exists(fname):
+                    os.remove(fname)
+
+    def test_append_compression_jobs_bigendian(self):
+        """ test nxsconfig append with big-endian raw images
+        and compression jobs
+        """
+        fun = sys._getframe().f_code.co_name
+        print("Run: %s.%s() " % (self.__class__.__name__, fun))
+        if self.writer != "h5py":
+            print("Big-endian fields not supported: skipping the test")
+            return
+
+        self.assertTrue(not ChunkCompressor.supported(2, ">u2"))
+        self.assertTrue(ChunkCompressor.supported(2, "=u2"))
+
+        filename = '%s/%s%s.nxs' % (os.getcwd(),
+                                    self.__class__.__name__, fun)
+        wrmodule = WRITERS[self.writer]
+        filewriter.writer = wrmodule
+        images = np.array(
+            [[[i * 100 + j * 10 + k for k in range(5)] for j in range(3)]
+             for i in range(4)], dtype=">u2")
+
+        try:
+            for i in range(4):
+                with open("rawtest1_%05d.dat" % i, "w") as fl:
+                    images[i].tofile(fl)
+            nxsfile = filewriter.create_file(filename, overwrite=True)
+            rt = nxsfile.root()
+            entry = rt.create_group("entry12345", "NXentry")
+            ins = entry.create_group("instrument", "NXinstrument")
+            det = ins.create_group("pilatus300k", "NXdetector")
+            col = det.create_group("collection", "NXcollection")
+            postrun = col.create_field("postrun", "string")
+            postrun.write("rawtest1_%05d.dat:0:3")
+            atts = postrun.attributes
+            atts.create("fielddtype", "string").write(">u2")
+            atts.create("fieldshape", "string").write(
+                json.dumps(images.shape[1:]))
+            nxsfile.close()
+
+            cmd = ('nxscollect append --compression-jobs 2 -c 2 -r %s %s'
+                   % (filename, self.flags)).split()
+            old_stdout = sys.stdout
+            old_stderr = sys.stderr
+            sys.stdout = StringIO()
+            sys.stderr = mystderr = StringIO()
+            old_argv = sys.argv
+            sys.argv = cmd
+            try:
+                nxscollect.main()
+            finally:
+                sys.argv = old_argv
+                sys.stdout = old_stdout
+                sys.stderr = old_stderr
+            self.assertEqual('', mystderr.getvalue())
+
+            nxsfile = filewriter.open_file(filename, readonly=True)
+            dt = nxsfile.root().open("entry12345").open("instrument").open(
+                "pilatus300k").open("data")
+            buffer = dt.read()
+            self.assertEqual(buffer.shape, images.shape)
+            self.assertTrue((buffer == images).all())
+            nxsfile.close()
+        finally:
+            for i in range(4):
+                if os.path.exists("rawtest1_%05d.dat" % i):
+                    os.remove("rawtest1_%05d.dat" % i)
+            if os.path.exists(filename):
+                os.remove(filename)
+
+    def test_append_stats(self):
+        """ test nxsconfig append with statistics of stages
+        """
+        fun = sys._getframe().f_code.co_name
+        print("Run: %s.%s() " % (self.__class__.__name__, fun))
+
+        filename = '%s/%s%s.nxs' % (os.getcwd(),
+                                    self.__class__.__name__, fun)
+        wrmodule = WRITERS[self.writer]
+        filewriter.writer = wrmodule
+
+        def collect(cmd):
+            old_stdout = sys.stdout
+            old_stderr = sys.stderr
+            sys.stdout = mystdout = StringIO()
+            sys.stderr = mystderr = StringIO()
+            old_argv = sys.argv
+            sys.argv = cmd
+            try:
+                nxscollect.main()
+            finally:
+                sys.argv = old_argv
+                sys.stdout = old_stdout
+                sys.stderr = old_stderr
+            self.assertEqual('', mystderr.getvalue())
+            return mystdout.getvalue().strip().split("\n")
+
+        try:
+            for i in range(3):
+                shutil.copy2('test/files/test_file%s.tif' % i,
+                             './test1_%05d.tif' % i)
+            for flag in ["--stats", "--stats-json"]:
+                nxsfile = filewriter.create_file(filename, overwrite=True)
+                rt = nxsfile.root()
+                entry = rt.create_group("entry12345", "NXentry")
+                ins = entry.create_group("instrument", "NXinstrument")
+                det = ins.create_group("pilatus300k", "NXdetector")
+                col = det.create_group("collection", "NXcollection")
+                postrun = col.create_field("postrun", "string")
+                postrun.write("test1_%05d.tif:0:2")
+                nxsfile.close()
+
+                svl = collect(('nxscollect append -r %s %s %s' % (
+                    flag, filename, self.flags)).split())
+                if flag == "--stats":
+                    self.assertEqual(len(svl), 18)
+                    self.assertEqual(
+                        svl[4].split(" in ")[0],
+                        "stats: append %s" % filename)
+                    self.assertEqual(
+                        svl[5].split(), ["stage", "calls", "seconds", "share"])
+                    self.assertEqual(
+                        [line.split()[:2] for line in svl[6:14]],
+                        [["copy", "1"], ["open", "1"], ["find", "3"],
+                         ["load", "3"], ["write", "3"], ["flush", "3"],
+                         ["close", "1"], ["store", "1"]])
+                    self.assertEqual(
+                        [line.split()[:3] for line in svl[14:]],
+                        [["files", "3"],
+                         ["bytes", "read", str(3 * 195 * 487 * 4)],
+                         ["frames", "3", svl[16].split()[2]],
+                         ["bytes", "written", str(3 * 195 * 487 * 4)]])
+                    self.assertTrue(svl[16].endswith(" frames/s"))
+                else:
+                    self.assertEqual(len(svl), 5)
+                    stats = json.loads(svl[4])
+                    self.assertEqual(stats["name"], "append %s" % filename)
+                    self.assertEqual(
+                        list(stats["stages"].keys()),
+                        ["copy", "open", "find", "load", "write", "flush",
+                         "close", "store"])
+                    self.assertEqual(stats["stages"]["load"]["calls"], 3)
+                    self.assertEqual(stats["frames"], 3)
+                    self.assertEqual(stats["files"], 3)
+                    self.assertTrue(stats["frames_per_second"] > 0)
+                    self.assertTrue(
+                        sum(st["seconds"] for st in stats["stages"].values())
+                        <= stats["seconds"])
+
+            for flags in ["--compression-jobs 2 -c 2", "--test"]:
+                nxsfile = filewriter.create_file(filename, overwrite=True)
+                rt = nxsfile.root()
+                entry = rt.create_group("entry12345", "NXentry")
+                ins = entry.create_group("instrument", "NXinstrument")
+                det = ins.create_group("pilatus300k", "NXdetector")
+                col = det.create_group("collection", "NXcollection")
+                postrun = col.create_field("postrun", "string")
+                postrun.write("test1_%05d.tif:0:2")
+                nxsfile.close()
+
+                svl = collect(('nxscollect append -r --stats-json %s %s %s' % (
+                    flags, filename, self.flags)).split())
+                stats = json.loads(svl[-1])
+                self.assertEqual(stats["frames"], 3)
+                self.assertEqual(stats["bytes_read"], 3 * 195 * 487 * 4)
+                if flags == "--test":
+                    self.assertTrue("bytes_written" not in stats)
+                    self.assertTrue("bytes_compressed" not in stats)
+                else:
+                    self.assertEqual(
+                        stats["bytes_written"], 3 * 195 * 487 * 4)
+                    self.assertTrue(
+                        0 < stats["bytes_compressed"] <
+                        stats["bytes_written"])
+
+            svl = collect(('nxscollect link -r --stats-json %s://entry12345'
+                           ' --target %s://entry12345 --name ext %s' % (
+                               filename, filename, self.flags)).split())
+            self.assertEqual(len(svl), 2)
+            stats = json.loads(svl[1])
+            self.assertEqual(stats["name"], "link %s" % filename)
+            self.assertEqual(
+                list(stats["stages"].keys()),
+                ["copy", "open", "link", "store"])
+        finally:
+            for i in range(3):
+                if os.path.exists('./test1_%05d.tif' % i):
+                    os.remove('./test1_%05d.tif' % i)
+            if os.path.exists(filename):
+                os.remove(filename)
+
+    def test_postruntasks_links(self):
+        """ test postruntasks with soft and external links
+        """
+        fun = sys._getframe().f_code.co_name
+        print("Run: %s.%s() " % (self.__class__.__name__, fun))
+
+        filename = '%s/%s%s.nxs' % (os.getcwd(),
+                                    self.__class__.__name__, fun)
+        extname = '%s/%s%s_ext.nxs' % (os.getcwd(),
+                                       self.__class__.__name__, fun)
+        wrmodule = WRITERS[self.writer]
+        filewriter.writer = wrmodule
+
+        try:
+            nxsfile = filewriter.create_file(extname, overwrite=True)
+            entry = nxsfile.root().create_group("entry12345", "NXentry")
+            entry.create_group("collection", "NXcollection").create_field(
+                "postrun", "string").write("test2_%05d.tif:0:2")
+            nxsfile.close()
+
+            nxsfile = filewriter.create_file(filename, overwrite=True)
+            rt = nxsfile.root()
+            entry = rt.create_group("entry12345", "NXentry")
+            ins = entry.create_group("instrument", "NXinstrument")
+            det = ins.create_group("pilatus", "NXdetector")
+            col = det.create_group("collection", "NXcollection")
+            postrun = col.create_field("postrun", "string")
+            postrun.write("test1_%05d.tif:0:2")
+            postrun.attributes.create("fieldname", "string").write("data")
+            postrun.close()
+            # a second collection of the same detector, i.e. the soft link
+            # target, would be collected twice by following the links
+            det2 = ins.create_group("lambda", "NXdetector")
+            filewriter.link(
+                "/entry12345/instrument/pilatus/collection", det2,
+                "collection")
+            # postrun fields of external files are not collected
+            filewriter.link(
+                "%s://entry12345" % extname, det2, "external")
+            filewriter.link(
+                "missing.nxs://entry12345", entry, "missing")
+            nxsfile.close()
+
+            nxsfile = filewriter.open_file(filename, readonly=True)
+            tasks = nxscollect.postruntasks(nxsfile.root())
+            self.assertEqual(
+                [(task["path"], task["fieldname"], task["files"])
+                 for task in tasks],
+                [("entry12345/instrument/pilatus", "data",
+                  ["test1_%05d.tif:0:2"])])
+            nxsfile.close()
+        finally:
+            for name in [filename, extname]:
+                if os.path.exists(name):
+                    os.remove(name)
+
     def test_append_file_withpostrun_tif_pilatus300k_comp(self):
         """ test nxsconfig append file with a tif postrun field
         """
@@ -6054,6 +6606,315 @@ For more help:
             os.remove("eh5test1_00002.nxs")
             os.remove("eh5test1_00003.nxs")
 
+    def test_vds_auto(self):
+        """ test nxscollect vds
+        """
+        fun = sys._getframe().f_code.co_name
+        print("Run: %s.%s() " % (self.__class__.__name__, fun))
+        if self.writer == "h5py":
+            import nxstools.h5pywriter as H5PYWriter
+            if not H5PYWriter.is_vds_supported():
+                print("VDS not supported: skipping the test")
+                return
+
+        filename = '%s/%s%s.nxs' % (os.getcwd(),
+                                    self.__class__.__name__, fun)
+        cachename = '%s/%s%s.json' % (os.getcwd(),
+                                      self.__class__.__name__, fun)
+        attrs = {
+            "int1": [-123, "NX_INT", "int64", (1,)],
+            "int2": [12, "NX_INT", "int64", (1,)],
+            "int3": [52, "NX_INT", "int64", (1,)],
+        }
+
+        commands = [
+            ('nxscollect vds --auto %s' % (self.flags)).split(),
+            ('nxscollect vds -r -a -j 1 %s' % (self.flags)).split(),
+            ('nxscollect vds -a -j 2 --probe-cache %s %s'
+             % (cachename, self.flags)).split(),
+            ('nxscollect vds -r -a --probe-cache %s %s'
+             % (cachename, self.flags)).split(),
+        ]
+        wrmodule = WRITERS[self.writer]
+        filewriter.writer = wrmodule
+        try:
+            mlen = [self.__rnd.randint(10, 200),
+                    self.__rnd.randint(10, 200)]
+            for ii, k in enumerate(sorted(attrs.keys())):
+                attrs[k][0] = np.array(
+                    [[attrs[k][0] * self.__rnd.randint(0, 3)
+                      for c in range(mlen[1])]
+                     for i in range(mlen[0] + ii * 3)],
+                    dtype=attrs[k][2]
+                )
+                fl = filewriter.create_file("eh5test1_%05d.nxs" % (ii + 1),
+                                            overwrite=True)
+                rt = fl.root()
+
+                entry = rt.create_group("entry345", "NXentry")
+                dt = entry.create_group("data", "NXdata")
+                shp = attrs[k][0].shape
+                data = dt.create_field("data", attrs[k][2], shp, shp)
+                data.write(attrs[k][0])
+                data.close()
+
+                dt.close()
+                entry.close()
+                fl.close()
+
+            for ci, cmd in enumerate(commands):
+                nxsfile = filewriter.create_file(
+                    filename, overwrite=True)
+                rt = nxsfile.root()
+                entry = rt.create_group("entry12345", "NXentry")
+                ins = entry.create_group("instrument", "NXinstrument")
+                entry.create_group("data", "NXdata")
+                nxsfile.close()
+
+                pcmd = cmd
+                pcmd.extend(
+                    ['%s://entry12345/instrument/pilatus300k:NXdetector/'
+                     'data' % filename])
+                pcmd.extend(["--target-fields",
+                             "eh5test1_%05d.nxs://entry345/data/data:1:3"])
+                old_stdout = sys.stdout
+                old_stderr = sys.stderr
+                sys.stdout = mystdout = StringIO()
+                sys.stderr = mystderr = StringIO()
+                old_argv = sys.argv
+                sys.argv = pcmd
+                nxscollect.main()
+
+                sys.argv = old_argv
+                sys.stdout = old_stdout
+                sys.stderr = old_stderr
+                vl = mystdout.getvalue()
+                er = mystderr.getvalue()
+
+                self.assertTrue(vl)
+                svl = vl.split("\n")
+                self.assertEqual(len(svl), 5)
+                self.assertEqual('', er)
+                self.assertTrue(svl[0].startswith(
+                    'vds: probed 3 target fields (%s cached)'
+                    % (3 if ci == 3 else 0)))
+                for i in range(3):
+                    self.assertTrue(svl[i + 1].startswith('vds: '))
+                    self.assertTrue(
+                        'h5test1_0000%s' % (i + 1) in svl[i + 1])
+                    self.assertTrue(
+                        str(attrs["int%s" % (i + 1)][0].shape)
+                        in svl[i + 1])
+
+                if '-r' not in cmd:
+                    os.remove("%s.__nxscollect_old__" % filename)
+                if ci == 2:
+                    # reading VDS updates mtime of target files
+                    # created in the same process
+                    os.remove(filename)
+                    continue
+                nxsfile = filewriter.open_file(filename, readonly=True)
+                rt = nxsfile.root()
+                entry = rt.open("entry12345")
+                ins = entry.open("instrument")
+                det = ins.open("pilatus300k")
+                dt = det.open("data")
+                ibuffer = dt.read()
+                fimage = np.concatenate(
+                    (attrs["int1"][0], attrs["int2"][0], attrs["int3"][0]))
+                self.assertEqual(ibuffer.shape, fimage.shape)
+                self.assertEqual(str(ibuffer.dtype), attrs["int1"][2])
+                image = ibuffer[:, :]
+                self.assertTrue((image == fimage).all())
+                nxsfile.close()
+                os.remove(filename)
+
+        finally:
+            os.remove("eh5test1_00001.nxs")
+            os.remove("eh5test1_00002.nxs")
+            os.remove("eh5test1_00003.nxs")
+            if os.path.exists(cachename):
+                os.remove(cachename)
+
+    def test_materialize(self):
+        """ test nxscollect materialize
+        """
+        fun = sys._getframe().f_code.co_name
+        print("Run: %s.%s() " % (self.__class__.__name__, fun))
+        if self.writer == "h5py":
+            import nxstools.h5pywriter as H5PYWriter
+            if not H5PYWriter.is_vds_supported():
+                print("VDS not supported: skipping the test")
+                return
+
+        filename = '%s/%s%s.nxs' % (os.getcwd(),
+                                    self.__class__.__name__, fun)
+        path = "entry12345/instrument/pilatus300k/data"
+        attrs = {
+            "int1": [-123, "NX_INT", "int64", (1,)],
+            "int2": [12, "NX_INT", "int64", (1,)],
+            "int3": [52, "NX_INT", "int64", (1,)],
+        }
+
+        commands = [
+            ('nxscollect materialize -k 3 %s' % (self.flags)).split(),
+            ('nxscollect materialize -r -j 1 %s' % (self.flags)).split(),
+            ('nxscollect materialize -r -j 3 -c 0 %s'
+             % (self.flags)).split(),
+        ]
+        wrmodule = WRITERS[self.writer]
+        filewriter.writer = wrmodule
+        tasksize = nxscollect.Materializer.tasksize
+
+        class InterruptedMaterializer(nxscollect.Materializer):
+
+            def _writeprogress(self, shape, dtype, frames):
+                nxscollect.Materializer._writeprogress(
+                    self, shape, dtype, frames)
+                if frames:
+                    self._signalhandler(signal.SIGINT, None)
+
+        try:
+            mlen = [self.__rnd.randint(10, 20),
+                    self.__rnd.randint(10, 200)]
+            for ii, k in enumerate(sorted(attrs.keys())):
+                attrs[k][0] = np.array(
+                    [[attrs[k][0] * self.__rnd.randint(0, 3)
+                      for c in range(mlen[1])]
+                     for i in range(mlen[0] + ii)],
+                    dtype=attrs[k][2]
+                )
+                fl = filewriter.create_file("eh5test1_%05d.nxs" % (ii + 1),
+                                            overwrite=True)
+                rt = fl.root()
+                entry = rt.create_group("entry345", "NXentry")
+                dt = entry.create_group("data", "NXdata")
+                shp = attrs[k][0].shape
+                data = dt.create_field("data", attrs[k][2], shp, shp)
+                data.write(attrs[k][0])
+                data.close()
+                dt.close()
+                entry.close()
+                fl.close()
+            fimage = np.concatenate(
+                (attrs["int1"][0], attrs["int2"][0], attrs["int3"][0]))
+
+            for ci, cmd in enumerate(commands):
+                nxscollect.Materializer.tasksize = tasksize
+                nxsfile = filewriter.create_file(
+                    filename, overwrite=True)
+                rt = nxsfile.root()
+                entry = rt.create_group("entry12345", "NXentry")
+                entry.create_group("instrument", "NXinstrument")
+                nxsfile.close()
+
+                old_stdout = sys.stdout
+                sys.stdout = StringIO()
+                old_argv = sys.argv
+                sys.argv = [
+                    'nxscollect', 'vds', '-r', '-a', '-j', '1',
+                    '%s://%s' % (filename, path),
+                    "--target-fields",
+                    "eh5test1_%05d.nxs://entry345/data/data:1:3"]
+                sys.argv.extend(self.flags.split())
+                nxscollect.main()
+                sys.argv = old_argv
+                sys.stdout = old_stdout
+
+                old_stdout = sys.stdout
+                old_stderr = sys.stderr
+                sys.stdout = mystdout = StringIO()
+                sys.stderr = mystderr = StringIO()
+                resumed = None
+                if ci == 2:
+                    nxscollect.Materializer.tasksize = 1
+                    materializer = InterruptedMaterializer(
+                        "%s://%s" % (filename, path), "2", 1, 1,
+                        False, False, self.writer)
+                    materializer.materialize()
+                    resumed = mystdout.getvalue()
+                    sys.stdout = mystdout = StringIO()
+                old_argv = sys.argv
+                sys.argv = cmd + ['%s://%s' % (filename, path)]
+                nxscollect.main()
+
+                sys.argv = old_argv
+                sys.stdout = old_stdout
+                sys.stderr = old_stderr
+                vl = mystdout.getvalue()
+                er = mystderr.getvalue()
+
+                self.assertEqual('', er)
+                svl = vl.split("\n")
+                self.assertEqual(len(svl), 3)
+                self.assertTrue(svl[0].startswith('materialize: '))
+                self.assertTrue(
+                    svl[0].endswith('%s int64' % list(fimage.shape))
+                    or ci == 2)
+                self.assertTrue(svl[1].startswith(
+                    'materialize: %s frames' % (
+                        fimage.shape[0] - (1 if ci == 2 else 0))))
+                self.assertTrue(svl[1].endswith('MB/s)'))
+                if resumed is not None:
+                    self.assertTrue(svl[0].endswith('resumed at frame 1'))
+                    self.assertTrue(
+                        'interrupted at frame 1 of %s' % fimage.shape[0]
+                        in resumed)
+
+                if '-r' not in cmd:
+                    os.remove("%s.__nxscollect_old__" % filename)
+                self.assertTrue(not os.path.exists(
+                    "%s.__nxscollect_materialize__" % filename))
+                self.assertTrue(not os.path.exists(
+                    "%s.__nxscollect_materialize__.json" % filename))
+                nxsfile = filewriter.open_file(filename, readonly=True)
+                rt = nxsfile.root()
+                dt = rt.open("entry12345").open("instrument").open(
+                    "pilatus300k").open("data")
+                if self.writer == "h5py":
+                    self.assertTrue(not dt.h5object.is_virtual)
+                    self.assertEqual(
+                        dt.h5object.chunks,
+                        (3 if ci == 0 else 1, fimage.shape[1]))
+                ibuffer = dt.read()
+                self.assertEqual(ibuffer.shape, fimage.shape)
+                self.assertTrue((ibuffer == fimage).all())
+                nxsfile.close()
+                os.remove(filename)
+
+        finally:
+            nxscollect.Materializer.tasksize = tasksize
+            os.remove("eh5test1_00001.nxs")
+            os.remove("eh5test1_00002.nxs")
+            os.remove("eh5test1_00003.nxs")
+
+    def test_materialize_worker_signals(self):
+        """ test signals in nxscollect materialize workers
+        """
+        fun = sys._getframe().f_code.co_name
+        print("Run: %s.%s() " % (self.__class__.__name__, fun))
+
+        stop = multiprocessing.Event()
+        pool = multiprocessing.Pool(2, nxscollect._initworker, (stop,))
+        try:
+            results = pool.imap(sleepingtask, range(6))
+            self.assertEqual(next(results), 0)
+            workers = multiprocessing.active_children()
+            self.assertTrue(workers)
+            for worker in workers:
+                os.kill(worker.pid, signal.SIGTERM)
+            self.assertEqual(list(results), [1, 2, 3, 4, 5])
+            self.assertTrue(all(worker.is_alive() for worker in workers))
+            results = pool.imap(sleepingtask, range(6))
+            self.assertEqual(next(results), 0)
+        finally:
+            starttime = time.time()
+            stop.set()
+            pool.terminate()
+            pool.join()
+        self.assertTrue(time.time() - starttime < 10)
+        self.assertTrue(all(not worker.is_alive() for worker in workers))
+
     def test_vds_append(self):
         """ test nxscollect vds
         """
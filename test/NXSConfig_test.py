@@ -26,6 +26,7 @@ import random
 import struct
 import binascii
 import time
+import json
 import numpy as np
 import threading
 try:
@@ -7805,6 +7806,116 @@ For more help:
                 self.checkRSTSection(section, title, header, result[ni])
         el.close()
 
+    def test_describe_components_format(self):
+        fun = sys._getframe().f_code.co_name
+        print("Run: %s.%s() " % (self.__class__.__name__, fun))
+
+        el = self.openConf()
+        man = el.mandatoryComponents()
+        el.unsetMandatoryComponents(man)
+        self.__man += man
+        avc = el.availableComponents()
+
+        oname = "mcs_test_component"
+        self.assertTrue(isinstance(avc, list))
+        xml = [
+            "<?xml version='1.0' encoding='utf8'?>"
+            "<definition>"
+            "<group name='entry' type='NXentry'>"
+            "<group name='data' type='NXdata'>"
+            "<field name='slit1' type='NX_FLOAT' units='mm'>"
+            "<datasource name='sl1right' type='CLIENT'>"
+            "<record name='motor_1'/>"
+            "</datasource>"
+            "<strategy mode='INIT'/>"
+            "</field>"
+            "</group>"
+            "</group>"
+            "</definition>",
+            "<?xml version='1.0' encoding='utf8'?>"
+            "<definition>"
+            "<group name='entry' type='NXentry'>"
+            "<group name='instrument' type='NXinstrument'>"
+            "<group name='pinhole' type='NXpinhole'>"
+            "<field name='diameter' type='NX_FLOAT' units='mm'>"
+            "<strategy mode='STEP' />"
+            "<datasource name='phdiameter' type='CLIENT'>"
+            "<record name='ph_diameter'/>"
+            "</datasource>"
+            "</field>"
+            "<field type='NX_FLOAT' name='x' units='mm'>"
+            "14.5<strategy mode='INIT'/>"
+            "</field>"
+            "</group>"
+            "</group>"
+            "</group>"
+            "</definition>"
+        ]
+        result = [
+            [
+                {"nexus_path": "entry/data/slit1",
+                 "strategy": "INIT", "source_name": "sl1right"},
+            ],
+            [
+                {"nexus_path": "entry/instrument/pinhole/diameter",
+                 "strategy": "STEP", "source_name": "phdiameter"},
+                {"nexus_path": "entry/instrument/pinhole/x",
+                 "strategy": "INIT", "source_name": None},
+            ],
+        ]
+        np = len(xml)
+        name = []
+        for i in range(np):
+
+            name.append(oname + '_%s' % i)
+            while name[i] in avc:
+                name[i] = name[i] + '_%s' % i
+
+        for i in range(np):
+            self.setXML(el, xml[i])
+            self.assertEqual(el.storeComponent(name[i]), None)
+            self.__cmps.append(name[i])
+
+        server = self._sv.new_device_info_writer.name
+        columns = "nexus_path,strategy,source_name"
+        rows = result[0] + result[1]
+
+        vl, er = self.runtest(
+            ["nxsconfig", "describe", "-s", server, "-c", columns,
+             "--format", "jsonl"] + name)
+        self.assertEqual('', er)
+        self.assertEqual(
+            [json.loads(line) for line in vl.strip().split("\n")],
+            [dict((k, v) for k, v in row.items() if v is not None)
+             for row in rows])
+
+        vl, er = self.runtest(
+            ["nxsconfig", "describe", "--server", server,
+             "--columns", columns, "--format", "csv"] + name)
+        self.assertEqual('', er)
+        self.assertEqual(
+            vl.strip().split("\n"),
+            [columns] +
+            [",".join(row[hd] or "" for hd in columns.split(","))
+             for row in rows])
+
+        for ni, nm in enumerate(name):
+            vl, er = self.runtest(
+                ["nxsconfig", "describe", "-s", server, "-c", columns,
+                 "--sample-rows", "1", "--column-widths", "nexus_path=50",
+                 nm])
+            self.assertEqual('', er)
+            lines = vl.strip().split("\n")
+            self.assertEqual(lines[0], "Component: '%s'" % nm)
+            self.assertEqual(lines[4].split(), columns.split(","))
+            self.assertEqual(lines[4].index("strategy"), 51)
+            self.assertEqual(len(lines), 7 + len(result[ni]))
+            for li, row in enumerate(result[ni]):
+                self.assertEqual(
+                    lines[6 + li].split(),
+                    [row[hd] for hd in columns.split(",") if row[hd]])
+        el.close()
+
     def test_describe_components_filters(self):
         fun = sys._getframe().f_code.co_name
         print("Run: %s.%s() " % (self.__class__.__name__, fun))
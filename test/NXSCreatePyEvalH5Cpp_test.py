@@ -143,6 +143,8 @@ class NXSCreatePyEvalH5CppTest(unittest.TestCase):
     def setUp(self):
         print("\nsetting up...")
         print("SEED = %s" % self.seed)
+        from nxstools.pyeval import beamtimeid
+        beamtimeid.dircache.clear()
 
     # test closer
     # \brief Common tear down
@@ -529,6 +531,103 @@ class NXSCreatePyEvalH5CppTest(unittest.TestCase):
         finally:
             os.remove(bfn)
 
+    def test_beamtimeid_cache(self):
+        """
+        """
+        fun = sys._getframe().f_code.co_name
+        print("Run: %s.%s() " % (self.__class__.__name__, fun))
+
+        cwd = os.getcwd()
+
+        tstroot = TstRoot()
+        commonblock = {"__nxroot__": tstroot}
+        tstroot.filename = "%s/testcurrent/myfile.nxs" % cwd
+        start_time = "14:13:12"
+        shortname = "P00"
+        currentdir = "%s" % cwd
+        currentprefix = "beamtime-metadata-"
+        currentpostfix = ".json"
+        commissiondir = "/testgpfs/commission"
+        commissionprefix = "beam-metadata-"
+        commissionpostfix = ".jsn"
+        localdir = "/testgpfs/local"
+        beamtime = "2342342"
+        sgh = socket.gethostname()
+        btid = "%s_%s@%s" % (shortname, start_time, sgh)
+
+        from nxstools.pyeval import beamtimeid
+        bfn = "%s/%s%s%s" % (cwd, currentprefix, beamtime, currentpostfix)
+        ttl = beamtimeid.dircache.ttl
+        try:
+            open(bfn, 'a').close()
+            beamtimeid.dircache.ttl = 1000
+            result = beamtimeid.beamtimeid(
+                commonblock,  start_time, shortname,
+                commissiondir, currentdir, localdir,
+                currentprefix, currentpostfix,
+                commissionprefix, commissionpostfix)
+            self.assertEqual(beamtime, result)
+
+            os.remove(bfn)
+            result = beamtimeid.beamtimeid(
+                commonblock,  start_time, shortname,
+                commissiondir, currentdir, localdir,
+                currentprefix, currentpostfix,
+                commissionprefix, commissionpostfix)
+            self.assertEqual(beamtime, result)
+
+            beamtimeid.dircache.ttl = 0
+            result = beamtimeid.beamtimeid(
+                commonblock,  start_time, shortname,
+                commissiondir, currentdir, localdir,
+                currentprefix, currentpostfix,
+                commissionprefix, commissionpostfix)
+            self.assertEqual(btid, result)
+        finally:
+            beamtimeid.dircache.ttl = ttl
+            if os.path.exists(bfn):
+                os.remove(bfn)
+
+    def test_directorycache_mtime(self):
+        """
+        """
+        fun = sys._getframe().f_code.co_name
+        print("Run: %s.%s() " % (self.__class__.__name__, fun))
+
+        from nxstools.pyeval import beamtimeid
+        dirname = "%s/%s_dir" % (os.getcwd(), fun)
+        bfn = "%s/beamtime-metadata-2342342.json" % dirname
+        try:
+            os.mkdir(dirname)
+            dircache = beamtimeid.DirectoryCache(ttl=0)
+            mtime = os.stat(dirname).st_mtime
+            self.assertEqual(dircache.listdir(dirname), ())
+
+            # a file created in the same timestamp tick as the listing
+            open(bfn, 'a').close()
+            os.utime(dirname, (mtime, mtime))
+            self.assertEqual(
+                dircache.listdir(dirname),
+                ("beamtime-metadata-2342342.json",))
+
+            # an old directory mtime is trusted
+            os.utime(dirname, (mtime - 100, mtime - 100))
+            self.assertEqual(
+                dircache.listdir(dirname),
+                ("beamtime-metadata-2342342.json",))
+            os.remove(bfn)
+            os.utime(dirname, (mtime - 100, mtime - 100))
+            self.assertEqual(
+                dircache.listdir(dirname),
+                ("beamtime-metadata-2342342.json",))
+            os.utime(dirname, (mtime - 50, mtime - 50))
+            self.assertEqual(dircache.listdir(dirname), ())
+        finally:
+            if os.path.exists(bfn):
+                os.remove(bfn)
+            if os.path.exists(dirname):
+                os.rmdir(dirname)
+
     def test_beamtime_filename_nodir(self):
         """
         """
@@ -1364,6 +1463,152 @@ class NXSCreatePyEvalH5CppTest(unittest.TestCase):
             if os.path.exists(self._fname):
                 os.remove(self._fname)
 
+    def test_nxdata_index(self):
+        """
+        """
+        fun = sys._getframe().f_code.co_name
+        print("Run: %s.%s() " % (self.__class__.__name__, fun))
+
+        mfileprefix = "%s%s" % (self.__class__.__name__, fun)
+        scanid = 12345
+        self._fname = "%s_%s.nxs" % (mfileprefix, scanid)
+
+        try:
+
+            entryname = "entry123"
+            fl = self.fwriter.create_file(self._fname, overwrite=True)
+            fl.writer = self.fwriter
+            rt = fl.root()
+            entry = rt.create_group(entryname, "NXentry")
+            dt = entry.create_group("data", "NXdata")
+            dt.create_field(
+                "pilatus", "uint32", [30, 30, 20], [1, 30, 20]).close()
+            dt.create_field("exp_c01", "uint32", [30], [1]).close()
+            dt.create_group("collection", "NXcollection").close()
+
+            commonblock = {"__root__": rt}
+
+            from nxstools.pyeval import common
+            index = common.nxdata_index(commonblock, dt)
+            self.assertEqual(
+                sorted(index.keys()), ["collection", "exp_c01", "pilatus"])
+            self.assertTrue(
+                index["exp_c01"]["target"].endswith(
+                    "/%s/data/exp_c01" % entryname))
+            self.assertEqual(index["exp_c01"]["rank"], None)
+            self.assertTrue(common.nxdata_index(commonblock, dt) is index)
+
+            # ranks and field types are cached when items are opened
+            opened = []
+            dtopen = dt.open
+
+            def myopen(name):
+                opened.append(name)
+                return dtopen(name)
+            dt.open = myopen
+            for name in ["collection", "exp_c01", "pilatus"]:
+                common.nxdata_shape(index, dt, name, 1)
+            self.assertEqual(
+                list(common.nxdata_shape(index, dt, "exp_c01", 1)), [30])
+            self.assertEqual(
+                list(common.nxdata_shape(index, dt, "pilatus")), [30, 30, 20])
+            self.assertEqual(
+                opened, ["collection", "exp_c01", "pilatus",
+                         "exp_c01", "pilatus"])
+            self.assertEqual(index["pilatus"]["rank"], 3)
+            self.assertEqual(index["collection"]["field"], False)
+            del opened[:]
+            for name in ["collection", "exp_c01", "pilatus"]:
+                common.nxdata_shape(index, dt, name, 1)
+            self.assertEqual(opened, ["exp_c01"])
+            del dt.open
+
+            dt.create_field("exp_c02", "uint32", [30], [1]).close()
+            index2 = common.nxdata_index(commonblock, dt)
+            self.assertTrue(index2 is not index)
+            self.assertTrue(
+                index2["exp_c02"]["target"].endswith(
+                    "/%s/data/exp_c02" % entryname))
+
+            dt.close()
+            entry.close()
+            fl.close()
+
+            # the next scan with the same file name
+            fl = self.fwriter.create_file(self._fname, overwrite=True)
+            fl.writer = self.fwriter
+            rt = fl.root()
+            entry = rt.create_group(entryname, "NXentry")
+            dt = entry.create_group("data", "NXdata")
+            dt.create_field("exp_c01", "uint32", [30], [1]).close()
+            dt.create_field("exp_c02", "uint32", [30], [1]).close()
+            dt.create_group("collection", "NXcollection").close()
+            commonblock["__root__"] = rt
+            index3 = common.nxdata_index(commonblock, dt)
+            self.assertTrue(index3 is not index2)
+            self.assertEqual(
+                sorted(index3.keys()), ["collection", "exp_c01", "exp_c02"])
+
+            dt.close()
+            entry.close()
+            fl.close()
+        finally:
+            if os.path.exists(self._fname):
+                os.remove(self._fname)
+
+    def test_signalname_growing(self):
+        """
+        """
+        fun = sys._getframe().f_code.co_name
+        print("Run: %s.%s() " % (self.__class__.__name__, fun))
+
+        mfileprefix = "%s%s" % (self.__class__.__name__, fun)
+        scanid = 12345
+        self._fname = "%s_%s.nxs" % (mfileprefix, scanid)
+
+        try:
+
+            entryname = "entry123"
+            fl = self.fwriter.create_file(self._fname, overwrite=True)
+            fl.writer = self.fwriter
+            rt = fl.root()
+            entry = rt.create_group(entryname, "NXentry")
+            dt = entry.create_group("data", "NXdata")
+            dt.create_field("exp_a01", "uint32", [1], [1]).close()
+            c01 = dt.create_field("exp_c01", "uint32", [1], [1])
+            mot = dt.create_field("exp_mot01", "float64", [1], [1])
+
+            commonblock = {"__root__": rt}
+            from nxstools.pyeval import datasignal
+            args = ["lambda2", "exp_c03", "exp_t01", "", entryname]
+
+            result = datasignal.signalname(commonblock, *args)
+            self.assertEqual(result, "exp_a01")
+            result = datasignal.axesnames(
+                commonblock, *(args + ["exp_mot01"]))
+            self.assertEqual(result, ["exp_mot01"])
+
+            c01.grow(0, 9)
+            result = datasignal.signalname(commonblock, *args)
+            self.assertEqual(result, "exp_c01")
+            result = datasignal.axesnames(
+                commonblock, *(args + ["exp_mot01"]))
+            self.assertEqual(result, ["."])
+
+            mot.grow(0, 9)
+            result = datasignal.axesnames(
+                commonblock, *(args + ["exp_mot01"]))
+            self.assertEqual(result, ["exp_mot01"])
+
+            c01.close()
+            mot.close()
+            dt.close()
+            entry.close()
+            fl.close()
+        finally:
+            if os.path.exists(self._fname):
+                os.remove(self._fname)
+
     def test_axesnames_scancommand(self):
         """
         """
@@ -26,6 +26,7 @@ import random
 import struct
 import binascii
 import time
+import argparse
 import threading
 
 try:
@@ -86,6 +87,27 @@ def myinput(w, text):
     myio.close()
 
 
+class FakeNexusServer(object):
+
+    def __init__(self, fail=None):
+        self.calls = []
+        self.pending = []
+        self.maxpending = 0
+        self.fail = fail
+
+    def recordAsynch(self, jsondata):
+        self.pending.append(jsondata)
+        self.maxpending = max(self.maxpending, len(self.pending))
+        self.calls.append(("record", jsondata))
+        return len(self.calls)
+
+    def recordReply(self, cid):
+        jsondata = self.pending.pop(0)
+        self.calls.append(("reply", jsondata))
+        if jsondata == self.fail:
+            raise Exception("Record failed")
+
+
 # test fixture
 class NXSDataTest(unittest.TestCase):
 
@@ -97,17 +119,19 @@ class NXSDataTest(unittest.TestCase):
         self.helperror = "Error: too few arguments\n"
 
         self.helpinfo = """usage: nxsdata [-h]
-               {openfile,setdata,openentry,record,closefile,closeentry} ...
+               {openfile,setdata,openentry,record,stream,
+               closefile,closeentry} ...
 
 Command-line tool for writing NeXus files with NXSDataWriter
 
 positional arguments:
-  {openfile,setdata,openentry,record,closefile,closeentry}
+  {openfile,setdata,openentry,record,stream,closefile,closeentry}
                         sub-command help
     openfile            open a new H5 file
     setdata             assign global JSON data
     openentry           create new entry
     record              record one step with step JSON data
+    stream              record steps with step JSON data read line by line
     closefile           close the current file
     closeentry          close the current entry
 
@@ -1741,6 +1765,94 @@ For more help:
                 if os.path.isfile(fname):
                     os.remove(fname)
 
+    def test_stream(self):
+        fun = sys._getframe().f_code.co_name
+        print("Run: %s.%s() " % (self.__class__.__name__, fun))
+        fname = '%s/%s%s.h5' % (os.getcwd(), self.__class__.__name__, fun)
+        mcas = [self._mca1, self._mca2, self._mca1, self._mca2]
+        jdata = ['{"data": {"exp_c01":' + str(self._counter[0]) +
+                 ', "p09/mca/exp.02":' + str(mca) + '  } }'
+                 for mca in mcas]
+
+        el = self.openWriter()
+
+        commands = [
+            ['nxsdata', 'stream',
+             '-s', self._sv.new_device_info_writer.name],
+            ['nxsdata', 'stream',
+             '--server', self._sv.new_device_info_writer.name],
+        ]
+        for cmd in commands:
+            try:
+                el.fileName = fname
+                el.openFile()
+                el.JSONRecord = jdata[0]
+                el.XMLSettings = self._scanXml % fname
+                el.openEntry()
+                vl, er = self.runtest(
+                    list(cmd), pipeinput="\n".join(jdata) + "\n")
+                self.assertEqual('', er)
+                self.assertTrue("records: 4" in vl)
+                el.closeEntry()
+                el.closeFile()
+
+                from nxstools import filewriter as FileWriter
+                FileWriter.writer = H5CppWriter
+                f = FileWriter.open_file(fname, readonly=True)
+                f = f.root()
+                det = f.open("entry1").open("instrument").open("detector")
+                mca = det.open("mca")
+                self.assertEqual(mca.shape, (4, 2048))
+                value = mca.read()
+                for k, mc in enumerate(mcas):
+                    for i in range(len(value[k])):
+                        self.assertEqual(mc[i], value[k][i])
+                f.close()
+
+            finally:
+
+                if os.path.isfile(fname):
+                    os.remove(fname)
+
+    def test_stream_order(self):
+        fun = sys._getframe().f_code.co_name
+        print("Run: %s.%s() " % (self.__class__.__name__, fun))
+        fname = '%s/%s%s.json' % (
+            os.getcwd(), self.__class__.__name__, fun)
+        jdata = ['{"data": {"exp_c01": %s}}' % i for i in range(5)]
+
+        old_server = nxsdata.NexusServer
+        try:
+            with open(fname, "w") as fl:
+                fl.write("\n".join(jdata[:2]) + "\n\n")
+                fl.write("\n".join(jdata[2:]) + "\n")
+
+            fake = FakeNexusServer()
+            nxsdata.NexusServer = lambda server: fake
+            vl, er = self.runtest(
+                ['nxsdata', 'stream', '-s', 'fake/writer/1', '-i', fname])
+            self.assertEqual('', er)
+            self.assertTrue("records: 5" in vl)
+            self.assertEqual(fake.maxpending, 1)
+            self.assertEqual(
+                fake.calls,
+                [(call, jd) for jd in jdata for call in ["record", "reply"]])
+
+            fake = FakeNexusServer(fail=jdata[2])
+            options = argparse.Namespace(server="fake/writer/1", input=fname)
+            self.assertRaises(
+                Exception, nxsdata.Stream(None).run, options)
+            self.assertEqual(fake.maxpending, 1)
+            self.assertEqual(fake.pending, [])
+            self.assertEqual(
+                fake.calls,
+                [(call, jd) for jd in jdata[:3]
+                 for call in ["record", "reply"]])
+        finally:
+            nxsdata.NexusServer = old_server
+            if os.path.isfile(fname):
+                os.remove(fname)
+
     def test_setrecorddata(self):
         fun = sys._getframe().f_code.co_name
         print("Run: %s.%s() " % (self.__class__.__name__, fun))
@@ -42,6 +42,7 @@ from io import BytesIO
 
 from nxstools import nxsfileinfo
 from nxstools import filewriter
+from nxstools.nxsfileparser import NXSFileParser, PathTrie
 
 
 try:
@@ -457,6 +458,111 @@ For more help:
         finally:
             os.remove(filename)
 
+    def test_field_data_formats(self):
+        """ test nxsfileinfo field with streamed output formats
+        """
+        fun = sys._getframe().f_code.co_name
+        print("Run: %s.%s() " % (self.__class__.__name__, fun))
+
+        filename = "ttestfileinfo.nxs"
+        smpl = "water"
+
+        wrmodule = WRITERS[self.writer]
+        filewriter.writer = wrmodule
+
+        def runcmd(cmd):
+            old_stdout = sys.stdout
+            old_stderr = sys.stderr
+            sys.stdout = mystdout = StringIO()
+            sys.stderr = mystderr = StringIO()
+            old_argv = sys.argv
+            sys.argv = cmd
+            nxsfileinfo.main()
+
+            sys.argv = old_argv
+            sys.stdout = old_stdout
+            sys.stderr = old_stderr
+            return mystdout.getvalue(), mystderr.getvalue()
+
+        try:
+            nxsfile = filewriter.create_file(filename, overwrite=True)
+            rt = nxsfile.root()
+            entry = rt.create_group("entry12345", "NXentry")
+            sample = entry.create_group("sample", "NXsample")
+            sample.create_field("name", "string").write(smpl)
+            sample.create_field("depends_on", "string").write(
+                "transformations/phi")
+            trans = sample.create_group(
+                "transformations", "NXtransformations")
+            phi = trans.create_field("phi", "float64")
+            phi.write(0.5)
+            phi.attributes.create("units", "string").write("deg")
+            nxsfile.close()
+
+            vl, er = runcmd(
+                ('nxsfileinfo field %s %s' % (filename, self.flags)).split())
+            self.assertEqual('', er)
+            vl2, er = runcmd(
+                ('nxsfileinfo field %s %s --sample-rows 100'
+                 % (filename, self.flags)).split())
+            self.assertEqual('', er)
+            self.assertEqual(vl, vl2)
+
+            vl, er = runcmd(
+                ('nxsfileinfo field %s %s --sample-rows 1 '
+                 '--column-widths nexus_path=60'
+                 % (filename, self.flags)).split())
+            self.assertEqual('', er)
+            lines = vl.split("\n")
+            self.assertEqual(lines[4], "=" * 60 + " " + lines[4][61:])
+            self.assertTrue(
+                [ln for ln in lines
+                 if ln.startswith(
+                     "/entry12345/sample/transformations/phi")])
+
+            for widths in ["nexus_path=abc", "nexus_path", "=60"]:
+                old_stdout = sys.stdout
+                old_stderr = sys.stderr
+                sys.stdout = StringIO()
+                sys.stderr = mystderr = StringIO()
+                old_argv = sys.argv
+                sys.argv = ('nxsfileinfo field %s %s --column-widths %s'
+                            % (filename, self.flags, widths)).split()
+                try:
+                    with self.assertRaises(SystemExit) as cm:
+                        nxsfileinfo.main()
+                finally:
+                    sys.argv = old_argv
+                    sys.stdout = old_stdout
+                    sys.stderr = old_stderr
+                self.assertEqual(cm.exception.code, 255)
+                self.assertTrue(
+                    mystderr.getvalue().startswith(
+                        "nxsfileinfo: Column width '%s'" % widths))
+
+            vl, er = runcmd(
+                ('nxsfileinfo field %s %s --format jsonl -c nexus_path,units'
+                 % (filename, self.flags)).split())
+            self.assertEqual('', er)
+            rows = [json.loads(ln) for ln in vl.split("\n") if ln]
+            self.assertTrue(
+                {"nexus_path": "/entry12345/sample/transformations/phi",
+                 "units": "deg"} in rows)
+            self.assertTrue(
+                {"nexus_path": "/entry12345/sample/name"} in rows)
+
+            vl, er = runcmd(
+                ('nxsfileinfo field %s %s --format csv -c nexus_path,units'
+                 % (filename, self.flags)).split())
+            self.assertEqual('', er)
+            lines = [ln for ln in vl.split("\n") if ln]
+            self.assertEqual(lines[0], "nexus_path,units")
+            self.assertEqual(len(lines), len(rows) + 1)
+            self.assertTrue(
+                "/entry12345/sample/transformations/phi,deg" in lines)
+        finally:
+            os.remove(filename)
+
     def test_general_simplefile_nodata(self):
         """ test nxsconfig execute empty file
         """
@@ -2220,6 +2326,246 @@ For more help:
             finally:
                 os.remove(filename)
 
+    def test_metadata_cache(self):
+        """ test nxsfileinfo metadata with the metadata cache
+        """
+        fun = sys._getframe().f_code.co_name
+        print("Run: %s.%s() " % (self.__class__.__name__, fun))
+
+        filename = "ttestfileinfo_cache.nxs"
+        cachedir = "ttestfileinfo_cache"
+        smfname = "ttestfileinfo_cache.scientific.json"
+
+        def metadata(*options):
+            old_stdout = sys.stdout
+            old_stderr = sys.stderr
+            sys.stdout = mystdout = StringIO()
+            sys.stderr = mystderr = StringIO()
+            old_argv = sys.argv
+            sys.argv = ['nxsfileinfo', 'metadata', filename, '-s', smfname,
+                        '--cache-dir', cachedir] + \
+                self.flags.split() + list(options)
+            try:
+                nxsfileinfo.main()
+            finally:
+                sys.argv = old_argv
+                sys.stdout = old_stdout
+                sys.stderr = old_stderr
+            self.assertEqual('', mystderr.getvalue())
+            return json.loads(mystdout.getvalue())
+
+        def entries():
+            return sorted(os.path.join(cachedir, name)
+                          for name in os.listdir(cachedir)
+                          if name.endswith(".nxsmdcache.json"))
+
+        wrmodule = WRITERS[self.writer]
+        filewriter.writer = wrmodule
+        try:
+            nxsfile = filewriter.create_file(filename, overwrite=True)
+            entry = nxsfile.root().create_group("entry12345", "NXentry")
+            entry.create_field("title", "string").write("Test experiment")
+            nxsfile.close()
+            with open(smfname, "w") as fl:
+                fl.write('{"user_comments": "first comment"}')
+
+            dct = metadata()
+            self.assertEqual(
+                dct["scientificMetadata"]["title"]["value"],
+                "Test experiment")
+            self.assertEqual(
+                dct["scientificMetadata"]["user_comments"], "first comment")
+            cached = entries()
+            self.assertEqual(len(cached), 1)
+
+            # a cache hit does not read the nexus file
+            with open(cached[0]) as fl:
+                centry = json.load(fl)
+            centry["metadata"] = json.dumps({"cached": True})
+            with open(cached[0], "w") as fl:
+                json.dump(centry, fl)
+            self.assertEqual(metadata(), {"cached": True})
+            self.assertEqual(
+                metadata("--no-cache")["scientificMetadata"][
+                    "title"]["value"],
+                "Test experiment")
+            self.assertEqual(entries(), cached)
+
+            # other options
+            dct = metadata("--raw-metadata")
+            self.assertTrue("entry12345" in dct)
+            self.assertEqual(len(entries()), 2)
+
+            # changed scientific metadata file
+            with open(smfname, "w") as fl:
+                fl.write('{"user_comments": "second comment"}')
+            dct = metadata()
+            self.assertEqual(
+                dct["scientificMetadata"]["user_comments"], "second comment")
+            self.assertEqual(len(entries()), 2)
+
+            # changed nexus file and eviction of cache entries only
+            userfiles = [
+                os.path.join(cachedir, "notes.json"),
+                os.path.join(cachedir, "0" * 40 + ".json")]
+            for name in userfiles:
+                with open(name, "w") as fl:
+                    fl.write('{"user": "data"}')
+                os.utime(name, (0, 0))
+            nxsfile = filewriter.open_file(filename, readonly=False)
+            nxsfile.root().open("entry12345").create_field(
+                "end_time", "string").write("2014-02-15T15:17:21+00:00")
+            nxsfile.close()
+            dct = metadata("--cache-size", "1")
+            self.assertTrue("end_time" in dct["scientificMetadata"])
+            self.assertEqual(len(entries()), 1)
+            for name in userfiles:
+                self.assertTrue(os.path.exists(name))
+        finally:
+            for name in [filename, smfname]:
+                if os.path.exists(name):
+                    os.remove(name)
+            if os.path.isdir(cachedir):
+                shutil.rmtree(cachedir)
+
+    def test_pathtrie(self):
+        """ test path trie of filters and skipped paths
+        """
+        fun = sys._getframe().f_code.co_name
+        print("Run: %s.%s() " % (self.__class__.__name__, fun))
+
+        trie = PathTrie(["/entry:NXentry/sample:NXsample/*",
+                         "/entry:NXentry/title"])
+        self.assertTrue(trie.descends("/"))
+        self.assertTrue(trie.descends("/entry:NXentry"))
+        self.assertTrue(trie.descends("/entry:NXentry/sample:NXsample"))
+        self.assertTrue(
+            trie.descends("/entry:NXentry/sample:NXsample/tr:NXtransforms"))
+        self.assertFalse(trie.descends("/entry:NXentry/title"))
+        self.assertFalse(trie.descends("/entry:NXentry/data:NXdata"))
+        self.assertFalse(trie.descends("/scan:NXentry"))
+        self.assertTrue(PathTrie(["*:NXsample/*"]).descends("/scan:NXentry"))
+        self.assertTrue(PathTrie(["/e?try/*"]).descends("/scan:NXentry"))
+
+        trie = PathTrie(["scientificMetadata.instrument.detector"],
+                        ".", False)
+        self.assertTrue(trie.covers("scientificMetadata.instrument.detector"))
+        self.assertTrue(
+            trie.covers("scientificMetadata.instrument.detector.data"))
+        self.assertFalse(trie.covers("scientificMetadata.instrument"))
+        self.assertFalse(trie.covers("scientificMetadata.instrument.source"))
+        self.assertFalse(
+            PathTrie(["scientificMetadata.*"], ".", False).covers(
+                "scientificMetadata.title"))
+
+    def test_metadata_pruned(self):
+        """ test nxsfileinfo metadata and field with pruned subtrees
+        """
+        fun = sys._getframe().f_code.co_name
+        print("Run: %s.%s() " % (self.__class__.__name__, fun))
+
+        filename = "ttestfileinfo_pruned.nxs"
+
+        def metadata(*options):
+            old_stdout = sys.stdout
+            old_stderr = sys.stderr
+            sys.stdout = mystdout = StringIO()
+            sys.stderr = mystderr = StringIO()
+            old_argv = sys.argv
+            sys.argv = ['nxsfileinfo', 'metadata', filename] + \
+                self.flags.split() + list(options)
+            try:
+                nxsfileinfo.main()
+            finally:
+                sys.argv = old_argv
+                sys.stdout = old_stdout
+                sys.stderr = old_stderr
+            self.assertEqual('', mystderr.getvalue())
+            return json.loads(mystdout.getvalue())
+
+        wrmodule = WRITERS[self.writer]
+        filewriter.writer = wrmodule
+        try:
+            nxsfile = filewriter.create_file(filename, overwrite=True)
+            entry = nxsfile.root().create_group("entry12345", "NXentry")
+            entry.create_field("title", "string").write("Test experiment")
+            ins = entry.create_group("instrument", "NXinstrument")
+            det = ins.create_group("detector", "NXdetector")
+            det.create_field("mode", "string").write("fast")
+            for i in range(5):
+                det.create_field("counter%s" % i, "float64").write(0.5 * i)
+            sample = entry.create_group("sample", "NXsample")
+            sample.create_field("name", "string").write("water")
+            params = entry.create_group(
+                "nxsfileinfo_parameters", "NXcollection")
+            nxsfile.close()
+
+            # parser with skipped paths
+            fl = filewriter.open_file(filename, readonly=True)
+            parser = NXSFileParser(fl.root())
+            parser.scientific = True
+            parser.skippaths = ["scientificMetadata.instrument.detector"]
+            parser.parseMeta()
+            sm = parser.description[0]["scientificMetadata"]
+            self.assertEqual(sm["instrument"], {"NX_class": "NXinstrument"})
+            self.assertEqual(sm["sample"]["name"]["value"], "water")
+
+            parser = NXSFileParser(fl.root())
+            parser.filters = ["/entry12345:NXentry/sample:NXsample/*"]
+            parser.parse()
+            self.assertEqual(
+                [desc["nexus_path"] for desc in parser.description],
+                ["/entry12345/sample/name"])
+            fl.close()
+
+            cmap = "scientificMetadata.instrument.detector:"
+            sm = metadata("--copy-map", cmap)["scientificMetadata"]
+            self.assertEqual(sm["instrument"], {"NX_class": "NXinstrument"})
+            self.assertEqual(sm["sample"]["name"]["value"], "water")
+
+            # the removed subtree is read by the copy map
+            cmap2 = cmap + "\nscientificMetadata.detector_mode: " \
+                "scientificMetadata.instrument.detector.mode.value"
+            sm = metadata("--copy-map", cmap2)["scientificMetadata"]
+            self.assertEqual(sm["instrument"], {"NX_class": "NXinstrument"})
+            self.assertEqual(sm["detector_mode"], "fast")
+
+            # the removed subtree is read by the copy map in the file
+            nxsfile = filewriter.open_file(filename, readonly=False)
+            params = nxsfile.root().open("entry12345").open(
+                "nxsfileinfo_parameters")
+            params.create_field("copymap", "string").write(
+                "scientificMetadata.detector_mode: "
+                "scientificMetadata.instrument.detector.mode.value")
+            nxsfile.close()
+            calls = {"parseMeta": 0, "run": 0}
+
+            def counted(klass, name):
+                method = getattr(klass, name)
+
+                def wrapper(obj):
+                    calls[name] += 1
+                    return method(obj)
+                return wrapper
+
+            old_parsemeta = NXSFileParser.parseMeta
+            old_run = nxsfileinfo.BeamtimeLoader.run
+            NXSFileParser.parseMeta = counted(NXSFileParser, "parseMeta")
+            nxsfileinfo.BeamtimeLoader.run = counted(
+                nxsfileinfo.BeamtimeLoader, "run")
+            try:
+                sm = metadata("--copy-map", cmap)["scientificMetadata"]
+            finally:
+                NXSFileParser.parseMeta = old_parsemeta
+                nxsfileinfo.BeamtimeLoader.run = old_run
+            self.assertEqual(sm["instrument"], {"NX_class": "NXinstrument"})
+            self.assertEqual(sm["detector_mode"], "fast")
+            # one fallback parsing and one beamtime loader
+            self.assertEqual(calls, {"parseMeta": 2, "run": 1})
+        finally:
+            if os.path.exists(filename):
+                os.remove(filename)
+
     def test_metadata_postfix(self):
         """ test nxsconfig execute empty file
         """
@@ -10040,47 +10386,50 @@ For more help:
                  ' --beamline %s '
                  % (filename, atid, caption, bid, bl)).split(),
             ]
-            for cmd in commands:
-                # print(cmd)
-                old_stdout = sys.stdout
-                old_stderr = sys.stderr
-                sys.stdout = mystdout = StringIO()
-                sys.stderr = mystderr = StringIO()
-                old_argv = sys.argv
-                sys.argv = cmd
-                nxsfileinfo.main()
+            try:
+                for cmd in commands:
+                    # print(cmd)
+                    old_stdout = sys.stdout
+                    old_stderr = sys.stderr
+                    sys.stdout = mystdout = StringIO()
+                    sys.stderr = mystderr = StringIO()
+                    old_argv = sys.argv
+                    sys.argv = cmd
+                    nxsfileinfo.main()
 
-                sys.argv = old_argv
-                sys.stdout = old_stdout
-                sys.stderr = old_stderr
-                vl = mystdout.getvalue()
-                er = mystderr.getvalue()
+                    sys.argv = old_argv
+                    sys.stdout = old_stdout
+                    sys.stderr = old_stderr
+                    vl = mystdout.getvalue()
+                    er = mystderr.getvalue()
 
-                self.assertEqual('', er)
-                dct = json.loads(vl)
-                res = {
-                    'id': atid,
-                    'caption': caption,
-                    'thumbnail':
-                    "data:image/png;base64,iVBORw0KGgoAAAANSUhEUgAAAAoAAAAKCA"
-                    "IAAAACUFjqAAAACXBIWXMAAC4jAAAuIwF4pT92AAAAB3RJTUUH5wEbCA"
-                    "AYYJKxWgAAABl0RVh0Q29tbWVudABDcmVhdGVkIHdpdGggR0lNUFeBDh"
-                    "cAAAEQSURBVBjTBcFNTgIxFADg9vVNO1MGCPiDxugK4wIXmpi40GN4Pg"
-                    "/gQbyAKxcaIxojKCoFZtq+vvp98uZ4cjDQ1+ejnX5n+uzvH+cXl/XV2f"
-                    "j27iHIBLvdemjt/tbAlqA0Y1qP93qHA4PtT78gjKuV1KYSWYpY1WitBi"
-                    "EpppiETAAhZ86CvNdKaY2F7bsATS4Je9NFA2SqNeWmjUZXwYfYbLRk9u"
-                    "3aLREQCJJL8LdJbrm0XVtv17oDqCnB5vTkCBAYjUlZSQDPHImYBQvgon"
-                    "x5n4EWXIA0pTFlhyKj0qiMc7EJ+DSdw6iuikyc+eNzPpv9fi/c69uXW+"
-                    "U2Qm84BKtAZW6D90SqqDyDz+CTQFSllv+/oo3kf3+TDAAAAABJRU5Erk"
-                    "Jggg==",
-                    "ownerGroup": "%s-dmgt" % bid,
-                    "accessGroups": [
-                        '%s-clbt' % bid,
-                        '%s-part' % bid,
-                        '%s-dmgt' % bid,
-                        '%sdmgt' % bl, '%sstaff' % bl],
-                }
-                self.myAssertDict(dct, res)
+                    self.assertEqual('', er)
+                    dct = json.loads(vl)
+                    res = {
+                        'id': atid,
+                        'caption': caption,
+                        'thumbnail':
+                        "data:image/png;base64,iVBORw0KGgoAAAANSUhEUgAAAAoAAAA"
+                        "KCAIAAAACUFjqAAAACXBIWXMAAC4jAAAuIwF4pT92AAAAB3RJTUUH"
+                        "5wEbCAAYYJKxWgAAABl0RVh0Q29tbWVudABDcmVhdGVkIHdpdGggR"
+                        "0lNUFeBDhcAAAEQSURBVBjTBcFNTgIxFADg9vVNO1MGCPiDxugK4w"
+                        "IXmpi40GN4Pg/gQbyAKxcaIxojKCoFZtq+vvp98uZ4cjDQ1+ejnX5"
+                        "n+uzvH+cXl/XV2fj27iHIBLvdemjt/tbAlqA0Y1qP93qHA4PtT78g"
+                        "jKuV1KYSWYpY1WitBiEpppiETAAhZ86CvNdKaY2F7bsATS4Je9NFA"
+                        "2SqNeWmjUZXwYfYbLRk9u3aLREQCJJL8LdJbrm0XVtv17oDqCnB5v"
+                        "TkCBAYjUlZSQDPHImYBQvgonx5n4EWXIA0pTFlhyKj0qiMc7EJ+DS"
+                        "dw6iuikyc+eNzPpv9fi/c69uXW+U2Qm84BKtAZW6D90SqqDyDz+CT"
+                        "QFSllv+/oo3kf3+TDAAAAABJRU5ErkJggg==",
+                        "ownerGroup": "%s-dmgt" % bid,
+                        "accessGroups": [
+                            '%s-clbt' % bid,
+                            '%s-part' % bid,
+                            '%s-dmgt' % bid,
+                            '%sdmgt' % bl, '%sstaff' % bl],
+                    }
+                    self.myAssertDict(dct, res)
+            finally:
+                os.remove(filename)
 
     def test_attachment_fio(self):
         """ test nxsfileinfo attachment
@@ -0,0 +1,126 @@
+#!/usr/bin/env python
+#   This file is part of nexdatas - Tango Server for NeXus data writer
+#
+#    Copyright (C) 2012-2018 DESY, Jan Kotanski <jkotan@mail.desy.de>
+#
+#    nexdatas is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    nexdatas is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with nexdatas.  If not, see <http://www.gnu.org/licenses/>.
+# \package test nexdatas
+# \file NXSParser_test.py
+# unittests for xml configuration parser
+#
+import unittest
+import sys
+
+from nxstools.nxsparser import ParserTools, ParsedDocument, TableTools
+
+
+# test fixture
+class NXSParserTest(unittest.TestCase):
+
+    # constructor
+    # \param methodName name of the test method
+    def __init__(self, methodName):
+        unittest.TestCase.__init__(self, methodName)
+
+        self.xml = (
+            '<definition>'
+            '<group type="NXentry" name="entry">'
+            '<group type="NXinstrument">'
+            '<field name="pos" type="NX_FLOAT" units="mm">'
+            '<attribute name="depends_on" type="NX_CHAR">x</attribute>'
+            '<dimensions rank="1"><dim index="1" value="3"/></dimensions>'
+            '<strategy mode="STEP"/>'
+            '<datasource type="TANGO" name="mot01">'
+            '<device name="p09/motor/exp.01" member="attribute"/>'
+            '<record name="Position"/>'
+            '</datasource>'
+            '</field>'
+            '<link name="data" target="/entry/data"/>'
+            '</group>'
+            '</group>'
+            '<!-- comment -->'
+            '<field name="title"/>'
+            '</definition>'
+        )
+
+    def test_document_paths(self):
+        """ test node paths of parsed document
+        """
+        fun = sys._getframe().f_code.co_name
+        print("Run: %s.%s() " % (self.__class__.__name__, fun))
+
+        document = ParsedDocument(self.xml)
+        self.assertEqual(
+            [(nd.get("name"), path, fpath)
+             for nd, path, fpath in document.nodes("field")],
+            [("pos", "entry/instrument/pos",
+              "entry:NXentry/instrument:NXinstrument/pos"),
+             ("title", "title", "title")])
+        self.assertEqual(
+            [(path, fpath)
+             for _, path, fpath in document.nodes("attribute")],
+            [("entry/instrument/pos@depends_on",
+              "entry:NXentry/instrument:NXinstrument/pos@depends_on")])
+        self.assertEqual(
+            [path for _, path, _ in document.nodes("link")],
+            ["entry/instrument/data"])
+        self.assertEqual(
+            [nd.get("name") for nd, _, _ in document.nodes("datasource")],
+            ["mot01"])
+        self.assertEqual(document.nodes("group"), [])
+
+    def test_parse_document(self):
+        """ test parsing of the same document with string and document
+        """
+        fun = sys._getframe().f_code.co_name
+        print("Run: %s.%s() " % (self.__class__.__name__, fun))
+
+        document = ParserTools.parseDocument(self.xml)
+        self.assertTrue(ParserTools.parseDocument(document) is document)
+        for method in [ParserTools.parseFields,
+                       ParserTools.parseAttributes,
+                       ParserTools.parseLinks,
+                       ParserTools.parseDataSources]:
+            self.assertEqual(method(document), method(self.xml))
+
+        fields = ParserTools.parseFields(document)
+        self.assertEqual(len(fields), 2)
+        self.assertEqual(fields[0]["source"], "p09/motor/exp.01/Position")
+        self.assertEqual(fields[0]["source_name"], "mot01")
+        self.assertEqual(fields[0]["shape"], [3])
+        self.assertEqual(fields[0]["strategy"], "STEP")
+        self.assertEqual(fields[0]["depends_on"], "x")
+        links = ParserTools.parseLinks(document)
+        self.assertEqual(
+            [ln["nexus_path"] for ln in links],
+            ["[entry/instrument/data]", "\\-> /entry/data"])
+
+    def test_table_widths(self):
+        """ test parsing of column widths
+        """
+        fun = sys._getframe().f_code.co_name
+        print("Run: %s.%s() " % (self.__class__.__name__, fun))
+
+        self.assertEqual(TableTools.parseWidths(None), {})
+        self.assertEqual(TableTools.parseWidths(""), {})
+        self.assertEqual(
+            TableTools.parseWidths("nexus_path=60,,value=0"),
+            {"nexus_path": 60, "value": 0})
+        for text in ["nexus_path=abc", "nexus_path", "=60", "a=1=2",
+                     "value=-3", "nexus_path=60,value"]:
+            self.assertRaises(ValueError, TableTools.parseWidths, text)
+
+
+if __name__ == '__main__':
+    unittest.main()
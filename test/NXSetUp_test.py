@@ -28,6 +28,7 @@ import binascii
 import time
 import socket
 import subprocess
+import threading
 try:
     import tango
 except Exception:
@@ -125,6 +126,99 @@ def myinput(w, text):
     # myio.close()
 
 
+class FakeServerInfo(object):
+
+    def __init__(self, host, level):
+        self.host = host
+        self.level = level
+
+
+class FakeDatabase(object):
+
+    def __init__(self, servers, levels, host="myhost"):
+        self.servers = servers
+        self.levels = levels
+        self.host = host
+
+    def get_host_list(self):
+        return FakeValue([self.host])
+
+    def get_host_server_list(self, host):
+        return FakeValue(list(self.servers))
+
+    def get_server_info(self, server):
+        return FakeServerInfo(self.host, self.levels.get(server, 0))
+
+    def get_device_exported(self, name):
+        return FakeValue(
+            [name] if name == "tango/admin/%s" % self.host else [])
+
+    def get_device_exported_for_class(self, name):
+        return FakeValue(["tango/admin/%s" % self.host])
+
+
+class FakeValue(object):
+
+    def __init__(self, value_string):
+        self.value_string = value_string
+
+
+class FakeStarter(object):
+
+    def __init__(self, running=None, events=True):
+        self.running = list(running or [])
+        self.events = events
+        self.callbacks = {}
+        self.unsubscribed = []
+        self.calls = 0
+
+    def name(self):
+        return "tango/admin/notmyhost"
+
+    def UpdateServersInfo(self):
+        pass
+
+    def DevGetRunningServers(self, flag):
+        self.calls += 1
+        return list(self.running)
+
+    def subscribe_event(self, attr, etype, callback):
+        if not self.events:
+            raise Exception("Events not supported")
+        eid = len(self.callbacks) + 1
+        self.callbacks[eid] = callback
+        return eid
+
+    def unsubscribe_event(self, eid):
+        self.unsubscribed.append(eid)
+        self.callbacks.pop(eid, None)
+
+    def fire(self):
+        for callback in list(self.callbacks.values()):
+            callback(None)
+
+
+class FakeSetUp(nxsetup.SetUp):
+
+    def __init__(self, db=None):
+        self.db = db
+        self.writer_name = None
+        self.cserver_name = None
+        self.useevents = True
+        self.tasks = []
+
+    def _changeLevel(self, name, level, tohigher=True):
+        self.db.levels[name] = level
+
+    def _stopTask(self, task):
+        self.tasks.append(("stop", task[0], self.db.levels[task[0]]))
+        return task[0], True, 0.0
+
+    def _startTask(self, task):
+        self.tasks.append(("start", task[0], self.db.levels[task[0]]))
+        return task[0], True, 0.0
+
+
 # test fixture
 class NXSetUpTest(unittest.TestCase):
 
@@ -416,6 +510,202 @@ For more help:
                 self.assertEqual(h2, h1)
             self.assertEqual('', er)
 
+    # waitFor test
+    # \brief It tests exponential backoff of SetUp._waitFor
+    def test_waitfor_backoff(self):
+        fun = sys._getframe().f_code.co_name
+        print("Run: %s.%s() " % (self.__class__.__name__, fun))
+
+        setup = FakeSetUp()
+        times = []
+
+        def condition():
+            times.append(time.time())
+            return len(times) >= 5
+
+        self.assertTrue(
+            setup._waitFor(condition, 10, mindelay=0.01, maxdelay=0.08))
+        self.assertEqual(len(times), 5)
+        gaps = [t2 - t1 for t1, t2 in zip(times[:-1], times[1:])]
+        for gap, delay in zip(gaps, [0.01, 0.02, 0.04, 0.08]):
+            self.assertTrue(gap >= delay * 0.9)
+
+        times = []
+        starttime = time.time()
+        self.assertTrue(
+            not setup._waitFor(lambda: times.append(1),
+                               0.3, mindelay=0.01, maxdelay=0.05))
+        self.assertTrue(time.time() - starttime >= 0.3)
+        self.assertTrue(len(times) >= 6)
+
+        def failing():
+            times.append(1)
+            if len(times) < 3:
+                raise Exception("Not ready")
+            return True
+
+        times = []
+        old_stdout = sys.stdout
+        sys.stdout = StringIO()
+        try:
+            self.assertTrue(
+                setup._waitFor(failing, 10, mindelay=0.01, maxdelay=0.01))
+        finally:
+            sys.stdout = old_stdout
+        self.assertEqual(len(times), 3)
+
+    # waitFor test
+    # \brief It tests SetUp._waitFor woken up by an event
+    def test_waitfor_event(self):
+        fun = sys._getframe().f_code.co_name
+        print("Run: %s.%s() " % (self.__class__.__name__, fun))
+
+        setup = FakeSetUp()
+        event = threading.Event()
+        ready = []
+
+        def trigger():
+            ready.append(True)
+            event.set()
+
+        timer = threading.Timer(0.2, trigger)
+        starttime = time.time()
+        timer.start()
+        try:
+            self.assertTrue(
+                setup._waitFor(lambda: bool(ready), 30, event,
+                               mindelay=20, maxdelay=20))
+        finally:
+            timer.join()
+        self.assertTrue(time.time() - starttime < 10)
+
+    # waitServerRunning test
+    # \brief It tests waiting with Starter change events
+    def test_waitserver_events(self):
+        fun = sys._getframe().f_code.co_name
+        print("Run: %s.%s() " % (self.__class__.__name__, fun))
+
+        server = "TestServer/haso000"
+        for events in [True, False]:
+            setup = FakeSetUp()
+            starter = FakeStarter(events=events)
+
+            def start():
+                starter.running.append(server)
+                starter.fire()
+
+            timer = threading.Timer(0.2, start)
+            timer.start()
+            try:
+                self.assertTrue(setup.waitServerRunning(
+                    server, None, starter, verbose=False, timeout=30))
+            finally:
+                timer.join()
+            self.assertEqual(starter.callbacks, {})
+            self.assertEqual(starter.unsubscribed, [1] if events else [])
+            self.assertTrue(starter.calls > 1)
+
+            def stop():
+                starter.running.remove(server)
+                starter.fire()
+
+            timer = threading.Timer(0.2, stop)
+            timer.start()
+            try:
+                self.assertTrue(not setup.waitServerNotRunning(
+                    server, None, starter, verbose=False, timeout=30))
+            finally:
+                timer.join()
+            self.assertEqual(starter.callbacks, {})
+            self.assertEqual(
+                starter.unsubscribed, [1, 1] if events else [])
+
+            starter.running.append(server)
+            starttime = time.time()
+            self.assertTrue(setup.waitServerNotRunning(
+                server, None, starter, verbose=False, timeout=0.3))
+            self.assertTrue(time.time() - starttime >= 0.3)
+
+        setup = FakeSetUp()
+        setup.useevents = False
+        starter = FakeStarter(running=[server])
+        self.assertTrue(setup.waitServerRunning(
+            server, None, starter, verbose=False, timeout=1))
+        self.assertEqual(starter.callbacks, {})
+        self.assertEqual(starter.unsubscribed, [])
+
+    # restartServers test
+    # \brief It tests stop and start ordering by Starter levels
+    def test_restartservers_levels(self):
+        fun = sys._getframe().f_code.co_name
+        print("Run: %s.%s() " % (self.__class__.__name__, fun))
+
+        servers = ["TestServer/haso000", "TestServer/haso000t",
+                   "TestServer/haso000tt", "TestServer/haso000ttt",
+                   "TestServer/haso000tttt", "OtherServer/haso000"]
+        levels = [3, 1, 2, 1, 2, 1]
+        running = servers[:4] + servers[5:]
+        starter = FakeStarter(running=running)
+        old_proxy = nxsetup.tango.DeviceProxy
+        old_stdout = sys.stdout
+        nxsetup.tango.DeviceProxy = lambda name: starter
+        try:
+            for jobs in [1, 2, 8]:
+                for restart in [True, False]:
+                    db = FakeDatabase(servers, dict(zip(servers, levels)))
+                    setup = FakeSetUp(db)
+                    sys.stdout = mystdout = StringIO()
+                    try:
+                        self.assertTrue(setup.restartServers(
+                            ["TestServer"], restart=restart, jobs=jobs))
+                    finally:
+                        sys.stdout = old_stdout
+                    stops = [tk for tk in setup.tasks if tk[0] == "stop"]
+                    starts = [tk for tk in setup.tasks if tk[0] == "start"]
+                    self.assertEqual(
+                        setup.tasks[:len(stops)], stops)
+                    self.assertEqual(
+                        sorted(tk[1] for tk in stops), sorted(servers[:4]))
+                    self.assertEqual(
+                        [tk[2] for tk in stops], [3, 2, 1, 1])
+                    self.assertEqual(
+                        sorted(tk[1] for tk in starts),
+                        sorted(servers[:4] if restart else servers[:5]))
+                    self.assertEqual(
+                        [tk[2] for tk in starts],
+                        [1, 1, 2, 3] if restart else [1, 1, 2, 2, 3])
+                    self.assertTrue("Summary:" in mystdout.getvalue())
+                    self.assertTrue(
+                        "OtherServer" not in mystdout.getvalue())
+
+            db = FakeDatabase(servers, dict(zip(servers, levels)))
+            setup = FakeSetUp(db)
+            sys.stdout = StringIO()
+            try:
+                self.assertTrue(setup.restartServers(
+                    ["TestServer/haso000", "TestServer/haso000t"],
+                    start=False, jobs=4))
+            finally:
+                sys.stdout = old_stdout
+            self.assertEqual(
+                setup.tasks,
+                [("stop", "TestServer/haso000", 3),
+                 ("stop", "TestServer/haso000t", 1)])
+
+            db = FakeDatabase(servers, dict(zip(servers, levels)))
+            setup = FakeSetUp(db)
+            sys.stdout = StringIO()
+            try:
+                self.assertTrue(setup.restartServers(
+                    ["TestServer"], level=5, jobs=4))
+            finally:
+                sys.stdout = old_stdout
+            self.assertEqual(
+                [tk[2] for tk in setup.tasks], [5] * 8)
+        finally:
+            sys.stdout = old_stdout
+            nxsetup.tango.DeviceProxy = old_proxy
+
     # comp_available test
     # \brief It tests XMLConfigurator
     def test_set(self):
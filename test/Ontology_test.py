@@ -0,0 +1,101 @@
+#!/usr/bin/env python
+#   This file is part of nexdatas - Tango Server for NeXus data writer
+#
+#    Copyright (C) 2012-2018 DESY, Jan Kotanski <jkotan@mail.desy.de>
+#
+#    nexdatas is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    nexdatas is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with nexdatas.  If not, see <http://www.gnu.org/licenses/>.
+# \package test nexdatas
+# \file Ontology_test.py
+# unittests for PaNET ontology index
+#
+import unittest
+import os
+import sys
+import json
+
+from nxstools import ontology
+
+
+# test fixture
+class OntologyTest(unittest.TestCase):
+
+    # constructor
+    # \param methodName name of the test method
+    def __init__(self, methodName):
+        unittest.TestCase.__init__(self, methodName)
+
+    def test_index_uptodate(self):
+        """ test if the precompiled index matches the ontology
+        """
+        fun = sys._getframe().f_code.co_name
+        print("Run: %s.%s() " % (self.__class__.__name__, fun))
+
+        with open(ontology.INDEX_FILE) as fl:
+            index = json.load(fl)
+        self.assertEqual(index, ontology.compile_techniques())
+
+    def test_lookup(self):
+        """ test technique id lookups
+        """
+        fun = sys._getframe().f_code.co_name
+        print("Run: %s.%s() " % (self.__class__.__name__, fun))
+
+        techniques = ontology.read_techniques()
+        index = ontology.TechniqueIndex()
+        self.assertEqual(len(index), len(techniques))
+        self.assertEqual(dict(index), techniques)
+        saxs = "http://purl.org/pan-science/PaNET/PaNET01188"
+        self.assertTrue(saxs in index)
+        self.assertTrue("%sPaNET99999" % ontology.PANET_PREFIX
+                        not in index)
+        self.assertEqual(index[saxs], "small angle x-ray scattering")
+        self.assertEqual(ontology.id_techniques[saxs],
+                         "small angle x-ray scattering")
+        self.assertRaises(KeyError, lambda: index["saxs"])
+        self.assertEqual(index.find("small angle x-ray scattering"), saxs)
+        self.assertEqual(index.find(" Small  Angle X-ray_Scattering"), saxs)
+        self.assertEqual(index.find("small angle"), None)
+
+    def test_find_prefix(self):
+        """ test technique prefix lookups
+        """
+        fun = sys._getframe().f_code.co_name
+        print("Run: %s.%s() " % (self.__class__.__name__, fun))
+
+        techniques = ontology.read_techniques()
+        index = ontology.TechniqueIndex()
+        for prefix in ["small angle", "X-ray", "neutron", "xyzzy", ""]:
+            nm = ontology.normalize(prefix)
+            res = sorted(
+                tid for tid, lb in techniques.items()
+                if ontology.normalize(lb).startswith(nm))
+            self.assertEqual(sorted(index.find_prefix(prefix)), res)
+        self.assertTrue(
+            "http://purl.org/pan-science/PaNET/PaNET01188" in
+            index.find_prefix("small angle x-ray"))
+
+    def test_missing_index(self):
+        """ test fallback to the ontology without the index file
+        """
+        fun = sys._getframe().f_code.co_name
+        print("Run: %s.%s() " % (self.__class__.__name__, fun))
+
+        index = ontology.TechniqueIndex(
+            filename=os.path.join(
+                os.path.dirname(ontology.INDEX_FILE), "missing.json"))
+        self.assertEqual(dict(index), ontology.read_techniques())
+
+
+if __name__ == '__main__':
+    unittest.main()
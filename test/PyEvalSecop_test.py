@@ -0,0 +1,290 @@
+#!/usr/bin/env python
+#   This file is part of nexdatas - Tango Server for NeXus data writer
+#
+#    Copyright (C) 2012-2018 DESY, Jan Kotanski <jkotan@mail.desy.de>
+#
+#    nexdatas is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    nexdatas is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with nexdatas.  If not, see <http://www.gnu.org/licenses/>.
+# \package test nexdatas
+# \file PyEvalSecop_test.py
+# unittests for the pyeval secop client
+#
+import unittest
+import sys
+import json
+import threading
+import time
+
+try:
+    import socketserver
+except ImportError:
+    import SocketServer as socketserver
+
+from nxstools.pyeval import secop
+
+
+class FakeSecopHandler(socketserver.StreamRequestHandler):
+
+    """ fake secop request handler """
+
+    def handle(self):
+        """ handles one connection
+        """
+        server = self.server
+        with server.lock:
+            server.connections += 1
+        batch = []
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                break
+            line = line.decode().strip()
+            with server.lock:
+                server.requests.append(line)
+            if line == "quit":
+                break
+            reply = server.reply(line)
+            if reply is None:
+                continue
+            batch.append(reply)
+            if len(batch) < server.batch:
+                continue
+            if server.reverse:
+                batch.reverse()
+            out = []
+            for rpl in batch:
+                out.append('update drv:value [0.0,{"t":0}]')
+                out.append(rpl)
+            batch = []
+            data = ("\n".join(out) + "\n").encode()
+            if server.split:
+                for i in range(0, len(data), server.split):
+                    self.wfile.write(data[i:i + server.split])
+                    self.wfile.flush()
+                    time.sleep(0.001)
+            else:
+                self.wfile.write(data)
+                self.wfile.flush()
+
+
+class FakeSecopServer(socketserver.ThreadingMixIn, socketserver.TCPServer):
+
+    """ fake secop node """
+
+    allow_reuse_address = True
+    daemon_threads = True
+
+    def __init__(self):
+        """ constructor
+        """
+        socketserver.TCPServer.__init__(
+            self, ("127.0.0.1", 0), FakeSecopHandler)
+        self.lock = threading.Lock()
+        self.connections = 0
+        self.requests = []
+        self.values = {"drv:value": 12.5, "drv:target": 10.0,
+                       "drv:status": [100, "idle"], "t:value": 300.0}
+        #: number of replies sent together
+        self.batch = 1
+        #: send a batch of replies in the reversed order
+        self.reverse = False
+        #: size of written chunks
+        self.split = 0
+
+    def reply(self, line):
+        """ creates a reply
+
+        :param line: request line
+        :type line: :obj:`str`
+        :returns: reply line
+        :rtype: :obj:`str`
+        """
+        words = line.split(" ", 2)
+        if words[0] == "*IDN?":
+            return "ISSE&SINE2020,SECoP,V2019-09-16,v1.0"
+        if words[0] == "describe":
+            return "describing . %s" % json.dumps(
+                {"equipment_id": "fake", "modules": {}})
+        if words[0] == "ping":
+            return 'pong %s [null,{"t":1.0}]' % words[1]
+        if words[0] == "read":
+            if words[1] == "drv:silent":
+                return None
+            if words[1] not in self.values:
+                return 'error_read %s ["NoSuchParameter","%s",{}]' % (
+                    words[1], words[1])
+            return "reply %s %s" % (
+                words[1], json.dumps([self.values[words[1]], {"t": 1.0}]))
+        if words[0] == "change":
+            self.values[words[1]] = json.loads(words[2])
+            return "changed %s %s" % (
+                words[1], json.dumps([self.values[words[1]], {"t": 1.0}]))
+        return 'error %s ["ProtocolError","",{}]' % line
+
+
+class PyEvalSecopTest(unittest.TestCase):
+
+    def setUp(self):
+        self.server = FakeSecopServer()
+        self.host, self.port = self.server.server_address
+        self.thread = threading.Thread(target=self.server.serve_forever)
+        self.thread.daemon = True
+        self.thread.start()
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_secop_cmd(self):
+        fun = sys._getframe().f_code.co_name
+        print("Run: %s.%s() " % (self.__class__.__name__, fun))
+        self.assertEqual(
+            secop.secop_cmd("read drv:value", self.host, self.port),
+            [12.5, {"t": 1.0}])
+        self.assertEqual(
+            secop.secop_cmd("describe", self.host, self.port),
+            {"equipment_id": "fake", "modules": {}})
+        self.assertEqual(
+            secop.secop_cmd("*IDN?", self.host, self.port),
+            "ISSE&SINE2020,SECoP,V2019-09-16,v1.0")
+        self.assertEqual(
+            secop.secop_cmd("read drv:wrong", self.host, self.port),
+            ["NoSuchParameter", "drv:wrong", {}])
+        self.assertEqual(
+            secop.secop_cmd("change drv:target 5.5", self.host, self.port),
+            [5.5, {"t": 1.0}])
+        self.assertEqual(self.server.connections, 5)
+
+    def test_pipeline_demultiplex(self):
+        fun = sys._getframe().f_code.co_name
+        print("Run: %s.%s() " % (self.__class__.__name__, fun))
+        self.server.batch = 4
+        self.server.reverse = True
+        self.server.split = 7
+        cmds = ["read drv:value", "read drv:status", "read t:value",
+                "ping 17"]
+        res = secop.secop_pipeline(cmds, self.host, self.port, 0.01)
+        self.assertEqual(res, [[12.5, {"t": 1.0}],
+                               [[100, "idle"], {"t": 1.0}],
+                               [300.0, {"t": 1.0}],
+                               [None, {"t": 1.0}]])
+
+    def test_pooled_client(self):
+        fun = sys._getframe().f_code.co_name
+        print("Run: %s.%s() " % (self.__class__.__name__, fun))
+        commonblock = {}
+        for _ in range(10):
+            self.assertEqual(
+                secop.secop_cmd("read drv:value", self.host, self.port,
+                                commonblock=commonblock),
+                [12.5, {"t": 1.0}])
+        self.assertEqual(self.server.connections, 1)
+        name = "secop_%s:%s" % (self.host, self.port)
+        client = commonblock[name].get()
+        self.assertTrue(isinstance(client, secop.SecopClient))
+
+        client.send("quit")
+        for _ in range(100):
+            if not client.connected:
+                break
+            time.sleep(0.01)
+        self.assertEqual(
+            secop.secop_cmd("read t:value", self.host, self.port,
+                            commonblock=commonblock),
+            [300.0, {"t": 1.0}])
+        self.assertEqual(self.server.connections, 2)
+        self.assertTrue(commonblock[name].get() is not client)
+
+        commonblock.clear()
+        self.assertEqual(
+            secop.secop_cmd("read t:value", self.host, self.port,
+                            commonblock=commonblock),
+            [300.0, {"t": 1.0}])
+        self.assertEqual(self.server.connections, 3)
+
+    def test_timeout(self):
+        fun = sys._getframe().f_code.co_name
+        print("Run: %s.%s() " % (self.__class__.__name__, fun))
+        client = secop.SecopClient(self.host, self.port)
+        try:
+            start = time.time()
+            res = client.pipeline(
+                ["read drv:silent", "read drv:value"], 0.0001)
+            self.assertTrue(time.time() - start < 2)
+            self.assertEqual(res, ["", [12.5, {"t": 1.0}]])
+            self.assertEqual(
+                client.command("read drv:target"), [10.0, {"t": 1.0}])
+        finally:
+            client.close()
+        self.assertTrue(not client.connected)
+        self.assertEqual(
+            secop.secop_cmd("read drv:value", "127.0.0.1", self.port + 1,
+                            commonblock={}), None)
+
+    def test_secop_group_cmd(self):
+        fun = sys._getframe().f_code.co_name
+        print("Run: %s.%s() " % (self.__class__.__name__, fun))
+        commonblock = {"__counter__": 1}
+        for counter in [1, 1, 2]:
+            commonblock["__counter__"] = counter
+            self.assertEqual(
+                secop.secop_group_cmd(
+                    "read drv:status", self.host, self.port,
+                    group="drv", access=[0, 1], commonblock=commonblock),
+                "idle")
+        with self.server.lock:
+            self.assertEqual(
+                self.server.requests.count("read drv:status"), 2)
+
+    def test_secop_group_snapshot(self):
+        fun = sys._getframe().f_code.co_name
+        print("Run: %s.%s() " % (self.__class__.__name__, fun))
+        commonblock = {"__counter__": 1}
+        cmds = [("read drv:value", [0], 12.5),
+                ("read drv:value", [1, "t"], 1.0),
+                ("read drv:status", [0, 0], 100),
+                ("read drv:target", [0], 10.0),
+                ("read t:value", [0], 300.0)]
+        exchanges = []
+        pipeline = secop.secop_pipeline
+
+        def counted(cmds, *args, **kwargs):
+            exchanges.append(list(cmds))
+            return pipeline(cmds, *args, **kwargs)
+
+        secop.secop_pipeline = counted
+        try:
+            for counter in [1, 2, 3]:
+                commonblock["__counter__"] = counter
+                exchanges[:] = []
+                for cmd, access, value in cmds:
+                    self.assertEqual(
+                        secop.secop_group_cmd(
+                            cmd, self.host, self.port, 0.01,
+                            group="node_snapshot", access=access,
+                            commonblock=commonblock),
+                        value)
+                if counter == 1:
+                    self.assertEqual(len(exchanges), 4)
+                else:
+                    self.assertEqual(
+                        exchanges,
+                        [["read drv:value", "read drv:status",
+                          "read drv:target", "read t:value"]])
+        finally:
+            secop.secop_pipeline = pipeline
+        self.assertEqual(self.server.connections, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -54,6 +54,10 @@ except SystemError as e:
 import unittest
 
 import NXSTools_test
+import Ontology_test
+import NXSParser_test
+import PyEvalSecop_test
+import NXSArgParser_test
 
 if not H5PY_AVAILABLE and not H5CPP_AVAILABLE:
     raise Exception("Please install h5py or pninexus.h5cpp")
@@ -260,6 +264,19 @@ def main():
     # test suit
     suite = unittest.TestSuite()
 
+    suite.addTests(
+        unittest.defaultTestLoader.loadTestsFromModule(
+            Ontology_test))
+    suite.addTests(
+        unittest.defaultTestLoader.loadTestsFromModule(
+            NXSParser_test))
+    suite.addTests(
+        unittest.defaultTestLoader.loadTestsFromModule(
+            PyEvalSecop_test))
+    suite.addTests(
+        unittest.defaultTestLoader.loadTestsFromModule(
+            NXSArgParser_test))
+
     if H5PY_AVAILABLE:
         suite.addTests(
             unittest.defaultTestLoader.loadTestsFromModule(